@@ -27,7 +27,7 @@ def _build_parser() -> argparse.ArgumentParser:
     parser.add_argument('--timeframe', default='1m', help='Bar timeframe (default: 1m).')
     parser.add_argument('--output-dir', default='backtest_results', help='Output directory for reports.')
     parser.add_argument('--walkforward', action='store_true', help='Enable walk-forward validation.')
-    parser.add_argument('--no-cache', action='store_true', help='Disable Massive cache usage.')
+    parser.add_argument('--no-cache', action='store_true', help='Fetch every month again instead of reusing the Massive cache.')
     parser.add_argument('--no-report', action='store_true', help='Skip report generation.')
     parser.add_argument('--massive-api-key', default=None, help='Massive.com API key (defaults to env).')
     return parser
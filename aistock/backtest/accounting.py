@@ -0,0 +1,508 @@
+"""
+Float64 accounting backend for backtests.
+
+``Portfolio`` keeps its books in ``Decimal`` so live trading never loses a
+cent to rounding. Backtests that replay millions of fills do not need that
+guarantee on every intermediate value, so ``FloatPortfolio`` keeps cash,
+positions and P&L in machine floats. It is a drop-in for ``Portfolio``:
+``RiskEngine`` and any other caller of the Decimal API see the same types.
+
+The Decimal API converts on every call, which costs about as much as the
+arithmetic it wraps. The simulation loop therefore uses the float-native
+methods (``get_cash_float``, ``get_position_float``, ``get_equity_float`` and
+``apply_fill_float``), which take and return floats, and converts to
+``Decimal`` once per period when it builds the ``PeriodResult``.
+
+Drift against the Decimal path is measured, not assumed: give the portfolio
+a ``shadow`` ``Portfolio`` and every fill is mirrored into it, with the
+largest differences collected in an ``AccountingReconciliation``.
+
+Live trading must keep using ``Portfolio``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+from ..portfolio import Portfolio, Position
+
+# Positions smaller than this (in shares/contracts) are treated as flat. Closing
+# a position in fractional slices leaves float residue around 1e-14.
+QUANTITY_EPSILON = 1e-9
+
+# Default maximum absolute drift (in account currency) a reconciliation accepts
+DEFAULT_TOLERANCE = 0.01
+
+
+def _to_decimal(value: float) -> Decimal:
+    """Shortest decimal that round-trips to ``value`` (``0.1`` -> ``Decimal('0.1')``)."""
+    return Decimal(repr(value))
+
+
+def _drift(value: float, reference: Decimal) -> float:
+    """Exact absolute difference between a float and its Decimal reference."""
+    return float(abs(Decimal(value) - reference))
+
+
+@dataclass
+class AccountingReconciliation:
+    """Largest differences between float and Decimal books over one run.
+
+    Every value is an absolute difference in account currency, except
+    ``max_position_drift`` (shares) and ``max_relative_equity_drift``
+    (fraction of Decimal equity).
+    """
+
+    tolerance: float = DEFAULT_TOLERANCE
+    fills: int = 0
+    equity_checks: int = 0
+    max_cash_drift: float = 0.0
+    max_equity_drift: float = 0.0
+    max_relative_equity_drift: float = 0.0
+    max_position_drift: float = 0.0
+    max_average_price_drift: float = 0.0
+    max_fill_pnl_drift: float = 0.0
+    realised_pnl_drift: float = 0.0
+    commission_drift: float = 0.0
+    position_mismatches: list[str] = field(default_factory=list)
+
+    @property
+    def within_tolerance(self) -> bool:
+        """True when no monetary drift exceeds ``tolerance`` and positions agree."""
+        worst = max(
+            self.max_cash_drift,
+            self.max_equity_drift,
+            self.max_fill_pnl_drift,
+            self.realised_pnl_drift,
+            self.commission_drift,
+        )
+        return worst <= self.tolerance and not self.position_mismatches
+
+    def to_dict(self) -> dict[str, Any]:
+        """Plain-data form for logs and JSON reports."""
+        return {
+            'tolerance': self.tolerance,
+            'within_tolerance': self.within_tolerance,
+            'fills': self.fills,
+            'equity_checks': self.equity_checks,
+            'max_cash_drift': self.max_cash_drift,
+            'max_equity_drift': self.max_equity_drift,
+            'max_relative_equity_drift': self.max_relative_equity_drift,
+            'max_position_drift': self.max_position_drift,
+            'max_average_price_drift': self.max_average_price_drift,
+            'max_fill_pnl_drift': self.max_fill_pnl_drift,
+            'realised_pnl_drift': self.realised_pnl_drift,
+            'commission_drift': self.commission_drift,
+            'position_mismatches': list(self.position_mismatches),
+        }
+
+
+class _FloatPosition:
+    """Mutable float counterpart of ``Position``; same update rules as ``Position.realise``."""
+
+    __slots__ = (
+        'symbol',
+        'quantity',
+        'average_price',
+        'entry_time_utc',
+        'last_update_utc',
+        'total_volume',
+        'multiplier',
+        '_decimal',
+    )
+
+    def __init__(self, symbol: str, multiplier: float = 1.0) -> None:
+        self.symbol = symbol
+        self.quantity: float = 0.0
+        self.average_price: float = 0.0
+        self.entry_time_utc: datetime | None = None
+        self.last_update_utc: datetime | None = None
+        self.total_volume: float = 0.0
+        self.multiplier: float = multiplier
+        # Decimal quantity, average price, volume and multiplier; rebuilt only after a fill
+        self._decimal: tuple[Decimal, Decimal, Decimal, Decimal] | None = None
+
+    @classmethod
+    def from_position(cls, position: Position) -> _FloatPosition:
+        book = cls(position.symbol, float(position.multiplier))
+        book.quantity = float(position.quantity)
+        book.average_price = float(position.average_price)
+        book.entry_time_utc = position.entry_time_utc
+        book.last_update_utc = position.last_update_utc
+        book.total_volume = float(position.total_volume)
+        return book
+
+    def realise(self, quantity_delta: float, price: float, timestamp: datetime | None) -> None:
+        self._decimal = None
+        quantity = self.quantity
+        new_qty = quantity + quantity_delta
+
+        if abs(new_qty) <= QUANTITY_EPSILON:
+            self.quantity = 0.0
+            self.average_price = 0.0
+            self.entry_time_utc = None
+        elif (quantity > 0 and new_qty < 0) or (quantity < 0 and new_qty > 0):
+            self.quantity = new_qty
+            self.average_price = price
+            self.entry_time_utc = timestamp
+        elif (quantity >= 0 and quantity_delta > 0) or (quantity <= 0 and quantity_delta < 0):
+            if quantity == 0:
+                self.average_price = price
+                self.entry_time_utc = timestamp
+            else:
+                self.average_price = (quantity * self.average_price + quantity_delta * price) / new_qty
+            self.quantity = new_qty
+        else:
+            self.quantity = new_qty
+
+        if timestamp:
+            if self.entry_time_utc is None and self.quantity != 0:
+                self.entry_time_utc = timestamp
+            self.last_update_utc = timestamp
+
+        self.total_volume += abs(quantity_delta)
+
+    def to_position(self) -> Position:
+        decimal = self._decimal
+        if decimal is None:
+            decimal = self._decimal = (
+                _to_decimal(self.quantity),
+                _to_decimal(self.average_price),
+                _to_decimal(self.total_volume),
+                _to_decimal(self.multiplier),
+            )
+        quantity, average_price, total_volume, multiplier = decimal
+        return Position(
+            symbol=self.symbol,
+            quantity=quantity,
+            average_price=average_price,
+            entry_time_utc=self.entry_time_utc,
+            last_update_utc=self.last_update_utc,
+            total_volume=total_volume,
+            multiplier=multiplier,
+        )
+
+
+class FloatPortfolio(Portfolio):
+    """
+    Backtest-only ``Portfolio`` whose books are float64.
+
+    The ``Portfolio`` methods take and return ``Decimal``; the ``*_float``
+    methods take and return floats and never build a ``Decimal`` unless a
+    shadow portfolio is attached. Differences from ``Portfolio``:
+
+    - Positions within ``QUANTITY_EPSILON`` of zero are closed.
+    - No lock: the simulation loop is single-threaded.
+    - No trade log and no settlement tracking (cash is always available).
+
+    Args:
+        initial_cash: Starting cash.
+        shadow: Optional Decimal ``Portfolio`` that mirrors every fill for
+            reconciliation. It should start with the same cash.
+        tolerance: Monetary drift ``reconciliation`` accepts.
+    """
+
+    def __init__(
+        self,
+        initial_cash: Decimal,
+        shadow: Portfolio | None = None,
+        tolerance: float = DEFAULT_TOLERANCE,
+    ) -> None:
+        self._cash: float = float(initial_cash)
+        self._book: dict[str, _FloatPosition] = {}
+        self._realised: float = 0.0
+        self._commissions: float = 0.0
+        # Last Decimal price seen per symbol and its float; a bar's price is marked once, not per call
+        self._marks: dict[str, tuple[Decimal, float]] = {}
+        super().__init__(initial_cash=initial_cash)
+        self._shadow = shadow
+        self._reconciliation = AccountingReconciliation(tolerance=tolerance) if shadow is not None else None
+
+    # Attributes the base class exposes publicly are views onto the float books
+
+    @property
+    def cash(self) -> Decimal:  # type: ignore[override]
+        return _to_decimal(self._cash)
+
+    @cash.setter
+    def cash(self, value: Decimal) -> None:  # pyright: ignore[reportIncompatibleVariableOverride]
+        self._cash = float(value)
+
+    @property
+    def positions(self) -> dict[str, Position]:  # type: ignore[override]
+        return self.snapshot_positions()
+
+    @positions.setter
+    def positions(self, value: dict[str, Position]) -> None:  # pyright: ignore[reportIncompatibleVariableOverride]
+        self.replace_positions(value)
+
+    @property
+    def realised_pnl(self) -> Decimal:  # type: ignore[override]
+        return _to_decimal(self._realised)
+
+    @realised_pnl.setter
+    def realised_pnl(self, value: Decimal) -> None:  # pyright: ignore[reportIncompatibleVariableOverride]
+        self._realised = float(value)
+
+    @property
+    def commissions_paid(self) -> Decimal:  # type: ignore[override]
+        return _to_decimal(self._commissions)
+
+    @commissions_paid.setter
+    def commissions_paid(self, value: Decimal) -> None:  # pyright: ignore[reportIncompatibleVariableOverride]
+        self._commissions = float(value)
+
+    @property
+    def reconciliation(self) -> AccountingReconciliation | None:
+        """Drift report against the shadow portfolio, or None without one."""
+        return self._reconciliation
+
+    def enable_settlement_tracking(self, enabled: bool) -> None:
+        if enabled:
+            raise ValueError('FloatPortfolio does not model settlement; use Portfolio')
+
+    # Float-native API for the simulation loop: no Decimal round-trip per call
+
+    def get_cash_float(self) -> float:
+        return self._cash
+
+    def get_position_float(self, symbol: str) -> float:
+        book = self._book.get(symbol)
+        return book.quantity if book else 0.0
+
+    def get_equity_float(self, last_prices: dict[str, Decimal]) -> float:
+        equity = self._equity(last_prices)
+        if self._shadow is not None:
+            self._check_equity(equity, last_prices)
+        return equity
+
+    def apply_fill_float(
+        self,
+        symbol: str,
+        signed_quantity: float,
+        price: float,
+        commission: float,
+        timestamp: datetime,
+        multiplier: float = 1.0,
+    ) -> float:
+        """Book a fill given as floats; return its realised P&L as a float."""
+        realised = self._book_fill(symbol, signed_quantity, price, commission, timestamp, multiplier)
+        if self._shadow is not None:
+            reference = self._shadow.apply_fill(
+                symbol,
+                _to_decimal(signed_quantity),
+                _to_decimal(price),
+                _to_decimal(commission),
+                timestamp,
+                _to_decimal(multiplier),
+            )
+            self._check_fill(symbol, realised, reference)
+        return realised
+
+    # Decimal API
+
+    def get_cash(self) -> Decimal:
+        return _to_decimal(self._cash)
+
+    def get_available_cash(self, as_of: datetime | None = None) -> Decimal:
+        return _to_decimal(self._cash)
+
+    def get_position(self, symbol: str) -> Decimal:
+        book = self._book.get(symbol)
+        return _to_decimal(book.quantity) if book else Decimal('0')
+
+    def get_avg_price(self, symbol: str) -> Decimal | None:
+        book = self._book.get(symbol)
+        return _to_decimal(book.average_price) if book else None
+
+    def _mark(self, symbol: str, price: Decimal) -> float:
+        mark = self._marks.get(symbol)
+        if mark is not None and mark[0] is price:
+            return mark[1]
+        value = float(price)
+        self._marks[symbol] = (price, value)
+        return value
+
+    def _equity(self, last_prices: dict[str, Decimal]) -> float:
+        value = self._cash
+        marks = self._marks
+        for symbol, book in self._book.items():
+            price = last_prices.get(symbol)
+            if price is None:
+                continue
+            mark = marks.get(symbol)
+            if mark is None or mark[0] is not price:
+                mark = marks[symbol] = (price, float(price))
+            value += book.quantity * mark[1] * book.multiplier
+        return value
+
+    def get_equity(self, last_prices: dict[str, Decimal]) -> Decimal:
+        return _to_decimal(self.get_equity_float(last_prices))
+
+    def get_gross_exposure(self, last_prices: dict[str, Decimal]) -> Decimal:
+        gross = 0.0
+        for symbol, book in self._book.items():
+            price = last_prices.get(symbol)
+            if price is not None:
+                gross += abs(book.quantity) * self._mark(symbol, price) * book.multiplier
+        return _to_decimal(gross)
+
+    def get_net_exposure(self, last_prices: dict[str, Decimal]) -> Decimal:
+        net = 0.0
+        for symbol, book in self._book.items():
+            price = last_prices.get(symbol)
+            if price is not None:
+                net += book.quantity * self._mark(symbol, price) * book.multiplier
+        return _to_decimal(net)
+
+    def _book_fill(
+        self,
+        symbol: str,
+        quantity: float,
+        price: float,
+        commission: float,
+        timestamp: datetime | None,
+        multiplier: float,
+    ) -> float:
+        """Update cash and the position book; return the fill's realised P&L."""
+        book = self._book.get(symbol)
+        realised = 0.0
+        if book is not None:
+            held = book.quantity
+            if (held > 0 and quantity < 0) or (held < 0 and quantity > 0):
+                closing = min(abs(quantity), abs(held))
+                edge = price - book.average_price if held > 0 else book.average_price - price
+                realised = edge * closing * multiplier
+        else:
+            book = self._book[symbol] = _FloatPosition(symbol, multiplier)
+
+        self._cash -= quantity * price * multiplier + commission
+        self._commissions += commission
+        book.multiplier = multiplier
+        book.realise(quantity, price, timestamp)
+        if book.quantity == 0:
+            del self._book[symbol]
+        self._realised += realised
+        return realised
+
+    def apply_fill(
+        self,
+        symbol: str,
+        signed_quantity: Decimal,
+        price: Decimal,
+        commission: Decimal,
+        timestamp: datetime,
+        multiplier: Decimal = Decimal('1'),
+    ) -> Decimal:
+        realised = self._book_fill(
+            symbol,
+            float(signed_quantity),
+            float(price),
+            float(commission),
+            timestamp,
+            float(multiplier),
+        )
+        if self._shadow is not None:
+            reference = self._shadow.apply_fill(symbol, signed_quantity, price, commission, timestamp, multiplier)
+            self._check_fill(symbol, realised, reference)
+        return _to_decimal(realised)
+
+    def update_position(self, symbol: str, quantity_delta: Decimal, price: Decimal, commission: Decimal = Decimal('0')):
+        """Book a trade without realised P&L tracking (mirrors ``Portfolio.update_position``).
+
+        Like ``Portfolio.update_position``, cash moves by the face notional and an
+        existing position keeps its contract multiplier.
+        """
+        quantity = float(quantity_delta)
+        fill_price = float(price)
+        fee = float(commission)
+        book = self._book.get(symbol)
+        if book is None:
+            book = self._book[symbol] = _FloatPosition(symbol)
+        self._cash -= quantity * fill_price + fee
+        self._commissions += fee
+        book.realise(quantity, fill_price, datetime.now(timezone.utc))
+        if book.quantity == 0:
+            del self._book[symbol]
+        if self._shadow is not None:
+            self._shadow.update_position(symbol, quantity_delta, price, commission)
+
+    def record_pnl(self, pnl: Decimal):
+        self._realised += float(pnl)
+        if self._shadow is not None:
+            self._shadow.record_pnl(pnl)
+
+    def withdraw_cash(self, amount: Decimal, reason: str = 'manual') -> None:
+        if not amount.is_finite() or amount <= 0:
+            raise ValueError(f'Withdrawal amount must be positive and finite, got {amount}')
+        if float(amount) > self._cash:
+            raise ValueError(f'Insufficient cash for withdrawal: ${self._cash:.2f} available, ${amount:.2f} requested')
+        self._cash -= float(amount)
+        if self._shadow is not None:
+            self._shadow.withdraw_cash(amount, reason)
+
+    def deposit_cash(self, amount: Decimal, reason: str = 'manual') -> None:
+        if not amount.is_finite() or amount <= 0:
+            raise ValueError(f'Deposit amount must be positive and finite, got {amount}')
+        self._cash += float(amount)
+        if self._shadow is not None:
+            self._shadow.deposit_cash(amount, reason)
+
+    def position(self, symbol: str) -> Position:
+        book = self._book.get(symbol)
+        return book.to_position() if book else Position(symbol=symbol)
+
+    def snapshot_positions(self) -> dict[str, Position]:
+        return {symbol: book.to_position() for symbol, book in self._book.items()}
+
+    def position_count(self) -> int:
+        return len(self._book)
+
+    def replace_positions(self, positions: dict[str, Position]) -> None:
+        self._book = {symbol: _FloatPosition.from_position(pos) for symbol, pos in positions.items()}
+
+    def get_realised_pnl(self) -> Decimal:
+        return _to_decimal(self._realised)
+
+    def get_commissions_paid(self) -> Decimal:
+        return _to_decimal(self._commissions)
+
+    # Reconciliation against the shadow portfolio
+
+    def _check_fill(self, symbol: str, realised: float, reference: Decimal) -> None:
+        shadow = self._shadow
+        report = self._reconciliation
+        assert shadow is not None and report is not None
+        report.fills += 1
+        report.max_fill_pnl_drift = max(report.max_fill_pnl_drift, _drift(realised, reference))
+        report.max_cash_drift = max(report.max_cash_drift, _drift(self._cash, shadow.cash))
+        report.realised_pnl_drift = _drift(self._realised, shadow.realised_pnl)
+        report.commission_drift = _drift(self._commissions, shadow.commissions_paid)
+
+        book = self._book.get(symbol)
+        expected = shadow.positions.get(symbol)
+        quantity = book.quantity if book else 0.0
+        expected_quantity = expected.quantity if expected else Decimal('0')
+        position_drift = _drift(quantity, expected_quantity)
+        report.max_position_drift = max(report.max_position_drift, position_drift)
+        # Decimal books keep dust positions that float books close; only real disagreements count
+        if position_drift > QUANTITY_EPSILON:
+            report.position_mismatches.append(f'{symbol}: float={quantity!r} decimal={expected_quantity}')
+        if book is not None and expected is not None:
+            report.max_average_price_drift = max(
+                report.max_average_price_drift, _drift(book.average_price, expected.average_price)
+            )
+
+    def _check_equity(self, equity: float, last_prices: dict[str, Decimal]) -> None:
+        shadow = self._shadow
+        report = self._reconciliation
+        assert shadow is not None and report is not None
+        reference = shadow.get_equity(last_prices)
+        drift = _drift(equity, reference)
+        report.equity_checks += 1
+        report.max_equity_drift = max(report.max_equity_drift, drift)
+        if reference:
+            report.max_relative_equity_drift = max(report.max_relative_equity_drift, drift / float(abs(reference)))
@@ -12,6 +12,7 @@ from typing import TYPE_CHECKING, Literal
 if TYPE_CHECKING:
     from ..config import RiskLimits
     from ..fsd import FSDConfig
+    from .accounting import AccountingReconciliation
 
 
 @dataclass
@@ -176,8 +177,14 @@ class BacktestPlanConfig:
     generate_report: bool = True
 
     # Performance options
-    use_cache: bool = True  # Use Massive.com data cache
-    parallel_folds: int = 1  # Reserved for future parallel fold execution (currently sequential)
+    use_cache: bool = True  # Reuse cached Massive.com months; False fetches every month again
+    parallel_folds: int = 1  # Worker processes for walk-forward folds (1 = run folds in-process)
+    random_seed: int | None = None  # Seeds each period from (seed, fold, phase); None leaves the RNG unseeded
+
+    # Accounting backend: 'decimal' (exact, as in live trading) or 'float' (float64 books, faster)
+    accounting: Literal['decimal', 'float'] = 'decimal'
+    reconcile_accounting: bool = False  # Float mode only: mirror fills into Decimal books and report drift
+    accounting_tolerance: float = 0.01  # Max monetary drift a reconciliation accepts
 
     def __post_init__(self) -> None:
         """Validate configuration."""
@@ -187,6 +194,14 @@ class BacktestPlanConfig:
             raise ValueError('end_date must be after start_date')
         if self.initial_capital <= 0:
             raise ValueError('initial_capital must be positive')
+        if self.parallel_folds < 1:
+            raise ValueError('parallel_folds must be at least 1')
+        if self.accounting not in ('decimal', 'float'):
+            raise ValueError(f"accounting must be 'decimal' or 'float', got {self.accounting!r}")
+        if self.reconcile_accounting and self.accounting != 'float':
+            raise ValueError("reconcile_accounting requires accounting='float'")
+        if self.accounting_tolerance <= 0:
+            raise ValueError('accounting_tolerance must be positive')
 
     def total_days(self) -> int:
         """Calculate total number of trading days in the backtest period."""
@@ -261,3 +276,6 @@ class PeriodResult:
 
     # Trade log
     trades: list[dict[str, object]] = field(default_factory=list)
+
+    # Float-vs-Decimal drift (only with accounting='float' and reconcile_accounting)
+    accounting_reconciliation: AccountingReconciliation | None = None
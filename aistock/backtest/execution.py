@@ -6,6 +6,10 @@ Provides more accurate transaction cost modeling than simple fixed slippage:
 - Volume-based fill constraints (can't fill more than X% of bar volume)
 - Bid-ask spread simulation
 - Market impact modeling (temporary + permanent)
+
+``RealisticExecutionModel.calculate_fills`` applies the same model to whole
+arrays of orders at once in float64, for parameter sweeps and Monte Carlo
+cost sensitivity.
 """
 
 from __future__ import annotations
@@ -16,6 +20,9 @@ from dataclasses import dataclass, field
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
+
 if TYPE_CHECKING:
     from ..data import Bar
     from ..execution import Order
@@ -57,6 +64,42 @@ class FillResult:
     reason: str = ''
 
 
+@dataclass
+class BatchFillResult:
+    """Element-wise fill results for an array of orders.
+
+    Every field has the broadcast shape of the inputs. Where ``filled`` is
+    False (the scalar path would return None) prices, quantities and costs
+    are zero. Costs are in the same units as ``ExecutionCosts``.
+    """
+
+    filled: NDArray[np.bool_]
+    fill_price: NDArray[np.float64]
+    fill_quantity: NDArray[np.float64]
+    is_partial: NDArray[np.bool_]
+    slippage: NDArray[np.float64]
+    spread_cost: NDArray[np.float64]
+    temporary_impact: NDArray[np.float64]
+    permanent_impact: NDArray[np.float64]
+    commission: NDArray[np.float64]
+
+    @property
+    def total_cost(self) -> NDArray[np.float64]:
+        """Total execution cost per order (same components as ``ExecutionCosts.total``)."""
+        return self.slippage + self.spread_cost + self.temporary_impact + self.commission
+
+    def cost_breakdown(self, axis: int | None = None) -> dict[str, NDArray[np.float64]]:
+        """Costs by category summed over ``axis`` (all orders when None), as ``get_cost_breakdown``."""
+        return {
+            'slippage': np.sum(self.slippage, axis=axis),
+            'spread_cost': np.sum(self.spread_cost, axis=axis),
+            'temporary_impact': np.sum(self.temporary_impact, axis=axis),
+            'permanent_impact': np.sum(self.permanent_impact, axis=axis),
+            'commission': np.sum(self.commission, axis=axis),
+            'total': np.sum(self.total_cost, axis=axis),
+        }
+
+
 class RealisticExecutionModel:
     """
     Enhanced execution model with realistic costs and constraints.
@@ -422,6 +465,171 @@ class RealisticExecutionModel:
 
         return results
 
+    def calculate_fills(
+        self,
+        is_buy: ArrayLike,
+        quantity: ArrayLike,
+        close: ArrayLike,
+        high: ArrayLike,
+        low: ArrayLike,
+        volume: ArrayLike,
+        limit_price: ArrayLike | None = None,
+        stop_price: ArrayLike | None = None,
+    ) -> BatchFillResult:
+        """
+        Vectorized ``calculate_fill`` over arrays of orders and bars.
+
+        Inputs are broadcast against each other, so a single order book can be
+        evaluated against a matrix of scenario bars (or the reverse). The bar
+        range is the model's volatility proxy and bar volume its liquidity
+        measure, exactly as in the scalar path; results match it to float64
+        rounding.
+
+        Args:
+            is_buy: True for buy orders, False for sells.
+            quantity: Order quantity (unsigned).
+            close, high, low, volume: Bar data the orders execute against.
+            limit_price: Limit price per order; NaN (or None) means no limit.
+            stop_price: Stop price per order, used where there is no limit;
+                NaN (or None) means no stop. Orders with neither are market orders.
+
+        Returns:
+            BatchFillResult with element-wise fills and costs.
+        """
+        config = self.config
+        buy, qty, close_, high_, low_, vol = np.broadcast_arrays(
+            np.asarray(is_buy, dtype=np.bool_),
+            np.abs(np.asarray(quantity, dtype=np.float64)),
+            np.asarray(close, dtype=np.float64),
+            np.asarray(high, dtype=np.float64),
+            np.asarray(low, dtype=np.float64),
+            np.asarray(volume, dtype=np.float64),
+        )
+        shape = buy.shape
+        limit = np.broadcast_to(np.asarray(np.nan if limit_price is None else limit_price, dtype=np.float64), shape)
+        stop = np.broadcast_to(np.asarray(np.nan if stop_price is None else stop_price, dtype=np.float64), shape)
+
+        # Order type: limit where given, else stop where given, else market
+        is_limit = ~np.isnan(limit)
+        is_stop = ~is_limit & ~np.isnan(stop)
+        with np.errstate(invalid='ignore'):
+            limit_fills = np.where(buy, low_ <= limit, high_ >= limit)
+            stop_triggers = np.where(buy, high_ >= stop, low_ <= stop)
+        eligible = np.where(is_limit, limit_fills, np.where(is_stop, stop_triggers, True))
+        base_price = np.where(is_limit, np.where(buy, np.fmin(close_, limit), np.fmax(close_, limit)), close_)
+
+        # Volume-constrained fill quantity
+        if config.enable_volume_fill_limits:
+            max_fill = vol * config.max_volume_participation
+            is_partial = qty > max_fill
+            fill_qty = np.where(vol < config.min_bar_volume, 0.0, np.minimum(qty, max_fill))
+        else:
+            fill_qty = qty.copy()
+            is_partial = np.zeros(shape, dtype=np.bool_)
+        filled = eligible & (fill_qty > 0)
+        fill_qty = np.where(filled, fill_qty, 0.0)
+
+        has_volume = vol > 0
+        safe_volume = np.where(has_volume, vol, 1.0)
+        volume_fraction = fill_qty / safe_volume
+
+        # Size-dependent slippage (adverse to the trader)
+        slippage_bps = np.where(
+            has_volume,
+            np.minimum(
+                config.base_slippage_bps + volume_fraction * config.size_impact_factor * 100, config.max_slippage_bps
+            ),
+            config.max_slippage_bps,
+        )
+        slippage = close_ * slippage_bps / 10000
+        slippage = np.where(buy, slippage, -slippage)
+
+        # Bid-ask spread
+        bar_range = high_ - low_
+        default_spread = close_ * (config.spread_estimate_bps / 10000)
+        if config.use_dynamic_spread:
+            spread = np.where(
+                bar_range == 0, default_spread, np.maximum(bar_range * config.spread_volatility_factor, default_spread)
+            )
+        else:
+            spread = default_spread
+        spread_cost = fill_qty * (spread / 2)
+
+        # Square-root market impact
+        if config.enable_market_impact:
+            safe_close = np.where(close_ > 0, close_, 1.0)
+            volatility = np.where(close_ > 0, bar_range / safe_close, 0.01)
+            scale = np.where(has_volume, close_ * volatility * np.sqrt(fill_qty / np.maximum(vol, 1)), 0.0)
+            temp_impact = scale * config.temporary_impact_factor
+            perm_impact = scale * config.permanent_impact_factor
+        else:
+            temp_impact = np.zeros(shape)
+            perm_impact = np.zeros(shape)
+
+        commission = np.maximum(fill_qty * float(config.commission_per_share), float(config.min_commission))
+
+        fill_price = base_price + slippage + np.where(buy, temp_impact, -temp_impact) / 2
+
+        zero = np.zeros(shape)
+        return BatchFillResult(
+            filled=filled,
+            fill_price=np.where(filled, fill_price, zero),
+            fill_quantity=fill_qty,
+            is_partial=filled & is_partial,
+            slippage=np.where(filled, np.abs(slippage * fill_qty), zero),
+            spread_cost=np.where(filled, spread_cost, zero),
+            temporary_impact=np.where(filled, np.abs(temp_impact * fill_qty), zero),
+            permanent_impact=np.where(filled, np.abs(perm_impact * fill_qty), zero),
+            commission=np.where(filled, commission, zero),
+        )
+
+    def simulate_executions(
+        self,
+        is_buy: ArrayLike,
+        quantity: ArrayLike,
+        close: ArrayLike,
+        high: ArrayLike,
+        low: ArrayLike,
+        volume: ArrayLike,
+        limit_price: ArrayLike | None = None,
+        stop_price: ArrayLike | None = None,
+    ) -> BatchFillResult:
+        """
+        Vectorized ``simulate_execution``: fill many orders over consecutive bars.
+
+        Bar arrays have the bar index on their first axis (``close[t, ...]``);
+        the remaining axes broadcast against the order arrays. Each order's
+        unfilled remainder carries over to the next bar.
+
+        Returns:
+            BatchFillResult whose first axis is the bar index.
+        """
+        close_arr = np.asarray(close, dtype=np.float64)
+        high_arr = np.asarray(high, dtype=np.float64)
+        low_arr = np.asarray(low, dtype=np.float64)
+        volume_arr = np.asarray(volume, dtype=np.float64)
+        remaining = np.abs(np.asarray(quantity, dtype=np.float64))
+
+        steps: list[BatchFillResult] = []
+        for t in range(close_arr.shape[0]):
+            step = self.calculate_fills(
+                is_buy, remaining, close_arr[t], high_arr[t], low_arr[t], volume_arr[t], limit_price, stop_price
+            )
+            steps.append(step)
+            remaining = remaining - step.fill_quantity
+
+        return BatchFillResult(
+            filled=np.stack([s.filled for s in steps]),
+            fill_price=np.stack([s.fill_price for s in steps]),
+            fill_quantity=np.stack([s.fill_quantity for s in steps]),
+            is_partial=np.stack([s.is_partial for s in steps]),
+            slippage=np.stack([s.slippage for s in steps]),
+            spread_cost=np.stack([s.spread_cost for s in steps]),
+            temporary_impact=np.stack([s.temporary_impact for s in steps]),
+            permanent_impact=np.stack([s.permanent_impact for s in steps]),
+            commission=np.stack([s.commission for s in steps]),
+        )
+
     def get_cost_breakdown(
         self,
         fills: list[FillResult],
@@ -0,0 +1,335 @@
+"""
+Array-backed building blocks for the backtest simulation loop.
+
+``BacktestOrchestrator._simulate_trading`` steps through time over these:
+- ``AlignedBars``: per-symbol bar lists aligned on the union of their
+  timestamps, with presence/index matrices and precomputed day boundaries
+- ``HistoryView``: a read-only window over a list of bars that does not copy it
+- ``BarHistory``: fixed-capacity per-symbol history handing out ``HistoryView``s
+- ``FillLedger``: fills and per-symbol positions in typed columns
+- ``compute_period_metrics``: period statistics from the day-end equity
+  array and the ledger
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import islice
+from typing import overload
+
+import numpy as np
+from numpy.typing import NDArray
+
+from ..data import Bar, datetime_to_ns
+from .config import PeriodResult
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+class HistoryView(Sequence[Bar]):
+    """Read-only view of ``bars[start:stop]`` that does not copy the list.
+
+    Integer indexing (including negative indices) reads straight from the
+    underlying list; slicing copies only the requested range.
+    """
+
+    __slots__ = ('_bars', '_start', '_stop')
+
+    def __init__(self, bars: list[Bar], stop: int, start: int = 0) -> None:
+        if not 0 <= start <= stop <= len(bars):
+            raise ValueError(f'invalid history window [{start}:{stop}] over {len(bars)} bars')
+        self._bars = bars
+        self._start = start
+        self._stop = stop
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> Bar:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Bar]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Bar | list[Bar]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._stop - self._start)
+            return self._bars[self._start + start : self._start + stop : step]
+        size = self._stop - self._start
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('history index out of range')
+        return self._bars[self._start + index]
+
+    def __iter__(self) -> Iterator[Bar]:
+        return islice(self._bars, self._start, self._stop)
+
+    def __repr__(self) -> str:
+        return f'HistoryView(len={len(self)})'
+
+
+@dataclass
+class AlignedBars:
+    """Per-symbol bars aligned on a shared, sorted timeline.
+
+    ``present[t, s]`` is True when symbol ``s`` has a bar at ``timestamps[t]``
+    and ``bar_index[t, s]`` is the index into ``bars[s]`` of its latest bar at
+    or before that time (-1 before its first bar). ``day_end[t]`` marks the
+    last timestamp of each calendar day and ``day_ordinal[t]`` holds that day.
+    """
+
+    symbols: list[str]
+    bars: list[list[Bar]]
+    timestamps: NDArray[np.int64]
+    present: NDArray[np.bool_]
+    bar_index: NDArray[np.int64]
+    day_ordinal: NDArray[np.int64]
+    day_end: NDArray[np.bool_]
+
+    @classmethod
+    def from_bars(cls, bars: Sequence[Bar], symbols: Sequence[str] = ()) -> AlignedBars:
+        """Group ``bars`` by symbol and align them.
+
+        Symbols follow ``symbols`` (the plan order), then any others in the
+        order they first appear. When a symbol has several bars with the same
+        timestamp the last one wins.
+        """
+        order = list(dict.fromkeys(symbols))
+        by_symbol: dict[str, dict[int, Bar]] = {symbol: {} for symbol in order}
+        for bar in bars:
+            symbol_bars = by_symbol.get(bar.symbol)
+            if symbol_bars is None:
+                symbol_bars = by_symbol[bar.symbol] = {}
+                order.append(bar.symbol)
+            symbol_bars[datetime_to_ns(bar.timestamp)] = bar
+
+        per_symbol: list[list[Bar]] = []
+        per_symbol_ns: list[NDArray[np.int64]] = []
+        per_symbol_days: list[NDArray[np.int64]] = []
+        for symbol in order:
+            keyed = sorted(by_symbol[symbol].items())
+            per_symbol.append([bar for _, bar in keyed])
+            per_symbol_ns.append(np.fromiter((ns for ns, _ in keyed), dtype=np.int64, count=len(keyed)))
+            per_symbol_days.append(
+                np.fromiter((bar.timestamp.toordinal() for _, bar in keyed), dtype=np.int64, count=len(keyed))
+            )
+
+        timestamps = np.unique(np.concatenate(per_symbol_ns)) if per_symbol_ns else np.empty(0, dtype=np.int64)
+        steps, width = len(timestamps), len(order)
+        present = np.zeros((steps, width), dtype=np.bool_)
+        bar_index = np.full((steps, width), -1, dtype=np.int64)
+        day_ordinal = np.zeros(steps, dtype=np.int64)
+
+        for column, (ns, days) in enumerate(zip(per_symbol_ns, per_symbol_days)):
+            if not len(ns):
+                continue
+            rows = np.searchsorted(timestamps, ns)
+            present[rows, column] = True
+            day_ordinal[rows] = days
+            # Index of the latest bar at or before each timeline step
+            bar_index[:, column] = np.searchsorted(ns, timestamps, side='right') - 1
+
+        day_end = np.ones(steps, dtype=np.bool_)
+        if steps > 1:
+            day_end[:-1] = day_ordinal[1:] != day_ordinal[:-1]
+
+        return cls(
+            symbols=order,
+            bars=per_symbol,
+            timestamps=timestamps,
+            present=present,
+            bar_index=bar_index,
+            day_ordinal=day_ordinal,
+            day_end=day_end,
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def columns_at(self, step: int) -> list[int]:
+        """Symbol columns with a bar at ``step``, in symbol order."""
+        return np.flatnonzero(self.present[step]).tolist()
+
+    def bars_at(self, step: int) -> list[Bar]:
+        """Bars closing at ``step``, in symbol order."""
+        index = self.bar_index[step]
+        return [self.bars[column][index[column]] for column in self.columns_at(step)]
+
+
+class BarHistory:
+    """The most recent ``capacity`` bars of one symbol.
+
+    Bars are appended to a buffer that is compacted back to ``capacity`` once
+    it reaches twice that size, so appends are amortised O(1) and memory stays
+    bounded however long the run. ``view()`` is a read-only window over the
+    buffer; it is valid until the next ``append``.
+    """
+
+    __slots__ = ('capacity', '_buffer')
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError('capacity must be at least 1')
+        self.capacity = capacity
+        self._buffer: list[Bar] = []
+
+    def __len__(self) -> int:
+        return min(len(self._buffer), self.capacity)
+
+    def append(self, bar: Bar) -> None:
+        buffer = self._buffer
+        buffer.append(bar)
+        if len(buffer) >= 2 * self.capacity:
+            del buffer[: len(buffer) - self.capacity]
+
+    def view(self) -> HistoryView:
+        size = len(self._buffer)
+        return HistoryView(self._buffer, size, max(0, size - self.capacity))
+
+
+class FillLedger:
+    """Append-only fill log in float64 columns, plus each symbol's current position.
+
+    Columns grow geometrically, so recording a fill is amortised O(1). Symbols
+    get a column on first use (``column_of``).
+    """
+
+    COLUMNS = ('quantity', 'price', 'pnl', 'slippage', 'commission')
+
+    def __init__(self, symbols: Sequence[str] = (), capacity: int = 1024) -> None:
+        self._columns: dict[str, int] = {}
+        self._size = 0
+        self._symbol = np.empty(capacity, dtype=np.int32)
+        self._timestamp = np.empty(capacity, dtype=np.int64)
+        self._values = np.empty((len(self.COLUMNS), capacity), dtype=np.float64)
+        self.positions = np.zeros(0, dtype=np.float64)
+        for symbol in symbols:
+            self.column_of(symbol)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def column_of(self, symbol: str) -> int:
+        """Ledger column of ``symbol``, adding one if needed."""
+        column = self._columns.get(symbol)
+        if column is None:
+            column = self._columns[symbol] = len(self._columns)
+            self.positions = np.append(self.positions, 0.0)
+        return column
+
+    def _grow(self) -> None:
+        capacity = max(1, 2 * self._symbol.shape[0])
+        self._symbol = np.resize(self._symbol, capacity)
+        self._timestamp = np.resize(self._timestamp, capacity)
+        values = np.empty((len(self.COLUMNS), capacity), dtype=np.float64)
+        values[:, : self._size] = self._values[:, : self._size]
+        self._values = values
+
+    def record(self, column: int, timestamp_ns: int, trade: Mapping[str, object], position_after: float) -> None:
+        """Append one fill (a trade record from the orchestrator) for symbol ``column``."""
+        if self._size == self._symbol.shape[0]:
+            self._grow()
+        row = self._size
+        self._symbol[row] = column
+        self._timestamp[row] = timestamp_ns
+        quantity = _as_float(trade.get('quantity'))
+        self._values[0, row] = quantity if trade.get('side') == 'buy' else -quantity
+        self._values[1, row] = _as_float(trade.get('price'))
+        self._values[2, row] = _as_float(trade.get('pnl'))
+        self._values[3, row] = _as_float(trade.get('slippage'))
+        self._values[4, row] = _as_float(trade.get('commission'))
+        self._size += 1
+        self.positions[column] = position_after
+
+    def column(self, name: str) -> NDArray[np.float64]:
+        """View of a float column (``quantity`` is signed: sells are negative)."""
+        return self._values[self.COLUMNS.index(name), : self._size]
+
+    @property
+    def symbol_columns(self) -> NDArray[np.int32]:
+        return self._symbol[: self._size]
+
+    @property
+    def timestamps(self) -> NDArray[np.int64]:
+        return self._timestamp[: self._size]
+
+
+def _as_float(value: object) -> float:
+    if isinstance(value, (int, float, Decimal)):
+        return float(value)
+    return 0.0
+
+
+def compute_period_metrics(
+    result: PeriodResult,
+    initial_capital: Decimal,
+    equity: NDArray[np.float64],
+    ledger: FillLedger,
+) -> None:
+    """Fill the return, risk and trade statistics of ``result``.
+
+    ``equity`` holds one day-end equity per trading day. The arithmetic is the
+    same element-wise float math (and Decimal sums) the per-trade loop used, so
+    results are bit-for-bit reproducible.
+    """
+    if len(equity):
+        initial_equity = float(initial_capital)
+        final_equity = float(equity[-1])
+        result.total_return = Decimal(str(final_equity - initial_equity))
+        result.total_return_pct = (final_equity - initial_equity) / initial_equity
+
+        if len(equity) > 1:
+            import statistics
+
+            returns = ((equity[1:] - equity[:-1]) / equity[:-1]).tolist()
+            mean_return = statistics.mean(returns)
+            std_return = statistics.stdev(returns) if len(returns) > 1 else 1
+            annualizer = TRADING_DAYS_PER_YEAR**0.5
+            if std_return > 0:
+                result.sharpe_ratio = (mean_return * annualizer) / (std_return * annualizer)
+
+            # Sortino ratio (uses downside deviation only)
+            negative_returns = [r for r in returns if r < 0]
+            if negative_returns and len(negative_returns) > 1:
+                downside_std = statistics.stdev(negative_returns)
+                if downside_std > 0:
+                    result.sortino_ratio = (mean_return * annualizer) / (downside_std * annualizer)
+            elif mean_return > 0:
+                # No negative returns - infinite Sortino (cap at 10)
+                result.sortino_ratio = 10.0
+
+            # Max drawdown against the running peak
+            peak = np.maximum.accumulate(equity)
+            positive = peak > 0
+            max_dd = 0.0
+            if positive.any():
+                max_dd = max(0.0, float(((peak[positive] - equity[positive]) / peak[positive]).max()))
+            result.max_drawdown_pct = max_dd
+
+            # Calmar ratio (annualized return / max drawdown)
+            if max_dd > 0:
+                annualized_return = result.total_return_pct * (TRADING_DAYS_PER_YEAR / len(equity))
+                result.calmar_ratio = annualized_return / max_dd
+
+    if len(ledger):
+        pnl = ledger.column('pnl')
+        pnl_values = [Decimal(str(value)) for value in pnl.tolist()]
+        result.win_rate = int(np.count_nonzero(pnl > 0)) / len(ledger)
+        result.average_trade_pnl = sum(pnl_values, Decimal('0')) / Decimal(str(len(ledger)))
+
+        total_wins = sum((value for value in pnl_values if value > 0), Decimal('0'))
+        total_losses = sum((value for value in pnl_values if value < 0), Decimal('0'))
+        if total_losses < 0:
+            result.profit_factor = float(total_wins / abs(total_losses))
+        elif total_wins > 0:
+            result.profit_factor = float('inf')
+
+        result.total_slippage = sum((Decimal(str(value)) for value in ledger.column('slippage').tolist()), Decimal('0'))
+        result.total_commission = sum(
+            (Decimal(str(value)) for value in ledger.column('commission').tolist()), Decimal('0')
+        )
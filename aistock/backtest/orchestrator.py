@@ -11,13 +11,18 @@ This module coordinates:
 from __future__ import annotations
 
 import logging
+import random
 import time
-from collections import defaultdict
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+from itertools import chain
 from pathlib import Path
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Callable
+
+import numpy as np
 
 if TYPE_CHECKING:
     from ..fsd import FSDEngine
@@ -25,18 +30,81 @@ if TYPE_CHECKING:
 from ..calendar import is_within_open_close_buffer
 from ..config import RiskLimits
 from ..data import Bar
+from ..portfolio import Portfolio
 from ..providers.massive import MassiveConfig, MassiveDataProvider
 from ..risk import RiskEngine, RiskViolation
 from ..timeframes import TIMEFRAME_TO_SECONDS
-from .config import BacktestPlanConfig, DataFetchStatus, PeriodResult
+from .accounting import FloatPortfolio
+from .config import BacktestPlanConfig, DataFetchStatus, PeriodResult, WalkForwardConfig
 from .execution import RealisticExecutionModel
+from .kernel import AlignedBars, BarHistory, FillLedger, compute_period_metrics
 from .universe import HistoricalUniverseManager, UniverseValidationResult
-from .walkforward import WalkForwardResult, WalkForwardValidator
+from .walkforward import WalkForwardFold, WalkForwardResult, WalkForwardValidator
 
 logger = logging.getLogger(__name__)
 
 TradeRecord = dict[str, object]
 
+# Seed phases: each period's RNG seed is derived from (random_seed, fold_number, phase).
+_PHASE_TRAIN = 0
+_PHASE_TEST = 1
+_PHASE_HOLDOUT = 2
+_PHASE_SINGLE = 3
+
+# Bars of volume history the adaptive execution style averages over
+_ADAPTIVE_STYLE_LOOKBACK = 20
+
+
+def _period_seed(base_seed: int, fold_number: int, phase: int) -> int:
+    """Independent 32-bit seed for one backtest period."""
+    return int(np.random.SeedSequence([base_seed, fold_number, phase]).generate_state(1)[0])
+
+
+@dataclass
+class _FoldTask:
+    """Everything a worker process needs to run one walk-forward fold."""
+
+    config: BacktestPlanConfig
+    massive_config: MassiveConfig
+    fold: WalkForwardFold
+    total_folds: int
+    base_seed: int | None
+    log_path: Path
+
+
+@dataclass
+class _FoldOutcome:
+    fold_number: int
+    train_result: PeriodResult | None
+    test_result: PeriodResult | None
+    error: str | None = None
+
+
+def _run_fold_worker(task: _FoldTask) -> _FoldOutcome:
+    """
+    Run one fold (train, then test) in a worker process.
+
+    The worker opens the cache read-only and sends all log records to the
+    fold's own log file, so concurrent folds do not interleave output.
+    """
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    task.log_path.parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.FileHandler(task.log_path, mode='w')
+    handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    root.handlers = [handler]
+    root.setLevel(logging.INFO)
+    try:
+        orchestrator = BacktestOrchestrator(task.config, task.massive_config, read_only_cache=True)
+        validator = WalkForwardValidator(task.config.walkforward or WalkForwardConfig())
+        fold = task.fold
+        validator.run_fold(fold, orchestrator._fold_runner(fold.fold_number, task.base_seed), task.total_folds)
+        return _FoldOutcome(fold.fold_number, fold.train_result, fold.test_result, fold.error)
+    finally:
+        root.handlers = saved_handlers
+        root.setLevel(saved_level)
+        handler.close()
+
 
 @dataclass
 class BacktestResult:
@@ -114,6 +182,7 @@ class BacktestOrchestrator:
         self,
         config: BacktestPlanConfig,
         massive_config: MassiveConfig,
+        read_only_cache: bool = False,
     ) -> None:
         """
         Initialize the orchestrator.
@@ -121,10 +190,11 @@ class BacktestOrchestrator:
         Args:
             config: Backtest plan configuration.
             massive_config: Massive.com API configuration.
+            read_only_cache: Open the Massive cache read-only (used by fold workers).
         """
         self._config = config
         self._massive_config = massive_config
-        self._provider = MassiveDataProvider(massive_config)
+        self._provider = MassiveDataProvider(massive_config, read_only_cache=read_only_cache)
         self._universe_mgr = HistoricalUniverseManager()
         self._exec_model = RealisticExecutionModel(config.execution)
         self._scheduled_orders: list[_ScheduledBacktestOrder] = []
@@ -144,6 +214,8 @@ class BacktestOrchestrator:
 
         This method respects the 5 calls/minute rate limit and reports
         progress. For large symbol lists, this can take significant time.
+        With ``use_cache`` off in the plan, every month is fetched again
+        instead of only the uncached ones.
 
         Args:
             symbols: Symbols to fetch. Uses config symbols if not provided.
@@ -168,7 +240,8 @@ class BacktestOrchestrator:
         start_time = time.time()
 
         # Estimate fetch time
-        estimate = self._provider.estimate_fetch_time(symbols, start, end)
+        use_cache = self._config.use_cache
+        estimate = self._provider.estimate_fetch_time(symbols, start, end, use_cache=use_cache)
         logger.info(
             f'Prefetching data for {len(symbols)} symbols: {start} to {end}\n'
             f'Cached: {estimate["cached_symbols"]}, To fetch: {estimate["symbols_to_fetch"]}\n'
@@ -178,28 +251,16 @@ class BacktestOrchestrator:
 
         status.symbols_cached = estimate['cached_symbols']
 
-        # Fetch each symbol
-        for i, symbol in enumerate(symbols):
-            logger.info(f'[{i + 1}/{len(symbols)}] Fetching {symbol}...')
-
-            result = self._provider.fetch_bars(
-                symbol=symbol,
-                start_date=start,
-                end_date=end,
-                timespan='minute',
-                use_cache=self._config.use_cache,
-            )
-
-            if result.success:
-                status.symbols_fetched += 1
-                status.api_calls_used += result.api_calls_used
-                if result.from_cache:
-                    logger.info(f'  {symbol}: {len(result.data)} bars (from cache)')
-                else:
-                    logger.info(f'  {symbol}: {len(result.data)} bars (fetched)')
+        # Uncached months are fetched concurrently under the shared rate limit
+        report = self._provider.prefetch(symbols, start, end, timespan='minute', use_cache=use_cache)
+        status.api_calls_used = report.api_calls
+        for symbol in symbols:
+            errors = report.errors.get(symbol)
+            if errors:
+                status.errors.append(f'{symbol}: {"; ".join(errors)}')
+                logger.error(f'  {symbol}: FAILED - {errors[0]}')
             else:
-                status.errors.append(f'{symbol}: {result.error}')
-                logger.error(f'  {symbol}: FAILED - {result.error}')
+                status.symbols_fetched += 1
 
         status.elapsed_seconds = time.time() - start_time
         status.success = len(status.errors) == 0
@@ -312,9 +373,11 @@ class BacktestOrchestrator:
             result.walkforward_result = self._run_walkforward()
         else:
             logger.info('Step 3: Running single-period backtest...')
+            seed = self._config.random_seed
             period_result = self._run_single_period(
                 self._config.start_date,
                 self._config.end_date,
+                seed=_period_seed(seed, 0, _PHASE_SINGLE) if seed is not None else None,
             )
             result.period_results.append(period_result)
 
@@ -345,11 +408,6 @@ class BacktestOrchestrator:
             raise ValueError('Walk-forward config and dates are required')
 
         validator = WalkForwardValidator(self._config.walkforward)
-        if self._config.parallel_folds > 1:
-            logger.warning(
-                'parallel_folds=%s requested; backtests execute sequentially to keep provider/cache access safe.',
-                self._config.parallel_folds,
-            )
 
         # Generate folds
         folds = validator.generate_folds(
@@ -365,17 +423,98 @@ class BacktestOrchestrator:
             holdout_start = self._config.end_date - timedelta(days=self._config.walkforward.final_holdout_days)
             final_holdout_dates = (holdout_start, self._config.end_date)
 
-        # Run validation
-        def strategy_runner(start: date, end: date, is_training: bool) -> PeriodResult:
-            return self._run_single_period(start, end, is_training=is_training)
+        # Run folds
+        base_seed = self._config.random_seed
+        workers = min(self._config.parallel_folds, len(folds))
+        if workers > 1:
+            if base_seed is None:
+                # Forked workers would otherwise share the parent's RNG state
+                base_seed = random.SystemRandom().randrange(2**32)
+            self._run_folds_in_pool(validator, folds, base_seed, workers)
+        else:
+            logger.info(f'Running walk-forward validation with {len(folds)} folds')
+            for fold in folds:
+                validator.run_fold(fold, self._fold_runner(fold.fold_number, base_seed), len(folds))
+
+        final_holdout_result = None
+        if final_holdout_dates:
+            holdout_seed = _period_seed(base_seed, 0, _PHASE_HOLDOUT) if base_seed is not None else None
+
+            def holdout_runner(start: date, end: date, is_training: bool) -> PeriodResult:
+                return self._run_single_period(start, end, is_training=is_training, seed=holdout_seed)
+
+            final_holdout_result = validator.run_final_holdout(final_holdout_dates, holdout_runner)
+
+        walkforward_result = validator.collect_results(folds, final_holdout_result)
+
+        memory_stats = self._provider._get_cache().get_memory_cache_stats()
+        logger.info(
+            'Decoded bar cache: %s hits, %s misses, %s evictions, %.1f MB resident',
+            memory_stats['hits'],
+            memory_stats['misses'],
+            memory_stats['evictions'],
+            memory_stats['bytes'] / (1024 * 1024),
+        )
+        return walkforward_result
+
+    def _run_folds_in_pool(
+        self,
+        validator: WalkForwardValidator,
+        folds: list[WalkForwardFold],
+        base_seed: int,
+        workers: int,
+    ) -> None:
+        """Run folds in worker processes and store their results back on ``folds``."""
+        log_dir = Path(self._config.output_dir) / 'fold_logs'
+        logger.info(
+            f'Running walk-forward validation with {len(folds)} folds on {workers} worker processes '
+            f'(per-fold logs in {log_dir})'
+        )
+
+        tasks = [
+            _FoldTask(
+                config=self._config,
+                massive_config=self._massive_config,
+                fold=fold,
+                total_folds=len(folds),
+                base_seed=base_seed,
+                log_path=log_dir / f'fold_{fold.fold_number:03d}.log',
+            )
+            for fold in folds
+        ]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(_run_fold_worker, task) for task in tasks]
+            # Merge in fold order regardless of completion order
+            for fold, future in zip(folds, futures):
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    # e.g. BrokenProcessPool after a worker was killed: recorded so the aggregates show the gap
+                    logger.exception(f'Fold {fold.fold_number} worker failed')
+                    fold.error = f'Worker failed: {type(e).__name__}: {e}'
+                    continue
+                fold.train_result = outcome.train_result
+                fold.test_result = outcome.test_result
+                fold.error = outcome.error
+                validator.log_fold_summary(fold, len(folds))
 
-        return validator.run_validation(folds, strategy_runner, final_holdout_dates)
+    def _fold_runner(self, fold_number: int, base_seed: int | None) -> Callable[[date, date, bool], PeriodResult]:
+        """Strategy runner for one fold; train and test periods get their own seeds."""
+
+        def runner(start: date, end: date, is_training: bool) -> PeriodResult:
+            seed = None
+            if base_seed is not None:
+                seed = _period_seed(base_seed, fold_number, _PHASE_TRAIN if is_training else _PHASE_TEST)
+            return self._run_single_period(start, end, is_training=is_training, seed=seed)
+
+        return runner
 
     def _run_single_period(
         self,
         start_date: date | None,
         end_date: date | None,
         is_training: bool = False,
+        seed: int | None = None,
     ) -> PeriodResult:
         """
         Run backtest for a single period.
@@ -384,6 +523,8 @@ class BacktestOrchestrator:
             start_date: Period start.
             end_date: Period end.
             is_training: Whether this is a training period (for walk-forward).
+            seed: If given, seeds ``random`` and NumPy's global RNG (used by FSD
+                exploration) before the period runs.
 
         Returns:
             PeriodResult with metrics.
@@ -391,24 +532,27 @@ class BacktestOrchestrator:
         if not start_date or not end_date:
             raise ValueError('Start and end dates are required')
 
+        if seed is not None:
+            random.seed(seed)
+            np.random.seed(seed)
+
         result = PeriodResult(
             start_date=start_date,
             end_date=end_date,
             is_train=is_training,
         )
 
-        # Load data from cache
-        bars = self._load_bars_from_cache(start_date, end_date)
-        if not bars:
+        # Stream data from cache a month at a time
+        chunks = self._iter_bar_chunks(start_date, end_date)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
             logger.warning(f'No bars loaded for period {start_date} to {end_date}')
             return result
 
-        logger.debug(f'Loaded {len(bars)} bars for {start_date} to {end_date}')
-
         # Run through the trading logic
         # This is a simplified simulation - in production, you'd use SessionFactory
         try:
-            result = self._simulate_trading(bars, result)
+            result = self._simulate_chunks(chain([first_chunk], chunks), result)
         except Exception as e:
             logger.error(f'Trading simulation failed: {e}')
 
@@ -427,197 +571,197 @@ class BacktestOrchestrator:
         all_bars.sort(key=lambda b: b.timestamp)
         return all_bars
 
-    def _simulate_trading(self, bars: list[Bar], result: PeriodResult) -> PeriodResult:
+    def _iter_bar_chunks(self, start_date: date, end_date: date) -> Iterator[list[Bar]]:
+        """Yield the period's bars one calendar month at a time (empty months are skipped)."""
+        chunk_start = start_date
+        while chunk_start <= end_date:
+            next_month = (chunk_start.replace(day=1) + timedelta(days=32)).replace(day=1)
+            chunk_end = min(end_date, next_month - timedelta(days=1))
+            bars = self._load_bars_from_cache(chunk_start, chunk_end)
+            if bars:
+                logger.debug(f'Loaded {len(bars)} bars for {chunk_start} to {chunk_end}')
+                yield bars
+            chunk_start = next_month
+
+    def _history_capacity(self, decision_engine: FSDEngine) -> int:
+        """Bars of history kept per symbol: enough for the engine and execution planning."""
+        execution = self._exec_model.config
+        return max(decision_engine.max_lookback, _ADAPTIVE_STYLE_LOOKBACK, execution.vwap_slices)
+
+    def _make_portfolio(self) -> Portfolio:
+        """Portfolio for one period, using the accounting backend the plan selects."""
+        initial_capital = self._config.initial_capital
+        if self._config.accounting == 'float':
+            shadow = Portfolio(initial_cash=initial_capital) if self._config.reconcile_accounting else None
+            return FloatPortfolio(initial_capital, shadow=shadow, tolerance=self._config.accounting_tolerance)
+        return Portfolio(initial_cash=initial_capital)
+
+    def _simulate_trading(self, bars: Sequence[Bar], result: PeriodResult) -> PeriodResult:
+        """Simulate trading on the given bars (see ``_simulate_chunks``)."""
+        return self._simulate_chunks([bars], result)
+
+    def _simulate_chunks(self, chunks: Iterable[Sequence[Bar]], result: PeriodResult) -> PeriodResult:
         """
-        Simulate trading on the given bars.
+        Simulate trading over consecutive, time-ordered chunks of bars.
+
+        Only one chunk (plus the next, to detect day ends) is held at a time and
+        each symbol keeps a fixed-capacity history, so memory does not grow with
+        the length of the period.
 
         This is a simplified simulation. For full FSD integration,
         use SessionFactory to create a complete trading session.
         Risk limits and max holding periods from the backtest plan are enforced.
         """
         from ..fsd import FSDConfig, FSDEngine
-        from ..portfolio import Portfolio
 
         # Initialize components
         fsd_config = self._config.fsd_config or FSDConfig()
-        portfolio = Portfolio(initial_cash=self._config.initial_capital)
+        portfolio = self._make_portfolio()
         risk_limits = self._config.risk_limits or RiskLimits()
         risk_engine = RiskEngine(risk_limits, portfolio, self._bar_interval)
         fsd_engine = FSDEngine(fsd_config, portfolio)
         fsd_engine.start_session()
-
-        # Group bars by symbol and timestamp
-        bars_by_timestamp: dict[datetime, dict[str, Bar]] = {}
-        for bar in bars:
-            if bar.timestamp not in bars_by_timestamp:
-                bars_by_timestamp[bar.timestamp] = {}
-            bars_by_timestamp[bar.timestamp][bar.symbol] = bar
-
-        # Simulate trading
+        # Unfilled slices belong to the previous period's portfolio; each period starts flat
+        self._scheduled_orders = []
+
+        history_capacity = self._history_capacity(fsd_engine)
+        histories: dict[str, BarHistory] = {}
+        ledger = FillLedger(self._config.symbols)
+        # Float books are read as floats all period; the Decimal curve is built once at the end
+        float_books = isinstance(portfolio, FloatPortfolio)
         equity_curve: list[tuple[date, Decimal]] = []
+        equity_days: list[date] = []
+        equity_values: list[float] = []
         trades: list[TradeRecord] = []
-        history_by_symbol: dict[str, list[Bar]] = defaultdict(list)
-
-        def _trade_pnl(trade: TradeRecord) -> float:
-            pnl_value = trade.get('pnl')
-            if isinstance(pnl_value, (int, float, Decimal)):
-                return float(pnl_value)
-            return 0.0
-
-        sorted_timestamps = sorted(bars_by_timestamp.keys())
-
         last_prices: dict[str, Decimal] = {}
-        for i, timestamp in enumerate(sorted_timestamps):
-            symbol_bars = bars_by_timestamp[timestamp]
-            for sym, bar in symbol_bars.items():
-                last_prices[sym] = bar.close
-
-            for symbol, bar in symbol_bars.items():
-                history = history_by_symbol[symbol]
-                history.append(bar)
-                scheduled_trades = self._process_scheduled_orders(
-                    symbol,
-                    bar,
-                    portfolio,
-                    fsd_engine,
-                    risk_engine=risk_engine,
-                    last_prices=last_prices,
-                )
-                if scheduled_trades:
-                    trades.extend(scheduled_trades)
-                    result.total_trades += len(scheduled_trades)
-
-                forced_trades = self._maybe_force_exit(
-                    symbol,
-                    bar,
-                    portfolio,
-                    history,
-                    fsd_engine,
-                    risk_engine,
-                    last_prices,
-                )
-                if forced_trades:
-                    trades.extend(forced_trades)
-                    result.total_trades += len(forced_trades)
-                    continue
 
-                # Get FSD decision
-                decision = fsd_engine.evaluate_opportunity(symbol, history, last_prices)
-                action_payload = decision.get('action')
-                action_type = None
-                size_fraction = None
-                signal = None
-                if isinstance(action_payload, dict):
-                    action_type = action_payload.get('type')
-                    size_fraction = action_payload.get('size_fraction')
-                    signal = action_payload.get('signal')
-                elif isinstance(action_payload, str):
-                    action_type = action_payload
-                if not action_type and isinstance(signal, (int, float)):
-                    if signal > 0:
-                        action_type = 'BUY'
-                    elif signal < 0:
-                        action_type = 'SELL'
-
-                # Execute action
-                if decision.get('should_trade') and isinstance(action_type, str):
-                    trade_results = self._execute_action(
-                        action_type,
+        def _record(column: int, timestamp_ns: int, symbol: str, new_trades: list[TradeRecord]) -> None:
+            position_after = portfolio.get_position_float(symbol)
+            for trade in new_trades:
+                ledger.record(column, timestamp_ns, trade, position_after)
+            trades.extend(new_trades)
+            result.total_trades += len(new_trades)
+
+        aligned_chunks = (AlignedBars.from_bars(chunk, self._config.symbols) for chunk in chunks if chunk)
+        aligned = next(aligned_chunks, None)
+        while aligned is not None:
+            # Look one chunk ahead so a day split across chunks is closed only once
+            following = next(aligned_chunks, None)
+            last_step = len(aligned) - 1
+
+            for step in range(len(aligned)):
+                timestamp_ns = int(aligned.timestamps[step])
+                step_bars = aligned.bars_at(step)
+                for bar in step_bars:
+                    last_prices[bar.symbol] = bar.close
+
+                for bar in step_bars:
+                    symbol = bar.symbol
+                    column = ledger.column_of(symbol)
+                    symbol_history = histories.get(symbol)
+                    if symbol_history is None:
+                        symbol_history = histories[symbol] = BarHistory(history_capacity)
+                    symbol_history.append(bar)
+                    history = symbol_history.view()
+
+                    scheduled_trades = self._process_scheduled_orders(
                         symbol,
                         bar,
                         portfolio,
-                        history,
                         fsd_engine,
-                        size_fraction=size_fraction,
-                        signal=signal,
-                        last_prices=last_prices,
                         risk_engine=risk_engine,
+                        last_prices=last_prices,
                     )
-                    if trade_results:
-                        trades.extend(trade_results)
-                        result.total_trades += len(trade_results)
-
-            # Record equity at end of day
-            if (
-                i == len(sorted_timestamps) - 1
-                or timestamp.date() != sorted_timestamps[min(i + 1, len(sorted_timestamps) - 1)].date()
-            ):
-                equity = portfolio.total_equity(last_prices)
-                equity_curve.append((timestamp.date(), Decimal(str(equity))))
+                    if scheduled_trades:
+                        _record(column, timestamp_ns, symbol, scheduled_trades)
+
+                    # Only open positions can hit the holding-period limit
+                    if ledger.positions[column] != 0:
+                        forced_trades = self._maybe_force_exit(
+                            symbol,
+                            bar,
+                            portfolio,
+                            history,
+                            fsd_engine,
+                            risk_engine,
+                            last_prices,
+                        )
+                        if forced_trades:
+                            _record(column, timestamp_ns, symbol, forced_trades)
+                            # No decision this bar, but the engine's indicators must not fall behind the window
+                            fsd_engine.observe_bars(symbol, history)
+                            continue
+
+                    # Get FSD decision
+                    decision = fsd_engine.evaluate_opportunity(symbol, history, last_prices)
+                    action_payload = decision.get('action')
+                    action_type = None
+                    size_fraction = None
+                    signal = None
+                    if isinstance(action_payload, dict):
+                        action_type = action_payload.get('type')
+                        size_fraction = action_payload.get('size_fraction')
+                        signal = action_payload.get('signal')
+                    elif isinstance(action_payload, str):
+                        action_type = action_payload
+                    if not action_type and isinstance(signal, (int, float)):
+                        if signal > 0:
+                            action_type = 'BUY'
+                        elif signal < 0:
+                            action_type = 'SELL'
+
+                    # Execute action
+                    if decision.get('should_trade') and isinstance(action_type, str):
+                        trade_results = self._execute_action(
+                            action_type,
+                            symbol,
+                            bar,
+                            portfolio,
+                            history,
+                            fsd_engine,
+                            size_fraction=size_fraction,
+                            signal=signal,
+                            last_prices=last_prices,
+                            risk_engine=risk_engine,
+                        )
+                        if trade_results:
+                            _record(column, timestamp_ns, symbol, trade_results)
+
+                # Record equity at end of day
+                day_end = bool(aligned.day_end[step])
+                if day_end and step == last_step and following is not None:
+                    day_end = following.day_ordinal[0] != aligned.day_ordinal[step]
+                if day_end:
+                    day = date.fromordinal(int(aligned.day_ordinal[step]))
+                    if float_books:
+                        equity_values.append(portfolio.get_equity_float(last_prices))
+                        equity_days.append(day)
+                    else:
+                        day_equity = Decimal(str(portfolio.total_equity(last_prices)))
+                        equity_values.append(float(day_equity))
+                        equity_curve.append((day, day_equity))
+
+            aligned = following
 
         # Calculate metrics
+        if float_books:
+            equity_curve = [(day, Decimal(repr(value))) for day, value in zip(equity_days, equity_values)]
         if equity_curve:
             result.equity_curve = equity_curve
-            initial_equity = float(self._config.initial_capital)
-            final_equity = float(equity_curve[-1][1])
-            result.total_return = Decimal(str(final_equity - initial_equity))
-            result.total_return_pct = (final_equity - initial_equity) / initial_equity
-
-            # Calculate Sharpe ratio (simplified)
-            if len(equity_curve) > 1:
-                returns = [
-                    (float(equity_curve[i][1]) - float(equity_curve[i - 1][1])) / float(equity_curve[i - 1][1])
-                    for i in range(1, len(equity_curve))
-                ]
-                if returns:
-                    import statistics
-
-                    mean_return = statistics.mean(returns)
-                    std_return = statistics.stdev(returns) if len(returns) > 1 else 1
-                    if std_return > 0:
-                        result.sharpe_ratio = (mean_return * 252**0.5) / (std_return * 252**0.5)
-
-                    # Calculate Sortino ratio (uses downside deviation only)
-                    negative_returns = [r for r in returns if r < 0]
-                    if negative_returns and len(negative_returns) > 1:
-                        downside_std = statistics.stdev(negative_returns)
-                        if downside_std > 0:
-                            result.sortino_ratio = (mean_return * 252**0.5) / (downside_std * 252**0.5)
-                    elif mean_return > 0:
-                        # No negative returns - infinite Sortino (cap at 10)
-                        result.sortino_ratio = 10.0
-
-            # Calculate max drawdown from equity curve
-            if len(equity_curve) > 1:
-                peak = float(equity_curve[0][1])
-                max_dd = 0.0
-                for _, equity_val in equity_curve:
-                    equity_float = float(equity_val)
-                    if equity_float > peak:
-                        peak = equity_float
-                    if peak > 0:
-                        drawdown = (peak - equity_float) / peak
-                        max_dd = max(max_dd, drawdown)
-                result.max_drawdown_pct = max_dd
-
-                # Calculate Calmar ratio (annualized return / max drawdown)
-                if max_dd > 0 and len(equity_curve) > 1:
-                    # Annualize the return based on trading days
-                    trading_days = len(equity_curve)
-                    annualized_return = result.total_return_pct * (252 / trading_days) if trading_days > 0 else 0
-                    result.calmar_ratio = annualized_return / max_dd if max_dd > 0 else 0.0
-
-        # Calculate win rate
+        equity = np.asarray(equity_values, dtype=np.float64)
+        compute_period_metrics(result, self._config.initial_capital, equity, ledger)
         if trades:
-            pnl_values = [Decimal(str(_trade_pnl(trade))) for trade in trades]
-            winning_trades = sum(1 for pnl in pnl_values if pnl > 0)
-            result.win_rate = winning_trades / len(trades)
-            result.average_trade_pnl = sum(pnl_values, Decimal('0')) / Decimal(str(len(trades)))
-
-            total_wins = sum((pnl for pnl in pnl_values if pnl > 0), Decimal('0'))
-            total_losses = sum((pnl for pnl in pnl_values if pnl < 0), Decimal('0'))
-            if total_losses < 0:
-                result.profit_factor = float(total_wins / abs(total_losses))
-            elif total_wins > 0:
-                result.profit_factor = float('inf')
-
-            result.total_slippage = sum(
-                (Decimal(str(trade.get('slippage', 0))) for trade in trades), Decimal('0')
-            )
-            result.total_commission = sum(
-                (Decimal(str(trade.get('commission', 0))) for trade in trades), Decimal('0')
-            )
             result.trades = trades
+        if isinstance(portfolio, FloatPortfolio) and portfolio.reconciliation is not None:
+            reconciliation = portfolio.reconciliation
+            result.accounting_reconciliation = reconciliation
+            log = logger.info if reconciliation.within_tolerance else logger.warning
+            log(
+                f'Accounting reconciliation {result.start_date} to {result.end_date}: '
+                f'{reconciliation.fills} fills, max equity drift {reconciliation.max_equity_drift:.2e}, '
+                f'max cash drift {reconciliation.max_cash_drift:.2e} '
+                f'(tolerance {reconciliation.tolerance}, within: {reconciliation.within_tolerance})'
+            )
 
         fsd_engine.end_session()
 
@@ -666,7 +810,7 @@ class BacktestOrchestrator:
         return price + offset if side == 'buy' else price - offset
 
     @staticmethod
-    def _build_vwap_weights(history: list[Bar], slices: int) -> list[float]:
+    def _build_vwap_weights(history: Sequence[Bar], slices: int) -> list[float]:
         if slices <= 1:
             return [1.0]
         if len(history) < slices:
@@ -690,7 +834,7 @@ class BacktestOrchestrator:
         symbol: str,
         bar: Bar,
         portfolio: Any,
-        history: list[Bar],
+        history: Sequence[Bar],
         decision_engine: FSDEngine | None,
         risk_engine: RiskEngine | None,
         last_prices: dict[str, Decimal],
@@ -793,7 +937,7 @@ class BacktestOrchestrator:
         side: str,
         quantity: Decimal,
         timestamp: datetime,
-        history: list[Bar],
+        history: Sequence[Bar],
     ) -> list[_ScheduledBacktestOrder]:
         execution = self._exec_model.config
         style = execution.execution_style.lower().strip()
@@ -838,10 +982,10 @@ class BacktestOrchestrator:
             )
         ]
 
-    def _choose_execution_style(self, total_qty: Decimal, history: list[Bar]) -> str:
+    def _choose_execution_style(self, total_qty: Decimal, history: Sequence[Bar]) -> str:
         if not history:
             return 'limit'
-        sample = history[-20:]
+        sample = history[-_ADAPTIVE_STYLE_LOOKBACK:]
         avg_volume = sum(bar.volume for bar in sample) / len(sample) if sample else 0
         if avg_volume <= 0:
             return 'limit'
@@ -937,15 +1081,24 @@ class BacktestOrchestrator:
             risk_engine.record_order_submission(bar.timestamp)
 
         signed_qty = fill_result.fill_quantity if side == OrderSide.BUY else -fill_result.fill_quantity
-        pos_before = float(portfolio.get_position(scheduled.symbol))
-        realised = portfolio.apply_fill(
-            scheduled.symbol,
-            signed_qty,
-            fill_result.fill_price,
-            fill_result.costs.commission,
-            bar.timestamp,
-        )
-        pos_after = float(portfolio.get_position(scheduled.symbol))
+        pos_before = portfolio.get_position_float(scheduled.symbol)
+        if isinstance(portfolio, FloatPortfolio):
+            realised = portfolio.apply_fill_float(
+                scheduled.symbol,
+                float(signed_qty),
+                float(fill_result.fill_price),
+                float(fill_result.costs.commission),
+                bar.timestamp,
+            )
+        else:
+            realised = portfolio.apply_fill(
+                scheduled.symbol,
+                signed_qty,
+                fill_result.fill_price,
+                fill_result.costs.commission,
+                bar.timestamp,
+            )
+        pos_after = portfolio.get_position_float(scheduled.symbol)
 
         if decision_engine is not None:
             decision_engine.handle_fill(
@@ -982,7 +1135,7 @@ class BacktestOrchestrator:
         symbol: str,
         bar: Bar,
         portfolio: Any,
-        history: list[Bar],
+        history: Sequence[Bar],
         decision_engine: FSDEngine | None = None,
         size_fraction: float | int | None = None,
         signal: float | int | None = None,
@@ -996,7 +1149,7 @@ class BacktestOrchestrator:
             return []
 
         # Determine order side and quantity
-        position_qty = float(portfolio.get_position(symbol))
+        position_qty = portfolio.get_position_float(symbol)
 
         if size_fraction is not None and signal is not None and signal != 0:
             try:
@@ -1040,7 +1193,7 @@ class BacktestOrchestrator:
         if action == 'BUY':
             # Buy if no position
             if position_qty >= 0:
-                order_qty = max(1, int(float(portfolio.cash) * 0.1 / float(bar.close)))
+                order_qty = max(1, int(portfolio.get_cash_float() * 0.1 / float(bar.close)))
                 side = OrderSide.BUY
             else:
                 return []
@@ -1053,7 +1206,7 @@ class BacktestOrchestrator:
                 return []
         elif action in {'INCREASE', 'INCREASE_SIZE'}:
             # Increase position
-            order_qty = max(1, int(float(portfolio.cash) * 0.05 / float(bar.close)))
+            order_qty = max(1, int(portfolio.get_cash_float() * 0.05 / float(bar.close)))
             side = OrderSide.BUY
         elif action in {'DECREASE', 'DECREASE_SIZE'}:
             # Decrease position
@@ -46,6 +46,8 @@ class WalkForwardFold:
     train_result: PeriodResult | None = None
     test_result: PeriodResult | None = None
     optimized_params: dict[str, Any] | None = None
+    # Why the fold is incomplete (a failed period or worker), if it is
+    error: str | None = None
 
     @property
     def train_days(self) -> int:
@@ -96,6 +98,11 @@ class WalkForwardResult:
         """Number of completed folds."""
         return sum(1 for f in self.folds if f.is_complete)
 
+    @property
+    def failed_folds(self) -> list[WalkForwardFold]:
+        """Folds left incomplete; the aggregate metrics exclude them."""
+        return [f for f in self.folds if not f.is_complete]
+
     def is_overfitting(self, threshold: float = 1.5) -> bool:
         """
         Check if strategy appears to be overfitting.
@@ -225,86 +232,152 @@ class WalkForwardValidator:
         Returns:
             WalkForwardResult with all metrics.
         """
-        result = WalkForwardResult(config=self.config, folds=folds)
-
         logger.info(f'Running walk-forward validation with {len(folds)} folds')
 
         for fold in folds:
-            logger.info(
-                f'Fold {fold.fold_number}/{len(folds)}: '
-                f'Train {fold.train_start} to {fold.train_end} ({fold.train_days}d), '
-                f'Test {fold.test_start} to {fold.test_end} ({fold.test_days}d)'
+            self.run_fold(fold, strategy_runner, total_folds=len(folds))
+
+        final_holdout_result = None
+        if final_holdout_dates:
+            final_holdout_result = self.run_final_holdout(final_holdout_dates, strategy_runner)
+
+        return self.collect_results(folds, final_holdout_result)
+
+    def run_fold(
+        self,
+        fold: WalkForwardFold,
+        strategy_runner: Callable[[date, date, bool], PeriodResult],
+        total_folds: int | None = None,
+    ) -> None:
+        """
+        Run the training then the test period of one fold, storing results on the fold.
+
+        A failed training period leaves the fold without results; a failed test
+        period leaves ``fold.test_result`` unset. Errors are logged and recorded
+        in ``fold.error``, not raised.
+        """
+        self._log_fold_header(fold, total_folds)
+
+        # Run training period
+        try:
+            fold.train_result = strategy_runner(
+                fold.train_start,
+                fold.train_end,
+                True,  # is_training
             )
+            fold.train_result.is_train = True
+            self._log_period('Train', fold.train_result)
+        except Exception as e:
+            logger.exception(f'  Train period failed: {e}')
+            fold.error = f'Train period failed: {type(e).__name__}: {e}'
+            return
+
+        # Run test period
+        try:
+            fold.test_result = strategy_runner(
+                fold.test_start,
+                fold.test_end,
+                False,  # is_training (OOS)
+            )
+            fold.test_result.is_test = True
+            self._log_period('Test', fold.test_result)
+        except Exception as e:
+            logger.exception(f'  Test period failed: {e}')
+            fold.error = f'Test period failed: {type(e).__name__}: {e}'
 
-            # Run training period
-            try:
-                fold.train_result = strategy_runner(
-                    fold.train_start,
-                    fold.train_end,
-                    True,  # is_training
-                )
-                fold.train_result.is_train = True
-
-                result.is_sharpes.append(fold.train_result.sharpe_ratio)
-                result.is_returns.append(fold.train_result.total_return_pct)
-
-                logger.info(
-                    f'  Train: Return={fold.train_result.total_return_pct:.2%}, '
-                    f'Sharpe={fold.train_result.sharpe_ratio:.2f}, '
-                    f'Trades={fold.train_result.total_trades}'
-                )
-
-            except Exception as e:
-                logger.error(f'  Train period failed: {e}')
-                continue
+    def run_final_holdout(
+        self,
+        final_holdout_dates: tuple[date, date],
+        strategy_runner: Callable[[date, date, bool], PeriodResult],
+    ) -> PeriodResult | None:
+        """Run the final out-of-sample holdout; returns None if it fails."""
+        holdout_start, holdout_end = final_holdout_dates
+        logger.info(f'Running final holdout: {holdout_start} to {holdout_end}')
+
+        try:
+            holdout_result = strategy_runner(
+                holdout_start,
+                holdout_end,
+                False,  # OOS
+            )
+            logger.info(
+                f'Final holdout: Return={holdout_result.total_return_pct:.2%}, '
+                f'Sharpe={holdout_result.sharpe_ratio:.2f}'
+            )
+            return holdout_result
+        except Exception as e:
+            logger.error(f'Final holdout failed: {e}')
+            return None
 
-            # Run test period
-            try:
-                fold.test_result = strategy_runner(
-                    fold.test_start,
-                    fold.test_end,
-                    False,  # is_training (OOS)
-                )
-                fold.test_result.is_test = True
+    def collect_results(
+        self,
+        folds: list[WalkForwardFold],
+        final_holdout_result: PeriodResult | None = None,
+    ) -> WalkForwardResult:
+        """
+        Aggregate fold results into a ``WalkForwardResult``.
 
-                result.oos_sharpes.append(fold.test_result.sharpe_ratio)
-                result.oos_returns.append(fold.test_result.total_return_pct)
+        Per-fold metrics are appended in fold order, so aggregates do not depend
+        on the order in which folds were executed.
+        """
+        result = WalkForwardResult(config=self.config, folds=folds)
 
-                if fold.test_result.total_return_pct > 0:
-                    result.oos_positive_folds += 1
+        for fold in sorted(folds, key=lambda f: f.fold_number):
+            if fold.train_result is None:
+                continue
+            result.is_sharpes.append(fold.train_result.sharpe_ratio)
+            result.is_returns.append(fold.train_result.total_return_pct)
 
-                logger.info(
-                    f'  Test: Return={fold.test_result.total_return_pct:.2%}, '
-                    f'Sharpe={fold.test_result.sharpe_ratio:.2f}, '
-                    f'Trades={fold.test_result.total_trades}'
-                )
+            if fold.test_result is None:
+                continue
+            result.oos_sharpes.append(fold.test_result.sharpe_ratio)
+            result.oos_returns.append(fold.test_result.total_return_pct)
+            if fold.test_result.total_return_pct > 0:
+                result.oos_positive_folds += 1
 
-            except Exception as e:
-                logger.error(f'  Test period failed: {e}')
+        result.final_holdout_result = final_holdout_result
 
-        # Run final holdout if provided
-        if final_holdout_dates:
-            holdout_start, holdout_end = final_holdout_dates
-            logger.info(f'Running final holdout: {holdout_start} to {holdout_end}')
-
-            try:
-                result.final_holdout_result = strategy_runner(
-                    holdout_start,
-                    holdout_end,
-                    False,  # OOS
-                )
-                logger.info(
-                    f'Final holdout: Return={result.final_holdout_result.total_return_pct:.2%}, '
-                    f'Sharpe={result.final_holdout_result.sharpe_ratio:.2f}'
-                )
-            except Exception as e:
-                logger.error(f'Final holdout failed: {e}')
+        failed = result.failed_folds
+        if failed:
+            incomplete = ', '.join(f'{f.fold_number} ({f.error or "no result"})' for f in failed)
+            logger.warning(
+                f'Walk-forward aggregates cover {result.completed_folds} of {result.total_folds} folds; '
+                f'incomplete: {incomplete}'
+            )
 
         # Calculate aggregate metrics
         self._calculate_aggregate_metrics(result)
 
         return result
 
+    def log_fold_summary(self, fold: WalkForwardFold, total_folds: int | None = None) -> None:
+        """Log a fold and its results the way ``run_fold`` does (for folds run elsewhere)."""
+        self._log_fold_header(fold, total_folds)
+        if fold.train_result is None:
+            logger.error('  Train period failed')
+            return
+        self._log_period('Train', fold.train_result)
+        if fold.test_result is None:
+            logger.error('  Test period failed')
+            return
+        self._log_period('Test', fold.test_result)
+
+    @staticmethod
+    def _log_fold_header(fold: WalkForwardFold, total_folds: int | None) -> None:
+        logger.info(
+            f'Fold {fold.fold_number}/{total_folds or "?"}: '
+            f'Train {fold.train_start} to {fold.train_end} ({fold.train_days}d), '
+            f'Test {fold.test_start} to {fold.test_end} ({fold.test_days}d)'
+        )
+
+    @staticmethod
+    def _log_period(label: str, period: PeriodResult) -> None:
+        logger.info(
+            f'  {label}: Return={period.total_return_pct:.2%}, '
+            f'Sharpe={period.sharpe_ratio:.2f}, '
+            f'Trades={period.total_trades}'
+        )
+
     def _calculate_aggregate_metrics(self, result: WalkForwardResult) -> None:
         """Calculate aggregate metrics from fold results."""
         if result.is_sharpes:
@@ -363,6 +436,7 @@ class WalkForwardValidator:
             'validation_mode': self.config.mode,
             'total_folds': result.total_folds,
             'completed_folds': result.completed_folds,
+            'failed_folds': [{'fold': f.fold_number, 'error': f.error} for f in result.failed_folds],
             'in_sample_sharpe': round(result.in_sample_sharpe, 3),
             'out_of_sample_sharpe': round(result.out_of_sample_sharpe, 3),
             'overfitting_ratio': round(result.overfitting_ratio, 3),
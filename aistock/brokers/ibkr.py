@@ -12,6 +12,7 @@ from ..data import Bar  # For optional historical bars
 from ..execution import ExecutionReport, Order, OrderSide, OrderType
 from ..log_config import configure_logger
 from .base import BaseBroker
+from .realtime import RealtimeBarDispatcher, RealtimeBarDropHandler, RealtimeBarStats
 
 RealTimeBarHandler: TypeAlias = Callable[[datetime, str, float, float, float, float, float], None]
 
@@ -216,6 +217,13 @@ class IBKRBroker(BaseBroker, EWrapper, EClient):  # type: ignore[misc]  # pragma
 
         # P1-1 Fix: Track subscription details for re-subscription after reconnect
         self._active_subscriptions: dict[str, tuple[RealTimeBarHandler, int]] = {}  # symbol -> (handler, bar_size)
+        # Real-time bar handlers run on these workers, not on the IBAPI reader thread
+        self._bar_dispatcher = RealtimeBarDispatcher(
+            workers=config.ib_bar_workers,
+            queue_size=config.ib_bar_queue_size,
+            policy=config.ib_bar_drop_policy,
+            name='IBKRRealtimeBars',
+        )
 
         # P0 Fix: Position reconciliation state
         self._positions: dict[str, tuple[float, float]] = {}  # symbol -> (quantity, avg_price)
@@ -252,6 +260,7 @@ class IBKRBroker(BaseBroker, EWrapper, EClient):  # type: ignore[misc]  # pragma
         """
         if self.isConnected():
             return
+        self._bar_dispatcher.start()
         self._connect_with_retry()
         # P1: Start heartbeat monitor
         self._heartbeat_stop.clear()
@@ -275,6 +284,8 @@ class IBKRBroker(BaseBroker, EWrapper, EClient):  # type: ignore[misc]  # pragma
             self._thread.join(timeout=5)
             self._thread = None
         self._connected.clear()
+        # Handle bars already received before the subscribers shut down
+        self._bar_dispatcher.stop(drain=True)
 
     def _connect_with_retry(self) -> None:
         """
@@ -475,6 +486,14 @@ class IBKRBroker(BaseBroker, EWrapper, EClient):  # type: ignore[misc]  # pragma
 
         self.cancelRealTimeBars(req_id)
 
+    def set_realtime_bar_drop_handler(self, handler: RealtimeBarDropHandler | None) -> None:
+        """Register ``handler(symbol, first, last)``, told about real-time bars discarded by ib_bar_drop_policy."""
+        self._bar_dispatcher.set_drop_handler(handler)
+
+    def get_realtime_bar_stats(self) -> RealtimeBarStats:
+        """Real-time bar hand-off counters and queue lag (see RealtimeBarDispatcher.get_stats)."""
+        return self._bar_dispatcher.get_stats()
+
     # --- IBAPI Callbacks ------------------------------------------------
     def managedAccounts(self, accountsList: str) -> None:  # noqa: N802,N803 - IBKR API callback name
         self._logger.info('Managed accounts', extra={'accounts': accountsList})
@@ -564,18 +583,18 @@ class IBKRBroker(BaseBroker, EWrapper, EClient):  # type: ignore[misc]  # pragma
         wap: float,
         count: int,
     ) -> None:  # noqa: N802 - IBKR API callback name
-        # P2-2: Log heartbeat for observability
-        now = datetime.now(timezone.utc)
-        self._last_heartbeat = now
-        self._logger.debug('heartbeat', extra={'timestamp': now.isoformat(), 'req_id': reqId})
+        # P2-2: Record activity for the heartbeat monitor (bar flow is observable via get_realtime_bar_stats)
+        self._last_heartbeat = datetime.now(timezone.utc)
 
         # Thread-safe handler lookup
         with self._market_lock:
             entry = self._market_handlers.get(reqId)
 
         if entry:
+            # Hand off to the bar workers; the reader thread never runs the handler
             symbol, handler = entry
-            handler(datetime.fromtimestamp(time, tz=timezone.utc), symbol, open_, high, low, close, volume)
+            timestamp = datetime.fromtimestamp(time, tz=timezone.utc)
+            self._bar_dispatcher.submit(symbol, handler, timestamp, open_, high, low, close, volume)
 
     # Historical data callbacks
     def historicalData(self, reqId: int, bar: HistoricalBar) -> None:  # noqa: N802 - IBKR API callback name
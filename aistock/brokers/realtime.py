@@ -0,0 +1,383 @@
+"""
+Hand-off of real-time bars from a broker's callback thread to worker threads.
+
+IBAPI delivers every real-time bar on its socket reader thread, and running
+the subscriber's handler there (aggregation, decisions, risk checks, order
+submission) stalls the reader, so bars of every subscription lag behind.
+``RealtimeBarDispatcher`` makes the callback only enqueue the bar:
+
+- Each symbol is pinned to one worker, so its bars are handled in arrival
+  order while different symbols are handled in parallel.
+- The hand-off is two ``deque.append`` calls under the worker's lock; the
+  worker is only woken (an ``Event.set``) when it is idle.
+- Each symbol's queue is bounded, so a burst on one symbol never pushes out
+  the bars of another symbol sharing its worker. When a symbol's queue is
+  full, the policy decides: ``block`` (the default) makes the callback wait
+  up to ``block_timeout`` for space before discarding the incoming bar,
+  ``drop_oldest`` discards the symbol's oldest queued bar (freshest data
+  wins), and ``drop_newest`` discards the incoming bar.
+- Discarded bars are not silently skipped: the drop handler is told the
+  first and last timestamp of each run of a symbol's discarded bars, on the
+  worker thread and before that symbol's next bar is handled, so whatever
+  aggregates the bars can mark the affected buckets incomplete.
+- ``get_stats`` reports submitted, processed and dropped bars, handler
+  errors, queue depth, and queue lag (time from enqueue to handling).
+
+Producer-side counters (submitted, dropped, blocked) assume one callback
+thread per dispatcher, which is IBAPI's model.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+from typing import TypedDict
+
+logger = logging.getLogger(__name__)
+
+# (timestamp, symbol, open, high, low, close, volume)
+RealtimeBarHandler = Callable[[datetime, str, float, float, float, float, float], None]
+# (symbol, first dropped timestamp, last dropped timestamp)
+RealtimeBarDropHandler = Callable[[str, datetime, datetime], None]
+
+DROP_OLDEST = 'drop_oldest'
+DROP_NEWEST = 'drop_newest'
+BLOCK = 'block'
+DROP_POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK)
+
+DEFAULT_WORKERS = 2
+DEFAULT_QUEUE_SIZE = 1_000
+# Idle workers re-check for work (and for stop) at least this often
+IDLE_WAIT_SECONDS = 0.5
+# Poll interval of a producer blocked on a full queue
+BLOCK_POLL_SECONDS = 0.001
+# A dropped-bar warning is logged for the first drop and then every this many
+DROP_LOG_INTERVAL = 1000
+
+# (symbol, handler, (timestamp, open, high, low, close, volume), enqueued_at or None when handled inline)
+_QueuedBar = tuple[str, RealtimeBarHandler, tuple[datetime, float, float, float, float, float], float | None]
+
+
+class RealtimeBarStats(TypedDict):
+    """Hand-off counters and queue lag of a ``RealtimeBarDispatcher``."""
+
+    workers: int
+    policy: str
+    queue_size: int  # per symbol
+    symbols: int
+    submitted: int
+    processed: int
+    dropped: int
+    blocked: int
+    errors: int
+    queued: int
+    max_queued: int  # deepest single-symbol queue seen
+    lag_last_seconds: float
+    lag_max_seconds: float
+    lag_mean_seconds: float
+
+
+class _Worker:
+    """One worker thread and its queue; its counters are written by the worker or the producer only."""
+
+    __slots__ = (
+        'lock',
+        'order',
+        'wake',
+        'idle',
+        'thread',
+        'submitted',
+        'dropped',
+        'blocked',
+        'processed',
+        'errors',
+        'max_queued',
+        'lag_total',
+        'lag_max',
+        'lag_last',
+    )
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()  # Protects order and the bars and drops of its symbols
+        # One entry per queued bar, naming the symbol whose oldest bar is handled next
+        self.order: deque[_SymbolQueue] = deque()
+        self.wake = threading.Event()
+        self.idle = False
+        self.thread: threading.Thread | None = None
+        # Producer side
+        self.submitted = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.max_queued = 0
+        # Worker side
+        self.processed = 0
+        self.errors = 0
+        self.lag_total = 0.0
+        self.lag_max = 0.0
+        self.lag_last = 0.0
+
+
+class _SymbolQueue:
+    """Bars of one symbol waiting for its worker, and the span of its dropped bars not yet reported."""
+
+    __slots__ = ('worker', 'bars', 'dropped_span')
+
+    def __init__(self, worker: _Worker) -> None:
+        self.worker = worker
+        self.bars: deque[_QueuedBar] = deque()
+        self.dropped_span: tuple[datetime, datetime] | None = None
+
+    def record_drop(self, timestamp: datetime) -> None:
+        """Extend the unreported span (caller holds the worker's lock)."""
+        span = self.dropped_span
+        if span is None:
+            self.dropped_span = (timestamp, timestamp)
+        else:
+            self.dropped_span = (min(span[0], timestamp), max(span[1], timestamp))
+
+
+class RealtimeBarDispatcher:
+    """
+    Bounded, per-symbol-ordered hand-off of real-time bars to a worker pool.
+
+    With ``workers=0`` bars are handled synchronously on the calling thread
+    (the behaviour before the dispatcher existed).
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        policy: str = BLOCK,
+        block_timeout: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        name: str = 'RealtimeBars',
+    ) -> None:
+        """
+        Initialize the dispatcher (workers start with ``start``).
+
+        Args:
+            workers: Worker threads; 0 handles bars on the callback thread.
+            queue_size: Bars queued per symbol before the policy applies.
+            policy: One of ``DROP_POLICIES``; dropping bars is opt-in.
+            block_timeout: Longest a ``block`` producer waits for space.
+            clock: Monotonic time source for the lag metrics.
+            name: Prefix of the worker thread names.
+        """
+        if workers < 0:
+            raise ValueError(f'workers must be non-negative, got {workers}')
+        if queue_size < 1:
+            raise ValueError(f'queue_size must be at least 1, got {queue_size}')
+        if policy not in DROP_POLICIES:
+            raise ValueError(f'policy must be one of {DROP_POLICIES}, got {policy!r}')
+        if block_timeout < 0:
+            raise ValueError(f'block_timeout must be non-negative, got {block_timeout}')
+        self._workers = [_Worker() for _ in range(workers)]
+        self._capacity = queue_size
+        self._policy = policy
+        self._block_timeout = block_timeout
+        self._clock = clock
+        self._name = name
+        self._symbols: dict[str, _SymbolQueue] = {}
+        self._drop_handler: RealtimeBarDropHandler | None = None
+        self._inline = _Worker()  # counters of synchronous (workers=0) handling
+        self._running = False
+        self._stopping = False
+        self._lock = threading.Lock()  # Protects start/stop
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def set_drop_handler(self, handler: RealtimeBarDropHandler | None) -> None:
+        """Register the callback told about discarded bars (see the module docstring)."""
+        self._drop_handler = handler
+
+    def start(self) -> None:
+        with self._lock:
+            if self._running:
+                return
+            self._stopping = False
+            for index, worker in enumerate(self._workers):
+                worker.thread = threading.Thread(
+                    target=self._run, args=(worker,), daemon=True, name=f'{self._name}-{index}'
+                )
+                worker.thread.start()
+            self._running = True
+
+    def stop(self, drain: bool = True, timeout: float = 5.0) -> None:
+        """
+        Stop the workers.
+
+        Args:
+            drain: Handle the bars still queued first; otherwise discard them
+                (counted as dropped).
+            timeout: Longest to wait for each worker to finish.
+        """
+        with self._lock:
+            if not self._running:
+                return
+            self._stopping = True
+            for worker in self._workers:
+                if not drain:
+                    with worker.lock:
+                        worker.dropped += len(worker.order)
+                        worker.order.clear()
+                        for entry in self._symbols.values():
+                            if entry.worker is worker:
+                                entry.bars.clear()
+                                entry.dropped_span = None
+                worker.wake.set()
+            current = threading.current_thread()
+            for worker in self._workers:
+                if worker.thread is not None and worker.thread is not current:
+                    worker.thread.join(timeout=timeout)
+                worker.thread = None
+            self._running = False
+
+    def submit(
+        self,
+        symbol: str,
+        handler: RealtimeBarHandler,
+        timestamp: datetime,
+        open_: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: float,
+    ) -> bool:
+        """
+        Queue a bar for ``handler`` (called as ``handler(timestamp, symbol, ...)``).
+
+        Returns:
+            False if the bar itself was dropped by the policy, True otherwise.
+        """
+        if not self._workers:
+            self._inline.submitted += 1
+            self._handle(self._inline, (symbol, handler, (timestamp, open_, high, low, close, volume), None))
+            return True
+
+        entry = self._symbols.get(symbol)
+        if entry is None:
+            worker = self._workers[len(self._symbols) % len(self._workers)]
+            entry = self._symbols.setdefault(symbol, _SymbolQueue(worker))
+        worker = entry.worker
+        worker.submitted += 1
+
+        bars = entry.bars
+        if self._policy == BLOCK and len(bars) >= self._capacity:
+            self._wait_for_room(entry)
+        item: _QueuedBar = (symbol, handler, (timestamp, open_, high, low, close, volume), self._clock())
+        full = False
+        with worker.lock:
+            if len(bars) < self._capacity:
+                bars.append(item)
+                worker.order.append(entry)
+            else:
+                full = True
+                if self._policy == DROP_OLDEST:
+                    # The new bar takes over the dropped bar's turn in the worker's order
+                    entry.record_drop(bars.popleft()[2][0])
+                    bars.append(item)
+                else:
+                    entry.record_drop(timestamp)
+            depth = len(bars)
+        worker.max_queued = max(worker.max_queued, depth)
+        if full:
+            self._count_drop(worker)
+        accepted = not full or self._policy == DROP_OLDEST
+        if accepted and worker.idle:
+            worker.wake.set()
+        return accepted
+
+    def _wait_for_room(self, entry: _SymbolQueue) -> None:
+        """Make a ``block`` producer wait until the symbol's queue has space, the timeout passes or workers stop."""
+        entry.worker.blocked += 1
+        deadline = time.monotonic() + self._block_timeout
+        while len(entry.bars) >= self._capacity and self._running and time.monotonic() < deadline:
+            time.sleep(BLOCK_POLL_SECONDS)
+
+    def _count_drop(self, worker: _Worker) -> None:
+        worker.dropped += 1
+        dropped = sum(w.dropped for w in self._workers)
+        if dropped == 1 or dropped % DROP_LOG_INTERVAL == 0:
+            logger.warning(
+                'realtime_bars_dropped',
+                extra={'dropped': dropped, 'policy': self._policy, 'queue_size': self._capacity},
+            )
+
+    def _run(self, worker: _Worker) -> None:
+        order = worker.order
+        item: _QueuedBar | None
+        dropped_span: tuple[datetime, datetime] | None
+        while True:
+            with worker.lock:
+                if order:
+                    entry = order.popleft()
+                    item = entry.bars.popleft()
+                    dropped_span, entry.dropped_span = entry.dropped_span, None
+                else:
+                    item, dropped_span = None, None
+            if item is None:
+                if self._stopping:
+                    return
+                # Publish idleness before the final check so a concurrent submit either is seen here or wakes us
+                worker.wake.clear()
+                worker.idle = True
+                if not order:
+                    worker.wake.wait(IDLE_WAIT_SECONDS)
+                worker.idle = False
+                continue
+            if dropped_span is not None:
+                self._report_drop(worker, item[0], dropped_span)
+            self._handle(worker, item)
+
+    def _report_drop(self, worker: _Worker, symbol: str, span: tuple[datetime, datetime]) -> None:
+        handler = self._drop_handler
+        if handler is None:
+            return
+        try:
+            handler(symbol, span[0], span[1])
+        except Exception:
+            worker.errors += 1
+            logger.exception('realtime_bar_drop_handler_failed', extra={'symbol': symbol})
+
+    def _handle(self, worker: _Worker, item: _QueuedBar) -> None:
+        symbol, handler, (timestamp, open_, high, low, close, volume), enqueued_at = item
+        if enqueued_at is not None:
+            lag = self._clock() - enqueued_at
+            worker.lag_last = lag
+            worker.lag_total += lag
+            worker.lag_max = max(worker.lag_max, lag)
+        try:
+            handler(timestamp, symbol, open_, high, low, close, volume)
+        except Exception:
+            worker.errors += 1
+            logger.exception('realtime_bar_handler_failed', extra={'symbol': symbol})
+        worker.processed += 1
+
+    def get_stats(self) -> RealtimeBarStats:
+        """Counters and queue-lag metrics (lags in seconds; 0.0 before the first queued bar)."""
+        workers = self._workers or [self._inline]
+        processed = sum(w.processed for w in workers)
+        queued_processed = processed if self._workers else 0
+        return {
+            'workers': len(self._workers),
+            'policy': self._policy,
+            'queue_size': self._capacity if self._workers else 0,
+            'symbols': len(self._symbols),
+            'submitted': sum(w.submitted for w in workers),
+            'processed': processed,
+            'dropped': sum(w.dropped for w in workers),
+            'blocked': sum(w.blocked for w in workers),
+            'errors': sum(w.errors for w in workers),
+            'queued': sum(len(w.order) for w in workers),
+            'max_queued': max(w.max_queued for w in workers),
+            'lag_last_seconds': max(w.lag_last for w in workers),
+            'lag_max_seconds': max(w.lag_max for w in workers),
+            'lag_mean_seconds': sum(w.lag_total for w in workers) / queued_processed if queued_processed else 0.0,
+        }
@@ -217,6 +217,13 @@ class BrokerConfig:
     ib_exchange: str = 'SMART'  # Default exchange
     ib_currency: str = 'USD'  # Default currency
     contracts: dict[str, ContractSpec] = field(default_factory=dict)
+    # Real-time bars are handled off the IBAPI reader thread (see brokers.realtime)
+    ib_bar_workers: int = 2  # Worker threads (0 = handle on the reader thread)
+    ib_bar_queue_size: int = 1_000  # Bars queued per symbol before ib_bar_drop_policy applies
+    # "block" (wait for the workers), or opt in to losing bars with "drop_oldest" / "drop_newest"
+    ib_bar_drop_policy: str = 'block'
+    # Seconds a decision-bar group waits for lagging symbols before it is processed without them
+    ib_decision_group_timeout: float = 2.0
 
     def validate(self) -> None:
         """
@@ -238,6 +245,21 @@ class BrokerConfig:
         if self.ib_client_id is not None and self.ib_client_id < 0:
             raise ValueError(f'ib_client_id must be non-negative, got {self.ib_client_id}')
 
+        if self.ib_bar_workers < 0:
+            raise ValueError(f'ib_bar_workers must be non-negative, got {self.ib_bar_workers}')
+
+        if self.ib_bar_queue_size < 1:
+            raise ValueError(f'ib_bar_queue_size must be at least 1, got {self.ib_bar_queue_size}')
+
+        valid_drop_policies = {'drop_oldest', 'drop_newest', 'block'}
+        if self.ib_bar_drop_policy not in valid_drop_policies:
+            raise ValueError(
+                f'ib_bar_drop_policy must be one of {valid_drop_policies}, got {self.ib_bar_drop_policy!r}'
+            )
+
+        if self.ib_decision_group_timeout <= 0:
+            raise ValueError(f'ib_decision_group_timeout must be positive, got {self.ib_decision_group_timeout}')
+
         if self.backend == 'ibkr':
             if not self.ib_account:
                 raise ValueError('ib_account is required when backend is "ibkr"')
@@ -4,12 +4,20 @@ Data structures and loading utilities.
 
 from __future__ import annotations
 
-from collections.abc import Generator, Iterable, Mapping, Sequence
+import bisect
+import heapq
+import os
+from collections.abc import Generator, Iterable, Iterator, Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import suppress
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
-from decimal import Decimal, InvalidOperation
+from datetime import datetime, timedelta, timezone, tzinfo
+from decimal import Decimal
 from pathlib import Path
-from typing import TYPE_CHECKING, Protocol, SupportsInt, cast, overload
+from typing import TYPE_CHECKING, Literal, Protocol, cast, overload
+
+import numpy as np
+from numpy.typing import NDArray
 
 if TYPE_CHECKING:
     from .config import DataQualityConfig, DataSource
@@ -58,30 +66,7 @@ class _PandasModule(Protocol):
 
     def to_datetime(self, arg: object, *, utc: bool | None = None) -> _Index: ...
 
-
-def _to_decimal(value: object) -> Decimal | None:
-    if value is None:
-        return None
-    try:
-        return Decimal(str(value))
-    except (InvalidOperation, TypeError, ValueError):
-        return None
-
-
-def _to_int(value: object) -> int | None:
-    if value is None:
-        return None
-    if isinstance(value, (int, float, Decimal, str)):
-        try:
-            return int(value)
-        except (TypeError, ValueError):
-            return None
-    if hasattr(value, '__int__'):
-        try:
-            return int(cast(SupportsInt, value))
-        except (TypeError, ValueError):
-            return None
-    return None
+    def to_numeric(self, arg: object, *, errors: str = 'raise') -> _SeriesLike: ...
 
 
 @dataclass
@@ -110,7 +95,457 @@ class Bar:
             raise ValueError(f'Volume cannot be negative: {self.volume}')
 
 
-def load_csv_file(file_path: Path, symbol: str, tz: timezone | None = None) -> list[Bar]:
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NS_PER_MICROSECOND = 1_000
+
+
+def datetime_to_ns(value: datetime) -> int:
+    """Convert a datetime to integer nanoseconds since the Unix epoch (naive values are taken as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return ((value - _EPOCH) // timedelta(microseconds=1)) * _NS_PER_MICROSECOND
+
+
+def ns_to_datetime(value: int, tz: tzinfo | None = timezone.utc) -> datetime:
+    """Inverse of ``datetime_to_ns``; ``tz=None`` returns a naive UTC datetime."""
+    moment = _EPOCH + timedelta(microseconds=int(value) // _NS_PER_MICROSECOND)
+    if tz is None:
+        return moment.replace(tzinfo=None)
+    return moment.astimezone(tz)
+
+
+def _to_fixed_point(values: Iterable[Decimal], price_scale: int, count: int) -> NDArray[np.int64]:
+    """Decimal prices as int64 multiples of ``1 / price_scale`` (rounded half to even)."""
+    scale = Decimal(price_scale)
+    return np.fromiter((int((value * scale).to_integral_value()) for value in values), dtype=np.int64, count=count)
+
+
+class BarFrame(Sequence[Bar]):
+    """Columnar OHLCV storage for one symbol.
+
+    Timestamps are int64 epoch nanoseconds and volume is int64. Prices are
+    float64, or int64 fixed point when ``price_scale`` is set (price =
+    value / price_scale), which keeps Decimal inputs exact. Slicing returns a
+    BarFrame over views of the same buffers, and indexing builds a ``Bar`` on
+    demand, so a frame can stand in for ``Sequence[Bar]`` in existing code.
+    """
+
+    __slots__ = ('symbol', 'timestamps', 'open', 'high', 'low', 'close', 'volume', 'price_scale', 'tz')
+
+    def __init__(
+        self,
+        symbol: str,
+        timestamps: NDArray[np.int64],
+        open: NDArray[np.float64] | NDArray[np.int64],
+        high: NDArray[np.float64] | NDArray[np.int64],
+        low: NDArray[np.float64] | NDArray[np.int64],
+        close: NDArray[np.float64] | NDArray[np.int64],
+        volume: NDArray[np.int64],
+        price_scale: int | None = None,
+        tz: tzinfo | None = timezone.utc,
+        validate: bool = True,
+    ):
+        self.symbol = symbol
+        self.timestamps = timestamps
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.price_scale = price_scale
+        self.tz = tz
+        if validate:
+            self.validate()
+
+    def validate(self) -> None:
+        """Vectorized equivalent of ``Bar.__post_init__`` plus shape and dtype checks."""
+        n = len(self.timestamps)
+        price_dtype = np.int64 if self.price_scale is not None else np.float64
+        if self.price_scale is not None and self.price_scale <= 0:
+            raise ValueError(f'price_scale must be positive, got {self.price_scale}')
+        if self.timestamps.ndim != 1 or self.timestamps.dtype != np.int64:
+            raise ValueError('timestamps must be a 1-d int64 array of epoch nanoseconds')
+        for name in ('open', 'high', 'low', 'close'):
+            column = cast(NDArray[np.generic], getattr(self, name))
+            if column.shape != (n,) or column.dtype != price_dtype:
+                raise ValueError(f'{name} must be a 1-d {np.dtype(price_dtype).name} array of length {n}')
+        if self.volume.shape != (n,) or self.volume.dtype != np.int64:
+            raise ValueError(f'volume must be a 1-d int64 array of length {n}')
+
+        bad = np.flatnonzero(self.high < self.low)
+        if bad.size:
+            i = int(bad[0])
+            raise ValueError(f'High ({self._price(self.high, i)}) < Low ({self._price(self.low, i)}) at row {i}')
+        bad = np.flatnonzero((self.open < self.low) | (self.open > self.high))
+        if bad.size:
+            raise ValueError(f'Open ({self._price(self.open, int(bad[0]))}) outside High/Low range at row {bad[0]}')
+        bad = np.flatnonzero((self.close < self.low) | (self.close > self.high))
+        if bad.size:
+            raise ValueError(f'Close ({self._price(self.close, int(bad[0]))}) outside High/Low range at row {bad[0]}')
+        bad = np.flatnonzero(self.volume < 0)
+        if bad.size:
+            raise ValueError(f'Volume cannot be negative: {int(self.volume[bad[0]])} at row {bad[0]}')
+
+    # ----- Construction ---------------------------------------------------
+
+    @classmethod
+    def empty(cls, symbol: str, price_scale: int | None = None, tz: tzinfo | None = timezone.utc) -> BarFrame:
+        # Zero-length, so the price columns can share one array
+        prices: NDArray[np.float64] | NDArray[np.int64] = (
+            np.empty(0, dtype=np.int64) if price_scale is not None else np.empty(0, dtype=np.float64)
+        )
+        return cls(
+            symbol,
+            timestamps=np.empty(0, dtype=np.int64),
+            open=prices,
+            high=prices,
+            low=prices,
+            close=prices,
+            volume=np.empty(0, dtype=np.int64),
+            price_scale=price_scale,
+            tz=tz,
+            validate=False,
+        )
+
+    @classmethod
+    def from_bars(cls, bars: Sequence[Bar], symbol: str | None = None, price_scale: int | None = None) -> BarFrame:
+        """Pack a list of bars (one symbol, any order kept as given) into columns.
+
+        Args:
+            bars: Bars to convert
+            symbol: Symbol for an empty frame or to override ``bars[0].symbol``
+            price_scale: Store prices as int64 fixed point with this scale (e.g. 10_000)
+                instead of float64; a BarFrame given with a scale is rescaled
+                (see ``with_price_scale``), without one it is returned as is
+        """
+        if isinstance(bars, BarFrame):
+            return bars if price_scale is None else bars.with_price_scale(price_scale)
+        if not bars:
+            if symbol is None:
+                raise ValueError('symbol is required to build an empty BarFrame')
+            return cls.empty(symbol, price_scale=price_scale)
+
+        frame_symbol = symbol if symbol is not None else bars[0].symbol
+        tz = bars[0].timestamp.tzinfo
+        timestamps = np.fromiter((datetime_to_ns(bar.timestamp) for bar in bars), dtype=np.int64, count=len(bars))
+        volume = np.fromiter((bar.volume for bar in bars), dtype=np.int64, count=len(bars))
+
+        def column(name: str) -> NDArray[np.float64] | NDArray[np.int64]:
+            values = (cast(Decimal, getattr(bar, name)) for bar in bars)
+            if price_scale is None:
+                return np.fromiter((float(value) for value in values), dtype=np.float64, count=len(bars))
+            return _to_fixed_point(values, price_scale, len(bars))
+
+        return cls(
+            frame_symbol,
+            timestamps=timestamps,
+            open=column('open'),
+            high=column('high'),
+            low=column('low'),
+            close=column('close'),
+            volume=volume,
+            price_scale=price_scale,
+            tz=tz,
+            validate=False,
+        )
+
+    def with_price_scale(self, price_scale: int | None) -> BarFrame:
+        """This frame with prices stored at ``price_scale`` (None = float64).
+
+        Converting to fixed point rounds each price (as ``Decimal``) to the
+        nearest multiple of ``1 / price_scale``, exactly like ``from_bars``;
+        converting to float64 divides by the current scale. Timestamps and
+        volume are shared, not copied.
+        """
+        if price_scale == self.price_scale:
+            return self
+        if price_scale is not None and price_scale <= 0:
+            raise ValueError(f'price_scale must be positive, got {price_scale}')
+        names = ('open', 'high', 'low', 'close')
+        current = self.price_scale
+        if price_scale is None:
+            columns = [self.prices(name) for name in names]
+        elif current is not None and price_scale % current == 0:
+            factor = price_scale // current
+            limit = np.iinfo(np.int64).max // factor
+            columns = []
+            for name in names:
+                values = cast(NDArray[np.int64], getattr(self, name))
+                if values.size and int(np.abs(values).max()) > limit:
+                    raise ValueError(f'{name} prices overflow int64 at price_scale={price_scale}')
+                columns.append(values * factor)
+        else:
+            n = len(self)
+            columns = []
+            for name in names:
+                values = cast('NDArray[np.float64] | NDArray[np.int64]', getattr(self, name))
+                columns.append(_to_fixed_point((self._price(values, i) for i in range(n)), price_scale, n))
+        return BarFrame(
+            self.symbol,
+            timestamps=self.timestamps,
+            open=columns[0],
+            high=columns[1],
+            low=columns[2],
+            close=columns[3],
+            volume=self.volume,
+            price_scale=price_scale,
+            tz=self.tz,
+            validate=False,
+        )
+
+    def to_bars(self) -> list[Bar]:
+        """Materialise every row as a ``Bar``."""
+        return [self[i] for i in range(len(self))]
+
+    # ----- Sequence protocol ----------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @overload
+    def __getitem__(self, index: int) -> Bar: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> BarFrame: ...
+
+    def __getitem__(self, index: int | slice) -> Bar | BarFrame:
+        if isinstance(index, slice):
+            return BarFrame(
+                self.symbol,
+                self.timestamps[index],
+                self.open[index],
+                self.high[index],
+                self.low[index],
+                self.close[index],
+                self.volume[index],
+                price_scale=self.price_scale,
+                tz=self.tz,
+                validate=False,
+            )
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError('BarFrame index out of range')
+        return Bar(
+            symbol=self.symbol,
+            timestamp=ns_to_datetime(int(self.timestamps[index]), self.tz),
+            open=self._price(self.open, index),
+            high=self._price(self.high, index),
+            low=self._price(self.low, index),
+            close=self._price(self.close, index),
+            volume=int(self.volume[index]),
+        )
+
+    def __iter__(self) -> Iterator[Bar]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __repr__(self) -> str:
+        kind = f'fixed/{self.price_scale}' if self.price_scale is not None else 'float64'
+        return f'BarFrame(symbol={self.symbol!r}, rows={len(self)}, prices={kind})'
+
+    # ----- Column access --------------------------------------------------
+
+    def _price(self, column: NDArray[np.float64] | NDArray[np.int64], index: int) -> Decimal:
+        value = column[index]
+        if self.price_scale is not None:
+            return Decimal(int(value)) / Decimal(self.price_scale)
+        return Decimal(repr(float(value)))
+
+    def prices(self, name: str) -> NDArray[np.float64]:
+        """Price column as float64 (a view for float frames, a scaled copy for fixed point)."""
+        if name not in ('open', 'high', 'low', 'close'):
+            raise ValueError(f'Unknown price column: {name}')
+        column = cast('NDArray[np.float64] | NDArray[np.int64]', getattr(self, name))
+        if self.price_scale is None:
+            return cast(NDArray[np.float64], column)
+        return column / float(self.price_scale)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(
+            int(column.nbytes) for column in (self.timestamps, self.open, self.high, self.low, self.close, self.volume)
+        )
+
+    def timestamp_at(self, index: int) -> datetime:
+        return ns_to_datetime(int(self.timestamps[index]), self.tz)
+
+    def between(self, start: datetime | None = None, end: datetime | None = None) -> BarFrame:
+        """Zero-copy slice of rows with ``start <= timestamp < end`` (timestamps must be sorted)."""
+        lo = 0 if start is None else int(np.searchsorted(self.timestamps, datetime_to_ns(start), side='left'))
+        hi = len(self) if end is None else int(np.searchsorted(self.timestamps, datetime_to_ns(end), side='left'))
+        return self[lo:hi]
+
+
+_OHLC_COLUMNS = ('open', 'high', 'low', 'close')
+_REQUIRED_COLUMNS = [*_OHLC_COLUMNS, 'volume']
+# load_csv_directory only starts a process pool by itself for at least this much CSV
+PARALLEL_CSV_MIN_BYTES = 64 * 1024 * 1024
+# Rows named in an aggregated diagnostic before it is truncated.
+_DIAGNOSTIC_SAMPLE = 3
+
+
+@dataclass
+class _CsvColumns:
+    """Validated columns of one CSV file, ready to become bars or a BarFrame."""
+
+    index: _Index
+    prices: dict[str, NDArray[np.float64]]
+    volume: NDArray[np.int64]
+    # Source cells, kept so Decimals are built exactly as Decimal(str(value)) always did.
+    raw: dict[str, NDArray[np.generic]]
+
+
+def _read_csv_frame(pd: _PandasModule, file_path: Path) -> _DataFrame:
+    return pd.read_csv(file_path, index_col=0, parse_dates=True)
+
+
+def _clean_csv_frame(df: _DataFrame) -> _DataFrame:
+    df = df.sort_index()
+    df = df[~df.index.duplicated(keep='last')]
+    return df.dropna(subset=_REQUIRED_COLUMNS)  # type: ignore[call-overload]
+
+
+def _describe_rows(index: _Index, mask: NDArray[np.bool_]) -> str:
+    rows = np.flatnonzero(mask)
+    sample = ', '.join(str(index[int(i)]) for i in rows[:_DIAGNOSTIC_SAMPLE])  # type: ignore[index]
+    more = f', ... (+{rows.size - _DIAGNOSTIC_SAMPLE} more)' if rows.size > _DIAGNOSTIC_SAMPLE else ''
+    return f'{rows.size} row(s) [{sample}{more}]'
+
+
+def _validate_csv_columns(
+    pd: _PandasModule, df: _DataFrame, symbol: str, strict: bool
+) -> tuple[_CsvColumns, str | None]:
+    """Validate OHLCV columns with whole-column masks.
+
+    Matches the row-by-row rules the loaders have always applied: unparseable
+    values, High < Low and negative volume drop the row; in strict mode
+    non-positive prices and Open/Close outside the High/Low range raise,
+    otherwise those rows are dropped too (non-positive prices are only
+    rejected in strict mode). Dropped rows are summarised in one returned
+    diagnostic line instead of a warning per row.
+    """
+    n = len(df)  # type: ignore[arg-type]
+    raw: dict[str, NDArray[np.generic]] = {}
+    prices: dict[str, NDArray[np.float64]] = {}
+    for name in _OHLC_COLUMNS:
+        raw[name] = np.asarray(df[name])
+        prices[name] = np.asarray(pd.to_numeric(df[name], errors='coerce'), dtype=np.float64)
+    volume_numeric = np.asarray(pd.to_numeric(df['volume'], errors='coerce'), dtype=np.float64)
+
+    invalid = ~np.isfinite(volume_numeric)
+    for column in prices.values():
+        invalid |= ~np.isfinite(column)
+    open_, high, low, close = (prices[name] for name in _OHLC_COLUMNS)
+    volume = np.where(invalid, 0, volume_numeric).astype(np.int64)
+    ok = ~invalid
+    with np.errstate(invalid='ignore'):
+        non_positive = ok & ((open_ <= 0) | (high <= 0) | (low <= 0) | (close <= 0)) if strict else np.zeros(n, bool)
+        ok &= ~non_positive
+        high_below_low = ok & (high < low)
+        ok &= ~high_below_low
+        outside = ok & ((open_ < low) | (open_ > high) | (close < low) | (close > high))
+        ok &= ~outside
+        negative_volume = ok & (volume < 0)
+        ok &= ~negative_volume
+
+    if strict and (non_positive.any() or outside.any()):
+        first = int(np.flatnonzero(non_positive | outside)[0])
+        timestamp = df.index[first]  # type: ignore[index]
+        if non_positive[first]:
+            detail = (
+                f'Invalid prices: open={raw["open"][first]}, high={raw["high"][first]}, '
+                f'low={raw["low"][first]}, close={raw["close"][first]}'
+            )
+        else:
+            detail = 'Open/Close outside High/Low range'
+        problems = _describe_rows(df.index, non_positive | outside)
+        raise ValueError(f'Invalid bar data for {symbol} at {timestamp}: {detail} ({problems} affected)')
+
+    dropped = {
+        'missing or invalid values': invalid,
+        'high below low': high_below_low,
+        'open/close outside high/low': outside,
+        'negative volume': negative_volume,
+    }
+    reasons = [f'{reason}: {_describe_rows(df.index, mask)}' for reason, mask in dropped.items() if mask.any()]
+    diagnostic = f'Warning: Skipped invalid bar data for {symbol}: ' + '; '.join(reasons) if reasons else None
+
+    keep = np.flatnonzero(ok)
+    columns = _CsvColumns(
+        index=df.index[keep],  # type: ignore[index]
+        prices={name: column[keep] for name, column in prices.items()},
+        volume=volume[keep],
+        raw={name: values[keep] for name, values in raw.items()},
+    )
+    return columns, diagnostic
+
+
+def _columns_to_bars(columns: _CsvColumns, symbol: str) -> list[Bar]:
+    timestamps = columns.index.to_pydatetime()  # type: ignore[attr-defined]
+    text = {name: [str(value) for value in values.tolist()] for name, values in columns.raw.items()}
+    return [
+        Bar(
+            symbol=symbol,
+            timestamp=timestamp,
+            open=Decimal(open_),
+            high=Decimal(high),
+            low=Decimal(low),
+            close=Decimal(close),
+            volume=volume,
+        )
+        for timestamp, open_, high, low, close, volume in zip(
+            timestamps, text['open'], text['high'], text['low'], text['close'], columns.volume.tolist()
+        )
+    ]
+
+
+def _columns_to_frame(columns: _CsvColumns, symbol: str) -> BarFrame:
+    index = columns.index
+    timestamps = np.asarray(index.as_unit('ns').asi8, dtype=np.int64)  # type: ignore[attr-defined]
+    prices = {name: np.ascontiguousarray(columns.prices[name]) for name in _OHLC_COLUMNS}
+    return BarFrame(
+        symbol,
+        timestamps=timestamps,
+        open=prices['open'],
+        high=prices['high'],
+        low=prices['low'],
+        close=prices['close'],
+        volume=np.ascontiguousarray(columns.volume),
+        tz=cast('tzinfo | None', index.tz),
+        validate=False,
+    )
+
+
+def _import_pandas() -> _PandasModule:
+    try:
+        import pandas as pd
+    except ModuleNotFoundError as exc:  # pragma: no cover
+        raise RuntimeError('pandas is required to load CSV market data') from exc
+    return cast(_PandasModule, pd)
+
+
+@overload
+def load_csv_file(
+    file_path: Path, symbol: str, tz: timezone | None = None, *, strict: bool = True, as_frame: Literal[False] = False
+) -> list[Bar]: ...
+
+
+@overload
+def load_csv_file(
+    file_path: Path, symbol: str, tz: timezone | None = None, *, strict: bool = True, as_frame: Literal[True]
+) -> BarFrame: ...
+
+
+def load_csv_file(
+    file_path: Path,
+    symbol: str,
+    tz: timezone | None = None,
+    *,
+    strict: bool = True,
+    as_frame: bool = False,
+) -> list[Bar] | BarFrame:
     """
     Load a single CSV file and return list of Bars.
 
@@ -118,17 +553,15 @@ def load_csv_file(file_path: Path, symbol: str, tz: timezone | None = None) -> l
         file_path: Path to CSV file
         symbol: Symbol name
         tz: Timezone (optional, defaults to UTC)
+        strict: Raise on non-positive prices or Open/Close outside High/Low
+            (otherwise such rows are skipped)
+        as_frame: Return a columnar BarFrame instead of Bar objects
 
     Returns:
-        List of Bar objects
+        List of Bar objects (or a BarFrame)
     """
-    try:
-        import pandas as pd
-    except ModuleNotFoundError as exc:  # pragma: no cover
-        raise RuntimeError('pandas is required to load CSV market data') from exc
-
-    pd = cast(_PandasModule, pd)
-    df = pd.read_csv(file_path, index_col=0, parse_dates=True)
+    pd = _import_pandas()
+    df = _read_csv_frame(pd, file_path)
 
     # Ensure timezone (prefer provided tz, default to UTC)
     target_tz = tz if tz is not None else timezone.utc
@@ -138,82 +571,141 @@ def load_csv_file(file_path: Path, symbol: str, tz: timezone | None = None) -> l
         df.index = df.index.tz_convert(target_tz)  # type: ignore[attr-defined]
 
     # Validate columns
-    required_cols = ['open', 'high', 'low', 'close', 'volume']
-    if not all(col in df.columns for col in required_cols):
+    if not all(col in df.columns for col in _REQUIRED_COLUMNS):
         raise ValueError(f'Missing required columns in {file_path}')
 
-    # Clean and validate
-    df = df.sort_index()
-    df = df[~df.index.duplicated(keep='last')]
-    df = df.dropna(subset=required_cols)  # type: ignore[call-overload]
-
-    # Convert to Bar objects
-    bars: list[Bar] = []
-    for timestamp, row in df.iterrows():
-        try:
-            # Validate prices are positive
-            open_value = _to_decimal(row['open'])
-            high_value = _to_decimal(row['high'])
-            low_value = _to_decimal(row['low'])
-            close_value = _to_decimal(row['close'])
-            volume_value = _to_int(row['volume'])
-            if open_value is None:
-                raise ValueError('Missing or invalid bar values')
-            if high_value is None:
-                raise ValueError('Missing or invalid bar values')
-            if low_value is None:
-                raise ValueError('Missing or invalid bar values')
-            if close_value is None:
-                raise ValueError('Missing or invalid bar values')
-            if volume_value is None:
-                raise ValueError('Missing or invalid bar values')
-            if open_value <= 0 or high_value <= 0 or low_value <= 0 or close_value <= 0:
-                raise ValueError(
-                    f'Invalid prices: open={open_value}, high={high_value}, low={low_value}, close={close_value}'
-                )
-
-            bar = Bar(
-                symbol=symbol,
-                timestamp=timestamp,  # type: ignore[arg-type]
-                open=open_value,
-                high=high_value,
-                low=low_value,
-                close=close_value,
-                volume=volume_value,
-            )
-            bars.append(bar)
-        except (ValueError, KeyError) as e:
-            # For invalid data, re-raise to catch in tests, but print warning for other issues
-            if 'Invalid prices' in str(e) or 'outside' in str(e):
-                print(f'Warning: Invalid bar data for {symbol} at {timestamp}: {e}')
-                # In strict mode, raise the error
-                raise ValueError(f'Invalid bar data for {symbol} at {timestamp}: {e}')
-            else:
-                print(f'Warning: Invalid bar data for {symbol} at {timestamp}: {e}')
-                continue
+    columns, diagnostic = _validate_csv_columns(pd, _clean_csv_frame(df), symbol, strict=strict)
+    if diagnostic:
+        print(diagnostic)
+    if as_frame:
+        return _columns_to_frame(columns, symbol)
+    return _columns_to_bars(columns, symbol)
+
+
+def _symbol_csv_path(data_path: Path, symbol: str) -> Path:
+    # Convert symbol to filename (replace / with _)
+    safe_symbol = symbol.replace('/', '_').replace('\\', '_')
+    return data_path / f'{safe_symbol}.csv'
 
-    return bars
 
+def _load_symbol_csv(
+    data_path: Path,
+    symbol: str,
+    min_volume: float,
+    min_bars: int,
+    strict: bool,
+    as_frame: bool,
+) -> tuple[str, list[Bar] | BarFrame | None, list[str]]:
+    """Load one symbol for ``load_csv_directory`` (in-process or in a worker process).
+
+    Diagnostics are returned rather than printed so the caller can emit them in
+    symbol order.
+    """
+    messages: list[str] = []
+    file_path = _symbol_csv_path(data_path, symbol)
+
+    if not file_path.exists():
+        messages.append(f'Warning: Data file not found for {symbol}: {file_path}')
+        return symbol, None, messages
 
+    try:
+        pd = _import_pandas()
+        df = _read_csv_frame(pd, file_path)
+
+        # Ensure UTC timezone
+        if df.index.tz is None:  # type: ignore[attr-defined]
+            df.index = pd.to_datetime(df.index, utc=True)  # type: ignore[attr-defined]
+
+        # Validate columns
+        if not all(col in df.columns for col in _REQUIRED_COLUMNS):
+            messages.append(f'Warning: Missing columns in {file_path}')
+            return symbol, None, messages
+
+        df = _clean_csv_frame(df)
+
+        # Apply data quality filters
+        if min_volume > 0:
+            df = df[df['volume'] >= min_volume]
+
+        if len(df) < min_bars:  # type: ignore[arg-type]
+            messages.append(f'Warning: Insufficient bars for {symbol}: {len(df)} < {min_bars}')  # type: ignore[arg-type]
+            return symbol, None, messages
+
+        columns, diagnostic = _validate_csv_columns(pd, df, symbol, strict=strict)
+        if diagnostic:
+            messages.append(diagnostic)
+        if len(columns.volume) == 0:
+            return symbol, None, messages
+        loaded: list[Bar] | BarFrame = (
+            _columns_to_frame(columns, symbol) if as_frame else _columns_to_bars(columns, symbol)
+        )
+        messages.append(f'Loaded {len(loaded)} bars for {symbol}')
+        return symbol, loaded, messages
+
+    except Exception as e:
+        messages.append(f'Error loading data for {symbol}: {e}')
+        return symbol, None, messages
+
+
+def _csv_bytes(data_path: Path, symbols: Sequence[str]) -> int:
+    total = 0
+    for symbol in symbols:
+        with suppress(OSError):
+            total += _symbol_csv_path(data_path, symbol).stat().st_size
+    return total
+
+
+@overload
 def load_csv_directory(
-    data_source: DataSource, data_quality_config: DataQualityConfig | None = None
-) -> dict[str, list[Bar]]:
+    data_source: DataSource,
+    data_quality_config: DataQualityConfig | None = None,
+    *,
+    strict: bool = False,
+    as_frame: Literal[False] = False,
+    max_workers: int | None = None,
+) -> dict[str, list[Bar]]: ...
+
+
+@overload
+def load_csv_directory(
+    data_source: DataSource,
+    data_quality_config: DataQualityConfig | None = None,
+    *,
+    strict: bool = False,
+    as_frame: Literal[True],
+    max_workers: int | None = None,
+) -> dict[str, BarFrame]: ...
+
+
+def load_csv_directory(
+    data_source: DataSource,
+    data_quality_config: DataQualityConfig | None = None,
+    *,
+    strict: bool = False,
+    as_frame: bool = False,
+    max_workers: int | None = None,
+) -> dict[str, list[Bar]] | dict[str, BarFrame]:
     """
     Load CSV files from directory.
 
+    Files are loaded in-process unless ``max_workers`` asks for a process pool
+    or the requested files add up to ``PARALLEL_CSV_MIN_BYTES`` (where parsing
+    outweighs the cost of starting workers and pickling results back); results
+    keep the requested symbol order either way.
+
     Args:
         data_source: DataSource config with path and symbols
         data_quality_config: DataQualityConfig for validation (optional, uses defaults if None)
+        strict: Apply load_csv_file's strict validation (a failing symbol is skipped)
+        as_frame: Return a columnar BarFrame per symbol instead of Bar lists
+        max_workers: Worker processes, capped at the symbol count (1 loads in-process).
+            Default: in-process, or one per CPU for directories of at least
+            ``PARALLEL_CSV_MIN_BYTES``
 
     Returns:
-        Dictionary mapping symbol to list of Bars
+        Dictionary mapping symbol to list of Bars (or BarFrames)
     """
-    try:
-        import pandas as pd
-    except ModuleNotFoundError as exc:  # pragma: no cover
-        raise RuntimeError('pandas is required to load CSV market data') from exc
-
-    pd = cast(_PandasModule, pd)
+    _import_pandas()
     # Use default quality config if not provided
     if data_quality_config is None:
         from .config import DataQualityConfig
@@ -222,7 +714,6 @@ def load_csv_directory(
         min_bars = getattr(data_source, 'warmup_bars', 30)
         data_quality_config = DataQualityConfig(min_bars=min_bars)
 
-    data_map: dict[str, list[Bar]] = {}
     data_path = Path(data_source.path)
 
     if not data_path.exists():
@@ -236,83 +727,108 @@ def load_csv_directory(
         csv_files = list(data_path.glob('*.csv'))
         symbols_to_load = [f.stem.replace('_', '/') for f in csv_files]
 
-    for symbol in symbols_to_load:
-        # Convert symbol to filename (replace / with _)
-        safe_symbol = symbol.replace('/', '_').replace('\\', '_')
-        file_path = data_path / f'{safe_symbol}.csv'
+    args = [
+        (data_path, symbol, data_quality_config.min_volume, data_quality_config.min_bars, strict, as_frame)
+        for symbol in symbols_to_load
+    ]
+    if max_workers is None:
+        max_workers = 1
+        if len(args) > 1 and _csv_bytes(data_path, symbols_to_load) >= PARALLEL_CSV_MIN_BYTES:
+            max_workers = os.cpu_count() or 1
+    workers = min(len(args), max_workers)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_load_symbol_csv, *zip(*args)))
+    else:
+        results = [_load_symbol_csv(*arg) for arg in args]
 
-        if not file_path.exists():
-            print(f'Warning: Data file not found for {symbol}: {file_path}')
-            continue
+    data_map: dict[str, list[Bar] | BarFrame] = {}
+    for symbol, loaded, messages in results:
+        for message in messages:
+            print(message)
+        if loaded is not None:
+            data_map[symbol] = loaded
 
-        try:
-            df = pd.read_csv(file_path, index_col=0, parse_dates=True)
-
-            # Ensure UTC timezone
-            if df.index.tz is None:  # type: ignore[attr-defined]
-                df.index = pd.to_datetime(df.index, utc=True)  # type: ignore[attr-defined]
-
-            # Validate columns
-            required_cols = ['open', 'high', 'low', 'close', 'volume']
-            if not all(col in df.columns for col in required_cols):
-                print(f'Warning: Missing columns in {file_path}')
-                continue
-
-            # Clean and validate
-            df = df.sort_index()
-            df = df[~df.index.duplicated(keep='last')]
-            df = df.dropna(subset=required_cols)  # type: ignore[call-overload]
-
-            # Apply data quality filters
-            if data_quality_config.min_volume > 0:
-                df = df[df['volume'] >= data_quality_config.min_volume]
-
-            if len(df) < data_quality_config.min_bars:
-                print(f'Warning: Insufficient bars for {symbol}: {len(df)} < {data_quality_config.min_bars}')
-                continue
-
-            # Convert to Bar objects
-            bars: list[Bar] = []
-            for timestamp, row in df.iterrows():
-                try:
-                    open_value = _to_decimal(row['open'])
-                    high_value = _to_decimal(row['high'])
-                    low_value = _to_decimal(row['low'])
-                    close_value = _to_decimal(row['close'])
-                    volume_value = _to_int(row['volume'])
-                    if open_value is None:
-                        raise ValueError('Missing or invalid bar values')
-                    if high_value is None:
-                        raise ValueError('Missing or invalid bar values')
-                    if low_value is None:
-                        raise ValueError('Missing or invalid bar values')
-                    if close_value is None:
-                        raise ValueError('Missing or invalid bar values')
-                    if volume_value is None:
-                        raise ValueError('Missing or invalid bar values')
-                    bar = Bar(
-                        symbol=symbol,
-                        timestamp=timestamp,  # type: ignore[arg-type]
-                        open=open_value,
-                        high=high_value,
-                        low=low_value,
-                        close=close_value,
-                        volume=volume_value,
-                    )
-                    bars.append(bar)
-                except (ValueError, KeyError) as e:
-                    print(f'Warning: Invalid bar data for {symbol} at {timestamp}: {e}')
-                    continue
-
-            if bars:
-                data_map[symbol] = bars
-                print(f'Loaded {len(bars)} bars for {symbol}')
-
-        except Exception as e:
-            print(f'Error loading data for {symbol}: {e}')
+    return cast('dict[str, list[Bar]] | dict[str, BarFrame]', data_map)
+
+
+def merge_bar_streams(
+    streams: Mapping[str, Iterable[Bar]],
+    fill_missing: bool = False,
+    last_bars: dict[str, Bar] | None = None,
+) -> Generator[tuple[datetime, str, Bar], None, None]:
+    """
+    Merge per-symbol bar streams into one chronological stream.
+
+    A heap holds the next bar of each symbol, so memory is one bar per
+    symbol however many timestamps there are, and each stream is pulled only
+    as far as the merge has progressed: streams may be lists, memory-mapped
+    ``BarFrame`` objects, or generators reading from disk. Each stream must
+    be sorted by timestamp. Bars sharing a timestamp are yielded in the
+    mapping's symbol order.
+
+    Args:
+        streams: Symbol -> bars sorted by timestamp.
+        fill_missing: At each timestamp, also yield a flat zero-volume bar at
+            the last close for every symbol that has had a bar but has none
+            at that timestamp.
+        last_bars: Last real bar per symbol, updated in place (the forward-fill
+            state, carried over between calls).
+
+    Yields:
+        Tuple of (timestamp, symbol, bar)
+    """
+    symbols = list(streams)
+    last = {} if last_bars is None else last_bars
+
+    # (timestamp, symbol order, bar, rest of stream); one entry per symbol, so ties never compare bars
+    heap: list[tuple[datetime, int, Bar, Iterator[Bar]]] = []
+    for order, symbol in enumerate(symbols):
+        stream = iter(streams[symbol])
+        first = next(stream, None)
+        if first is not None:
+            heap.append((first.timestamp, order, first, stream))
+    heapq.heapify(heap)
+
+    # Orders of symbols that have had a bar: the forward-fill candidates
+    started = sorted(order for order, symbol in enumerate(symbols) if symbol in last) if fill_missing else []
+    seen = set(started)
+
+    while heap:
+        timestamp = heap[0][0]
+        group: list[tuple[int, Bar]] = []
+        while heap and heap[0][0] == timestamp:
+            _, order, bar, stream = heap[0]
+            group.append((order, bar))
+            following = next(stream, None)
+            if following is None:
+                heapq.heappop(heap)
+            else:
+                heapq.heapreplace(heap, (following.timestamp, order, following, stream))
+
+        if not fill_missing:
+            for order, bar in group:
+                symbol = symbols[order]
+                last[symbol] = bar
+                yield (timestamp, symbol, bar)
             continue
 
-    return data_map
+        for order, _ in group:
+            if order not in seen:
+                seen.add(order)
+                bisect.insort(started, order)
+        position = 0
+        for order in started:
+            symbol = symbols[order]
+            if position < len(group) and group[position][0] == order:
+                while position < len(group) and group[position][0] == order:
+                    bar = group[position][1]
+                    last[symbol] = bar
+                    position += 1
+                    yield (timestamp, symbol, bar)
+            else:
+                close = last[symbol].close
+                yield (timestamp, symbol, Bar(symbol, timestamp, close, close, close, close, 0))
 
 
 class DataFeed:
@@ -322,7 +838,7 @@ class DataFeed:
 
     def __init__(
         self,
-        data_map: dict[str, list[Bar]],
+        data_map: Mapping[str, Sequence[Bar]],
         bar_interval: timedelta | None = None,
         warmup_bars: int = 0,
         fill_missing: bool = False,
@@ -357,45 +873,12 @@ class DataFeed:
         """
         Iterate through bars chronologically across all symbols with optional forward fill.
 
+        See ``merge_bar_streams``; the feed's last-bar state carries over between calls.
+
         Yields:
             Tuple of (timestamp, symbol, bar)
         """
-        # Collect all timestamps
-        all_timestamps: set[datetime] = set()
-        for bars in self.data_map.values():
-            for bar in bars:
-                all_timestamps.add(bar.timestamp)
-
-        sorted_timestamps = sorted(all_timestamps)
-
-        # Create indices for each symbol
-        indices: dict[str, int] = {symbol: 0 for symbol in self.data_map}  # noqa: C420
-
-        # Iterate through timestamps
-        for timestamp in sorted_timestamps:
-            for symbol, bars in self.data_map.items():
-                idx = indices[symbol]
-
-                # Check if this symbol has a bar at this timestamp
-                if idx < len(bars) and bars[idx].timestamp == timestamp:
-                    # Real bar
-                    bar = bars[idx]
-                    indices[symbol] += 1
-                    self._last_bars[symbol] = bar
-                    yield (timestamp, symbol, bar)
-                elif self.fill_missing and symbol in self._last_bars:
-                    # Forward fill with last known bar
-                    last_bar = self._last_bars[symbol]
-                    filled_bar = Bar(
-                        symbol=symbol,
-                        timestamp=timestamp,
-                        open=last_bar.close,
-                        high=last_bar.close,
-                        low=last_bar.close,
-                        close=last_bar.close,
-                        volume=0,
-                    )
-                    yield (timestamp, symbol, filled_bar)
+        yield from merge_bar_streams(self.data_map, self.fill_missing, self._last_bars)
 
     def reset(self) -> None:
         """Reset feed to beginning."""
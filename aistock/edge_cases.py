@@ -13,6 +13,7 @@ Handles:
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Any
@@ -41,13 +42,16 @@ class EdgeCaseHandler:
     than to lose money in an unforeseen scenario.
     """
 
+    # Most bars any check reads back from the latest one
+    LOOKBACK_BARS = 10
+
     def __init__(self):
         self.logger = configure_logger('EdgeCaseHandler', structured=True)
 
     def check_edge_cases(
         self,
         symbol: str,
-        bars: list[Bar],
+        bars: Sequence[Bar],
         timeframe_data: dict[str, list[Bar]] | None = None,
         current_time: datetime | None = None,
     ) -> EdgeCaseResult:
@@ -176,7 +180,7 @@ class EdgeCaseHandler:
             'count': len(missing),
         }
 
-    def _check_extreme_volatility(self, bars: list[Bar]) -> dict[str, Any]:
+    def _check_extreme_volatility(self, bars: Sequence[Bar]) -> dict[str, Any]:
         """Check for extreme volatility (flash crash, circuit breaker)."""
         if len(bars) < 2:
             return {'is_extreme': False, 'volatility_pct': 0.0}
@@ -196,7 +200,7 @@ class EdgeCaseHandler:
 
         return {'is_extreme': is_extreme, 'volatility_pct': volatility_pct}
 
-    def _check_stale_data(self, bars: list[Bar], current_time: datetime) -> dict[str, Any]:
+    def _check_stale_data(self, bars: Sequence[Bar], current_time: datetime) -> dict[str, Any]:
         """Check if data is stale (no recent updates)."""
         if not bars:
             return {'is_stale': True, 'age_minutes': float('inf')}
@@ -229,7 +233,7 @@ class EdgeCaseHandler:
 
         return {'is_stale': is_stale, 'age_minutes': age_minutes}
 
-    def _check_price_validity(self, bars: list[Bar]) -> dict[str, Any]:
+    def _check_price_validity(self, bars: Sequence[Bar]) -> dict[str, Any]:
         """Check for invalid prices (corruption, bad data)."""
         has_invalid = False
 
@@ -246,7 +250,7 @@ class EdgeCaseHandler:
 
         return {'has_invalid': has_invalid}
 
-    def _check_low_volume(self, bars: list[Bar]) -> dict[str, Any]:
+    def _check_low_volume(self, bars: Sequence[Bar]) -> dict[str, Any]:
         """Check for suspiciously low volume."""
         if len(bars) < 10:
             return {'is_suspicious': False, 'avg_volume': 0}
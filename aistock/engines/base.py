@@ -8,6 +8,7 @@ import logging
 import threading
 from abc import ABC, abstractmethod
 from collections import deque
+from collections.abc import Sequence
 from datetime import datetime
 from decimal import Decimal
 from typing import Any, Callable, TypedDict
@@ -89,7 +90,7 @@ class BaseDecisionEngine(ABC):
     def evaluate_opportunity(
         self,
         symbol: str,
-        bars: list[Bar],
+        bars: Sequence[Bar],
         last_prices: dict[str, Decimal],
     ) -> dict[str, Any]:
         """Evaluate a trading opportunity.
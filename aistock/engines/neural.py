@@ -5,6 +5,7 @@ architecture for Q-value estimation.
 """
 
 import logging
+from collections.abc import Sequence
 from decimal import Decimal
 from typing import Any, Callable
 
@@ -79,7 +80,7 @@ class NeuralEngine(BaseDecisionEngine):
     def evaluate_opportunity(
         self,
         symbol: str,
-        bars: list[Bar],
+        bars: Sequence[Bar],
         last_prices: dict[str, Decimal],
     ) -> dict[str, Any]:
         """Evaluate a trading opportunity.
@@ -153,7 +154,7 @@ class NeuralEngine(BaseDecisionEngine):
     def _extract_state(
         self,
         symbol: str,
-        bars: list[Bar],
+        bars: Sequence[Bar],
         last_prices: dict[str, Decimal],
     ) -> dict[str, float]:
         """Extract continuous state features.
@@ -6,6 +6,7 @@ and Prioritized Experience Replay.
 """
 
 import logging
+from collections.abc import Sequence
 from decimal import Decimal
 from typing import Any, Callable
 
@@ -98,7 +99,7 @@ class TabularEngine(BaseDecisionEngine):
     def evaluate_opportunity(
         self,
         symbol: str,
-        bars: list[Bar],
+        bars: Sequence[Bar],
         last_prices: dict[str, Decimal],
     ) -> dict[str, Any]:
         """Evaluate a trading opportunity.
@@ -171,7 +172,7 @@ class TabularEngine(BaseDecisionEngine):
     def _extract_state(
         self,
         symbol: str,
-        bars: list[Bar],
+        bars: Sequence[Bar],
         last_prices: dict[str, Decimal],
     ) -> dict[str, Any]:
         """Extract state features from market data.
@@ -10,23 +10,37 @@ PROFESSIONAL ENHANCEMENTS:
 - Professional trading safeguards
 """
 
-import hashlib
 import json
 import logging
 import math
 import random
 import threading
+import time
 from collections import OrderedDict, deque
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal
+from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, TypedDict, cast
 
 import numpy as np
 
 from .audit import JSONValue
 from .data import Bar
+from .indicators import MAX_CLOSE_LOOKBACK, MOMENTUM_FAST, MOMENTUM_SLOW, SymbolIndicatorState
 from .portfolio import Portfolio
+from .q_table import (
+    DELTA_COMPACTION_RATIO,
+    QTable,
+    QTableSnapshot,
+    StateEncoder,
+    discretize,
+    encode_delta,
+    read_deltas,
+    read_snapshot,
+    write_snapshot,
+)
 
 if TYPE_CHECKING:
     from .edge_cases import EdgeCaseHandler
@@ -37,6 +51,42 @@ if TYPE_CHECKING:
 
 VIX_SYMBOL_CANDIDATES = ('VIX', '^VIX', 'VIXY', 'VXX')
 
+# Bars required before a state can be extracted
+MIN_STATE_BARS = 20
+# Closes kept per symbol for correlation checks
+PRICE_HISTORY_BARS = 100
+
+# Trend labels: (state key, short MA window, long MA window, up multiplier, down multiplier)
+TREND_RULES: tuple[tuple[str, int, int, float, float], ...] = (
+    ('trend', 5, 10, 1.01, 0.99),
+    ('trend_fast', 3, 6, 1.01, 0.99),
+    ('trend_slow', 15, 30, 1.005, 0.995),
+)
+# Volatility labels: (state key, return window, low threshold, high threshold)
+VOLATILITY_RULES: tuple[tuple[str, int, float, float], ...] = (
+    ('volatility', 19, 0.01, 0.03),
+    ('volatility_fast', 5, 0.012, 0.04),
+    ('volatility_slow', 29, 0.008, 0.025),
+)
+# Numeric state features, in FeatureBatch column order.
+FEATURE_COLUMNS = (
+    'price_change_pct',
+    'volume_ratio',
+    'momentum_fast',
+    'momentum_slow',
+    'rsi',
+    'macd_hist_pct',
+    'bb_pos',
+    'bb_width',
+    'market_breadth',
+    'vix_level',
+    'spread_bps',
+    'depth_proxy',
+    'position_pct',
+    'current_price',
+)
+
+
 @dataclass
 class FSDConfig:
     """Configuration for FSD RL agent."""
@@ -357,12 +407,19 @@ class RLAgent:
     Reward: Realized P&L - risk penalty - transaction costs
     """
 
+    ACTIONS: tuple[str, ...] = ('BUY', 'SELL', 'HOLD', 'INCREASE_SIZE', 'DECREASE_SIZE')
+
     def __init__(self, config: FSDConfig):
         self.config = config
 
-        # Q-value table with LRU eviction to prevent unbounded growth
-        # OrderedDict provides deterministic iteration order and LRU support
-        self.q_values: OrderedDict[str, dict[str, float]] = OrderedDict()
+        # States are packed into mixed-radix integer keys; Q-values live in a
+        # preallocated array with LRU eviction to prevent unbounded growth
+        self.state_encoder = StateEncoder(config)
+        self.q_values = QTable(config.max_q_table_states, self.ACTIONS)
+        # States from MD5-keyed state files, adopted into q_values on first visit.
+        # They share one decay stamp (the table's log scale when they were loaded).
+        self._legacy_q_values: OrderedDict[str, dict[str, float]] = OrderedDict()
+        self._legacy_log_scale = 0.0
         self._lock = threading.Lock()  # P0-3 Fix: Protect Q-value updates from concurrent access
 
         # Statistics
@@ -382,13 +439,43 @@ class RLAgent:
         Ensure Q-table stays within configured capacity.
 
         Uses LRU eviction (oldest state removed first) once the configured
-        max_q_table_states threshold is reached. Maintains backward
-        compatibility by only activating when the threshold is positive.
+        max_q_table_states threshold is reached. Legacy states that have not
+        been visited since migration are older than anything in the array
+        table, so they are evicted first.
         """
-        max_states = getattr(self.config, 'max_q_table_states', 0)
-        if max_states and len(self.q_values) >= max_states:
-            # Remove oldest state (least recently updated/visited)
-            self.q_values.popitem(last=False)
+        max_states = self.config.max_q_table_states
+        if len(self.q_values) + len(self._legacy_q_values) >= max_states:
+            if self._legacy_q_values:
+                self._legacy_q_values.popitem(last=False)
+            else:
+                # Remove oldest state (least recently updated/visited)
+                self.q_values.evict_oldest()
+
+    def _state_row(self, state_key: int) -> int:
+        """Return the Q-table row for a state, creating or migrating it on first visit (caller holds lock)."""
+        row = self.q_values.touch(state_key)
+        if row is not None:
+            return row
+        legacy_values = self._legacy_values(state_key, pop=True)
+        # P1-1 Fix: Evict old states if necessary before adding new one
+        self._ensure_q_table_capacity()
+        return self.q_values.insert(state_key, legacy_values, log_scale=self._legacy_log_scale)
+
+    def _legacy_values(self, state_key: int, pop: bool = False) -> list[float] | None:
+        """Look up a state in the MD5-keyed legacy table (caller holds lock; values not yet decayed)."""
+        if not self._legacy_q_values:
+            return None
+        legacy_hash = self.state_encoder.legacy_hash(state_key)
+        if legacy_hash is None:
+            return None
+        legacy = self._legacy_q_values.pop(legacy_hash, None) if pop else self._legacy_q_values.get(legacy_hash)
+        if legacy is None:
+            return None
+        return [float(legacy.get(action, 0.0)) for action in self.ACTIONS]
+
+    def _legacy_decay_multiplier(self) -> float:
+        """Decay accumulated by legacy states since they were loaded (caller holds lock)."""
+        return math.exp(self.q_values.log_scale - self._legacy_log_scale)
 
     def check_q_table_size(self) -> QTableInfo:
         """
@@ -420,12 +507,13 @@ class RLAgent:
         logger = logging.getLogger(__name__)
 
         with self._lock:
-            num_states = len(self.q_values)
-            num_actions = len(self.get_actions())
+            num_states = len(self.q_values) + len(self._legacy_q_values)
+            num_actions = len(self.ACTIONS)
 
         # Estimate memory usage (rough approximation)
-        # Each Q-value is ~8 bytes (float), plus ~100 bytes overhead per state for dict/hash
-        bytes_per_state = (num_actions * 8) + 100
+        # Each Q-value is 8 bytes in the value matrix, plus an 8-byte key slot and
+        # ~100 bytes for the key -> row LRU index entry
+        bytes_per_state = (num_actions * 8) + 8 + 100
         estimated_memory_mb = (num_states * bytes_per_state) / (1024 * 1024)
 
         critical_threshold = getattr(self.config, 'max_q_table_states', 200_000)
@@ -495,6 +583,11 @@ class RLAgent:
         whether they've been visited recently. This encourages the agent to
         re-evaluate old states if market conditions change.
 
+        The decay is lazy: the table records the factor in a global log scale
+        in O(1) and each state catches up the next time it is read or written,
+        or when the table is folded for persistence. The resulting Q-values
+        equal those of an eager sweep (up to floating-point rounding).
+
         Returns:
             dict[str, Any]: Dictionary containing:
                 - enabled (bool): Whether decay is enabled in config
@@ -503,7 +596,7 @@ class RLAgent:
                 - reason (str): Reason for skip (if skipped=True)
                 - days_elapsed (float): Days since last decay (clamped if > 90 days)
                 - decay_factor (float): Actual decay multiplier applied
-                - states_decayed (int): Number of states processed
+                - states_decayed (int): Number of states the decay applies to
                 - timestamp (str): ISO timestamp of decay operation
                 - clamped (bool): True if days_elapsed was clamped to prevent extreme decay
                 - original_days_elapsed (float): Original unclamped value (if clamped=True)
@@ -513,7 +606,7 @@ class RLAgent:
 
         Side Effects:
             - Updates self.last_decay_timestamp to current time
-            - Modifies all Q-values in self.q_values (if enabled and not skipped)
+            - Advances the Q-table decay scale (if enabled and not skipped)
         """
         if not self.config.enable_q_value_decay:
             return {'enabled': False}
@@ -547,11 +640,8 @@ class RLAgent:
             decay_factor = min_decay_factor
 
         with self._lock:
-            states_decayed = 0
-            for state_hash in self.q_values:
-                for action in self.q_values[state_hash]:
-                    self.q_values[state_hash][action] *= decay_factor
-                states_decayed += 1
+            self.q_values.decay(decay_factor)
+            states_decayed = len(self.q_values) + len(self._legacy_q_values)
 
         self.last_decay_timestamp = current_time
 
@@ -569,95 +659,21 @@ class RLAgent:
 
         return result
 
-    def _hash_state(self, state: dict[str, object]) -> str:
-        """Create hashable state representation."""
-        # Discretize continuous values
-        pc_val: object = state.get('price_change_pct', 0.0)
-        price_change: float = float(pc_val) if isinstance(pc_val, (int, float)) else 0.0
-        vr_val: object = state.get('volume_ratio', 1.0)
-        vol_ratio: float = float(vr_val) if isinstance(vr_val, (int, float)) else 1.0
-        pp_val: object = state.get('position_pct', 0.0)
-        position_pct: float = float(pp_val) if isinstance(pp_val, (int, float)) else 0.0
-
-        t_val: object = state.get('trend', 'neutral')
-        trend_default: str = t_val if isinstance(t_val, str) else 'neutral'
-        v_val: object = state.get('volatility', 'normal')
-        vol_default: str = v_val if isinstance(v_val, str) else 'normal'
-        # Normalize optional string fields first to avoid Any warnings
-        tf_raw: object = state.get('trend_fast', trend_default)
-        trend_fast_norm: str = tf_raw if isinstance(tf_raw, str) else trend_default
-        ts_raw: object = state.get('trend_slow', trend_default)
-        trend_slow_norm: str = ts_raw if isinstance(ts_raw, str) else trend_default
-        vf_raw: object = state.get('volatility_fast', vol_default)
-        vol_fast_norm: str = vf_raw if isinstance(vf_raw, str) else vol_default
-        vs_raw: object = state.get('volatility_slow', vol_default)
-        vol_slow_norm: str = vs_raw if isinstance(vs_raw, str) else vol_default
-
-        rsi_raw: object = state.get('rsi', 50.0)
-        rsi_val: float = float(rsi_raw) if isinstance(rsi_raw, (int, float)) else 50.0
-        macd_raw: object = state.get('macd_hist_pct', 0.0)
-        macd_val: float = float(macd_raw) if isinstance(macd_raw, (int, float)) else 0.0
-        bb_raw: object = state.get('bb_pos', 0.5)
-        bb_val: float = float(bb_raw) if isinstance(bb_raw, (int, float)) else 0.5
-        mfast_raw: object = state.get('momentum_fast', 0.0)
-        mfast_val: float = float(mfast_raw) if isinstance(mfast_raw, (int, float)) else 0.0
-        mslow_raw: object = state.get('momentum_slow', 0.0)
-        mslow_val: float = float(mslow_raw) if isinstance(mslow_raw, (int, float)) else 0.0
-        breadth_raw: object = state.get('market_breadth', 0.0)
-        breadth_val: float = float(breadth_raw) if isinstance(breadth_raw, (int, float)) else 0.0
-        vix_raw: object = state.get('vix_level', 0.0)
-        vix_val: float = float(vix_raw) if isinstance(vix_raw, (int, float)) else 0.0
-        spread_raw: object = state.get('spread_bps', 0.0)
-        spread_val: float = float(spread_raw) if isinstance(spread_raw, (int, float)) else 0.0
-        depth_raw: object = state.get('depth_proxy', 0.0)
-        depth_val: float = float(depth_raw) if isinstance(depth_raw, (int, float)) else 0.0
-
-        discretized = {
-            'price_change_bin': self._discretize(price_change, -0.05, 0.05, self.config.price_change_bins),
-            'volume_bin': self._discretize(vol_ratio, 0.5, 2.0, self.config.volume_bins),
-            'position_bin': self._discretize(position_pct, -0.5, 0.5, self.config.position_bins),
-            'trend': trend_default,
-            'volatility': vol_default,
-            # Multi-timeframe features (fast≈1-3 bars, slow≈15-30 bars)
-            'trend_fast': trend_fast_norm,
-            'trend_slow': trend_slow_norm,
-            'volatility_fast': vol_fast_norm,
-            'volatility_slow': vol_slow_norm,
-            'rsi_bin': self._discretize(rsi_val, 0.0, 100.0, self.config.rsi_bins),
-            'macd_bin': self._discretize(macd_val, -0.05, 0.05, self.config.macd_bins),
-            'bb_pos_bin': self._discretize(bb_val, 0.0, 1.0, self.config.bollinger_bins),
-            'momentum_fast_bin': self._discretize(mfast_val, -1.0, 1.0, self.config.momentum_bins),
-            'momentum_slow_bin': self._discretize(mslow_val, -1.0, 1.0, self.config.momentum_bins),
-            'breadth_bin': self._discretize(breadth_val, -1.0, 1.0, self.config.breadth_bins),
-            'vix_bin': self._discretize(vix_val, 10.0, 50.0, self.config.vix_bins),
-            'spread_bin': self._discretize(spread_val, 0.0, 200.0, self.config.spread_bins),
-            'depth_bin': self._discretize(depth_val, 0.0, 5.0, self.config.depth_bins),
-        }
-
-        # Create hash
-        state_str = json.dumps(discretized, sort_keys=True)
-        return hashlib.md5(state_str.encode()).hexdigest()
+    def _encode_state(self, state: dict[str, object]) -> int:
+        """Discretize a state and pack it into its integer Q-table key."""
+        return self.state_encoder.encode(state)
 
     # Public wrapper to satisfy external callers in strict type mode
-    def hash_state(self, state: dict[str, object]) -> str:
-        return self._hash_state(state)
+    def hash_state(self, state: dict[str, object]) -> int:
+        return self._encode_state(state)
 
     def _discretize(self, value: float, min_val: float, max_val: float, bins: int) -> int:
         """Discretize continuous value into bins."""
-        if value <= min_val:
-            return 0
-        if value >= max_val:
-            return bins - 1
-
-        range_size = max_val - min_val
-        bin_size = range_size / bins
-        bin_idx = int((value - min_val) / bin_size)
-
-        return min(bin_idx, bins - 1)
+        return discretize(value, min_val, max_val, bins)
 
     def get_actions(self) -> list[str]:
         """Get list of possible actions."""
-        return ['BUY', 'SELL', 'HOLD', 'INCREASE_SIZE', 'DECREASE_SIZE']
+        return list(self.ACTIONS)
 
     def select_action(self, state: dict[str, object], training: bool = True) -> str:
         """
@@ -670,26 +686,20 @@ class RLAgent:
         Returns:
             Selected action
         """
-        state_hash = self._hash_state(state)
+        state_key = self._encode_state(state)
 
         # P0-3 Fix: Thread-safe Q-value access
         with self._lock:
-            # Initialize Q-values for this state if new
-            if state_hash not in self.q_values:
-                # P1-1 Fix: Evict old states if necessary before adding new one
-                self._ensure_q_table_capacity()
-                self.q_values[state_hash] = dict.fromkeys(self.get_actions(), 0.0)
-            # Mark as recently accessed for LRU ordering
-            self.q_values.move_to_end(state_hash)
+            # Initialize Q-values for this state if new; marks it recently used for LRU ordering
+            row = self._state_row(state_key)
 
             # Epsilon-greedy
             if training and np.random.random() < self.exploration_rate:
                 # Explore: random action
-                return random.choice(self.get_actions())
+                return random.choice(self.ACTIONS)
             else:
-                # Exploit: best Q-value
-                q_vals = self.q_values[state_hash]
-                return max(q_vals.items(), key=lambda item: item[1])[0]
+                # Exploit: best Q-value (first action wins ties)
+                return self.ACTIONS[int(np.argmax(self.q_values.row_values(row)))]
 
     def update_q_value(
         self, state: dict[str, object], action: str, reward: float, next_state: dict[str, object], done: bool
@@ -699,35 +709,29 @@ class RLAgent:
 
         Q(s,a) ← Q(s,a) + α[r + γ·max Q(s',a') - Q(s,a)]
         """
-        state_hash = self._hash_state(state)
-        next_state_hash = self._hash_state(next_state)
+        state_key = self._encode_state(state)
+        next_state_key = self._encode_state(next_state)
+        action_idx = self.q_values.action_index[action]
 
         # P0-3 Fix: Thread-safe Q-value update
         with self._lock:
             # Initialize if needed
-            if state_hash not in self.q_values:
-                # P1-1 Fix: Evict old states if necessary before adding new one
-                self._ensure_q_table_capacity()
-                self.q_values[state_hash] = dict.fromkeys(self.get_actions(), 0.0)
-            self.q_values.move_to_end(state_hash)
-            if next_state_hash not in self.q_values:
-                # P1-1 Fix: Evict old states if necessary before adding new one
-                self._ensure_q_table_capacity()
-                self.q_values[next_state_hash] = dict.fromkeys(self.get_actions(), 0.0)
-            self.q_values.move_to_end(next_state_hash)
+            row = self._state_row(state_key)
+            next_row = self._state_row(next_state_key)
+            q_vals = self.q_values.row_values(row)
 
             # Current Q-value
-            current_q = self.q_values[state_hash][action]
+            current_q = float(q_vals[action_idx])
 
             # Max future Q-value
-            max_future_q = 0.0 if done else max(self.q_values[next_state_hash].values())
+            max_future_q = 0.0 if done else float(self.q_values.row_values(next_row).max())
 
             # Q-learning update
             new_q = current_q + self.config.learning_rate * (
                 reward + self.config.discount_factor * max_future_q - current_q
             )
 
-            self.q_values[state_hash][action] = new_q
+            q_vals[action_idx] = new_q
 
             # Decay exploration
             if done:
@@ -743,15 +747,21 @@ class RLAgent:
 
         CRITICAL FIX: Guards against sigmoid overflow with extreme Q-values.
         """
-        state_hash = self._hash_state(state)
+        state_key = self._encode_state(state)
+        action_idx = self.q_values.action_index.get(action)
 
         # P0-3 Fix: Thread-safe Q-value read
         with self._lock:
-            if state_hash not in self.q_values:
-                return 0.5  # Neutral confidence for unseen states
-
-            q_vals = self.q_values[state_hash]
-            action_q = q_vals.get(action, 0.0)
+            row = self.q_values.row_for(state_key)
+            if row is not None:
+                q_vals = self.q_values.row_values(row).tolist()
+            else:
+                legacy_values = self._legacy_values(state_key)
+                if legacy_values is None:
+                    return 0.5  # Neutral confidence for unseen states
+                multiplier = self._legacy_decay_multiplier()
+                q_vals = [q * multiplier for q in legacy_values]
+            action_q = q_vals[action_idx] if action_idx is not None else 0.0
 
         # CRITICAL FIX: Guard against sigmoid overflow
         # math.exp() overflows for values > 700, underflows for values < -700
@@ -765,6 +775,131 @@ class RLAgent:
 
         return confidence
 
+    def export_q_table(self, include_q_values: bool = True) -> dict[str, Any]:
+        """
+        Snapshot the Q-table (with pending decay folded in) as JSON-serialisable data.
+
+        With ``include_q_values=False`` only the encoding and unmigrated legacy
+        states are exported; the array table itself goes to the binary
+        checkpoint (see ``snapshot_q_table``).
+        """
+        with self._lock:
+            exported: dict[str, Any] = {'q_state_encoding': self.state_encoder.describe()}
+            if include_q_values:
+                exported['q_values'] = self.q_values.to_dict()
+            if self._legacy_q_values:
+                multiplier = self._legacy_decay_multiplier()
+                exported['legacy_q_values'] = {
+                    key: {action: q * multiplier for action, q in values.items()}
+                    for key, values in self._legacy_q_values.items()
+                }
+        return exported
+
+    def restore_q_table(self, q_values: object, encoding: object = None, legacy_q_values: object = None) -> None:
+        """
+        Replace the Q-table with persisted states.
+
+        Files written before the integer state encoder carry MD5 keys and no
+        ``q_state_encoding``; those states are held aside and adopted into the
+        array table the first time the agent visits them. Keys persisted under
+        a different bin layout cannot be mapped and are discarded.
+        """
+        logger = logging.getLogger(__name__)
+        entries: dict[str, object] = cast(dict[str, object], q_values) if isinstance(q_values, dict) else {}
+        legacy_entries: dict[str, object] = (
+            dict(cast(dict[str, object], legacy_q_values)) if isinstance(legacy_q_values, dict) else {}
+        )
+
+        if encoding is None:
+            legacy_entries.update(entries)
+            entries = {}
+        elif not self.state_encoder.matches(encoding):
+            if entries:
+                logger.warning(f'Discarding {len(entries):,} persisted Q-states: state encoding changed')
+            entries = {}
+
+        with self._lock:
+            self.q_values.clear()
+            self._legacy_q_values.clear()
+            self._legacy_log_scale = self.q_values.log_scale
+
+            for legacy_hash, raw_values in legacy_entries.items():
+                if isinstance(raw_values, dict):
+                    values = cast(dict[str, object], raw_values)
+                    self._legacy_q_values[legacy_hash] = {
+                        action: float(q) for action, q in values.items() if isinstance(q, (int, float))
+                    }
+            while len(self._legacy_q_values) > self.config.max_q_table_states:
+                self._legacy_q_values.popitem(last=False)
+
+            for raw_key, raw_values in entries.items():
+                try:
+                    state_key = int(raw_key)
+                except ValueError:
+                    continue
+                if not isinstance(raw_values, dict) or state_key in self.q_values:
+                    continue
+                values = cast(dict[str, object], raw_values)
+                row_values: list[float] = []
+                for action in self.ACTIONS:
+                    q = values.get(action, 0.0)
+                    row_values.append(float(q) if isinstance(q, (int, float)) else 0.0)
+                # Oldest states are inserted first, so capacity trimming keeps the most recent ones
+                self._ensure_q_table_capacity()
+                self.q_values.insert(state_key, row_values)
+
+    def snapshot_q_table(self, dirty_only: bool = False) -> QTableSnapshot:
+        """Copy the array table (or only rows touched since the last snapshot) for a binary checkpoint."""
+        with self._lock:
+            return self.q_values.snapshot(dirty_only=dirty_only)
+
+    def restore_q_snapshot(self, base: QTableSnapshot, deltas: list[QTableSnapshot]) -> None:
+        """
+        Replace the array table with a binary checkpoint: a full snapshot plus delta records.
+
+        Delta records are replayed in order, restoring both values and LRU
+        recency. Legacy states loaded by ``restore_q_table`` are kept.
+        """
+        with self._lock:
+            self.q_values.clear()
+            self.q_values.load_rows(base)
+            for delta in deltas:
+                for key, values, stamp in zip(delta.keys.tolist(), delta.values, delta.stamps.tolist()):
+                    self.q_values.apply_row(key, values, stamp)
+                self.q_values.log_scale = delta.log_scale
+            self.q_values.mark_clean()
+            # Legacy values were folded at the same save, i.e. at the same decay scale
+            self._legacy_log_scale = self.q_values.log_scale
+            while self._legacy_q_values and (
+                len(self.q_values) + len(self._legacy_q_values) > self.config.max_q_table_states
+            ):
+                self._legacy_q_values.popitem(last=False)
+
+
+@dataclass
+class FeatureBatch:
+    """State features for every symbol completing a bar at the same timestamp.
+
+    ``matrix`` is N x len(FEATURE_COLUMNS); ``labels`` holds the categorical
+    trend/volatility features as one array of N strings per state key.
+    """
+
+    symbols: list[str]
+    matrix: np.ndarray
+    labels: dict[str, np.ndarray]
+
+    def column(self, name: str) -> np.ndarray:
+        return self.matrix[:, FEATURE_COLUMNS.index(name)]
+
+    def state(self, row: int) -> dict[str, Any]:
+        values = self.matrix[row]
+        state: dict[str, Any] = {'symbol': self.symbols[row]}
+        for idx, name in enumerate(FEATURE_COLUMNS):
+            state[name] = float(values[idx])
+        for key, column in self.labels.items():
+            state[key] = str(column[row])
+        return state
+
 
 class SymbolStats(TypedDict):
     trades: int
@@ -995,73 +1130,13 @@ class FSDEngine:
         # Price history cache for correlation calculation
         self._price_history_cache: dict[str, list[float]] = {}
 
-    @staticmethod
-    def _compute_rsi(closes: list[float], period: int = 14) -> float | None:
-        if len(closes) < period + 1:
-            return None
-        window = np.array(closes[-(period + 1) :], dtype=float)
-        deltas = np.diff(window)
-        gains = np.where(deltas > 0, deltas, 0.0)
-        losses = np.where(deltas < 0, -deltas, 0.0)
-        avg_gain = gains.mean()
-        avg_loss = losses.mean()
-        if avg_loss == 0:
-            return 100.0
-        rs = avg_gain / avg_loss
-        return 100.0 - (100.0 / (1.0 + rs))
-
-    @staticmethod
-    def _compute_ema_series(values: list[float], period: int) -> list[float]:
-        if not values:
-            return []
-        k = 2.0 / (period + 1.0)
-        ema = values[0]
-        series = [ema]
-        for val in values[1:]:
-            ema = (val - ema) * k + ema
-            series.append(ema)
-        return series
-
-    def _compute_macd(self, closes: list[float]) -> tuple[float, float, float] | None:
-        if len(closes) < 35:
-            return None
-        ema12 = self._compute_ema_series(closes, 12)
-        ema26 = self._compute_ema_series(closes, 26)
-        macd_series = [fast - slow for fast, slow in zip(ema12, ema26)]
-        signal_series = self._compute_ema_series(macd_series, 9)
-        macd_line = macd_series[-1]
-        signal_line = signal_series[-1] if signal_series else 0.0
-        return (macd_line, signal_line, macd_line - signal_line)
+        # Binary Q-table checkpoint bookkeeping (see _save_q_table_checkpoint)
+        self._q_table_generation: int | None = None
+        self._q_table_base_bytes = 0
+        self._q_table_delta_bytes = 0
 
-    @staticmethod
-    def _compute_bollinger_pos(
-        closes: list[float],
-        period: int = 20,
-        num_std: float = 2.0,
-    ) -> tuple[float, float] | None:
-        if len(closes) < period:
-            return None
-        window = np.array(closes[-period:], dtype=float)
-        sma = float(window.mean())
-        std = float(window.std())
-        upper = sma + (num_std * std)
-        lower = sma - (num_std * std)
-        if upper == lower:
-            return (0.5, 0.0)
-        pos = (window[-1] - lower) / (upper - lower)
-        width = (upper - lower) / sma if sma > 0 else 0.0
-        return (pos, width)
-
-    @staticmethod
-    def _compute_momentum(closes: list[float], window: int) -> float:
-        if len(closes) <= window:
-            return 0.0
-        past = closes[-(window + 1)]
-        if past == 0:
-            return 0.0
-        raw = (closes[-1] - past) / past
-        scaled = raw * 10.0
-        return max(-1.0, min(1.0, scaled))
+        # Rolling indicator state per symbol, advanced bar by bar (see _sync_indicators)
+        self._indicators: dict[str, SymbolIndicatorState] = {}
 
     def _compute_market_breadth(self, last_prices: dict[str, Decimal]) -> float:
         advancers = 0
@@ -1097,17 +1172,57 @@ class FSDEngine:
         spread = float(bar.high - bar.low)
         return (spread / float(bar.close)) * 10000.0
 
-    @staticmethod
-    def _compute_depth_proxy(recent_volumes: list[int]) -> float:
-        if not recent_volumes:
-            return 0.0
-        avg_volume = np.mean(recent_volumes[:-1]) if len(recent_volumes) > 1 else recent_volumes[-1]
-        if avg_volume <= 0:
-            return 0.0
-        ratio = recent_volumes[-1] / avg_volume
-        return max(0.0, min(5.0, float(ratio)))
+    def _sync_indicators(self, symbol: str, bars: Sequence[Bar]) -> SymbolIndicatorState:
+        """Bring the symbol's rolling indicators up to ``bars[-1]``.
+
+        Callers pass a growing history, so normally only the bars after the last
+        one seen are fed in. A history that does not extend the previous one
+        (first sight, rewind, gap or revised bar) triggers a full rebuild.
+        """
+        state = self._indicators.get(symbol)
+        if state is not None and state.last_bar is not None:
+            last_seen = state.last_bar
+            if bars[-1] is last_seen or bars[-1] == last_seen:
+                return state
+            if bars[-1].timestamp > last_seen.timestamp:
+                idx = len(bars) - 1
+                while idx >= 0 and bars[idx].timestamp > last_seen.timestamp:
+                    idx -= 1
+                if idx >= 0 and (bars[idx] is last_seen or bars[idx] == last_seen):
+                    for bar in bars[idx + 1 :]:
+                        state.update(bar)
+                    return state
+
+        state = SymbolIndicatorState.from_bars(bars)
+        self._indicators[symbol] = state
+        return state
+
+    @property
+    def max_lookback(self) -> int:
+        """Most bars any part of a decision reads back from the latest bar.
+
+        A history window of this many bars gives the same decisions as the full
+        history, provided every bar reaches the engine (``evaluate_opportunity``
+        or ``observe_bars``) so the incremental indicators are never rebuilt.
+        """
+        lookback = max(MIN_STATE_BARS, PRICE_HISTORY_BARS, MAX_CLOSE_LOOKBACK)
+        for component in (self.pattern_detector, self.safeguards, self.edge_case_handler):
+            if component is not None:
+                lookback = max(lookback, component.LOOKBACK_BARS)
+        return lookback
+
+    def observe_bars(self, symbol: str, bars: Sequence[Bar]) -> None:
+        """Advance the symbol's indicators to ``bars[-1]`` without making a decision.
+
+        For callers that skip ``evaluate_opportunity`` on some bars but pass
+        bounded history windows: keeping the indicators current means a later
+        window still overlaps the last bar seen. Symbols the engine has not
+        started tracking are left alone.
+        """
+        if bars and symbol in self._indicators:
+            self._sync_indicators(symbol, bars)
 
-    def extract_state(self, symbol: str, bars: list[Bar], last_prices: dict[str, Decimal]) -> dict[str, Any]:
+    def extract_state(self, symbol: str, bars: Sequence[Bar], last_prices: dict[str, Decimal]) -> dict[str, Any]:
         """
         ENHANCED: Extract state features from market data with professional analysis.
 
@@ -1119,85 +1234,57 @@ class FSDEngine:
         Returns:
             State dictionary with multi-timeframe and pattern features
         """
-        if len(bars) < 20:
+        if len(bars) < MIN_STATE_BARS:
             return {}
 
-        # Recent price changes
-        recent_closes: list[float] = [float(bar.close) for bar in bars[-20:]]
-        current_price = recent_closes[-1]
-        prev_price = recent_closes[-2] if len(recent_closes) > 1 else current_price
+        ind = self._sync_indicators(symbol, bars)
+        current_price = ind.close
+        price_change_pct = ind.price_change_pct()
+        volume_ratio = ind.volume_ratio()
 
-        price_change_pct = (current_price - prev_price) / prev_price if prev_price > 0 else 0
-
-        # Volume analysis
-        recent_volumes: list[int] = [bar.volume for bar in bars[-20:]]
-        avg_volume = np.mean(recent_volumes) if recent_volumes else 1
-        current_volume = bars[-1].volume
-        volume_ratio = current_volume / avg_volume if avg_volume > 0 else 1.0
-
-        rsi_value = self._compute_rsi(recent_closes) or 50.0
+        rsi_value = ind.rsi() or 50.0
         macd_hist_pct = 0.0
-        macd_values = self._compute_macd(recent_closes)
+        macd_values = ind.macd()
         if macd_values:
             _, _, macd_hist = macd_values
             macd_hist_pct = (macd_hist / current_price) if current_price > 0 else 0.0
 
         bb_pos = 0.5
         bb_width = 0.0
-        bb_values = self._compute_bollinger_pos(recent_closes)
+        bb_values = ind.bollinger()
         if bb_values:
             bb_pos, bb_width = bb_values
 
-        momentum_fast = self._compute_momentum(recent_closes, window=5)
-        momentum_slow = self._compute_momentum(recent_closes, window=20)
+        momentum_fast = ind.momentum(MOMENTUM_FAST)
+        momentum_slow = ind.momentum(MOMENTUM_SLOW)
 
         market_breadth = self._compute_market_breadth(last_prices)
         vix_level = self._extract_vix_level(last_prices) or 0.0
         spread_bps = self._estimate_spread_bps(bars[-1])
-        depth_proxy = self._compute_depth_proxy(recent_volumes)
+        depth_proxy = ind.depth_proxy()
 
         # Trend detection (multi-timeframe using different windows from same bars)
         # Fast trend ~ 1-3 minute view; Slow trend ~ 15-30 minute view
-        trend = 'neutral'
-        trend_fast = 'neutral'
-        trend_slow = 'neutral'
-        if len(recent_closes) >= 10:
-            short_ma = np.mean(recent_closes[-5:])
-            long_ma = np.mean(recent_closes[-10:])
-            trend = 'up' if short_ma > long_ma * 1.01 else 'down' if short_ma < long_ma * 0.99 else 'neutral'
-        if len(recent_closes) >= 6:
-            fast_short = np.mean(recent_closes[-3:])
-            fast_long = np.mean(recent_closes[-6:])
-            trend_fast = (
-                'up' if fast_short > fast_long * 1.01 else 'down' if fast_short < fast_long * 0.99 else 'neutral'
-            )
-        if len(recent_closes) >= 30:
-            slow_short = np.mean(recent_closes[-15:])
-            slow_long = np.mean(recent_closes[-30:])
-            trend_slow = (
-                'up' if slow_short > slow_long * 1.005 else 'down' if slow_short < slow_long * 0.995 else 'neutral'
-            )
+        labels: dict[str, str] = {}
+        for key, short, long, up, down in TREND_RULES:
+            label = 'neutral'
+            if ind.has_closes(long):
+                short_ma = ind.close_mean(short)
+                long_ma = ind.close_mean(long)
+                label = 'up' if short_ma > long_ma * up else 'down' if short_ma < long_ma * down else 'neutral'
+            labels[key] = label
 
         # Volatility (standard deviation of returns) at multiple horizons
-        volatility = 'normal'
-        volatility_fast = 'normal'
-        volatility_slow = 'normal'
-        if len(recent_closes) >= 10:
-            returns = np.diff(recent_closes) / recent_closes[:-1]
-            volatility_val = np.std(returns)
-            volatility = 'low' if volatility_val < 0.01 else 'high' if volatility_val > 0.03 else 'normal'
-        if len(recent_closes) >= 6:
-            returns_fast = np.diff(recent_closes[-6:]) / np.array(recent_closes[-6:-1])
-            vol_fast_val = np.std(returns_fast)
-            volatility_fast = 'low' if vol_fast_val < 0.012 else 'high' if vol_fast_val > 0.04 else 'normal'
-        if len(recent_closes) >= 30:
-            returns_slow = np.diff(recent_closes[-30:]) / np.array(recent_closes[-30:-1])
-            vol_slow_val = np.std(returns_slow)
-            volatility_slow = 'low' if vol_slow_val < 0.008 else 'high' if vol_slow_val > 0.025 else 'normal'
+        for key, window, low, high in VOLATILITY_RULES:
+            label = 'normal'
+            if ind.has_returns(window):
+                vol = ind.return_std(window)
+                label = 'low' if vol < low else 'high' if vol > high else 'normal'
+            labels[key] = label
 
         # Position state
         current_position = self.current_positions.get(symbol, Decimal('0'))
-        equity = float(self.portfolio.get_equity(last_prices))
+        equity = self.portfolio.get_equity_float(last_prices)
         position_value = float(current_position) * current_price
         position_pct = position_value / equity if equity > 0 else 0
 
@@ -1205,12 +1292,12 @@ class FSDEngine:
             'symbol': symbol,
             'price_change_pct': price_change_pct,
             'volume_ratio': volume_ratio,
-            'trend': trend,
-            'volatility': volatility,
-            'trend_fast': trend_fast,
-            'trend_slow': trend_slow,
-            'volatility_fast': volatility_fast,
-            'volatility_slow': volatility_slow,
+            'trend': labels['trend'],
+            'volatility': labels['volatility'],
+            'trend_fast': labels['trend_fast'],
+            'trend_slow': labels['trend_slow'],
+            'volatility_fast': labels['volatility_fast'],
+            'volatility_slow': labels['volatility_slow'],
             'momentum_fast': momentum_fast,
             'momentum_slow': momentum_slow,
             'rsi': rsi_value,
@@ -1225,6 +1312,10 @@ class FSDEngine:
             'current_price': current_price,
         }
 
+        self._add_professional_features(symbol, bars, state)
+        return state
+
+    def _add_professional_features(self, symbol: str, bars: Sequence[Bar], state: dict[str, Any]) -> None:
         # PROFESSIONAL ENHANCEMENT 1: Multi-timeframe features
         if self.timeframe_manager and self.timeframe_manager.has_sufficient_data(symbol):
             timeframe_features = self.timeframe_manager.get_timeframe_features(symbol)
@@ -1247,9 +1338,103 @@ class FSDEngine:
                 state['has_bullish_pattern'] = False
                 state['has_bearish_pattern'] = False
 
-        return state
+    def extract_feature_batch(
+        self,
+        histories: Mapping[str, Sequence[Bar]],
+        last_prices: dict[str, Decimal],
+    ) -> FeatureBatch:
+        """Collect the numeric state features of many symbols into one matrix.
+
+        Meant for all symbols completing a bar at the same timestamp. Each
+        symbol's indicators are still advanced and read one symbol at a time
+        (an O(1) read of its ``SymbolIndicatorState``); what the batch shares
+        is the rest: market breadth, the VIX lookup and portfolio equity are
+        computed once and broadcast, and the MACD/position percentages and the
+        trend/volatility labels are derived column-wise over all rows.
+        Symbols with fewer than 20 bars are left out of the batch.
 
-    def evaluate_opportunity(self, symbol: str, bars: list[Bar], last_prices: dict[str, Decimal]) -> dict[str, Any]:
+        Args:
+            histories: Bars per symbol (each ending at the shared timestamp)
+            last_prices: Current prices for all symbols
+
+        Returns:
+            FeatureBatch with one row per symbol with sufficient history
+        """
+        symbols = [symbol for symbol, bars in histories.items() if len(bars) >= MIN_STATE_BARS]
+        n = len(symbols)
+        raw = np.empty((n, len(FEATURE_COLUMNS)), dtype=float)
+        trend_means = np.full((n, 2 * len(TREND_RULES)), np.nan)
+        vol_stds = np.full((n, len(VOLATILITY_RULES)), np.nan)
+        positions = np.empty(n, dtype=float)
+
+        for row, symbol in enumerate(symbols):
+            bars = histories[symbol]
+            ind = self._sync_indicators(symbol, bars)
+            rsi = ind.rsi()
+            macd = ind.macd()
+            bollinger = ind.bollinger() or (0.5, 0.0)
+            raw[row] = (
+                ind.price_change_pct(),
+                ind.volume_ratio(),
+                ind.momentum(MOMENTUM_FAST),
+                ind.momentum(MOMENTUM_SLOW),
+                rsi or 50.0,
+                macd[2] if macd else 0.0,
+                bollinger[0],
+                bollinger[1],
+                0.0,
+                0.0,
+                self._estimate_spread_bps(bars[-1]),
+                ind.depth_proxy(),
+                0.0,
+                ind.close,
+            )
+            for idx, (_, short, long, _, _) in enumerate(TREND_RULES):
+                if ind.has_closes(long):
+                    trend_means[row, 2 * idx] = ind.close_mean(short)
+                    trend_means[row, 2 * idx + 1] = ind.close_mean(long)
+            for idx, (_, window, _, _) in enumerate(VOLATILITY_RULES):
+                if ind.has_returns(window):
+                    vol_stds[row, idx] = ind.return_std(window)
+            positions[row] = float(self.current_positions.get(symbol, Decimal('0')))
+
+        col = FEATURE_COLUMNS.index
+        prices = raw[:, col('current_price')]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            macd_pct = np.where(prices > 0, raw[:, col('macd_hist_pct')] / prices, 0.0)
+        raw[:, col('macd_hist_pct')] = macd_pct
+        raw[:, col('market_breadth')] = self._compute_market_breadth(last_prices)
+        raw[:, col('vix_level')] = self._extract_vix_level(last_prices) or 0.0
+        equity = self.portfolio.get_equity_float(last_prices)
+        raw[:, col('position_pct')] = positions * prices / equity if equity > 0 else 0.0
+
+        # NaN (window not yet full) compares False and falls through to the default label.
+        labels: dict[str, np.ndarray] = {}
+        for idx, (key, _, _, up, down) in enumerate(TREND_RULES):
+            short_ma = trend_means[:, 2 * idx]
+            long_ma = trend_means[:, 2 * idx + 1]
+            labels[key] = np.select([short_ma > long_ma * up, short_ma < long_ma * down], ['up', 'down'], 'neutral')
+        for idx, (key, _, low, high) in enumerate(VOLATILITY_RULES):
+            vol = vol_stds[:, idx]
+            labels[key] = np.select([vol < low, vol > high], ['low', 'high'], 'normal')
+
+        return FeatureBatch(symbols=symbols, matrix=raw, labels=labels)
+
+    def extract_states(
+        self,
+        histories: Mapping[str, Sequence[Bar]],
+        last_prices: dict[str, Decimal],
+    ) -> dict[str, dict[str, Any]]:
+        """Batched ``extract_state``: one state dict per symbol (empty if history is too short)."""
+        batch = self.extract_feature_batch(histories, last_prices)
+        states: dict[str, dict[str, Any]] = {symbol: {} for symbol in histories}
+        for row, symbol in enumerate(batch.symbols):
+            state = batch.state(row)
+            self._add_professional_features(symbol, histories[symbol], state)
+            states[symbol] = state
+        return states
+
+    def evaluate_opportunity(self, symbol: str, bars: Sequence[Bar], last_prices: dict[str, Decimal]) -> dict[str, Any]:
         """
         ENHANCED: Evaluate whether to trade this symbol with advanced features:
         - Session-based confidence adaptation (lowers threshold after a grace period)
@@ -1271,40 +1456,108 @@ class FSDEngine:
         """
         # Keep a snapshot of the latest prices so fill handlers can align position normalisation with equity.
         self._last_prices = dict(last_prices)
+        timeframe_data = self._timeframe_data(symbol)
+
+        # ===== EDGE CASE PROTECTION (First Line of Defense) =====
+        blocked = self._edge_case_block(symbol, bars, timeframe_data)
+        if blocked is not None:
+            return blocked
+
+        # Extract current state
+        state = self.extract_state(symbol, bars, last_prices)
+        self._previous_prices = dict(last_prices)
+
+        return self._decide(symbol, bars, last_prices, state, timeframe_data)
+
+    def evaluate_batch(
+        self,
+        histories: Mapping[str, Sequence[Bar]],
+        last_prices: dict[str, Decimal],
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Evaluate every symbol completing a bar at the same timestamp.
+
+        Equivalent to calling ``evaluate_opportunity`` per symbol, except that
+        state features come from ``extract_feature_batch`` and the price
+        snapshots, market breadth and equity are computed once per bar rather
+        than once per symbol (each of those is O(N), so per-symbol calls cost
+        O(N^2) per bar). Decisions themselves are still made symbol by symbol.
+
+        Args:
+            histories: Bars per symbol (each ending at the shared timestamp)
+            last_prices: Current prices for all symbols
+
+        Returns:
+            Decision dictionary per symbol, in the order of ``histories``
+        """
+        self._last_prices = dict(last_prices)
+        decisions: dict[str, dict[str, Any]] = {}
+        timeframe_data: dict[str, dict[str, list[Bar]]] = {}
+        eligible: dict[str, Sequence[Bar]] = {}
+        for symbol, bars in histories.items():
+            symbol_timeframes = self._timeframe_data(symbol)
+            blocked = self._edge_case_block(symbol, bars, symbol_timeframes)
+            if blocked is not None:
+                decisions[symbol] = blocked
+                continue
+            timeframe_data[symbol] = symbol_timeframes
+            eligible[symbol] = bars
+
+        states = self.extract_states(eligible, last_prices)
+        self._previous_prices = dict(last_prices)
+
+        for symbol, bars in eligible.items():
+            decisions[symbol] = self._decide(symbol, bars, last_prices, states[symbol], timeframe_data[symbol])
+        return {symbol: decisions[symbol] for symbol in histories}
+
+    def _timeframe_data(self, symbol: str) -> dict[str, list[Bar]]:
         timeframe_data: dict[str, list[Bar]] = {}
         if self.timeframe_manager:
             for tf in self.timeframe_manager.timeframes:
                 tf_bars = self.timeframe_manager.get_bars(symbol, tf, lookback=50)
                 if tf_bars:
                     timeframe_data[tf] = tf_bars
+        return timeframe_data
 
-        # ===== EDGE CASE PROTECTION (First Line of Defense) =====
-        if self.edge_case_handler:
-            edge_result = self.edge_case_handler.check_edge_cases(
-                symbol=symbol,
-                bars=bars,
-                timeframe_data=timeframe_data if timeframe_data else None,
-                current_time=datetime.now(timezone.utc),
-            )
-
-            if edge_result.action == 'block':
-                # Critical edge case - block trading
-                return {
-                    'should_trade': False,
-                    'action': {'trade': False},
-                    'confidence': 0.0,
-                    'state': {},
-                    'reason': f'edge_case_blocked: {edge_result.reason}',
-                    'edge_case': {
-                        'severity': edge_result.severity,
-                        'reason': edge_result.reason,
-                    },
-                }
-
-        # Extract current state
-        state = self.extract_state(symbol, bars, last_prices)
-        self._previous_prices = dict(last_prices)
+    def _edge_case_block(
+        self,
+        symbol: str,
+        bars: Sequence[Bar],
+        timeframe_data: dict[str, list[Bar]],
+    ) -> dict[str, Any] | None:
+        """Return a blocking decision if the edge case handler vetoes the symbol."""
+        if not self.edge_case_handler:
+            return None
+        edge_result = self.edge_case_handler.check_edge_cases(
+            symbol=symbol,
+            bars=bars,
+            timeframe_data=timeframe_data if timeframe_data else None,
+            current_time=datetime.now(timezone.utc),
+        )
+        if edge_result.action != 'block':
+            return None
+        # Critical edge case - block trading
+        return {
+            'should_trade': False,
+            'action': {'trade': False},
+            'confidence': 0.0,
+            'state': {},
+            'reason': f'edge_case_blocked: {edge_result.reason}',
+            'edge_case': {
+                'severity': edge_result.severity,
+                'reason': edge_result.reason,
+            },
+        }
 
+    def _decide(
+        self,
+        symbol: str,
+        bars: Sequence[Bar],
+        last_prices: dict[str, Decimal],
+        state: dict[str, Any],
+        timeframe_data: dict[str, list[Bar]],
+    ) -> dict[str, Any]:
+        """Turn an extracted state into a trading decision (safeguards, RL action, sizing)."""
         if not state:
             return {
                 'should_trade': False,
@@ -1596,7 +1849,7 @@ class FSDEngine:
         """
         self._advanced_risk_manager = manager
 
-    def _update_price_history_cache(self, symbol: str, bars: list[Bar]) -> None:
+    def _update_price_history_cache(self, symbol: str, bars: Sequence[Bar]) -> None:
         """Update price history cache for correlation calculation.
 
         Args:
@@ -1606,11 +1859,8 @@ class FSDEngine:
         if not bars:
             return
 
-        # Extract closing prices
-        closes = [float(bar.close) for bar in bars]
-
-        # Update cache (keep last 100 bars for correlation)
-        self._price_history_cache[symbol] = closes[-100:]
+        # Update cache (keep the last PRICE_HISTORY_BARS closes for correlation)
+        self._price_history_cache[symbol] = [float(bar.close) for bar in bars[-PRICE_HISTORY_BARS:]]
 
     def handle_fill(
         self,
@@ -1645,7 +1895,7 @@ class FSDEngine:
         next_state = self.last_state.copy()
         price_snapshot = dict(getattr(self, '_last_prices', {}))
         price_snapshot[symbol] = Decimal(str(fill_price))
-        equity_value = float(self.portfolio.get_equity(price_snapshot))
+        equity_value = self.portfolio.get_equity_float(price_snapshot)
         if equity_value > 0:
             position_notional = new_position * fill_price
             next_state['position_pct'] = position_notional / equity_value
@@ -1786,14 +2036,90 @@ class FSDEngine:
             reward -= transaction_cost / position_value  # Normalize
         return reward
 
+    @staticmethod
+    def q_table_paths(filepath: Path) -> tuple[Path, Path]:
+        """Return the binary Q-table snapshot and delta log paths that accompany a state file."""
+        return (
+            filepath.with_name(f'{filepath.stem}.qtable.bin'),
+            filepath.with_name(f'{filepath.stem}.qtable.delta'),
+        )
+
+    def _save_q_table_checkpoint(self, filepath: Path) -> dict[str, Any]:
+        """
+        Persist the Q-table as a binary snapshot, or append only the rows touched since the last save.
+
+        Delta records are appended while the delta log stays under
+        DELTA_COMPACTION_RATIO of the snapshot size; beyond that the snapshot is
+        rewritten atomically (previous one kept as ``.backup``) and the delta
+        log restarts.
+        """
+        from .persistence import atomic_write_bytes
+
+        base_path, delta_path = self.q_table_paths(filepath)
+        row_bytes = 16 + 8 * len(RLAgent.ACTIONS)
+        pending_bytes = self.rl_agent.q_values.dirty_count * row_bytes
+        can_append = (
+            self._q_table_generation is not None
+            and base_path.exists()
+            and self._q_table_delta_bytes + pending_bytes <= self._q_table_base_bytes * DELTA_COMPACTION_RATIO
+        )
+
+        try:
+            if can_append and self._q_table_generation is not None:
+                # Always append, even with no dirty rows: the record carries the current decay scale
+                record = encode_delta(self.rl_agent.snapshot_q_table(dirty_only=True), self._q_table_generation)
+                with delta_path.open('ab') as handle:
+                    # Drop a torn record left by an interrupted append before writing
+                    handle.truncate(self._q_table_delta_bytes)
+                    handle.write(record)
+                self._q_table_delta_bytes += len(record)
+            else:
+                generation = max(time.time_ns(), (self._q_table_generation or 0) + 1)
+                snapshot = self.rl_agent.snapshot_q_table()
+                atomic_write_bytes(lambda handle: write_snapshot(handle, snapshot, generation), base_path)
+                delta_path.unlink(missing_ok=True)
+                self._q_table_generation = generation
+                self._q_table_base_bytes = base_path.stat().st_size
+                self._q_table_delta_bytes = 0
+        except Exception:
+            # Dirty rows were already handed off; force a full snapshot on the next save
+            self._q_table_generation = None
+            raise
+
+        return {'format': 'binary_v1', 'snapshot': base_path.name, 'delta_log': delta_path.name}
+
+    def _load_q_table_checkpoint(self, filepath: Path) -> bool:
+        """Load the binary Q-table snapshot (falling back to its backup) and replay its delta log."""
+        logger = logging.getLogger(__name__)
+        base_path, delta_path = self.q_table_paths(filepath)
+
+        for candidate in (base_path, base_path.with_suffix('.backup')):
+            if not candidate.exists():
+                continue
+            try:
+                generation, base = read_snapshot(candidate)
+                deltas, valid_bytes = read_deltas(delta_path, generation, len(RLAgent.ACTIONS))
+                self.rl_agent.restore_q_snapshot(base, deltas)
+            except (OSError, ValueError) as exc:
+                logger.warning(f'Q-table checkpoint {candidate} unreadable: {exc}')
+                continue
+            # Deltas are only ever appended on top of the primary snapshot
+            self._q_table_generation = generation if candidate == base_path else None
+            self._q_table_base_bytes = candidate.stat().st_size
+            self._q_table_delta_bytes = valid_bytes
+            return True
+        return False
+
     def save_state(self, filepath: str):
         """
         ENHANCED: Save FSD Q-values, statistics, and per-symbol performance.
 
         P0-NEW-2 Fix: Uses atomic writes to prevent Q-value corruption on crash.
-        """
-        from pathlib import Path
 
+        The Q-table is written to a binary checkpoint next to ``filepath`` (see
+        ``_save_q_table_checkpoint``); the JSON file keeps statistics, the state
+        encoding and any not-yet-migrated legacy states.
+        """
         from .persistence import atomic_write_json
 
         logger = logging.getLogger(__name__)
@@ -1832,8 +2158,12 @@ class FSDEngine:
         elif decay_info.get('skipped'):
             logger.debug(f'Q-value decay skipped: {decay_info.get("reason", "unknown")}')
 
+        # Binary checkpoint first, so the JSON never references rows that were not written
+        q_table_meta = self._save_q_table_checkpoint(Path(filepath))
+
         state = {
-            'q_values': self.rl_agent.q_values,
+            **self.rl_agent.export_q_table(include_q_values=False),
+            'q_table': q_table_meta,
             'total_trades': self.rl_agent.total_trades,
             'winning_trades': self.rl_agent.winning_trades,
             'total_pnl': self.rl_agent.total_pnl,
@@ -1863,8 +2193,13 @@ class FSDEngine:
         ENHANCED: Load FSD Q-values, statistics, and per-symbol performance.
 
         P0-NEW-2 Fix: Attempts backup file if primary is corrupted.
+
+        State files from before the binary checkpoint carry Q-values inline
+        (MD5- or integer-keyed); they are imported and written out in the
+        binary format on the next save.
         """
-        from pathlib import Path
+        logger = logging.getLogger(__name__)
+        self._q_table_generation = None
 
         try:
             path = Path(filepath)
@@ -1895,18 +2230,17 @@ class FSDEngine:
                 return False  # No files found or all corrupted
 
             payload: dict[str, object] = cast(dict[str, object], payload_obj) if isinstance(payload_obj, dict) else {}
-            q_values_obj: object = payload.get('q_values', {})
-            if isinstance(q_values_obj, dict):
-                # P1-1 Fix: Convert loaded dict to OrderedDict for LRU eviction
-                self.rl_agent.q_values = OrderedDict(q_values_obj)  # type: ignore[arg-type]
-            else:
-                self.rl_agent.q_values = OrderedDict()
-
-            max_states = getattr(self.config, 'max_q_table_states', 0)
-            if max_states and len(self.rl_agent.q_values) > max_states:
-                # Trim oldest states to respect configured capacity
-                while len(self.rl_agent.q_values) > max_states:
-                    self.rl_agent.q_values.popitem(last=False)
+            # Legacy files carry MD5 state keys; restore_q_table migrates them lazily
+            self.rl_agent.restore_q_table(
+                payload.get('q_values', {}),
+                payload.get('q_state_encoding'),
+                payload.get('legacy_q_values'),
+            )
+            if isinstance(payload.get('q_table'), dict):
+                if self.rl_agent.state_encoder.matches(payload.get('q_state_encoding')):
+                    self._load_q_table_checkpoint(path)
+                else:
+                    logger.warning('Ignoring binary Q-table checkpoint: state encoding changed')
 
             # Restore Q-value decay timestamp (regime adaptation)
             ldt_obj: object = payload.get('last_decay_timestamp')
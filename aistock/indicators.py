@@ -0,0 +1,294 @@
+"""
+Incremental per-symbol indicator state for the FSD feature extractor.
+
+``FSDEngine.extract_state`` used to rebuild float lists from the most recent
+bars and recompute RSI, EMA/MACD, Bollinger bands, momentum, trend averages and
+three return volatilities with NumPy on every call. For windows this small the
+per-call NumPy overhead dominates, so each symbol now keeps a
+``SymbolIndicatorState`` that is updated in O(1) per bar and read directly.
+
+Definitions follow the NumPy computations they replaced (population standard
+deviation, EMAs seeded with the first close), except that RSI is now Wilder's:
+seeded with the simple average of the first ``RSI_PERIOD`` changes, then
+smoothed with ``(prev * (n - 1) + current) / n``. That, and the longer MACD,
+momentum, trend and volatility lookbacks, change the discretized Q-state, so
+Q-tables learned with the old features are not comparable.
+tests/test_indicators.py keeps the reference implementations for parity.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from collections.abc import Sequence
+from datetime import datetime
+
+from .data import Bar
+
+# Windows read by extract_state; sizes are in bars (closes) unless noted.
+CLOSE_WINDOWS = (3, 5, 6, 10, 15, 20, 30)
+RETURN_WINDOWS = (5, 19, 29)  # 6, 20 and 30 closes respectively
+VOLUME_WINDOW = 20
+RSI_PERIOD = 14
+BOLLINGER_PERIOD = 20
+BOLLINGER_STD = 2.0
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+MACD_MIN_BARS = 35
+MOMENTUM_FAST = 5
+MOMENTUM_SLOW = 20
+
+# Longest close lookback needed (momentum_slow reads closes[-21], trend_slow 30 closes).
+MAX_CLOSE_LOOKBACK = max(max(CLOSE_WINDOWS), MOMENTUM_SLOW + 1, RETURN_WINDOWS[-1] + 1)
+
+# Relative variance below which a window is treated as flat (floating-point residue).
+_FLAT_VARIANCE_TOLERANCE = 1e-12
+
+
+class RollingWindow:
+    """Fixed-size sliding window with O(1) mean and population variance.
+
+    Uses Welford's update for additions and its inverse for the value leaving
+    the window. Accumulated rounding is discarded by recomputing the moments
+    from the stored values once every ``size`` pushes, which keeps the amortised
+    cost O(1).
+    """
+
+    __slots__ = ('size', '_values', '_mean', '_m2', '_nonzero', '_pushes')
+
+    def __init__(self, size: int):
+        if size <= 0:
+            raise ValueError(f'Window size must be positive, got {size}')
+        self.size = size
+        self._values: deque[float] = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._nonzero = 0
+        self._pushes = 0
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def full(self) -> bool:
+        return len(self._values) == self.size
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def nonzero(self) -> int:
+        """Number of values in the window that are not exactly zero."""
+        return self._nonzero
+
+    @property
+    def variance(self) -> float:
+        count = len(self._values)
+        if count == 0:
+            return 0.0
+        var = self._m2 / count
+        if var <= _FLAT_VARIANCE_TOLERANCE * max(self._mean * self._mean, 1e-300):
+            return 0.0
+        return var
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def push(self, value: float) -> None:
+        values = self._values
+        if value != 0.0:
+            self._nonzero += 1
+        if len(values) == self.size:
+            old = values.popleft()
+            if old != 0.0:
+                self._nonzero -= 1
+            values.append(value)
+            old_mean = self._mean
+            self._mean = old_mean + (value - old) / self.size
+            self._m2 += (value - old) * (value - self._mean + old - old_mean)
+        else:
+            values.append(value)
+            delta = value - self._mean
+            self._mean += delta / len(values)
+            self._m2 += delta * (value - self._mean)
+
+        self._pushes += 1
+        if self._pushes >= self.size:
+            self._resync()
+
+    def _resync(self) -> None:
+        values = self._values
+        count = len(values)
+        mean = math.fsum(values) / count
+        self._mean = mean
+        self._m2 = math.fsum((v - mean) * (v - mean) for v in values)
+        self._pushes = 0
+
+
+class SymbolIndicatorState:
+    """Rolling indicator state for a single symbol.
+
+    Feed bars in timestamp order with ``update``; every accessor is O(1).
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.last_bar: Bar | None = None
+        self._closes: deque[float] = deque(maxlen=MAX_CLOSE_LOOKBACK)
+        self._close_windows = {size: RollingWindow(size) for size in CLOSE_WINDOWS}
+        self._return_windows = {size: RollingWindow(size) for size in RETURN_WINDOWS}
+        # Wilder-smoothed average gain and loss, and the number of changes seen
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._changes = 0
+        self._volumes: deque[int] = deque(maxlen=VOLUME_WINDOW)
+        self._volume_sum = 0
+        self._ema_fast = 0.0
+        self._ema_slow = 0.0
+        self._ema_signal = 0.0
+
+    @property
+    def last_timestamp(self) -> datetime | None:
+        return self.last_bar.timestamp if self.last_bar is not None else None
+
+    def update(self, bar: Bar) -> None:
+        close = float(bar.close)
+        closes = self._closes
+        if closes:
+            prev = closes[-1]
+            delta = close - prev
+            gain = delta if delta > 0 else 0.0
+            loss = -delta if delta < 0 else 0.0
+            if self._changes < RSI_PERIOD:
+                # Seed: running simple average of the first RSI_PERIOD changes
+                seen = self._changes + 1
+                self._avg_gain += (gain - self._avg_gain) / seen
+                self._avg_loss += (loss - self._avg_loss) / seen
+            else:
+                self._avg_gain = (self._avg_gain * (RSI_PERIOD - 1) + gain) / RSI_PERIOD
+                self._avg_loss = (self._avg_loss * (RSI_PERIOD - 1) + loss) / RSI_PERIOD
+            self._changes += 1
+            ret = delta / prev if prev != 0 else 0.0
+            for window in self._return_windows.values():
+                window.push(ret)
+
+            k_fast = 2.0 / (MACD_FAST + 1.0)
+            k_slow = 2.0 / (MACD_SLOW + 1.0)
+            k_signal = 2.0 / (MACD_SIGNAL + 1.0)
+            self._ema_fast = (close - self._ema_fast) * k_fast + self._ema_fast
+            self._ema_slow = (close - self._ema_slow) * k_slow + self._ema_slow
+            macd = self._ema_fast - self._ema_slow
+            self._ema_signal = (macd - self._ema_signal) * k_signal + self._ema_signal
+        else:
+            # EMAs are seeded with the first value.
+            self._ema_fast = close
+            self._ema_slow = close
+            self._ema_signal = 0.0
+
+        closes.append(close)
+        for window in self._close_windows.values():
+            window.push(close)
+
+        volumes = self._volumes
+        if len(volumes) == VOLUME_WINDOW:
+            self._volume_sum -= volumes[0]
+        volumes.append(bar.volume)
+        self._volume_sum += bar.volume
+
+        self.count += 1
+        self.last_bar = bar
+
+    @classmethod
+    def from_bars(cls, bars: Sequence[Bar]) -> SymbolIndicatorState:
+        state = cls()
+        for bar in bars:
+            state.update(bar)
+        return state
+
+    # ----- Price features -------------------------------------------------
+
+    @property
+    def close(self) -> float:
+        return self._closes[-1]
+
+    def price_change_pct(self) -> float:
+        if len(self._closes) < 2:
+            return 0.0
+        prev = self._closes[-2]
+        return (self._closes[-1] - prev) / prev if prev > 0 else 0.0
+
+    def close_mean(self, window: int) -> float:
+        return self._close_windows[window].mean
+
+    def has_closes(self, window: int) -> bool:
+        return self._close_windows[window].full
+
+    def return_std(self, window: int) -> float:
+        return self._return_windows[window].std
+
+    def has_returns(self, window: int) -> bool:
+        return self._return_windows[window].full
+
+    # ----- Indicators -----------------------------------------------------
+
+    def rsi(self) -> float | None:
+        """Wilder RSI; None until ``RSI_PERIOD`` changes have been seen."""
+        if self._changes < RSI_PERIOD:
+            return None
+        if self._avg_loss <= 0:
+            return 100.0
+        rs = self._avg_gain / self._avg_loss
+        return 100.0 - (100.0 / (1.0 + rs))
+
+    def macd(self) -> tuple[float, float, float] | None:
+        if self.count < MACD_MIN_BARS:
+            return None
+        macd_line = self._ema_fast - self._ema_slow
+        return (macd_line, self._ema_signal, macd_line - self._ema_signal)
+
+    def bollinger(self) -> tuple[float, float] | None:
+        window = self._close_windows[BOLLINGER_PERIOD]
+        if not window.full:
+            return None
+        sma = window.mean
+        band = BOLLINGER_STD * window.std
+        upper = sma + band
+        lower = sma - band
+        if upper == lower:
+            return (0.5, 0.0)
+        pos = (self._closes[-1] - lower) / (upper - lower)
+        width = (upper - lower) / sma if sma > 0 else 0.0
+        return (pos, width)
+
+    def momentum(self, window: int) -> float:
+        closes = self._closes
+        if len(closes) <= window:
+            return 0.0
+        past = closes[-(window + 1)]
+        if past == 0:
+            return 0.0
+        scaled = (closes[-1] - past) / past * 10.0
+        return max(-1.0, min(1.0, scaled))
+
+    # ----- Volume features ------------------------------------------------
+
+    def volume_ratio(self) -> float:
+        count = len(self._volumes)
+        if count == 0:
+            return 1.0
+        avg_volume = self._volume_sum / count
+        return self._volumes[-1] / avg_volume if avg_volume > 0 else 1.0
+
+    def depth_proxy(self) -> float:
+        """Current volume relative to the preceding bars of the volume window."""
+        volumes = self._volumes
+        if not volumes:
+            return 0.0
+        current = volumes[-1]
+        avg_volume = (self._volume_sum - current) / (len(volumes) - 1) if len(volumes) > 1 else current
+        if avg_volume <= 0:
+            return 0.0
+        return max(0.0, min(5.0, current / avg_volume))
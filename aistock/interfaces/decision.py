@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from datetime import datetime
 from decimal import Decimal
 from typing import Any, Callable, Protocol, runtime_checkable
@@ -19,7 +20,7 @@ class DecisionEngineProtocol(Protocol):
     def evaluate_opportunity(
         self,
         symbol: str,
-        bars: list[Bar],
+        bars: Sequence[Bar],
         last_prices: dict[str, Decimal],
     ) -> dict[str, Any]:
         """Evaluate a trading opportunity.
@@ -5,17 +5,28 @@ Detects classic candlestick patterns used by professional traders:
 - Bullish patterns (hammer, engulfing, morning star, etc.)
 - Bearish patterns (shooting star, engulfing, evening star, etc.)
 - Neutral patterns (doji, spinning top)
+
+``PatternDetector.detect_patterns`` evaluates the latest bar of a history;
+``PatternDetector.scan`` evaluates every bar of a whole series in one
+vectorized pass (for research and labelling training data) with the same
+rules, so row ``i`` of a scan equals ``detect_patterns(bars[: i + 1])``.
 """
 
 from __future__ import annotations
 
 import threading
 from collections import OrderedDict
+from collections.abc import Sequence
 from dataclasses import dataclass
+from datetime import datetime
 from decimal import Decimal
 from enum import Enum
+from typing import cast
+
+import numpy as np
+from numpy.typing import ArrayLike, NDArray
 
-from .data import Bar
+from .data import Bar, BarFrame
 
 
 class PatternType(str, Enum):
@@ -60,6 +71,164 @@ class DetectedPattern:
     description: str
 
 
+_PATTERN_SIGNALS: dict[PatternType, PatternSignal] = {
+    PatternType.HAMMER: PatternSignal.BULLISH,
+    PatternType.INVERTED_HAMMER: PatternSignal.BULLISH,
+    PatternType.BULLISH_ENGULFING: PatternSignal.BULLISH,
+    PatternType.MORNING_STAR: PatternSignal.BULLISH,
+    PatternType.THREE_WHITE_SOLDIERS: PatternSignal.BULLISH,
+    PatternType.PIERCING_LINE: PatternSignal.BULLISH,
+    PatternType.SHOOTING_STAR: PatternSignal.BEARISH,
+    PatternType.HANGING_MAN: PatternSignal.BEARISH,
+    PatternType.BEARISH_ENGULFING: PatternSignal.BEARISH,
+    PatternType.EVENING_STAR: PatternSignal.BEARISH,
+    PatternType.THREE_BLACK_CROWS: PatternSignal.BEARISH,
+    PatternType.DARK_CLOUD_COVER: PatternSignal.BEARISH,
+    PatternType.DOJI: PatternSignal.NEUTRAL,
+    PatternType.SPINNING_TOP: PatternSignal.NEUTRAL,
+}
+
+# (pattern, confidence) -> description of every detection the detector reports
+_DESCRIPTIONS: dict[tuple[PatternType, float], str] = {
+    (PatternType.DOJI, 0.6): 'Doji - Market indecision, potential reversal',
+    (PatternType.HAMMER, 0.85): 'Hammer - Strong bullish reversal (downtrend + volume)',
+    (PatternType.HAMMER, 0.60): 'Hammer - Bullish reversal (downtrend, weak volume)',
+    (PatternType.SHOOTING_STAR, 0.85): 'Shooting Star - Strong bearish reversal (uptrend + volume)',
+    (PatternType.SHOOTING_STAR, 0.60): 'Shooting Star - Bearish reversal (uptrend, weak volume)',
+    (PatternType.SPINNING_TOP, 0.5): 'Spinning Top - Indecision, wait for confirmation',
+    (PatternType.BULLISH_ENGULFING, 0.90): 'Bullish Engulfing - Very strong bullish reversal (volume confirmed)',
+    (PatternType.BULLISH_ENGULFING, 0.75): 'Bullish Engulfing - Strong bullish reversal',
+    (PatternType.BEARISH_ENGULFING, 0.90): 'Bearish Engulfing - Very strong bearish reversal (volume confirmed)',
+    (PatternType.BEARISH_ENGULFING, 0.75): 'Bearish Engulfing - Strong bearish reversal',
+    (PatternType.PIERCING_LINE, 0.7): 'Piercing Line - Bullish reversal pattern',
+    (PatternType.DARK_CLOUD_COVER, 0.7): 'Dark Cloud Cover - Bearish reversal pattern',
+    (PatternType.MORNING_STAR, 0.9): 'Morning Star - Extremely strong bullish reversal',
+    (PatternType.EVENING_STAR, 0.9): 'Evening Star - Extremely strong bearish reversal',
+    (PatternType.THREE_WHITE_SOLDIERS, 0.8): 'Three White Soldiers - Strong bullish continuation',
+    (PatternType.THREE_BLACK_CROWS, 0.8): 'Three Black Crows - Strong bearish continuation',
+}
+
+# Patterns the detector reports, in the order ``detect_patterns`` lists them (the scan's columns)
+SCAN_PATTERNS: tuple[PatternType, ...] = (
+    PatternType.DOJI,
+    PatternType.HAMMER,
+    PatternType.SHOOTING_STAR,
+    PatternType.SPINNING_TOP,
+    PatternType.BULLISH_ENGULFING,
+    PatternType.BEARISH_ENGULFING,
+    PatternType.PIERCING_LINE,
+    PatternType.DARK_CLOUD_COVER,
+    PatternType.MORNING_STAR,
+    PatternType.EVENING_STAR,
+    PatternType.THREE_WHITE_SOLDIERS,
+    PatternType.THREE_BLACK_CROWS,
+)
+_SINGLE_BAR_COLUMNS = slice(0, 4)
+_TWO_BAR_COLUMNS = slice(4, 8)
+_THREE_BAR_COLUMNS = slice(8, 12)
+
+# Confidence above which a pattern counts as strong for early exit
+STRONG_CONFIDENCE = 0.8
+# Price decimals tried when making float prices exact fixed-point integers
+MAX_SCAN_DECIMALS = 8
+
+
+def _detected(pattern_type: PatternType, confidence: float) -> DetectedPattern:
+    return DetectedPattern(
+        pattern_type=pattern_type,
+        signal=_PATTERN_SIGNALS[pattern_type],
+        confidence=confidence,
+        description=_DESCRIPTIONS[pattern_type, confidence],
+    )
+
+
+@dataclass(frozen=True)
+class PatternScan:
+    """
+    Patterns detected at every bar of a series.
+
+    ``strength[i, j]`` is the confidence with which ``patterns[j]`` is
+    reported for the history ending at bar ``i`` (0.0 if it is not).
+    """
+
+    patterns: tuple[PatternType, ...]
+    strength: NDArray[np.float64]  # bars x patterns
+
+    def __len__(self) -> int:
+        return len(self.strength)
+
+    @property
+    def detected(self) -> NDArray[np.bool_]:
+        return self.strength > 0
+
+    def column(self, pattern_type: PatternType) -> NDArray[np.float64]:
+        return self.strength[:, self.patterns.index(pattern_type)]
+
+    def at(self, index: int) -> list[DetectedPattern]:
+        """The patterns ``detect_patterns`` reports for the history ending at bar ``index``."""
+        row = self.strength[index]
+        return [
+            _detected(pattern_type, float(confidence))
+            for pattern_type, confidence in zip(self.patterns, row, strict=True)
+            if confidence > 0
+        ]
+
+
+# One OHLC column: exact integers (fixed point), or floats on the approximate path
+_PriceColumn = Sequence[int] | NDArray[np.int64] | NDArray[np.float64]
+
+
+# (open, high, low, close, volume) of each bar, oldest first
+_Fingerprint = tuple[tuple[Decimal, Decimal, Decimal, Decimal, int], ...]
+# (symbol, timeframe, last bar timestamp, fingerprint)
+_CacheKey = tuple[str, str, datetime, _Fingerprint]
+
+
+def _fingerprint(bars: Sequence[Bar]) -> _Fingerprint:
+    """Content of the bars a detection reads; the count also records whether full context was available."""
+    return tuple((bar.open, bar.high, bar.low, bar.close, bar.volume) for bar in bars)
+
+
+def _exact_ratio(value: Decimal) -> tuple[int, int]:
+    numerator, denominator = value.as_integer_ratio()
+    return numerator, denominator
+
+
+def _decimal_columns(bars: Sequence[Bar]) -> list[list[int]]:
+    """OHLC of ``bars`` as integers at the smallest scale that makes every price exact."""
+    decimals = 0
+    for bar in bars:
+        for price in (bar.open, bar.high, bar.low, bar.close):
+            exponent = price.as_tuple().exponent
+            if isinstance(exponent, int):
+                decimals = max(decimals, -exponent)
+    return [[int(getattr(bar, name).scaleb(decimals)) for bar in bars] for name in ('open', 'high', 'low', 'close')]
+
+
+def _float_decimals(columns: list[NDArray[np.float64]]) -> int:
+    """Fewest decimals at which every price is an exact fixed-point integer, or -1."""
+    for decimals in range(MAX_SCAN_DECIMALS + 1):
+        scale = 10.0**decimals
+        if all(
+            np.max(np.abs(np.round(column * scale)), initial=0.0) < 2**53
+            and np.array_equal(np.round(column * scale) / scale, column)
+            for column in columns
+        ):
+            return decimals
+    return -1
+
+
+def _integer_array(values: Sequence[int] | NDArray[np.int64], limit: int) -> NDArray[np.int64] | NDArray[np.object_]:
+    """int64 if ``limit`` times the largest magnitude cannot overflow, else exact Python ints."""
+    if isinstance(values, np.ndarray):
+        largest = max(abs(int(values.max())), abs(int(values.min()))) if len(values) else 0
+    else:
+        largest = max(map(abs, values), default=0)
+    if largest * limit < 2**62:
+        return np.asarray(values, dtype=np.int64)
+    return np.array([int(value) for value in values], dtype=object)
+
+
 class PatternDetector:
     """
     Professional candlestick pattern detector.
@@ -67,8 +236,14 @@ class PatternDetector:
     Uses strict pattern recognition rules used by professional technical analysts.
 
     P2-3 Fix: Includes caching to avoid re-computing patterns for same bar data.
+    Results are cached per (symbol, timeframe, last bar timestamp, fingerprint
+    of the bars the rules read), so symbols sharing a bar boundary never
+    collide and each symbol's bar is detected once however many callers ask.
     """
 
+    # Most bars any rule reads back from the latest one (volume confirmation)
+    LOOKBACK_BARS = 10
+
     def __init__(self, body_threshold: float = 0.3, wick_ratio: float = 2.0, cache_size: int = 1000):
         """
         Initialize pattern detector.
@@ -76,20 +251,26 @@ class PatternDetector:
         Args:
             body_threshold: Maximum body size for small-body patterns (as fraction of range)
             wick_ratio: Minimum wick-to-body ratio for wick patterns
-            cache_size: Maximum number of cached pattern results (P0-2 Fix: increased to 1000, thread-safe)
+            cache_size: Maximum number of cached pattern results (P0-2 Fix: increased to 1000, thread-safe);
+                0 disables the cache
         """
+        if cache_size < 0:
+            raise ValueError(f'cache_size must be non-negative, got {cache_size}')
         # P0-7 Fix: Convert to Decimal for compatibility with Decimal bar prices
         self.body_threshold = Decimal(str(body_threshold))
         self.wick_ratio = Decimal(str(wick_ratio))
 
         # P0-2 Fix: Thread-safe LRU cache for pattern detection results (bounded to 1000)
-        # Key: (timestamp of last bar, hash of last 3 bar timestamps)
+        # Key: (symbol, timeframe, timestamp of last bar, fingerprint of the last LOOKBACK_BARS bars)
         # Value: list of DetectedPattern
-        self._cache: OrderedDict[tuple[object, ...], list[DetectedPattern]] = OrderedDict()
+        self._cache: OrderedDict[_CacheKey, list[DetectedPattern]] = OrderedDict()
         self._cache_max_size = cache_size
         self._lock = threading.Lock()  # P0-2 Fix: Protect cache from concurrent access
+        self._cache_hits = 0
+        self._cache_misses = 0
+        self._cache_evictions = 0
 
-    def _is_downtrend(self, bars: list[Bar], lookback: int = 5) -> bool:
+    def _is_downtrend(self, bars: Sequence[Bar], lookback: int = 5) -> bool:
         """
         P1-3 Fix: Check if market is in downtrend (for reversal pattern context).
 
@@ -113,7 +294,7 @@ class PatternDetector:
         # Current price below SMA = downtrend
         return closes[-1] < sma
 
-    def _is_uptrend(self, bars: list[Bar], lookback: int = 5) -> bool:
+    def _is_uptrend(self, bars: Sequence[Bar], lookback: int = 5) -> bool:
         """
         P1-3 Fix: Check if market is in uptrend (for reversal pattern context).
 
@@ -137,7 +318,7 @@ class PatternDetector:
         # Current price above SMA = uptrend
         return closes[-1] > sma
 
-    def _has_volume_confirmation(self, bars: list[Bar], multiplier: float = 1.5) -> bool:
+    def _has_volume_confirmation(self, bars: Sequence[Bar], multiplier: float = 1.5) -> bool:
         """
         P1-3 Fix: Check if current bar has volume confirmation.
 
@@ -158,7 +339,7 @@ class PatternDetector:
 
         return current_volume >= avg_volume * multiplier
 
-    def detect_patterns(self, bars: list[Bar]) -> list[DetectedPattern]:
+    def detect_patterns(self, bars: Sequence[Bar], timeframe: str = '') -> list[DetectedPattern]:
         """
         Detect all candlestick patterns in the most recent bars.
 
@@ -167,6 +348,8 @@ class PatternDetector:
 
         Args:
             bars: List of bars (need at least 10 for reliable detection with context)
+            timeframe: Bar timeframe (e.g. '1m', '5m'), keeping the cached
+                results of one symbol's timeframes apart
 
         Returns:
             List of detected patterns (filtered by trend context and volume)
@@ -179,20 +362,18 @@ class PatternDetector:
         prev = bars[-2] if len(bars) >= 2 else None
         prev_prev = bars[-3] if len(bars) >= 3 else None
 
-        # Cache key: timestamps of last 3 bars (or fewer if not available)
-        cache_key_parts = [current.timestamp]
-        if prev:
-            cache_key_parts.append(prev.timestamp)
-        if prev_prev:
-            cache_key_parts.append(prev_prev.timestamp)
-        cache_key = tuple(cache_key_parts)
+        # Cache key: every input the rules read, so equal keys mean equal results
+        cache_key = (current.symbol, timeframe, current.timestamp, _fingerprint(bars[-self.LOOKBACK_BARS :]))
 
         # P0-2 Fix: Check cache with lock (thread-safe read)
         with self._lock:
-            if cache_key in self._cache:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
                 # Move to end (LRU)
                 self._cache.move_to_end(cache_key)
-                return self._cache[cache_key].copy()  # Return copy to prevent external modification
+                self._cache_hits += 1
+                return cached.copy()  # Return copy to prevent external modification
+            self._cache_misses += 1
 
         # Cache miss - compute patterns (outside lock to avoid holding lock during expensive computation)
         patterns: list[DetectedPattern] = []
@@ -223,15 +404,45 @@ class PatternDetector:
 
         # P0-2 Fix: Store in cache with lock (thread-safe write, bounded LRU)
         with self._lock:
-            if len(self._cache) >= self._cache_max_size:
-                # Remove oldest entry (FIFO eviction for LRU)
+            if self._cache_max_size:
+                self._cache[cache_key] = patterns.copy()
+            while len(self._cache) > self._cache_max_size:
+                # Remove least recently used entry
                 self._cache.popitem(last=False)
-
-            self._cache[cache_key] = patterns.copy()
+                self._cache_evictions += 1
 
         return patterns
 
-    def _detect_single_bar_patterns(self, bar: Bar, prev: Bar | None, bars: list[Bar]) -> list[DetectedPattern]:
+    def invalidate(self, symbol: str | None = None) -> int:
+        """
+        Drop cached results for one symbol (or all of them), e.g. after its
+        history was corrected. Returns the number of entries dropped.
+        """
+        with self._lock:
+            if symbol is None:
+                dropped = len(self._cache)
+                self._cache.clear()
+                return dropped
+            stale = [key for key in self._cache if key[0] == symbol]
+            for key in stale:
+                del self._cache[key]
+            return len(stale)
+
+    def get_cache_stats(self) -> dict[str, int | float]:
+        """Cache counters for monitoring (hit rate is 0.0 before the first lookup)."""
+        with self._lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'evictions': self._cache_evictions,
+                'hit_rate': self._cache_hits / lookups if lookups else 0.0,
+                'entries': len(self._cache),
+                'max_entries': self._cache_max_size,
+                'symbols': len({key[0] for key in self._cache}),
+            }
+
+    def _detect_single_bar_patterns(self, bar: Bar, prev: Bar | None, bars: Sequence[Bar]) -> list[DetectedPattern]:
         """
         P1-3 Fix: Detect single-bar patterns with trend context and volume confirmation.
 
@@ -244,14 +455,7 @@ class PatternDetector:
 
         # Doji - small body, indecision
         if self._is_doji(bar):
-            patterns.append(
-                DetectedPattern(
-                    pattern_type=PatternType.DOJI,
-                    signal=PatternSignal.NEUTRAL,
-                    confidence=0.6,
-                    description='Doji - Market indecision, potential reversal',
-                )
-            )
+            patterns.append(_detected(PatternType.DOJI, 0.6))
 
         # P1-3 Fix: Hammer - bullish reversal ONLY in downtrend with volume
         if self._is_hammer(bar):
@@ -263,22 +467,12 @@ class PatternDetector:
                 # Full confirmation: downtrend + volume
                 if has_volume:
                     patterns.append(
-                        DetectedPattern(
-                            pattern_type=PatternType.HAMMER,
-                            signal=PatternSignal.BULLISH,
-                            confidence=0.85,  # High confidence with full confirmation
-                            description='Hammer - Strong bullish reversal (downtrend + volume)',
-                        )
+                        _detected(PatternType.HAMMER, 0.85)  # High confidence with full confirmation
                     )
                 else:
                     # Partial confirmation: downtrend only (no volume)
                     patterns.append(
-                        DetectedPattern(
-                            pattern_type=PatternType.HAMMER,
-                            signal=PatternSignal.BULLISH,
-                            confidence=0.60,  # Reduced confidence without volume
-                            description='Hammer - Bullish reversal (downtrend, weak volume)',
-                        )
+                        _detected(PatternType.HAMMER, 0.60)  # Reduced confidence without volume
                     )
             # Otherwise skip - hammer in uptrend is false signal
 
@@ -292,39 +486,22 @@ class PatternDetector:
                 # Full confirmation: uptrend + volume
                 if has_volume:
                     patterns.append(
-                        DetectedPattern(
-                            pattern_type=PatternType.SHOOTING_STAR,
-                            signal=PatternSignal.BEARISH,
-                            confidence=0.85,  # High confidence with full confirmation
-                            description='Shooting Star - Strong bearish reversal (uptrend + volume)',
-                        )
+                        _detected(PatternType.SHOOTING_STAR, 0.85)  # High confidence with full confirmation
                     )
                 else:
                     # Partial confirmation: uptrend only (no volume)
                     patterns.append(
-                        DetectedPattern(
-                            pattern_type=PatternType.SHOOTING_STAR,
-                            signal=PatternSignal.BEARISH,
-                            confidence=0.60,  # Reduced confidence without volume
-                            description='Shooting Star - Bearish reversal (uptrend, weak volume)',
-                        )
+                        _detected(PatternType.SHOOTING_STAR, 0.60)  # Reduced confidence without volume
                     )
             # Otherwise skip - shooting star in downtrend is false signal
 
         # Spinning Top - indecision
         if self._is_spinning_top(bar):
-            patterns.append(
-                DetectedPattern(
-                    pattern_type=PatternType.SPINNING_TOP,
-                    signal=PatternSignal.NEUTRAL,
-                    confidence=0.5,
-                    description='Spinning Top - Indecision, wait for confirmation',
-                )
-            )
+            patterns.append(_detected(PatternType.SPINNING_TOP, 0.5))
 
         return patterns
 
-    def _detect_two_bar_patterns(self, current: Bar, prev: Bar, bars: list[Bar]) -> list[DetectedPattern]:
+    def _detect_two_bar_patterns(self, current: Bar, prev: Bar, bars: Sequence[Bar]) -> list[DetectedPattern]:
         """
         P1-3 Fix: Detect two-bar patterns with volume confirmation.
 
@@ -340,21 +517,11 @@ class PatternDetector:
             has_volume = len(bars) >= 10 and self._has_volume_confirmation(bars)
             if has_volume:
                 patterns.append(
-                    DetectedPattern(
-                        pattern_type=PatternType.BULLISH_ENGULFING,
-                        signal=PatternSignal.BULLISH,
-                        confidence=0.90,  # Increased with volume
-                        description='Bullish Engulfing - Very strong bullish reversal (volume confirmed)',
-                    )
+                    _detected(PatternType.BULLISH_ENGULFING, 0.90)  # Increased with volume
                 )
             else:
                 patterns.append(
-                    DetectedPattern(
-                        pattern_type=PatternType.BULLISH_ENGULFING,
-                        signal=PatternSignal.BULLISH,
-                        confidence=0.75,  # Reduced without volume
-                        description='Bullish Engulfing - Strong bullish reversal',
-                    )
+                    _detected(PatternType.BULLISH_ENGULFING, 0.75)  # Reduced without volume
                 )
 
         # P1-3 Fix: Bearish Engulfing with volume confirmation
@@ -362,49 +529,25 @@ class PatternDetector:
             has_volume = len(bars) >= 10 and self._has_volume_confirmation(bars)
             if has_volume:
                 patterns.append(
-                    DetectedPattern(
-                        pattern_type=PatternType.BEARISH_ENGULFING,
-                        signal=PatternSignal.BEARISH,
-                        confidence=0.90,  # Increased with volume
-                        description='Bearish Engulfing - Very strong bearish reversal (volume confirmed)',
-                    )
+                    _detected(PatternType.BEARISH_ENGULFING, 0.90)  # Increased with volume
                 )
             else:
                 patterns.append(
-                    DetectedPattern(
-                        pattern_type=PatternType.BEARISH_ENGULFING,
-                        signal=PatternSignal.BEARISH,
-                        confidence=0.75,  # Reduced without volume
-                        description='Bearish Engulfing - Strong bearish reversal',
-                    )
+                    _detected(PatternType.BEARISH_ENGULFING, 0.75)  # Reduced without volume
                 )
 
         # Piercing Line - bullish reversal
         if self._is_piercing_line(current, prev):
-            patterns.append(
-                DetectedPattern(
-                    pattern_type=PatternType.PIERCING_LINE,
-                    signal=PatternSignal.BULLISH,
-                    confidence=0.7,
-                    description='Piercing Line - Bullish reversal pattern',
-                )
-            )
+            patterns.append(_detected(PatternType.PIERCING_LINE, 0.7))
 
         # Dark Cloud Cover - bearish reversal
         if self._is_dark_cloud_cover(current, prev):
-            patterns.append(
-                DetectedPattern(
-                    pattern_type=PatternType.DARK_CLOUD_COVER,
-                    signal=PatternSignal.BEARISH,
-                    confidence=0.7,
-                    description='Dark Cloud Cover - Bearish reversal pattern',
-                )
-            )
+            patterns.append(_detected(PatternType.DARK_CLOUD_COVER, 0.7))
 
         return patterns
 
     def _detect_three_bar_patterns(
-        self, current: Bar, prev: Bar, prev_prev: Bar, bars: list[Bar]
+        self, current: Bar, prev: Bar, prev_prev: Bar, bars: Sequence[Bar]
     ) -> list[DetectedPattern]:
         """
         P1-3 Fix: Detect three-bar patterns (bars parameter for future enhancements).
@@ -419,47 +562,19 @@ class PatternDetector:
 
         # Morning Star - strong bullish reversal
         if self._is_morning_star(current, prev, prev_prev):
-            patterns.append(
-                DetectedPattern(
-                    pattern_type=PatternType.MORNING_STAR,
-                    signal=PatternSignal.BULLISH,
-                    confidence=0.9,
-                    description='Morning Star - Extremely strong bullish reversal',
-                )
-            )
+            patterns.append(_detected(PatternType.MORNING_STAR, 0.9))
 
         # Evening Star - strong bearish reversal
         if self._is_evening_star(current, prev, prev_prev):
-            patterns.append(
-                DetectedPattern(
-                    pattern_type=PatternType.EVENING_STAR,
-                    signal=PatternSignal.BEARISH,
-                    confidence=0.9,
-                    description='Evening Star - Extremely strong bearish reversal',
-                )
-            )
+            patterns.append(_detected(PatternType.EVENING_STAR, 0.9))
 
         # Three White Soldiers - strong bullish continuation
         if self._is_three_white_soldiers(current, prev, prev_prev):
-            patterns.append(
-                DetectedPattern(
-                    pattern_type=PatternType.THREE_WHITE_SOLDIERS,
-                    signal=PatternSignal.BULLISH,
-                    confidence=0.8,
-                    description='Three White Soldiers - Strong bullish continuation',
-                )
-            )
+            patterns.append(_detected(PatternType.THREE_WHITE_SOLDIERS, 0.8))
 
         # Three Black Crows - strong bearish continuation
         if self._is_three_black_crows(current, prev, prev_prev):
-            patterns.append(
-                DetectedPattern(
-                    pattern_type=PatternType.THREE_BLACK_CROWS,
-                    signal=PatternSignal.BEARISH,
-                    confidence=0.8,
-                    description='Three Black Crows - Strong bearish continuation',
-                )
-            )
+            patterns.append(_detected(PatternType.THREE_BLACK_CROWS, 0.8))
 
         return patterns
 
@@ -711,6 +826,143 @@ class PatternDetector:
 
         return all_bearish and descending and opens_within_body
 
+    # Batch scanning
+
+    def scan(self, bars: Sequence[Bar]) -> PatternScan:
+        """
+        Detect patterns at every bar of a series in one vectorized pass.
+
+        Row ``i`` of the result equals ``detect_patterns(bars[: i + 1])``,
+        including trend context, volume confirmation and early exit. A
+        ``BarFrame`` is scanned from its columns without building ``Bar``
+        objects; a list of bars is converted to fixed point exactly.
+
+        Args:
+            bars: Bars of one symbol in time order.
+
+        Returns:
+            PatternScan with one row per bar and one column per ``SCAN_PATTERNS`` entry.
+        """
+        if isinstance(bars, BarFrame):
+            volume = np.asarray(bars.volume, dtype=np.int64)
+            if bars.price_scale is None:
+                return self.scan_arrays(bars.open, bars.high, bars.low, bars.close, volume)
+            return self._scan([bars.open, bars.high, bars.low, bars.close], volume)
+        volume = np.fromiter((bar.volume for bar in bars), dtype=np.int64, count=len(bars))
+        return self._scan(_decimal_columns(bars), volume)
+
+    def scan_arrays(
+        self,
+        open_: ArrayLike,
+        high: ArrayLike,
+        low: ArrayLike,
+        close: ArrayLike,
+        volume: ArrayLike,
+    ) -> PatternScan:
+        """
+        Scan OHLCV arrays (see ``scan``).
+
+        Float prices with up to ``MAX_SCAN_DECIMALS`` decimals are compared as
+        exact fixed-point integers, matching the detector's Decimal arithmetic.
+        Prices with more precision fall back to float64 comparisons, which
+        can differ from ``detect_patterns`` on bars exactly at a threshold.
+        """
+        columns = [np.asarray(column, dtype=np.float64) for column in (open_, high, low, close)]
+        volumes = np.asarray(volume, dtype=np.int64)
+        decimals = _float_decimals(columns)
+        if decimals < 0:
+            return self._scan(columns, volumes)
+        scale = 10.0**decimals
+        return self._scan([np.round(column * scale).astype(np.int64) for column in columns], volumes)
+
+    def _scan(self, prices: Sequence[_PriceColumn], volume: NDArray[np.int64]) -> PatternScan:
+        """
+        Evaluate every rule at every bar.
+
+        ``prices`` holds the open, high, low and close columns as exact
+        integers (or floats on the fallback path). Each
+        ratio test of the Decimal rules is cross-multiplied so that no
+        division is needed, e.g. ``body / range < 0.1`` becomes
+        ``10 * body < range``.
+        """
+        n = len(volume)
+        thr_num, thr_den = _exact_ratio(self.body_threshold)
+        wick_num, wick_den = _exact_ratio(self.wick_ratio)
+        limit = 2 * max(10, thr_num, thr_den, wick_num, wick_den)
+        if isinstance(prices[0], np.ndarray) and prices[0].dtype == np.float64:
+            columns = list(prices)
+        else:
+            columns = [_integer_array(cast('Sequence[int] | NDArray[np.int64]', column), limit) for column in prices]
+        # Typed as int64; object (beyond int64) and float64 columns support the same operators
+        o, h, lo, c = cast('list[NDArray[np.int64]]', columns)
+        strength = np.zeros((n, len(SCAN_PATTERNS)))
+        if n == 0:
+            return PatternScan(SCAN_PATTERNS, strength)
+
+        # Single-bar shape
+        body = np.abs(c - o)
+        total_range = h - lo
+        has_range = total_range != 0
+        upper_wick = h - np.maximum(o, c)
+        lower_wick = np.minimum(o, c) - lo
+        small_body = has_range & (body * thr_den < total_range * thr_num)
+        doji = has_range & (body * 10 < total_range)
+        hammer = small_body & (lower_wick * wick_den > body * wick_num) & (upper_wick * 10 < body) & (c >= o)
+        shooting_star = small_body & (upper_wick * wick_den > body * wick_num) & (lower_wick * 10 < body) & (c <= o)
+        spinning_top = small_body & (upper_wick > 0) & (lower_wick > 0)
+
+        # Context needs LOOKBACK_BARS of history: trend vs the 5-bar SMA, volume vs the 9 bars before
+        context = np.arange(n) >= self.LOOKBACK_BARS - 1
+        window = 5
+        close_sum = c.copy()
+        for lag in range(1, window):
+            close_sum[lag:] = close_sum[lag:] + c[:-lag]
+        downtrend = context & (c * window < close_sum)
+        uptrend = context & (c * window > close_sum)
+        volume_sums = np.concatenate(([0], np.cumsum(volume)))
+        prior_volume = np.zeros(n)
+        if n > 9:
+            prior_volume[9:] = volume_sums[9:n] - volume_sums[: n - 9]
+        has_volume = context & (volume >= prior_volume / 9 * 1.5)
+
+        strength[:, 0] = np.where(doji, 0.6, 0.0)
+        strength[:, 1] = np.where(hammer & downtrend, np.where(has_volume, 0.85, 0.60), 0.0)
+        strength[:, 2] = np.where(shooting_star & uptrend, np.where(has_volume, 0.85, 0.60), 0.0)
+        strength[:, 3] = np.where(spinning_top, 0.5, 0.0)
+
+        # Two-bar patterns at bars 1.. (``p*`` = previous bar)
+        if n >= 2:
+            po, pc, co, cc = o[:-1], c[:-1], o[1:], c[1:]
+            prev_bearish = pc < po
+            prev_bullish = pc > po
+            bullish = cc > co
+            bearish = cc < co
+            two_volume = has_volume[1:]
+            bullish_engulfing = prev_bearish & bullish & (co < pc) & (cc > po)
+            bearish_engulfing = prev_bullish & bearish & (co > pc) & (cc < po)
+            strength[1:, 4] = np.where(bullish_engulfing, np.where(two_volume, 0.90, 0.75), 0.0)
+            strength[1:, 5] = np.where(bearish_engulfing, np.where(two_volume, 0.90, 0.75), 0.0)
+            strength[1:, 6] = np.where(prev_bearish & bullish & (co < pc) & (cc * 2 > po + pc), 0.7, 0.0)
+            strength[1:, 7] = np.where(prev_bullish & bearish & (co > pc) & (cc * 2 < po + pc), 0.7, 0.0)
+
+        # Three-bar patterns at bars 2.. (``pp*`` = two bars back)
+        if n >= 3:
+            ppo, ppc, po, pc, co, cc = o[:-2], c[:-2], o[1:-1], c[1:-1], o[2:], c[2:]
+            star = np.abs(pc - po) * 10 < np.abs(ppc - ppo) * 3
+            strength[2:, 8] = np.where((ppc < ppo) & star & (cc > co) & (cc * 2 > ppo + ppc), 0.9, 0.0)
+            strength[2:, 9] = np.where((ppc > ppo) & star & (cc < co) & (cc * 2 < ppo + ppc), 0.9, 0.0)
+            soldiers = (ppc > ppo) & (pc > po) & (cc > co) & (ppc < pc) & (pc < cc) & (po > ppo) & (co > po)
+            crows = (ppc < ppo) & (pc < po) & (cc < co) & (ppc > pc) & (pc > cc) & (po < ppo) & (co < po)
+            strength[2:, 10] = np.where(soldiers, 0.8, 0.0)
+            strength[2:, 11] = np.where(crows, 0.8, 0.0)
+
+        # Early exit: two strong patterns stop detection of the later groups
+        strong_single = (strength[:, _SINGLE_BAR_COLUMNS] > STRONG_CONFIDENCE).sum(axis=1)
+        strength[strong_single >= 2, _TWO_BAR_COLUMNS] = 0.0
+        strong_two = strong_single + (strength[:, _TWO_BAR_COLUMNS] > STRONG_CONFIDENCE).sum(axis=1)
+        strength[strong_two >= 2, _THREE_BAR_COLUMNS] = 0.0
+        return PatternScan(SCAN_PATTERNS, strength)
+
     def get_strongest_signal(self, patterns: list[DetectedPattern]) -> PatternSignal:
         """
         Get the strongest trading signal from detected patterns.
@@ -739,6 +991,8 @@ class PatternDetector:
 
 __all__ = [
     'PatternDetector',
+    'PatternScan',
+    'SCAN_PATTERNS',
     'DetectedPattern',
     'PatternType',
     'PatternSignal',
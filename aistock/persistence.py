@@ -5,11 +5,11 @@ from __future__ import annotations
 import csv
 import json
 import threading
-from collections.abc import Iterable
+from collections.abc import Callable, Iterable
 from datetime import date, datetime, timezone
 from decimal import Decimal
 from pathlib import Path
-from typing import TypeAlias, cast
+from typing import IO, TypeAlias, cast
 
 from .audit import JSONValue
 from .engine import Trade
@@ -23,7 +23,7 @@ _PERSISTENCE_LOCK = threading.Lock()
 JSONDict: TypeAlias = dict[str, JSONValue]
 
 
-def _atomic_write_json(data: JSONValue, filepath: Path) -> None:
+def _atomic_write(filepath: Path, write: Callable[[IO[bytes]], None]) -> None:
     """
     P0-5 Fix: Atomic write with locking to prevent corruption.
     P2-1 Fix: Enhanced temp file cleanup in finally block.
@@ -36,8 +36,8 @@ def _atomic_write_json(data: JSONValue, filepath: Path) -> None:
     5. Guaranteed temp file cleanup via finally block
 
     Args:
-        data: JSON-serializable data
         filepath: Target file path
+        write: Callback that writes the file contents to a binary handle
     """
     with _PERSISTENCE_LOCK:
         # Ensure parent directory exists
@@ -49,8 +49,8 @@ def _atomic_write_json(data: JSONValue, filepath: Path) -> None:
 
         try:
             # Step 1: Write data to temp file
-            with temp_path.open('w') as handle:
-                json.dump(data, handle, indent=2)
+            with temp_path.open('wb') as handle:
+                write(handle)
 
             # Step 2: Create backup of existing file (if it exists)
             if filepath.exists():
@@ -73,11 +73,25 @@ def _atomic_write_json(data: JSONValue, filepath: Path) -> None:
                     temp_path.unlink()
 
 
+def _atomic_write_json(data: JSONValue, filepath: Path) -> None:
+    """Atomically write ``data`` as indented JSON (see ``_atomic_write``)."""
+
+    def write(handle: IO[bytes]) -> None:
+        handle.write(json.dumps(data, indent=2).encode())
+
+    _atomic_write(filepath, write)
+
+
 def atomic_write_json(data: JSONValue, filepath: Path) -> None:
     """Public wrapper for atomic JSON writes."""
     _atomic_write_json(data, filepath)
 
 
+def atomic_write_bytes(write: Callable[[IO[bytes]], None], filepath: Path) -> None:
+    """Public wrapper for atomic binary writes; ``write`` streams the contents to the temp file."""
+    _atomic_write(filepath, write)
+
+
 def write_trades(trades: Iterable[Trade], path: str) -> None:
     target = Path(path)
     target.parent.mkdir(parents=True, exist_ok=True)
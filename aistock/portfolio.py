@@ -164,6 +164,14 @@ class Portfolio:
             pos = self.positions.get(symbol)
             return pos.quantity if pos else Decimal('0')
 
+    def get_cash_float(self) -> float:
+        """Cash as a float, for simulation and feature code (thread-safe)."""
+        return float(self.get_cash())
+
+    def get_position_float(self, symbol: str) -> float:
+        """Position quantity as a float, for simulation and feature code (thread-safe)."""
+        return float(self.get_position(symbol))
+
     def get_avg_price(self, symbol: str) -> Decimal | None:
         """Get average entry price for symbol (thread-safe)."""
         with self._lock:
@@ -294,6 +302,10 @@ class Portfolio:
 
             return self.cash + position_value
 
+    def get_equity_float(self, last_prices: dict[str, Decimal]) -> float:
+        """Total equity as a float, for simulation and feature code (thread-safe)."""
+        return float(self.get_equity(last_prices))
+
     def total_equity(self, last_prices: dict[str, Decimal]) -> Decimal:
         """Alias for get_equity for compatibility (thread-safe)."""
         return self.get_equity(last_prices)
@@ -13,6 +13,7 @@ from __future__ import annotations
 
 import threading
 from collections import defaultdict, deque
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from enum import Enum
@@ -55,6 +56,9 @@ class ProfessionalSafeguards:
     - Timeframe divergence (conflicting signals)
     """
 
+    # Most bars any check reads back from the latest one (news-event volume average)
+    LOOKBACK_BARS = 20
+
     def __init__(
         self,
         max_trades_per_hour: int = 20,
@@ -89,7 +93,7 @@ class ProfessionalSafeguards:
     def check_trading_allowed(
         self,
         symbol: str,
-        bars: list[Bar],
+        bars: Sequence[Bar],
         current_time: datetime | None = None,
         timeframe_divergence: bool = False,
     ) -> TradingSafeguardResult:
@@ -253,7 +257,7 @@ class ProfessionalSafeguards:
 
         return {'allowed': True, 'warning': warning, 'reason': None}
 
-    def _check_price_spike(self, bars: list[Bar]) -> dict[str, object]:
+    def _check_price_spike(self, bars: Sequence[Bar]) -> dict[str, object]:
         """Check if price is spiking (chasing detection)."""
         if len(bars) < 5:
             return {'is_spike': False, 'warning': None, 'spike_pct': 0.0}
@@ -279,7 +283,7 @@ class ProfessionalSafeguards:
 
         return {'is_spike': is_spike, 'warning': warning, 'spike_pct': spike_pct}
 
-    def _check_news_event(self, bars: list[Bar]) -> dict[str, object]:
+    def _check_news_event(self, bars: Sequence[Bar]) -> dict[str, object]:
         """Check for unusual volume/volatility (likely news event)."""
         if len(bars) < 20:
             return {'likely_news': False, 'warning': None, 'volume_ratio': 1.0}
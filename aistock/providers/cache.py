@@ -2,36 +2,207 @@
 Disk caching layer for Massive.com data.
 
 Stores fetched data locally to avoid repeated API calls and respect rate limits.
+Bars are kept in memory-mapped binary month files (see ``month_file``); months
+still in the original JSON format are read transparently until migrated with
+``MassiveCache.migrate_legacy_months`` or ``scripts/migrate_massive_cache.py``.
+
+Decoded months are also kept in a process-wide, byte-budgeted LRU so that
+overlapping walk-forward windows read and decode each month from disk once.
+
+Which months are cached is answered from an in-memory coverage index (see
+``coverage``) rather than by checking the filesystem month by month. Months
+the API returned no bars for are indexed as empty and have no file.
+
+Months can be written compressed (``compression``), and a disk budget evicts
+the least recently accessed months once the cache outgrows it. Recency is the
+later of a month file's access and modification times; a writable cache
+stamps the access time itself whenever it reads a month from disk, so
+eviction does not depend on how the filesystem is mounted.
 """
 
 from __future__ import annotations
 
-import hashlib
+import contextlib
 import json
 import logging
-from dataclasses import asdict, dataclass
-from datetime import date, datetime, timezone
-from decimal import Decimal
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Iterator
+from datetime import date, timezone
 from pathlib import Path
 from typing import TYPE_CHECKING, cast
 
+import numpy as np
+
+from .coverage import CoverageIndex, CoverageVerification, MonthCoverage, SeriesKey, describe_month
+from .month_file import (
+    LEGACY_MONTH_SUFFIX,
+    MAX_MONTH_RUNS,
+    MONTH_CODECS,
+    MONTH_FILE_SUFFIX,
+    MonthFileError,
+    append_month_run,
+    available_codecs,
+    bars_to_month_frame,
+    compact_month_file,
+    date_bounds,
+    merge_runs,
+    month_file_codec,
+    read_legacy_json_month,
+    read_month_file,
+    read_month_runs,
+    split_months,
+    write_month_file,
+)
+
 if TYPE_CHECKING:
-    from ..data import Bar
+    from ..data import Bar, BarFrame
 
 
 logger = logging.getLogger(__name__)
 
+# Approximate resident size of one decoded Bar (object, datetime, four Decimals, int).
+DECODED_BAR_BYTES = 600
+DEFAULT_MEMORY_CACHE_BYTES = 512 * 1024 * 1024
+
+# Uncompressed size of one row in a month file (six 8-byte columns)
+MONTH_ROW_BYTES = 48
+# Eviction stops once the cache is back under this fraction of its disk budget
+DISK_BUDGET_LOW_WATERMARK = 0.9
+IDLE_MONTH_SECONDS = 30 * 24 * 3600
+
+# (cache root, asset_type, symbol, year-month, timespan)
+MonthKey = tuple[str, str, str, str, str]
+
+
+class CachedMonth:
+    """One cached month: its columns in memory and, once requested, the decoded bars."""
 
-@dataclass
-class CacheMetadata:
-    """Metadata for a cached data file."""
+    __slots__ = ('frame', 'bars')
 
-    symbol: str
-    start_date: str  # ISO format
-    end_date: str  # ISO format
-    timespan: str
-    fetch_timestamp: str  # ISO format
-    record_count: int
+    def __init__(self, frame: BarFrame) -> None:
+        self.frame = frame
+        self.bars: list[Bar] | None = None
+
+    @property
+    def nbytes(self) -> int:
+        decoded = len(self.bars) * DECODED_BAR_BYTES if self.bars is not None else 0
+        return self.frame.nbytes + decoded
+
+
+class DecodedMonthLRU:
+    """
+    Thread-safe LRU of cached months bounded by an approximate byte budget.
+
+    Bars handed out from the LRU are shared between callers and must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_CACHE_BYTES) -> None:
+        if max_bytes < 0:
+            raise ValueError(f'max_bytes must be non-negative, got {max_bytes}')
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[MonthKey, tuple[CachedMonth, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: MonthKey) -> CachedMonth | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: MonthKey, month: CachedMonth) -> None:
+        """Insert or re-account ``month`` (call again after decoding its bars)."""
+        size = month.nbytes
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            if size > self._max_bytes:
+                return
+            self._entries[key] = (month, size)
+            self._bytes += size
+            self._evict_locked()
+
+    def invalidate(self, predicate: Callable[[MonthKey], bool]) -> int:
+        """Drop every entry whose key matches ``predicate``; returns the number dropped."""
+        with self._lock:
+            stale = [key for key in self._entries if predicate(key)]
+            for key in stale:
+                self._bytes -= self._entries.pop(key)[1]
+            return len(stale)
+
+    def resize(self, max_bytes: int) -> None:
+        if max_bytes < 0:
+            raise ValueError(f'max_bytes must be non-negative, got {max_bytes}')
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict_locked()
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self._max_bytes,
+            }
+
+    def _evict_locked(self) -> None:
+        while self._bytes > self._max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+
+_decoded_months = DecodedMonthLRU()
+
+
+def _detached(frame: BarFrame) -> BarFrame:
+    """Read-only in-memory copy of a memory-mapped frame, so cached months do not hold files open."""
+    from ..data import BarFrame
+
+    columns = []
+    for name in ('timestamps', 'open', 'high', 'low', 'close', 'volume'):
+        column = np.array(getattr(frame, name))
+        column.flags.writeable = False
+        columns.append(column)
+    return BarFrame(frame.symbol, *columns, price_scale=frame.price_scale, tz=frame.tz, validate=False)
+
+
+def get_decoded_month_cache() -> DecodedMonthLRU:
+    """The process-wide LRU shared by every ``MassiveCache`` instance."""
+    return _decoded_months
 
 
 class MassiveCache:
@@ -42,69 +213,89 @@ class MassiveCache:
         {cache_dir}/
             stocks/
                 AAPL/
-                    2024-01_minute.json
-                    2024-02_minute.json
+                    2024-01_minute.bars
+                    2024-02_minute.bars
             futures/
                 ESH26/
-                    2024-01_minute.json
+                    2024-01_minute.bars
             corporate_actions/
                 ipos.json
                 splits.json
                 dividends.json
                 ticker_events.json
             metadata/
-                cache_index.json
+                coverage.json
+                coverage.journal
     """
 
-    def __init__(self, cache_dir: str | Path = 'data/massive_cache') -> None:
+    def __init__(
+        self,
+        cache_dir: str | Path = 'data/massive_cache',
+        memory_cache_bytes: int | None = None,
+        read_only: bool = False,
+        compression: str = 'none',
+        disk_budget_bytes: int | None = None,
+    ) -> None:
         """
         Initialize the cache.
 
         Args:
             cache_dir: Directory to store cached data.
+            memory_cache_bytes: If given, resize the process-wide decoded-month
+                LRU to this budget (0 disables it).
+            read_only: Never create, write or delete files (e.g. in backtest
+                worker processes); mutating methods raise PermissionError.
+            compression: Codec for months written from now on: ``'none'``
+                (memory-mapped reads) or one of ``month_file.MONTH_CODECS``.
+                A codec this Python lacks (``zstd`` before 3.14) falls back
+                to ``zlib``.
+            disk_budget_bytes: If given, evict the least recently accessed
+                months whenever a store leaves the month files above this size.
         """
+        if compression not in MONTH_CODECS:
+            raise ValueError(f'Unknown cache compression {compression!r}; expected one of {MONTH_CODECS}')
+        if compression not in available_codecs():
+            logger.warning(f'Compression {compression!r} is not available in this Python; using zlib')
+            compression = 'zlib'
+        if disk_budget_bytes is not None and disk_budget_bytes < 0:
+            raise ValueError(f'disk_budget_bytes must be non-negative, got {disk_budget_bytes}')
         self._cache_dir = Path(cache_dir)
-        self._cache_dir.mkdir(parents=True, exist_ok=True)
-
-        # Create subdirectories
-        (self._cache_dir / 'stocks').mkdir(exist_ok=True)
-        (self._cache_dir / 'futures').mkdir(exist_ok=True)
-        (self._cache_dir / 'corporate_actions').mkdir(exist_ok=True)
-        (self._cache_dir / 'metadata').mkdir(exist_ok=True)
-
-        self._index_path = self._cache_dir / 'metadata' / 'cache_index.json'
-        self._index: dict[str, CacheMetadata] = self._load_index()
-
-    def _load_index(self) -> dict[str, CacheMetadata]:
-        """Load cache index from disk."""
-        if not self._index_path.exists():
-            return {}
-
-        try:
-            with open(self._index_path) as f:
-                data = json.load(f)
-            return {k: CacheMetadata(**v) for k, v in data.items()}
-        except (json.JSONDecodeError, TypeError, KeyError) as e:
-            logger.warning(f'Failed to load cache index: {e}')
-            return {}
-
-    def _save_index(self) -> None:
-        """Save cache index to disk."""
-        data = {k: asdict(v) for k, v in self._index.items()}
-        with open(self._index_path, 'w') as f:
-            json.dump(data, f, indent=2)
-
-    def _get_cache_key(
-        self,
-        symbol: str,
-        start_date: date,
-        end_date: date,
-        timespan: str,
-        asset_type: str = 'stocks',
-    ) -> str:
-        """Generate a unique cache key."""
-        key_str = f'{asset_type}:{symbol}:{start_date.isoformat()}:{end_date.isoformat()}:{timespan}'
-        return hashlib.sha256(key_str.encode()).hexdigest()[:16]
+        self._read_only = read_only
+        self._compression = compression
+        self._disk_budget = disk_budget_bytes
+        self._memory = get_decoded_month_cache()
+        if memory_cache_bytes is not None:
+            self._memory.resize(memory_cache_bytes)
+
+        if not read_only:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+            # Create subdirectories
+            (self._cache_dir / 'stocks').mkdir(exist_ok=True)
+            (self._cache_dir / 'futures').mkdir(exist_ok=True)
+            (self._cache_dir / 'corporate_actions').mkdir(exist_ok=True)
+            (self._cache_dir / 'metadata').mkdir(exist_ok=True)
+        self._cache_root = str(self._cache_dir.resolve())
+
+        self._coverage = CoverageIndex(self._cache_dir / 'metadata', read_only=read_only)
+        # First open of this cache (or an unreadable index): index what is on disk once
+        self._coverage.load_or_replace(lambda: self._scan_months()[0])
+
+    @property
+    def read_only(self) -> bool:
+        return self._read_only
+
+    @property
+    def compression(self) -> str:
+        return self._compression
+
+    @property
+    def disk_budget_bytes(self) -> int | None:
+        return self._disk_budget
+
+    def _check_writable(self) -> None:
+        if self._read_only:
+            raise PermissionError(f'MassiveCache at {self._cache_dir} is read-only')
 
     def _get_cache_path(
         self,
@@ -116,7 +307,94 @@ class MassiveCache:
         """Get the file path for cached data."""
         # Sanitize symbol for filesystem (e.g., ES/H26 -> ES_H26)
         safe_symbol = symbol.replace('/', '_').replace('\\', '_')
-        return self._cache_dir / asset_type / safe_symbol / f'{year_month}_{timespan}.json'
+        return self._cache_dir / asset_type / safe_symbol / f'{year_month}_{timespan}{MONTH_FILE_SUFFIX}'
+
+    def _series_key(self, symbol: str, timespan: str, asset_type: str) -> SeriesKey:
+        return (asset_type, symbol.replace('/', '_').replace('\\', '_'), timespan)
+
+    def _covered_months(self, symbol: str, timespan: str, asset_type: str) -> dict[str, MonthCoverage]:
+        """Months of a series cached in either the binary or the legacy JSON format."""
+        return self._coverage.months(self._series_key(symbol, timespan, asset_type))
+
+    def _read_month(self, cache_path: Path) -> BarFrame | None:
+        """Read one cached month, falling back to its legacy JSON file; None if not cached."""
+        legacy_path = cache_path.with_suffix(LEGACY_MONTH_SUFFIX)
+        try:
+            if cache_path.exists():
+                frame = read_month_file(cache_path)
+                self._touch(cache_path)
+                return frame
+            if legacy_path.exists():
+                bars = read_legacy_json_month(legacy_path)
+                return bars_to_month_frame(bars[0].symbol, bars) if bars else None
+        except (OSError, MonthFileError, json.JSONDecodeError, KeyError, ValueError) as e:
+            logger.warning(f'Failed to load cache {cache_path}: {e}')
+        return None
+
+    def _touch(self, path: Path) -> None:
+        """Stamp a month's access time (the eviction recency) without changing its modification time."""
+        if self._read_only:
+            return
+        try:
+            os.utime(path, ns=(time.time_ns(), path.stat().st_mtime_ns))
+        except OSError as e:
+            logger.debug(f'Could not update access time of {path}: {e}')
+
+    def _month_key(self, symbol: str, year_month: str, timespan: str, asset_type: str) -> MonthKey:
+        safe_symbol = symbol.replace('/', '_').replace('\\', '_')
+        return (self._cache_root, asset_type, safe_symbol, year_month, timespan)
+
+    def _cached_month(self, symbol: str, year_month: str, timespan: str, asset_type: str) -> CachedMonth | None:
+        """Return a month from the in-memory LRU, reading it from disk on a miss."""
+        memory = self._memory
+        if not memory.enabled:
+            frame = self._read_month(self._get_cache_path(symbol, year_month, timespan, asset_type))
+            return CachedMonth(frame) if frame is not None else None
+
+        key = self._month_key(symbol, year_month, timespan, asset_type)
+        month = memory.get(key)
+        if month is None:
+            frame = self._read_month(self._get_cache_path(symbol, year_month, timespan, asset_type))
+            if frame is None:
+                return None
+            month = CachedMonth(_detached(frame))
+            memory.put(key, month)
+        return month
+
+    def _iter_months(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        timespan: str,
+        asset_type: str,
+    ) -> Iterator[tuple[str, CachedMonth, int, int]]:
+        """Yield ``(year_month, month, lo, hi)`` per cached month in range; rows ``[lo, hi)`` cover the dates."""
+        covered = self._covered_months(symbol, timespan, asset_type)
+        current = date(start_date.year, start_date.month, 1)
+        while current <= end_date:
+            year_month = current.strftime('%Y-%m')
+            coverage = covered.get(year_month)
+            month = (
+                self._cached_month(symbol, year_month, timespan, asset_type)
+                if coverage is not None and not coverage.empty
+                else None
+            )
+            if month is not None:
+                lo, hi = date_bounds(month.frame, start_date, end_date)
+                if hi > lo:
+                    yield year_month, month, lo, hi
+
+            # Move to next month
+            current = (
+                date(current.year + 1, 1, 1)
+                if current.month == 12
+                else date(current.year, current.month + 1, 1)
+            )
+
+    def get_memory_cache_stats(self) -> dict[str, int]:
+        """Hit/miss/eviction counters and byte usage of the shared decoded-month LRU."""
+        return self._memory.stats()
 
     def has_cached_data(
         self,
@@ -140,11 +418,10 @@ class MassiveCache:
             True if all required data is cached.
         """
         # Check each month in the range
+        covered = self._covered_months(symbol, timespan, asset_type)
         current = date(start_date.year, start_date.month, 1)
         while current <= end_date:
-            year_month = current.strftime('%Y-%m')
-            cache_path = self._get_cache_path(symbol, year_month, timespan, asset_type)
-            if not cache_path.exists():
+            if current.strftime('%Y-%m') not in covered:
                 return False
 
             # Move to next month
@@ -172,13 +449,13 @@ class MassiveCache:
         """
         missing: list[tuple[date, date]] = []
         current_missing_start: date | None = None
+        covered = self._covered_months(symbol, timespan, asset_type)
 
         current = date(start_date.year, start_date.month, 1)
         while current <= end_date:
             year_month = current.strftime('%Y-%m')
-            cache_path = self._get_cache_path(symbol, year_month, timespan, asset_type)
 
-            if not cache_path.exists():
+            if year_month not in covered:
                 if current_missing_start is None:
                     current_missing_start = current
             elif current_missing_start is not None:
@@ -217,7 +494,14 @@ class MassiveCache:
         asset_type: str = 'stocks',
     ) -> None:
         """
-        Store bars to cache, organized by month.
+        Store bars to cache, organized by (UTC) month.
+
+        Bars are added to what is already cached; on duplicate timestamps the
+        new bar wins. For a month already in the binary format only the new
+        rows are written, as a run appended to its file (see
+        ``month_file.append_month_run``). A legacy JSON month is merged into a
+        new binary file and removed. The month's entry in the coverage index
+        is journaled once its file is in place.
 
         Args:
             symbol: Ticker symbol.
@@ -227,58 +511,178 @@ class MassiveCache:
         """
         if not bars:
             return
+        self._check_writable()
+
+        # Sort once; every month is then a contiguous slice
+        frame = bars_to_month_frame(symbol, bars)
+        series_key = self._series_key(symbol, timespan, asset_type)
+        covered = self._coverage.months(series_key)
+        written: set[tuple[SeriesKey, str]] = set()
+        for year_month, month_frame in split_months(frame):
+            cache_path = self._get_cache_path(symbol, year_month, timespan, asset_type)
+            coverage = self._add_to_month(cache_path, month_frame, covered.get(year_month))
+            cache_path.with_suffix(LEGACY_MONTH_SUFFIX).unlink(missing_ok=True)
+            stale = self._month_key(symbol, year_month, timespan, asset_type)
+            self._memory.invalidate(lambda key, stale=stale: key == stale)
+            self._coverage.record(series_key, year_month, coverage)
+            written.add((series_key, year_month))
 
-        # Group bars by year-month
-        bars_by_month: dict[str, list[dict[str, object]]] = {}
-        for bar in bars:
-            year_month = bar.timestamp.strftime('%Y-%m')
-            if year_month not in bars_by_month:
-                bars_by_month[year_month] = []
-
-            bars_by_month[year_month].append(
-                {
-                    'symbol': bar.symbol,
-                    'timestamp': bar.timestamp.isoformat(),
-                    'open': str(bar.open),
-                    'high': str(bar.high),
-                    'low': str(bar.low),
-                    'close': str(bar.close),
-                    'volume': bar.volume,
-                }
-            )
+            logger.debug(f'Cached {len(month_frame)} bars for {symbol} {year_month}')
 
-        # Write each month's data
-        safe_symbol = symbol.replace('/', '_').replace('\\', '_')
-        symbol_dir = self._cache_dir / asset_type / safe_symbol
-        symbol_dir.mkdir(parents=True, exist_ok=True)
+        if self._disk_budget is not None:
+            self.enforce_disk_budget(keep=written)
 
-        for year_month, month_bars in bars_by_month.items():
-            cache_path = self._get_cache_path(symbol, year_month, timespan, asset_type)
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
+    def record_empty_month(
+        self,
+        symbol: str,
+        year_month: str,
+        timespan: str = 'minute',
+        asset_type: str = 'stocks',
+    ) -> None:
+        """
+        Index a month the API returned no bars for, so it counts as cached.
 
-            with open(cache_path, 'w') as f:
-                json.dump(month_bars, f)
+        No file is written. A month that already holds bars is left as is.
 
-            logger.debug(f'Cached {len(month_bars)} bars for {symbol} {year_month}')
+        Args:
+            symbol: Ticker symbol.
+            year_month: Month as ``YYYY-MM``.
+            timespan: Data timespan.
+            asset_type: Asset type (stocks, futures).
+        """
+        self._check_writable()
+        series_key = self._series_key(symbol, timespan, asset_type)
+        if year_month in self._coverage.months(series_key):
+            return
+        self._coverage.record(series_key, year_month, MonthCoverage(0, 0, 0))
+        logger.debug(f'Recorded {symbol} {year_month} as empty')
 
-        # Update index
-        if bars:
-            key = self._get_cache_key(
-                symbol,
-                bars[0].timestamp.date(),
-                bars[-1].timestamp.date(),
-                timespan,
-                asset_type,
-            )
-            self._index[key] = CacheMetadata(
-                symbol=symbol,
-                start_date=bars[0].timestamp.date().isoformat(),
-                end_date=bars[-1].timestamp.date().isoformat(),
-                timespan=timespan,
-                fetch_timestamp=datetime.now(timezone.utc).isoformat(),
-                record_count=len(bars),
+    def _add_to_month(self, cache_path: Path, frame: BarFrame, previous: MonthCoverage | None) -> MonthCoverage:
+        """Write ``frame`` into a cached month and return the month's new extent."""
+        codec = self._compression
+        if not cache_path.exists():
+            legacy = self._read_month(cache_path)
+            if legacy is not None:
+                merged = merge_runs([legacy, frame])
+                size = write_month_file(cache_path, merged, codec)
+                return MonthCoverage.from_frame(merged, size)
+
+        # A new month is created under the month lock too, in case another process creates it first
+        runs = append_month_run(cache_path, frame, codec)
+        if runs > MAX_MONTH_RUNS:
+            compact_month_file(cache_path, codec)
+            logger.debug(f'Compacted {cache_path} ({runs} runs)')
+        size = cache_path.stat().st_size
+        if runs == 1:
+            # The file was unreadable and now holds just ``frame``
+            return MonthCoverage.from_frame(frame, size)
+        if runs <= MAX_MONTH_RUNS and previous is not None and int(frame.timestamps[0]) > previous.last_ns:
+            # Appended after the month's last bar: the extent follows without reading the month
+            return MonthCoverage(previous.first_ns, int(frame.timestamps[-1]), previous.bar_count + len(frame), size)
+        return MonthCoverage.from_frame(read_month_file(cache_path), size)
+
+    def _month_path(self, key: SeriesKey, year_month: str) -> Path:
+        """File holding an indexed month: the binary file, or its legacy JSON file if that is all there is."""
+        asset_type, symbol, timespan = key
+        cache_path = self._get_cache_path(symbol, year_month, timespan, asset_type)
+        legacy_path = cache_path.with_suffix(LEGACY_MONTH_SUFFIX)
+        return legacy_path if not cache_path.exists() and legacy_path.exists() else cache_path
+
+    def enforce_disk_budget(
+        self,
+        budget_bytes: int | None = None,
+        keep: Collection[tuple[SeriesKey, str]] = (),
+    ) -> list[str]:
+        """
+        Evict the least recently accessed months while the month files exceed the disk budget.
+
+        Eviction continues down to ``DISK_BUDGET_LOW_WATERMARK`` of the budget
+        so that every later store does not evict again. Evicted months are
+        simply no longer cached and are fetched again when next needed.
+
+        Args:
+            budget_bytes: Budget to enforce (defaults to the cache's own).
+            keep: ``(series key, YYYY-MM)`` months never to evict.
+
+        Returns:
+            Labels of the evicted months, least recently accessed first.
+        """
+        budget = self._disk_budget if budget_bytes is None else budget_bytes
+        if budget is None or self._coverage.total_bytes <= budget:
+            return []
+        self._check_writable()
+
+        candidates: list[tuple[int, SeriesKey, str, Path]] = []
+        for key, months in self._coverage.series():
+            for year_month, coverage in months.items():
+                # Empty months hold no bytes; evicting them would only cost a request
+                if coverage.empty or (key, year_month) in keep:
+                    continue
+                path = self._month_path(key, year_month)
+                try:
+                    stat = path.stat()
+                    last_access = max(stat.st_atime_ns, stat.st_mtime_ns)
+                except FileNotFoundError:
+                    last_access = 0
+                candidates.append((last_access, key, year_month, path))
+        candidates.sort(key=lambda candidate: candidate[0])
+
+        target = int(budget * DISK_BUDGET_LOW_WATERMARK)
+        evicted: list[str] = []
+        root = self._cache_root
+        for _, key, year_month, path in candidates:
+            if self._coverage.total_bytes <= target:
+                break
+            path.unlink(missing_ok=True)
+            path.with_suffix(LEGACY_MONTH_SUFFIX).unlink(missing_ok=True)
+            stale = (root, key[0], key[1], year_month, key[2])
+            self._memory.invalidate(lambda month_key, stale=stale: month_key == stale)
+            self._coverage.record(key, year_month, None)
+            evicted.append(describe_month(key, year_month))
+        if evicted:
+            logger.info(
+                f'Evicted {len(evicted)} least recently used months from {self._cache_dir} '
+                f'({self._coverage.total_bytes:,} of {budget:,} budget bytes in use)'
             )
-            self._save_index()
+        return evicted
+
+    def compress_months(self, codec: str | None = None) -> int:
+        """
+        Rewrite every cached binary month with ``codec`` (default: the cache's own).
+
+        Months already in that codec as a single run are left alone; legacy JSON
+        months are converted by ``migrate_legacy_months`` instead.
+
+        Returns:
+            Number of months rewritten.
+        """
+        self._check_writable()
+        codec = self._compression if codec is None else codec
+        if codec not in available_codecs():
+            raise ValueError(f'Unsupported month codec {codec!r}; available: {available_codecs()}')
+        rewritten = 0
+        root = self._cache_root
+        for key, months in self._coverage.series():
+            for year_month, coverage in months.items():
+                path = self._month_path(key, year_month)
+                if coverage.empty or path.suffix != MONTH_FILE_SUFFIX:
+                    continue
+                try:
+                    if month_file_codec(path) == codec and len(read_month_runs(path)[0]) == 1:
+                        continue
+                    compact_month_file(path, codec)
+                except (OSError, MonthFileError) as e:
+                    logger.warning(f'Skipping unreadable cache file {path}: {e}')
+                    continue
+                stale = (root, key[0], key[1], year_month, key[2])
+                self._memory.invalidate(lambda month_key, stale=stale: month_key == stale)
+                self._coverage.record(
+                    key,
+                    year_month,
+                    MonthCoverage(coverage.first_ns, coverage.last_ns, coverage.bar_count, path.stat().st_size),
+                )
+                rewritten += 1
+        return rewritten
 
     def load_bars(
         self,
@@ -301,47 +705,165 @@ class MassiveCache:
         Returns:
             List of Bar objects, sorted by timestamp.
         """
-        from ..data import Bar
-
         all_bars: list[Bar] = []
+        for year_month, month, lo, hi in self._iter_months(symbol, start_date, end_date, timespan, asset_type):
+            if month.bars is None:
+                month.bars = month.frame.to_bars()
+                # Re-account the entry now that it holds decoded bars
+                if self._memory.enabled:
+                    self._memory.put(self._month_key(symbol, year_month, timespan, asset_type), month)
+            all_bars.extend(month.bars[lo:hi])
+        return all_bars
 
-        current = date(start_date.year, start_date.month, 1)
-        while current <= end_date:
-            year_month = current.strftime('%Y-%m')
-            cache_path = self._get_cache_path(symbol, year_month, timespan, asset_type)
+    def load_frame(
+        self,
+        symbol: str,
+        start_date: date,
+        end_date: date,
+        timespan: str = 'minute',
+        asset_type: str = 'stocks',
+    ) -> BarFrame:
+        """
+        Load cached bars as a columnar ``BarFrame`` without building ``Bar`` objects.
 
-            if cache_path.exists():
-                try:
-                    with open(cache_path) as f:
-                        month_data = json.load(f)
-
-                    for bar_dict in month_data:
-                        ts = datetime.fromisoformat(bar_dict['timestamp'])
-                        if start_date <= ts.date() <= end_date:
-                            all_bars.append(
-                                Bar(
-                                    symbol=bar_dict['symbol'],
-                                    timestamp=ts,
-                                    open=Decimal(bar_dict['open']),
-                                    high=Decimal(bar_dict['high']),
-                                    low=Decimal(bar_dict['low']),
-                                    close=Decimal(bar_dict['close']),
-                                    volume=int(bar_dict['volume']),
-                                )
-                            )
-                except (json.JSONDecodeError, KeyError, ValueError) as e:
-                    logger.warning(f'Failed to load cache {cache_path}: {e}')
+        A range within a single month is a read-only view of the cached month;
+        ranges spanning several months are concatenated into one frame.
+        """
+        from ..data import BarFrame
+
+        frames = [
+            month.frame[lo:hi]
+            for _, month, lo, hi in self._iter_months(symbol, start_date, end_date, timespan, asset_type)
+        ]
+        if not frames:
+            return BarFrame.empty(symbol, tz=timezone.utc)
+        if len(frames) == 1:
+            return frames[0]
+        return BarFrame(
+            frames[0].symbol,
+            timestamps=np.concatenate([f.timestamps for f in frames]),
+            open=np.concatenate([f.prices('open') for f in frames]),
+            high=np.concatenate([f.prices('high') for f in frames]),
+            low=np.concatenate([f.prices('low') for f in frames]),
+            close=np.concatenate([f.prices('close') for f in frames]),
+            volume=np.concatenate([f.volume for f in frames]),
+            tz=timezone.utc,
+            validate=False,
+        )
+
+    def migrate_legacy_months(self, remove_legacy: bool = True) -> int:
+        """
+        Convert every legacy JSON month file under stocks/ and futures/ to the binary format.
 
-            # Move to next month
-            current = (
-                date(current.year + 1, 1, 1)
-                if current.month == 12
-                else date(current.year, current.month + 1, 1)
-            )
+        Args:
+            remove_legacy: Delete each JSON file once its binary file is written.
 
-        # Sort by timestamp
-        all_bars.sort(key=lambda b: b.timestamp)
-        return all_bars
+        Returns:
+            Number of months converted.
+        """
+        self._check_writable()
+        migrated = 0
+        for asset_type in ('stocks', 'futures'):
+            for legacy_path in sorted((self._cache_dir / asset_type).glob(f'*/*{LEGACY_MONTH_SUFFIX}')):
+                cache_path = legacy_path.with_suffix(MONTH_FILE_SUFFIX)
+                if not cache_path.exists():
+                    try:
+                        bars = read_legacy_json_month(legacy_path)
+                    except (OSError, json.JSONDecodeError, KeyError, ValueError) as e:
+                        logger.warning(f'Skipping unreadable cache file {legacy_path}: {e}')
+                        continue
+                    frame = bars_to_month_frame(legacy_path.parent.name, bars)
+                    size = write_month_file(cache_path, frame, self._compression)
+                    year_month, _, timespan = cache_path.stem.partition('_')
+                    key = (asset_type, legacy_path.parent.name, timespan)
+                    self._coverage.record(key, year_month, MonthCoverage.from_frame(frame, size) if bars else None)
+                    migrated += 1
+                    logger.debug(f'Migrated {legacy_path} ({len(bars)} bars)')
+                if remove_legacy:
+                    legacy_path.unlink()
+        return migrated
+
+    def get_coverage(
+        self,
+        symbol: str,
+        timespan: str = 'minute',
+        asset_type: str = 'stocks',
+    ) -> dict[str, MonthCoverage]:
+        """First/last bar timestamp and bar count of every cached month of a symbol, by ``YYYY-MM``."""
+        return dict(self._covered_months(symbol, timespan, asset_type))
+
+    def verify_index(self, repair: bool = True) -> CoverageVerification:
+        """
+        Rebuild the coverage index from the month files on disk and compare.
+
+        Args:
+            repair: Replace the index with the rebuilt one (in memory only for
+                a read-only cache).
+
+        Returns:
+            Months that were on disk but not indexed, indexed but gone, or
+            indexed with a different extent; plus files that could not be read.
+        """
+        on_disk, unreadable = self._scan_months()
+        indexed = dict(self._coverage.series())
+        # Empty months have no file to find; they stay indexed unless a file has appeared
+        for key, months in indexed.items():
+            for year_month, coverage in months.items():
+                if coverage.empty and year_month not in on_disk.get(key, {}):
+                    on_disk.setdefault(key, {})[year_month] = coverage
+        report = CoverageVerification(
+            months_on_disk=sum(not month.empty for months in on_disk.values() for month in months.values()),
+            unreadable=unreadable,
+        )
+        for key in sorted(on_disk.keys() | indexed.keys()):
+            disk_months = on_disk.get(key, {})
+            index_months = indexed.get(key, {})
+            for year_month in sorted(disk_months.keys() | index_months.keys()):
+                label = describe_month(key, year_month)
+                if year_month not in index_months:
+                    report.missing.append(label)
+                elif year_month not in disk_months:
+                    report.stale.append(label)
+                elif disk_months[year_month] != index_months[year_month]:
+                    report.mismatched.append(label)
+        if repair and not report.consistent:
+            self._coverage.replace(on_disk)
+            report.repaired = True
+        return report
+
+    def _scan_months(self) -> tuple[dict[SeriesKey, dict[str, MonthCoverage]], list[str]]:
+        """Read the extent of every month file under stocks/ and futures/ (binary files win over JSON)."""
+        series: dict[SeriesKey, dict[str, MonthCoverage]] = {}
+        unreadable: list[str] = []
+        for asset_type in ('stocks', 'futures'):
+            asset_dir = self._cache_dir / asset_type
+            if not asset_dir.is_dir():
+                continue
+            for symbol_dir in sorted(asset_dir.iterdir()):
+                if not symbol_dir.is_dir():
+                    continue
+                paths = sorted(symbol_dir.glob(f'*{MONTH_FILE_SUFFIX}')) + sorted(
+                    path
+                    for path in symbol_dir.glob(f'*{LEGACY_MONTH_SUFFIX}')
+                    if not path.with_suffix(MONTH_FILE_SUFFIX).exists()
+                )
+                for path in paths:
+                    year_month, _, timespan = path.stem.partition('_')
+                    try:
+                        if path.suffix == MONTH_FILE_SUFFIX:
+                            frame = read_month_file(path)
+                        else:
+                            bars = read_legacy_json_month(path)
+                            frame = bars_to_month_frame(symbol_dir.name, bars)
+                    except (OSError, MonthFileError, json.JSONDecodeError, KeyError, ValueError) as e:
+                        logger.warning(f'Skipping unreadable cache file {path}: {e}')
+                        unreadable.append(str(path.relative_to(self._cache_dir)))
+                        continue
+                    if len(frame) == 0:
+                        continue
+                    key = (asset_type, symbol_dir.name, timespan)
+                    series.setdefault(key, {})[year_month] = MonthCoverage.from_frame(frame, path.stat().st_size)
+        return series, unreadable
 
     def store_corporate_actions(
         self,
@@ -355,6 +877,7 @@ class MassiveCache:
             action_type: Type of action (ipos, splits, dividends, ticker_events).
             actions: List of action dictionaries.
         """
+        self._check_writable()
         cache_path = self._cache_dir / 'corporate_actions' / f'{action_type}.json'
         with open(cache_path, 'w') as f:
             json.dump(actions, f, indent=2)
@@ -392,13 +915,19 @@ class MassiveCache:
         """
         import shutil
 
+        self._check_writable()
+        root = self._cache_root
         if symbol and asset_type:
             safe_symbol = symbol.replace('/', '_').replace('\\', '_')
+            self._memory.invalidate(lambda key: key[:3] == (root, asset_type, safe_symbol))
+            self._coverage.discard(lambda key: key[:2] == (asset_type, safe_symbol))
             target_dir = self._cache_dir / asset_type / safe_symbol
             if target_dir.exists():
                 shutil.rmtree(target_dir)
                 logger.info(f'Cleared cache for {symbol} ({asset_type})')
         elif asset_type:
+            self._memory.invalidate(lambda key: key[:2] == (root, asset_type))
+            self._coverage.discard(lambda key: key[0] == asset_type)
             target_dir = self._cache_dir / asset_type
             if target_dir.exists():
                 shutil.rmtree(target_dir)
@@ -406,41 +935,75 @@ class MassiveCache:
                 logger.info(f'Cleared all {asset_type} cache')
         else:
             # Clear everything except metadata
+            self._memory.invalidate(lambda key: key[0] == root)
             for subdir in ['stocks', 'futures', 'corporate_actions']:
                 target_dir = self._cache_dir / subdir
                 if target_dir.exists():
                     shutil.rmtree(target_dir)
                     target_dir.mkdir()
-            self._index.clear()
-            self._save_index()
+            self._coverage.discard(lambda key: True)
             logger.info('Cleared entire cache')
 
-    def get_cache_stats(self) -> dict[str, int]:
-        """Get cache statistics."""
-        stats = {
+    def get_cache_stats(self) -> dict[str, int | float]:
+        """
+        Get cache statistics.
+
+        Besides file counts and sizes: ``raw_size_bytes`` (the month files'
+        uncompressed column bytes), ``compression_ratio`` (raw over on-disk
+        size of the binary months), ``compressed_files``, the disk budget
+        (0 if none), and access recency as the age in seconds of the least and
+        most recently accessed month plus the number idle for 30 days.
+        """
+        stats: dict[str, int | float] = {
             'stocks_symbols': 0,
             'stocks_files': 0,
             'futures_symbols': 0,
             'futures_files': 0,
             'total_size_bytes': 0,
+            'compressed_files': 0,
+            'raw_size_bytes': 0,
+            'compression_ratio': 1.0,
+            'disk_budget_bytes': self._disk_budget or 0,
+            'oldest_access_age_seconds': 0.0,
+            'newest_access_age_seconds': 0.0,
+            'idle_files_30d': 0,
         }
 
-        stocks_dir = self._cache_dir / 'stocks'
-        if stocks_dir.exists():
-            stats['stocks_symbols'] = len(list(stocks_dir.iterdir()))
-            for symbol_dir in stocks_dir.iterdir():
-                if symbol_dir.is_dir():
-                    files = list(symbol_dir.glob('*.json'))
-                    stats['stocks_files'] += len(files)
-                    stats['total_size_bytes'] += sum(f.stat().st_size for f in files)
-
-        futures_dir = self._cache_dir / 'futures'
-        if futures_dir.exists():
-            stats['futures_symbols'] = len(list(futures_dir.iterdir()))
-            for symbol_dir in futures_dir.iterdir():
-                if symbol_dir.is_dir():
-                    files = list(symbol_dir.glob('*.json'))
-                    stats['futures_files'] += len(files)
-                    stats['total_size_bytes'] += sum(f.stat().st_size for f in files)
-
+        now_ns = time.time_ns()
+        accesses: list[int] = []
+        binary_bytes = 0
+        for asset_type in ('stocks', 'futures'):
+            asset_dir = self._cache_dir / asset_type
+            if not asset_dir.exists():
+                continue
+            stats[f'{asset_type}_symbols'] = len(list(asset_dir.iterdir()))
+            for symbol_dir in asset_dir.iterdir():
+                if not symbol_dir.is_dir():
+                    continue
+                files = [f for f in symbol_dir.iterdir() if f.suffix in (MONTH_FILE_SUFFIX, LEGACY_MONTH_SUFFIX)]
+                stats[f'{asset_type}_files'] += len(files)
+                for f in files:
+                    stat = f.stat()
+                    stats['total_size_bytes'] += stat.st_size
+                    accesses.append(max(stat.st_atime_ns, stat.st_mtime_ns))
+                    if f.suffix != MONTH_FILE_SUFFIX:
+                        continue
+                    binary_bytes += stat.st_size
+                    with contextlib.suppress(OSError, MonthFileError):
+                        stats['compressed_files'] += month_file_codec(f) != 'none'
+
+        # Uncompressed size of the binary months, from the coverage index's row counts
+        raw_bytes = sum(
+            month.bar_count * MONTH_ROW_BYTES
+            for key, months in self._coverage.series()
+            for year_month, month in months.items()
+            if self._month_path(key, year_month).suffix == MONTH_FILE_SUFFIX
+        )
+        stats['raw_size_bytes'] = raw_bytes
+        if binary_bytes:
+            stats['compression_ratio'] = raw_bytes / binary_bytes
+        if accesses:
+            stats['oldest_access_age_seconds'] = max(0.0, (now_ns - min(accesses)) / 1e9)
+            stats['newest_access_age_seconds'] = max(0.0, (now_ns - max(accesses)) / 1e9)
+            stats['idle_files_30d'] = sum(1 for access in accesses if now_ns - access > IDLE_MONTH_SECONDS * 10**9)
         return stats
@@ -0,0 +1,432 @@
+"""
+Month coverage index for the Massive.com disk cache.
+
+``MassiveCache`` answers "which months are cached?" from this index instead of
+checking the filesystem month by month. For every (asset type, symbol,
+timespan) series it keeps, per cached month, the first and last bar timestamp,
+the bar count and the size of the month file (so the cache's disk usage is
+known without a scan).
+
+The index is persisted under ``metadata/`` as a compact JSON snapshot plus a
+JSON-lines journal:
+
+    coverage.json     {"version", "generation", "series": {"stocks/AAPL/minute": {"2024-01": [first_ns, last_ns, count, bytes]}}}
+    coverage.journal  one record per month written or removed since the snapshot
+
+Every store appends one journal line *after* its month file is in place, so a
+crash can only leave a month on disk that the index does not know about (it
+is fetched again, or picked up by ``MassiveCache.verify_index``), never an
+indexed month without data. The one exception is deliberate: a month the API
+returned no bars for is indexed as empty (a bar count of 0 and no file), so it
+is not requested again. Journal records carry the snapshot generation; a
+torn trailing line or records left over from an older snapshot are ignored.
+Once the journal grows past half the snapshot, it is folded into a new
+snapshot.
+
+Several processes may write one cache directory. Each change holds an
+exclusive ``flock`` on ``metadata/.coverage.lock`` while it catches up with
+the other writers' records and then appends its own (or writes a snapshot),
+so no writer truncates or overwrites records it has not seen. Snapshot temp
+files are named per process. Readers take no lock and pick up appended
+records when the journal grows.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, cast
+
+from .month_file import exclusive_file_lock
+
+if TYPE_CHECKING:
+    from ..data import BarFrame
+
+logger = logging.getLogger(__name__)
+
+COVERAGE_VERSION = 2
+SNAPSHOT_NAME = 'coverage.json'
+JOURNAL_NAME = 'coverage.journal'
+# Held by a writer across catching up with the journal and writing its change
+LOCK_NAME = '.coverage.lock'
+
+# Fold the journal into the snapshot once it holds this fraction of the snapshot's months
+JOURNAL_COMPACTION_RATIO = 0.5
+MIN_JOURNAL_COMPACTION_RECORDS = 1024
+
+# (asset_type, filesystem-safe symbol, timespan)
+SeriesKey = tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class MonthCoverage:
+    """Extent of one cached month: first/last bar timestamp (epoch ns, UTC), bar count and file size."""
+
+    first_ns: int
+    last_ns: int
+    bar_count: int
+    file_bytes: int = 0
+
+    @classmethod
+    def from_frame(cls, frame: BarFrame, file_bytes: int = 0) -> MonthCoverage:
+        if len(frame) == 0:
+            return cls(0, 0, 0, file_bytes)
+        return cls(int(frame.timestamps[0]), int(frame.timestamps[-1]), len(frame), file_bytes)
+
+    def to_list(self) -> list[int]:
+        return [self.first_ns, self.last_ns, self.bar_count, self.file_bytes]
+
+    @property
+    def empty(self) -> bool:
+        """True for a month fetched with no bars, which has no month file."""
+        return self.bar_count == 0
+
+    @property
+    def first_timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.first_ns / 1e9, tz=timezone.utc)
+
+    @property
+    def last_timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.last_ns / 1e9, tz=timezone.utc)
+
+
+@dataclass
+class CoverageVerification:
+    """Differences found between the coverage index and the month files on disk."""
+
+    months_on_disk: int = 0
+    missing: list[str] = field(default_factory=list)  # On disk but not indexed
+    stale: list[str] = field(default_factory=list)  # Indexed but not on disk
+    mismatched: list[str] = field(default_factory=list)  # Indexed with the wrong extent
+    unreadable: list[str] = field(default_factory=list)
+    repaired: bool = False
+
+    @property
+    def consistent(self) -> bool:
+        return not (self.missing or self.stale or self.mismatched)
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            'months_on_disk': self.months_on_disk,
+            'missing': self.missing,
+            'stale': self.stale,
+            'mismatched': self.mismatched,
+            'unreadable': self.unreadable,
+            'consistent': self.consistent,
+            'repaired': self.repaired,
+        }
+
+
+def _series_name(key: SeriesKey) -> str:
+    return '/'.join(key)
+
+
+def _parse_series_name(name: str) -> SeriesKey:
+    asset_type, symbol, timespan = name.split('/')
+    return asset_type, symbol, timespan
+
+
+def describe_month(key: SeriesKey, year_month: str) -> str:
+    """Path-like label of a month, as used in ``CoverageVerification``."""
+    asset_type, symbol, timespan = key
+    return f'{asset_type}/{symbol}/{year_month}_{timespan}'
+
+
+class CoverageIndex:
+    """
+    In-memory month coverage per series, backed by a snapshot and journal in ``directory``.
+
+    Args:
+        directory: Directory holding ``coverage.json`` and ``coverage.journal``.
+        read_only: Never write either file; ``record`` and ``replace`` only
+            update memory.
+    """
+
+    def __init__(self, directory: Path, read_only: bool = False) -> None:
+        self._directory = directory
+        self._snapshot_path = directory / SNAPSHOT_NAME
+        self._journal_path = directory / JOURNAL_NAME
+        self._lock_path = directory / LOCK_NAME
+        self._read_only = read_only
+        self._lock = threading.Lock()
+        self._series: dict[SeriesKey, dict[str, MonthCoverage]] = {}
+        self._total_bytes = 0
+        self._generation = 0
+        self._snapshot_signature: tuple[int, int, int] | None = None
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._loaded = False
+
+    @property
+    def exists(self) -> bool:
+        """True if a snapshot is on disk (or one was loaded into memory)."""
+        return self._loaded or self._snapshot_path.exists()
+
+    def load(self) -> bool:
+        """Load the snapshot and replay the journal; returns False if there is no snapshot."""
+        with self._lock:
+            return self._reload_locked()
+
+    def months(self, key: SeriesKey) -> dict[str, MonthCoverage]:
+        """Coverage of every cached month of a series, by ``YYYY-MM`` (treat as read-only)."""
+        with self._lock:
+            self._refresh_locked()
+            return self._series.get(key, {})
+
+    @property
+    def total_bytes(self) -> int:
+        """Combined size of every indexed month file."""
+        with self._lock:
+            self._refresh_locked()
+            return self._total_bytes
+
+    def series(self) -> Iterator[tuple[SeriesKey, dict[str, MonthCoverage]]]:
+        """Snapshot of all series and their months."""
+        with self._lock:
+            self._refresh_locked()
+            items = [(key, dict(months)) for key, months in self._series.items()]
+        yield from items
+
+    def load_or_replace(self, build: Callable[[], dict[SeriesKey, dict[str, MonthCoverage]]]) -> bool:
+        """Load the index or, if there is none, replace it with ``build()``; returns whether it was loaded.
+
+        Writers do both under the writer lock, so of several processes opening a
+        new cache at once only the first builds the index.
+        """
+        with self._lock:
+            if self._read_only:
+                if not self._reload_locked():
+                    self._replace_locked(build())
+                    return False
+                return True
+            with exclusive_file_lock(self._lock_path):
+                if self._reload_locked():
+                    return True
+                self._replace_locked(build())
+                return False
+
+    def record(self, key: SeriesKey, year_month: str, coverage: MonthCoverage | None) -> None:
+        """Set (or with ``None`` remove) one month and journal the change."""
+        with self._lock:
+            if self._read_only:
+                self._refresh_locked()
+                self._apply(key, year_month, coverage)
+                return
+            with exclusive_file_lock(self._lock_path):
+                self._catch_up_locked()
+                self._apply(key, year_month, coverage)
+                self._journal_locked(key, year_month, coverage)
+
+    def discard(self, predicate: Callable[[SeriesKey], bool]) -> int:
+        """Drop every series matching ``predicate`` and write a new snapshot; returns the number dropped."""
+        with self._lock:
+            if self._read_only:
+                self._refresh_locked()
+                return self._discard_locked(predicate)
+            with exclusive_file_lock(self._lock_path):
+                self._catch_up_locked()
+                dropped = self._discard_locked(predicate)
+                self._write_snapshot_locked()
+                return dropped
+
+    def _discard_locked(self, predicate: Callable[[SeriesKey], bool]) -> int:
+        stale = [key for key in self._series if predicate(key)]
+        for key in stale:
+            self._total_bytes -= sum(month.file_bytes for month in self._series.pop(key).values())
+        return len(stale)
+
+    def replace(self, series: dict[SeriesKey, dict[str, MonthCoverage]]) -> None:
+        """Replace the whole index (e.g. after rebuilding it from disk) and write a new snapshot."""
+        with self._lock:
+            if self._read_only:
+                self._replace_locked(series)
+                return
+            with exclusive_file_lock(self._lock_path):
+                # Learn the current generation, so the new snapshot's is above it
+                self._catch_up_locked()
+                self._replace_locked(series)
+
+    def _replace_locked(self, series: dict[SeriesKey, dict[str, MonthCoverage]]) -> None:
+        self._series = {key: dict(months) for key, months in series.items() if months}
+        self._total_bytes = self._sum_bytes()
+        self._loaded = True
+        if not self._read_only:
+            self._write_snapshot_locked()
+
+    def compact(self) -> None:
+        """Fold the journal into a new snapshot."""
+        with self._lock:
+            if self._read_only:
+                self._refresh_locked()
+                return
+            with exclusive_file_lock(self._lock_path):
+                self._catch_up_locked()
+                self._write_snapshot_locked()
+
+    def _journal_locked(self, key: SeriesKey, year_month: str, coverage: MonthCoverage | None) -> None:
+        if not self._loaded:
+            self._write_snapshot_locked()
+            return
+        entry: dict[str, Any] = {
+            'g': self._generation,
+            'k': _series_name(key),
+            'm': year_month,
+            'c': coverage.to_list() if coverage is not None else None,
+        }
+        self._append_locked(json.dumps(entry, separators=(',', ':')).encode() + b'\n')
+        if self._journal_records >= max(MIN_JOURNAL_COMPACTION_RECORDS, JOURNAL_COMPACTION_RATIO * self._month_count()):
+            self._write_snapshot_locked()
+
+    def _apply(self, key: SeriesKey, year_month: str, coverage: MonthCoverage | None) -> None:
+        months = self._series.get(key)
+        previous = months.get(year_month) if months is not None else None
+        if previous is not None:
+            self._total_bytes -= previous.file_bytes
+        if coverage is None:
+            if months is not None:
+                months.pop(year_month, None)
+                if not months:
+                    del self._series[key]
+        else:
+            self._series.setdefault(key, {})[year_month] = coverage
+            self._total_bytes += coverage.file_bytes
+
+    def _month_count(self) -> int:
+        return sum(len(months) for months in self._series.values())
+
+    def _sum_bytes(self) -> int:
+        return sum(month.file_bytes for months in self._series.values() for month in months.values())
+
+    def _stat_snapshot(self) -> tuple[int, int, int] | None:
+        try:
+            stat = self._snapshot_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _reload_locked(self) -> bool:
+        signature = self._stat_snapshot()
+        if signature is None:
+            return False
+        try:
+            with open(self._snapshot_path, 'rb') as f:
+                data = cast(dict[str, Any], json.load(f))
+            if data.get('version') != COVERAGE_VERSION:
+                raise ValueError(f'unsupported coverage index version {data.get("version")}')
+            series: dict[SeriesKey, dict[str, MonthCoverage]] = {}
+            for name, months in cast(dict[str, dict[str, list[int]]], data['series']).items():
+                series[_parse_series_name(name)] = {
+                    year_month: MonthCoverage(*values) for year_month, values in months.items()
+                }
+            generation = int(data['generation'])
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            logger.warning(f'Failed to load coverage index {self._snapshot_path}: {e}')
+            return False
+
+        self._series = series
+        self._total_bytes = self._sum_bytes()
+        self._generation = generation
+        self._snapshot_signature = signature
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._loaded = True
+        self._replay_journal_locked()
+        return True
+
+    def _refresh_locked(self) -> None:
+        """Pick up a snapshot rewritten or journal records appended since the last read."""
+        if not self._loaded or self._snapshot_signature is None:
+            return
+        if self._stat_snapshot() != self._snapshot_signature:
+            self._reload_locked()
+            return
+        try:
+            size = self._journal_path.stat().st_size
+        except FileNotFoundError:
+            size = 0
+        if size < self._journal_offset:
+            self._reload_locked()
+        elif size > self._journal_offset:
+            self._replay_journal_locked()
+
+    def _catch_up_locked(self) -> None:
+        """Apply what other writers have written, including a snapshot written since this index was opened."""
+        if self._loaded:
+            self._refresh_locked()
+        else:
+            self._reload_locked()
+
+    def _replay_journal_locked(self) -> None:
+        """Apply complete journal records past the current offset that belong to this generation."""
+        try:
+            with open(self._journal_path, 'rb') as f:
+                f.seek(self._journal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+        offset = 0
+        while True:
+            end = data.find(b'\n', offset)
+            if end < 0:
+                break
+            try:
+                entry = cast(dict[str, Any], json.loads(data[offset:end]))
+                key = _parse_series_name(cast(str, entry['k']))
+                values = cast(list[int] | None, entry['c'])
+                coverage = MonthCoverage(*values) if values is not None else None
+                generation = int(entry['g'])
+                year_month = cast(str, entry['m'])
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                break
+            if generation != self._generation:
+                break
+            self._apply(key, year_month, coverage)
+            self._journal_records += 1
+            offset = end + 1
+        self._journal_offset += offset
+
+    def _append_locked(self, line: bytes) -> None:
+        self._directory.mkdir(parents=True, exist_ok=True)
+        with open(self._journal_path, 'ab') as f:
+            # Drop a torn or stale tail so the new record follows the last valid one
+            if f.tell() != self._journal_offset:
+                f.truncate(self._journal_offset)
+            f.write(line)
+        self._journal_offset += len(line)
+        self._journal_records += 1
+
+    def _write_snapshot_locked(self) -> None:
+        """Atomically write a snapshot of the next generation, then empty the journal."""
+        generation = self._generation + 1
+        payload = {
+            'version': COVERAGE_VERSION,
+            'generation': generation,
+            'series': {
+                _series_name(key): {year_month: c.to_list() for year_month, c in sorted(months.items())}
+                for key, months in sorted(self._series.items())
+            },
+        }
+        self._directory.mkdir(parents=True, exist_ok=True)
+        temp_path = self._snapshot_path.with_name(f'{self._snapshot_path.name}.{os.getpid()}.tmp')
+        try:
+            with temp_path.open('wb') as handle:
+                handle.write(json.dumps(payload, separators=(',', ':')).encode())
+            os.replace(temp_path, self._snapshot_path)
+        finally:
+            if temp_path.exists():
+                temp_path.unlink()
+        # Records of the previous generation are ignored from here on, so a crash
+        # before the truncation below cannot replay them twice.
+        with open(self._journal_path, 'wb'):
+            pass
+        self._generation = generation
+        self._snapshot_signature = self._stat_snapshot()
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._loaded = True
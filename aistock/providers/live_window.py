@@ -0,0 +1,243 @@
+"""
+Rolling in-memory bar windows behind MassiveDataProvider's live methods.
+
+``get_bars``, ``get_latest_bar`` and ``has_sufficient_data`` used to reload a
+month-file range from the disk cache on every call. ``LiveBarWindow`` keeps
+the most recent ``window_days`` of bars per symbol in memory instead:
+
+- A symbol's window is seeded from the cache on first use.
+- Once older than ``refresh_seconds`` it is extended by reading only the
+  bars after its newest one.
+- ``add_bar`` writes streamed bars straight into it.
+- ``invalidate`` makes the next lookup reseed a window (e.g. after a
+  backfill changed bars already in the window). Streamed bars newer than
+  the reloaded data are kept: they were never written to the cache.
+
+Lookups are then a bisect or a slice of an in-memory list.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from typing import TYPE_CHECKING
+
+from ..data import datetime_to_ns
+
+if TYPE_CHECKING:
+    from ..data import Bar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW_DAYS = 30
+DEFAULT_REFRESH_SECONDS = 60.0
+# Expired bars are dropped once they are this fraction of the window
+TRIM_FRACTION = 0.25
+
+# (symbol, start_date, end_date) -> bars sorted by timestamp
+BarLoader = Callable[[str, date, date], 'list[Bar]']
+
+
+class _SymbolWindow:
+    """Sorted bars of one symbol plus their timestamps (ns) for bisection."""
+
+    __slots__ = ('bars', 'timestamps', 'start', 'refreshed_at', 'reseed', 'lock')
+
+    def __init__(self) -> None:
+        self.bars: list[Bar] = []
+        self.timestamps: list[int] = []
+        # Bars before ``start`` have aged out of the window but are not yet trimmed
+        self.start = 0
+        self.refreshed_at: float | None = None
+        # Set by invalidation: the next lookup reloads the whole window
+        self.reseed = False
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.bars) - self.start
+
+    def extend(self, bars: list[Bar]) -> None:
+        """Append bars (sorted) that are newer than the window's newest bar."""
+        last = self.timestamps[-1] if self.timestamps else None
+        for bar in bars:
+            ts = datetime_to_ns(bar.timestamp)
+            if last is None or ts > last:
+                self.bars.append(bar)
+                self.timestamps.append(ts)
+                last = ts
+
+    def clear(self) -> None:
+        self.bars = []
+        self.timestamps = []
+        self.start = 0
+
+    def put(self, bar: Bar) -> None:
+        """Insert one bar, replacing any bar with the same timestamp."""
+        ts = datetime_to_ns(bar.timestamp)
+        if not self.timestamps or ts > self.timestamps[-1]:
+            self.bars.append(bar)
+            self.timestamps.append(ts)
+            return
+        index = bisect.bisect_left(self.timestamps, ts)
+        if index < len(self.timestamps) and self.timestamps[index] == ts:
+            self.bars[index] = bar
+        elif index >= self.start:
+            self.bars.insert(index, bar)
+            self.timestamps.insert(index, ts)
+
+    def expire(self, horizon_ns: int) -> None:
+        """Move the window start past bars older than ``horizon_ns``, trimming them in batches."""
+        if not self.timestamps:
+            return
+        self.start = max(self.start, bisect.bisect_left(self.timestamps, self.timestamps[-1] - horizon_ns))
+        if self.start and self.start >= TRIM_FRACTION * len(self.bars):
+            del self.bars[: self.start]
+            del self.timestamps[: self.start]
+            self.start = 0
+
+    def tail(self, count: int | None) -> list[Bar]:
+        if count is None:
+            return self.bars[self.start :]
+        if count <= 0:
+            return []
+        return self.bars[max(self.start, len(self.bars) - count) :]
+
+
+class LiveBarWindow:
+    """
+    Per-symbol rolling windows of recent bars, backed by a bar loader.
+
+    Thread-safe: windows are created under a shared lock, and each window is
+    seeded, refreshed and read under its own lock, so a slow seed of one
+    symbol does not block lookups of another.
+    """
+
+    def __init__(
+        self,
+        loader: BarLoader,
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        refresh_seconds: float = DEFAULT_REFRESH_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        today: Callable[[], date] = date.today,
+    ) -> None:
+        """
+        Initialize the windows.
+
+        Args:
+            loader: Reads cached bars for ``(symbol, start_date, end_date)``.
+            window_days: Calendar days of bars each window keeps.
+            refresh_seconds: Age after which a lookup first pulls newer
+                bars from the loader (0 refreshes on every lookup).
+            clock: Monotonic time source for the refresh policy.
+            today: Current date, the end of every load.
+        """
+        if window_days < 1:
+            raise ValueError(f'window_days must be at least 1, got {window_days}')
+        if refresh_seconds < 0:
+            raise ValueError(f'refresh_seconds must be non-negative, got {refresh_seconds}')
+        self._loader = loader
+        self._window_days = window_days
+        self._horizon_ns = window_days * 24 * 3600 * 10**9
+        self._refresh_seconds = refresh_seconds
+        self._clock = clock
+        self._today = today
+        self._windows: dict[str, _SymbolWindow] = {}
+        self._lock = threading.Lock()
+        self._seeds = 0
+        self._refreshes = 0
+
+    @property
+    def window_days(self) -> int:
+        return self._window_days
+
+    def _window(self, symbol: str) -> _SymbolWindow:
+        with self._lock:
+            window = self._windows.get(symbol)
+            if window is None:
+                window = self._windows[symbol] = _SymbolWindow()
+            return window
+
+    def _ensure_fresh(self, symbol: str, window: _SymbolWindow) -> None:
+        """Seed or extend ``window`` from the loader if it is unseeded or stale (caller holds its lock)."""
+        now = self._clock()
+        if not window.reseed and window.refreshed_at is not None and now - window.refreshed_at < self._refresh_seconds:
+            return
+        today = self._today()
+        if window.refreshed_at is None or window.reseed or not window.timestamps:
+            start = today - timedelta(days=self._window_days)
+            self._seeds += 1
+        else:
+            # Re-read only from the newest bar's day; ``extend`` skips what is already held
+            start = window.bars[-1].timestamp.date()
+            self._refreshes += 1
+        loaded = self._loader(symbol, start, today)
+        if window.reseed:
+            # The reloaded bars replace the window; only bars newer than all of them are kept
+            retained = window.tail(None)
+            window.clear()
+            window.extend(loaded)
+            window.extend(retained)
+            window.reseed = False
+        elif window.refreshed_at is None and window.bars:
+            # Streamed bars arrived before the first seed: merge rather than append
+            for bar in loaded:
+                window.put(bar)
+        else:
+            window.extend(loaded)
+        window.refreshed_at = now
+        window.expire(self._horizon_ns)
+
+    def get_bars(self, symbol: str, lookback: int | None = None) -> list[Bar]:
+        """Return the newest ``lookback`` bars in the window (all of them if None), oldest first."""
+        window = self._window(symbol)
+        with window.lock:
+            self._ensure_fresh(symbol, window)
+            return window.tail(lookback)
+
+    def get_latest_bar(self, symbol: str) -> Bar | None:
+        window = self._window(symbol)
+        with window.lock:
+            self._ensure_fresh(symbol, window)
+            return window.bars[-1] if len(window) else None
+
+    def bar_count(self, symbol: str) -> int:
+        window = self._window(symbol)
+        with window.lock:
+            self._ensure_fresh(symbol, window)
+            return len(window)
+
+    def add_bar(self, symbol: str, bar: Bar) -> None:
+        """Insert a streamed bar without touching the loader."""
+        window = self._window(symbol)
+        with window.lock:
+            window.put(bar)
+            window.expire(self._horizon_ns)
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        """Reseed one symbol's window (or all of them) from the loader on the next lookup.
+
+        Bars newer than the reloaded ones (streamed with ``add_bar``) survive the reseed.
+        """
+        with self._lock:
+            if symbol is None:
+                windows = list(self._windows.values())
+            else:
+                window = self._windows.get(symbol)
+                windows = [window] if window is not None else []
+        for window in windows:
+            with window.lock:
+                window.reseed = True
+
+    def get_stats(self) -> dict[str, int]:
+        with self._lock:
+            windows = list(self._windows.values())
+        return {
+            'symbols': len(windows),
+            'bars': sum(len(window) for window in windows),
+            'seeds': self._seeds,
+            'refreshes': self._refreshes,
+        }
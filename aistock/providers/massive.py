@@ -19,6 +19,8 @@ from typing import TYPE_CHECKING, Any, Literal
 
 if TYPE_CHECKING:
     from ..data import Bar
+    from .live_window import LiveBarWindow
+    from .prefetch import PrefetchReport
 
 
 logger = logging.getLogger(__name__)
@@ -39,6 +41,17 @@ class MassiveConfig:
         retry_backoff_seconds: Initial backoff time for retries.
         s3_endpoint: S3 endpoint for flat files.
         s3_bucket: S3 bucket name for flat files.
+        memory_cache_bytes: Byte budget of the process-wide decoded-month LRU (0 disables it).
+        api_base_url: REST API base URL (override to point at a proxy or test server).
+        prefetch_workers: Concurrent requests ``prefetch`` keeps in flight.
+        cache_compression: Codec for newly written cache months (``'none'`` keeps
+            them memory-mappable; ``'lzma'`` packs minute bars most tightly).
+        disk_cache_bytes: Disk budget for cached months; the least recently
+            accessed months are evicted beyond it (None: unlimited).
+        live_window_days: Days of minute bars the live lookups (``get_bars``,
+            ``get_latest_bar``, ``has_sufficient_data``) keep in memory per symbol.
+        live_refresh_seconds: Age after which a live lookup pulls newer bars
+            from the cache into the in-memory window.
     """
 
     api_key: str
@@ -50,6 +63,13 @@ class MassiveConfig:
     retry_backoff_seconds: float = 15.0
     s3_endpoint: str = 'https://files.massive.com'
     s3_bucket: str = 'flatfiles'
+    memory_cache_bytes: int = 512 * 1024 * 1024
+    api_base_url: str = 'https://api.massive.com'
+    prefetch_workers: int = 4
+    cache_compression: str = 'none'
+    disk_cache_bytes: int | None = None
+    live_window_days: int = 30
+    live_refresh_seconds: float = 60.0
 
     def __post_init__(self) -> None:
         """Validate configuration."""
@@ -57,6 +77,20 @@ class MassiveConfig:
             raise ValueError('API key is required')
         if self.rate_limit_per_minute < 1:
             raise ValueError('Rate limit must be at least 1')
+        if self.memory_cache_bytes < 0:
+            raise ValueError('memory_cache_bytes must be non-negative')
+        if self.prefetch_workers < 1:
+            raise ValueError('prefetch_workers must be at least 1')
+        from .month_file import MONTH_CODECS
+
+        if self.cache_compression not in MONTH_CODECS:
+            raise ValueError(f'cache_compression must be one of {MONTH_CODECS}')
+        if self.disk_cache_bytes is not None and self.disk_cache_bytes < 0:
+            raise ValueError('disk_cache_bytes must be non-negative')
+        if self.live_window_days < 1:
+            raise ValueError('live_window_days must be at least 1')
+        if self.live_refresh_seconds < 0:
+            raise ValueError('live_refresh_seconds must be non-negative')
         if self.rate_limit_per_minute > 5:
             logger.warning(
                 f'Rate limit {self.rate_limit_per_minute} exceeds free tier (5). '
@@ -75,7 +109,8 @@ class RateLimiter:
     def __init__(
         self,
         max_calls: int = 5,
-        window_seconds: int = 60,
+        window_seconds: float = 60,
+        safety_margin_seconds: float = 0.5,
     ) -> None:
         """
         Initialize rate limiter.
@@ -83,59 +118,67 @@ class RateLimiter:
         Args:
             max_calls: Maximum calls allowed in window.
             window_seconds: Time window in seconds.
+            safety_margin_seconds: Extra wait after the window frees a slot,
+                covering clock skew between us and the server.
         """
         self._max_calls = max_calls
         self._window_seconds = window_seconds
+        self._safety_margin = safety_margin_seconds
         self._call_times: deque[float] = deque()
         self._lock = threading.Lock()
         self._total_calls = 0
         self._total_waits = 0
         self._total_wait_time = 0.0
 
-    def acquire(self) -> None:
+    def acquire(self, cancel: threading.Event | None = None) -> bool:
         """
         Acquire a rate limit slot, blocking if necessary.
 
         This method will sleep if the rate limit has been reached,
-        waiting until a slot becomes available.
+        waiting until a slot becomes available. Safe to call from many
+        threads: a thread woken from its sleep re-checks the window, so
+        concurrent callers never exceed the limit together.
+
+        Args:
+            cancel: If set while waiting, give up without taking a slot.
+
+        Returns:
+            True once a slot is taken, False if cancelled.
         """
         with self._lock:
-            now = time.time()
+            while True:
+                now = time.time()
 
-            # Remove calls outside the window
-            while self._call_times and now - self._call_times[0] > self._window_seconds:
-                self._call_times.popleft()
+                # Remove calls outside the window
+                while self._call_times and now - self._call_times[0] > self._window_seconds:
+                    self._call_times.popleft()
 
-            # Check if we need to wait
-            if len(self._call_times) >= self._max_calls:
-                # Calculate wait time
-                oldest_call = self._call_times[0]
-                wait_time = self._window_seconds - (now - oldest_call) + 0.5  # Add buffer
+                if len(self._call_times) < self._max_calls:
+                    break
 
-                if wait_time > 0:
-                    logger.info(
-                        f'Rate limit reached ({self._max_calls}/{self._window_seconds}s). Sleeping {wait_time:.1f}s...'
-                    )
-                    self._total_waits += 1
-                    self._total_wait_time += wait_time
+                # Wait until the oldest call leaves the window
+                oldest_call = self._call_times[0]
+                wait_time = self._window_seconds - (now - oldest_call) + self._safety_margin
+                logger.info(
+                    f'Rate limit reached ({self._max_calls}/{self._window_seconds}s). Sleeping {wait_time:.1f}s...'
+                )
+                self._total_waits += 1
+                self._total_wait_time += wait_time
 
-                    # Release lock while sleeping
-                    self._lock.release()
-                    try:
+                # Release lock while sleeping
+                self._lock.release()
+                try:
+                    if cancel is None:
                         time.sleep(wait_time)
-                    finally:
-                        self._lock.acquire()
-
-                    # Refresh timestamp after sleep
-                    now = time.time()
-
-                    # Clean up old calls again
-                    while self._call_times and now - self._call_times[0] > self._window_seconds:
-                        self._call_times.popleft()
+                    elif cancel.wait(wait_time):
+                        return False
+                finally:
+                    self._lock.acquire()
 
             # Record this call
             self._call_times.append(now)
             self._total_calls += 1
+            return True
 
     def get_stats(self) -> dict[str, Any]:
         """Get rate limiter statistics."""
@@ -179,14 +222,16 @@ class MassiveDataProvider:
     This provider strictly respects that limit.
     """
 
-    def __init__(self, config: MassiveConfig) -> None:
+    def __init__(self, config: MassiveConfig, read_only_cache: bool = False) -> None:
         """
         Initialize the data provider.
 
         Args:
             config: Massive.com configuration.
+            read_only_cache: Open the disk cache read-only (no fetch results are stored).
         """
         self._config = config
+        self._read_only_cache = read_only_cache
         self._rate_limiter = RateLimiter(
             max_calls=config.rate_limit_per_minute,
             window_seconds=60,
@@ -195,6 +240,7 @@ class MassiveDataProvider:
         # Lazy import to avoid dependency if not using Massive
         self._client: Any = None
         self._cache: Any = None
+        self._live: LiveBarWindow | None = None
 
     def _get_client(self) -> Any:
         """Get or create the Massive REST client."""
@@ -202,7 +248,7 @@ class MassiveDataProvider:
             try:
                 from massive import RESTClient
 
-                self._client = RESTClient(api_key=self._config.api_key)
+                self._client = RESTClient(api_key=self._config.api_key, base=self._config.api_base_url)
             except ImportError as e:
                 raise ImportError('massive package not installed. Run: pip install massive') from e
         return self._client
@@ -212,9 +258,33 @@ class MassiveDataProvider:
         if self._cache is None:
             from .cache import MassiveCache
 
-            self._cache = MassiveCache(self._config.cache_dir)
+            self._cache = MassiveCache(
+                self._config.cache_dir,
+                memory_cache_bytes=self._config.memory_cache_bytes,
+                read_only=self._read_only_cache,
+                compression=self._config.cache_compression,
+                disk_budget_bytes=self._config.disk_cache_bytes,
+            )
         return self._cache
 
+    def _get_live_window(self) -> LiveBarWindow:
+        """Get or create the in-memory windows behind the live lookup methods."""
+        if self._live is None:
+            from .live_window import LiveBarWindow
+
+            cache = self._get_cache()
+            self._live = LiveBarWindow(
+                lambda symbol, start, end: cache.load_bars(symbol, start, end, 'minute'),
+                window_days=self._config.live_window_days,
+                refresh_seconds=self._config.live_refresh_seconds,
+            )
+        return self._live
+
+    def invalidate_live_window(self, symbol: str | None = None) -> None:
+        """Reload the in-memory bars of ``symbol`` (or every symbol) on the next lookup, keeping newer streamed bars."""
+        if self._live is not None:
+            self._live.invalidate(symbol)
+
     def fetch_bars(
         self,
         symbol: str,
@@ -358,6 +428,7 @@ class MassiveDataProvider:
         # Cache the results
         if all_bars and use_cache:
             cache.store_bars(symbol, all_bars, timespan)
+            self.invalidate_live_window(symbol)
 
         # Also load any previously cached data for the full range
         if use_cache:
@@ -371,6 +442,54 @@ class MassiveDataProvider:
             from_cache=False,
         )
 
+    def prefetch(
+        self,
+        symbols: list[str],
+        start_date: date,
+        end_date: date,
+        timespan: Literal['minute', 'day'] = 'minute',
+        multiplier: int = 1,
+        workers: int | None = None,
+        use_cache: bool = True,
+    ) -> PrefetchReport:
+        """
+        Fill the cache for many symbols with concurrent, rate-limited requests.
+
+        Every uncached month is requested once, earliest months first, from
+        ``workers`` threads sharing this provider's rate limiter. Completed
+        months are written to the cache as they arrive, so an interrupted
+        prefetch resumes where it stopped when called again.
+
+        Args:
+            symbols: Symbols to fetch, in priority order.
+            start_date: Start date for data.
+            end_date: End date for data.
+            timespan: Bar timespan ('minute' or 'day').
+            multiplier: Timespan multiplier.
+            workers: Concurrent requests (defaults to ``config.prefetch_workers``).
+            use_cache: False requests every month again, cached or not, and
+                merges the responses into the cache.
+
+        Returns:
+            PrefetchReport summarising calls, stored bars and failures.
+        """
+        from .prefetch import MassivePrefetcher
+
+        prefetcher = MassivePrefetcher(
+            self._get_client(),
+            self._get_cache(),
+            self._rate_limiter,
+            workers=workers or self._config.prefetch_workers,
+            max_retries=self._config.max_retries,
+            retry_backoff_seconds=self._config.retry_backoff_seconds,
+        )
+        report = prefetcher.run(
+            symbols, start_date, end_date, timespan=timespan, multiplier=multiplier, use_cache=use_cache
+        )
+        for symbol in symbols:
+            self.invalidate_live_window(symbol)
+        return report
+
     def fetch_futures(
         self,
         ticker: str,
@@ -688,6 +807,7 @@ class MassiveDataProvider:
         start_date: date,
         end_date: date,
         timespan: str = 'minute',
+        use_cache: bool = True,
     ) -> dict[str, Any]:
         """
         Estimate time to fetch data for given parameters.
@@ -697,10 +817,13 @@ class MassiveDataProvider:
             start_date: Start date.
             end_date: End date.
             timespan: Bar timespan.
+            use_cache: False counts every month as to be fetched, as ``prefetch`` does.
 
         Returns:
             Dictionary with estimate details.
         """
+        from .prefetch import plan_prefetch
+
         cache = self._get_cache()
 
         # Count missing data
@@ -709,13 +832,17 @@ class MassiveDataProvider:
         missing_ranges: dict[str, list[tuple[date, date]]] = {}
 
         for symbol in symbols:
-            if cache.has_cached_data(symbol, start_date, end_date, timespan):
+            if not use_cache:
+                missing_ranges[symbol] = [(start_date, end_date)]
+                total_api_calls += len(plan_prefetch(cache, [symbol], start_date, end_date, timespan, use_cache=False))
+            elif cache.has_cached_data(symbol, start_date, end_date, timespan):
                 cached_symbols += 1
             else:
                 ranges = cache.get_missing_ranges(symbol, start_date, end_date, timespan)
                 if ranges:
                     missing_ranges[symbol] = ranges
-                    total_api_calls += len(ranges)
+                    # prefetch issues one request per missing month
+                    total_api_calls += len(plan_prefetch(cache, [symbol], start_date, end_date, timespan))
                 else:
                     total_api_calls += 1
 
@@ -743,34 +870,28 @@ class MassiveDataProvider:
         lookback: int | None = None,
     ) -> list[Bar]:
         """
-        Get historical bars for a symbol.
+        Get recent minute bars for a symbol from its in-memory window.
 
-        This is the MarketDataProviderProtocol interface method.
-        For backtesting, data should be prefetched using fetch_bars().
-        """
-        # This method is for live trading integration
-        # For backtesting, use fetch_bars() to prefetch data
-        cache = self._get_cache()
-
-        # Try to load from cache
-        from datetime import timedelta
-
-        end_date = date.today()
-        start_date = end_date - timedelta(days=lookback or 30)
+        This is the MarketDataProviderProtocol interface method. The window
+        holds the last ``config.live_window_days`` of cached minute bars plus
+        any bars passed to ``add_bar``. For backtesting, prefetch data with
+        ``fetch_bars()`` and read it from the cache instead.
 
-        bars = cache.load_bars(symbol, start_date, end_date, 'minute')
-        return bars
+        Args:
+            symbol: Ticker symbol.
+            timeframe: Ignored; the cache serves minute bars.
+            lookback: Number of most recent bars (None = the whole window).
+        """
+        return self._get_live_window().get_bars(symbol, lookback)
 
     def has_sufficient_data(self, symbol: str, min_bars: int = 20) -> bool:
-        """Check if sufficient data is available in cache."""
-        bars = self.get_bars(symbol, lookback=min_bars * 2)
-        return len(bars) >= min_bars
+        """Check if the in-memory window holds at least ``min_bars`` bars."""
+        return self._get_live_window().bar_count(symbol) >= min_bars
 
     def add_bar(self, symbol: str, timeframe: str, bar: Bar) -> None:
-        """Add a new bar to the data store (not used in backtest mode)."""
-        pass  # No-op for backtest provider
+        """Add a streamed bar to the symbol's in-memory window (the disk cache is not written)."""
+        self._get_live_window().add_bar(symbol, bar)
 
     def get_latest_bar(self, symbol: str, timeframe: str = '1m') -> Bar | None:
-        """Get the most recent bar from cache."""
-        bars = self.get_bars(symbol, timeframe, lookback=1)
-        return bars[-1] if bars else None
+        """Get the most recent bar in the symbol's in-memory window."""
+        return self._get_live_window().get_latest_bar(symbol)
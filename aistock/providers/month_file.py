@@ -0,0 +1,529 @@
+"""
+Binary month files for the Massive.com disk cache.
+
+Each cached month used to be a JSON list of dicts with string prices, which
+had to be parsed in full (``fromisoformat`` and ``Decimal`` per bar) on every
+read. A month is now a columnar file that is memory-mapped on load. It holds
+one or more runs, each laid out as:
+
+    header   <4sHHQII  magic b'AIMB', version, flags, row count, symbol length,
+                       CRC-32 of symbol and columns (version 2; 0 in version 1)
+    symbol   UTF-8, zero-padded to an 8-byte boundary
+    columns  timestamp (int64 epoch ns, UTC), open, high, low, close (float64),
+             volume (int64), each ``row count`` values long, in that order
+
+Rows within a run are sorted by timestamp. Adding bars to a month appends a
+run with just the new rows (``append_month_run``); readers merge the runs,
+later runs winning on duplicate timestamps. A run torn by a crash fails its
+size or checksum and is ignored along with anything after it. Once a month
+has ``MAX_MONTH_RUNS`` runs it is compacted back into one, which is read as
+a zero-copy memory map: a date range is located with a binary search on the
+timestamp column and returned as a ``BarFrame`` slice.
+
+Appends and compactions hold an exclusive ``flock`` on a lock file next to the
+month files (``MONTH_LOCK_NAME``), so writers in different processes cannot
+interleave a read, truncate and write. The lock is on a separate file because
+compaction replaces the month file, and a lock on the replaced inode would
+not exclude a writer that opens the new one. Readers take no lock: runs are
+only ever appended or atomically replaced.
+
+Runs may instead be compressed (the codec id is the low byte of ``flags``):
+
+    header   as above; the CRC covers the packing header and payload
+    packing  <Qb7x  payload length, price decimals (-1: raw float64 bits)
+    payload  compressed symbol (padded) and filtered columns, padded to 8 bytes
+
+Before compression, timestamps are delta-encoded; prices that are exact at
+some number of decimals (cents, as Massive returns them) become delta-encoded
+fixed-point integers; and every column is byte-shuffled, so that the slowly
+varying high bytes of neighbouring values sit together. Compressed months are
+decoded into memory instead of memory-mapped.
+"""
+
+from __future__ import annotations
+
+import bz2
+import json
+import lzma
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, cast
+
+import numpy as np
+
+from ..data import Bar, BarFrame, datetime_to_ns
+
+MONTH_FILE_MAGIC = b'AIMB'
+MONTH_FILE_VERSION = 2
+MONTH_FILE_SUFFIX = '.bars'
+LEGACY_MONTH_SUFFIX = '.json'
+# Lock file in each symbol directory, held while a month file there is rewritten
+MONTH_LOCK_NAME = '.months.lock'
+
+# Rewrite a month as a single run once appends have split it into this many
+MAX_MONTH_RUNS = 8
+
+_HEADER = struct.Struct('<4sHHQII')
+_PACKING = struct.Struct('<Qb7x')
+_COLUMN_DTYPES = (
+    ('timestamps', np.int64),
+    ('open', np.float64),
+    ('high', np.float64),
+    ('low', np.float64),
+    ('close', np.float64),
+    ('volume', np.int64),
+)
+
+
+# Codec ids stored in the low byte of a run header's flags
+_CODEC_IDS = {'none': 0, 'zlib': 1, 'lzma': 2, 'bz2': 3, 'zstd': 4}
+_CODEC_MASK = 0xFF
+# Prices are stored as fixed-point integers when exact at up to this many decimals
+MAX_PRICE_DECIMALS = 8
+
+
+def _zstd_module() -> Any:
+    try:
+        from compression import zstd  # type: ignore[import-not-found]  # Python 3.14+
+    except ImportError:
+        return None
+    return zstd
+
+
+_CODECS: dict[str, tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+    'zlib': (lambda data: zlib.compress(data, 6), zlib.decompress),
+    'lzma': (lambda data: lzma.compress(data, preset=6), lzma.decompress),
+    'bz2': (lambda data: bz2.compress(data, 9), bz2.decompress),
+}
+_zstd = _zstd_module()
+if _zstd is not None:
+    _CODECS['zstd'] = (_zstd.compress, _zstd.decompress)
+
+
+def _fcntl_module() -> Any:
+    try:
+        import fcntl
+    except ImportError:  # Windows: only the in-process lock applies
+        return None
+    return fcntl
+
+
+_fcntl = _fcntl_module()
+
+MONTH_CODECS = tuple(_CODEC_IDS)
+
+
+def available_codecs() -> list[str]:
+    """Codec names this Python can write and read (``zstd`` needs Python 3.14+)."""
+    return ['none', *(name for name in _CODEC_IDS if name in _CODECS)]
+
+
+class MonthFileError(ValueError):
+    """Raised when a month file is truncated or not in the expected format."""
+
+
+# Serialises appends and compactions between threads; the lock file does so between processes
+_append_lock = threading.Lock()
+
+
+@contextmanager
+def exclusive_file_lock(lock_path: Path) -> Generator[None]:
+    """Hold an exclusive ``flock`` on ``lock_path`` (created if missing); a no-op without ``fcntl``."""
+    if _fcntl is None:
+        yield
+        return
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, 'ab') as handle:
+        _fcntl.flock(handle.fileno(), _fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            _fcntl.flock(handle.fileno(), _fcntl.LOCK_UN)
+
+
+@contextmanager
+def _month_write_lock(path: Path) -> Generator[None]:
+    """Hold the write lock of the directory holding month file ``path``."""
+    with _append_lock, exclusive_file_lock(path.parent / MONTH_LOCK_NAME):
+        yield
+
+
+def _aligned(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _shuffle(values: np.ndarray) -> bytes:
+    """Byte-transpose an 8-byte column: all first bytes, then all second bytes, ..."""
+    return np.ascontiguousarray(values, dtype='<i8').view(np.uint8).reshape(-1, 8).T.tobytes()
+
+
+def _unshuffle(data: bytes, offset: int, count: int) -> np.ndarray:
+    raw = np.frombuffer(data, dtype=np.uint8, count=count * 8, offset=offset).reshape(8, count)
+    return np.ascontiguousarray(raw.T).view('<i8').reshape(count)
+
+
+def _price_decimals(prices: np.ndarray) -> int:
+    """Fewest decimals at which every price is exact as a fixed-point integer, or -1."""
+    if not len(prices) or not np.all(np.isfinite(prices)):
+        return -1 if len(prices) else 0
+    for decimals in range(MAX_PRICE_DECIMALS + 1):
+        scale = 10.0**decimals
+        scaled = np.round(prices * scale)
+        if np.max(np.abs(scaled)) < 2**53 and np.array_equal(scaled / scale, prices):
+            return decimals
+    return -1
+
+
+def _delta(values: np.ndarray) -> np.ndarray:
+    return np.diff(values, prepend=np.zeros(values.shape[:-1] + (1,), dtype=np.int64))
+
+
+def _pack_columns(symbol: bytes, frame: BarFrame) -> tuple[bytes, int]:
+    """Filtered columns of a compressed run, before compression; returns them and the price decimals."""
+    prices = np.vstack(
+        [np.asarray(getattr(frame, name), dtype=np.float64) for name in ('open', 'high', 'low', 'close')]
+    )
+    decimals = _price_decimals(prices)
+    if decimals >= 0:
+        price_columns = _delta(np.round(prices * 10.0**decimals).astype(np.int64))
+    else:
+        price_columns = prices.view(np.int64)
+    parts = [symbol.ljust(_aligned(len(symbol)), b'\0'), _shuffle(_delta(np.asarray(frame.timestamps, dtype=np.int64)))]
+    parts.extend(_shuffle(column) for column in price_columns)
+    parts.append(_shuffle(np.asarray(frame.volume, dtype=np.int64)))
+    return b''.join(parts), decimals
+
+
+def _unpack_columns(data: bytes, symbol_len: int, count: int, decimals: int) -> BarFrame:
+    symbol = data[:symbol_len].decode('utf-8')
+    offset = _aligned(symbol_len)
+    columns: list[np.ndarray] = []
+    for _ in range(6):
+        columns.append(_unshuffle(data, offset, count))
+        offset += count * 8
+    timestamps = np.cumsum(columns[0])
+    prices = np.vstack(columns[1:5])
+    prices = np.cumsum(prices, axis=1) / 10.0**decimals if decimals >= 0 else prices.view(np.float64)
+    return BarFrame(
+        symbol, timestamps, prices[0], prices[1], prices[2], prices[3], columns[5], tz=timezone.utc, validate=False
+    )
+
+
+def encode_month(frame: BarFrame, codec: str = 'none') -> bytes:
+    """
+    Serialise a frame (sorted by timestamp) as one month run.
+
+    Args:
+        codec: ``'none'`` for a memory-mappable run, or a name from
+            ``available_codecs()`` for a compressed one.
+    """
+    if frame.price_scale is not None:
+        frame = BarFrame(
+            frame.symbol,
+            frame.timestamps,
+            frame.prices('open'),
+            frame.prices('high'),
+            frame.prices('low'),
+            frame.prices('close'),
+            frame.volume,
+            tz=frame.tz,
+            validate=False,
+        )
+    symbol = frame.symbol.encode('utf-8')
+    if codec != 'none':
+        if codec not in _CODECS:
+            raise ValueError(f'Unsupported month codec {codec!r}; available: {available_codecs()}')
+        packed, decimals = _pack_columns(symbol, frame)
+        compressed = _CODECS[codec][0](packed)
+        body = _PACKING.pack(len(compressed), decimals) + compressed
+        flags = _CODEC_IDS[codec]
+        header = _HEADER.pack(MONTH_FILE_MAGIC, MONTH_FILE_VERSION, flags, len(frame), len(symbol), zlib.crc32(body))
+        return header + body.ljust(_aligned(len(body)), b'\0')
+
+    parts = [symbol.ljust(_aligned(len(symbol)), b'\0')]
+    for name, dtype in _COLUMN_DTYPES:
+        parts.append(np.ascontiguousarray(getattr(frame, name), dtype=dtype).tobytes())
+    body = b''.join(parts)
+    header = _HEADER.pack(MONTH_FILE_MAGIC, MONTH_FILE_VERSION, 0, len(frame), len(symbol), zlib.crc32(body))
+    return header + body
+
+
+def write_month_file(path: Path, frame: BarFrame, codec: str = 'none') -> int:
+    """Atomically write ``frame`` to ``path`` as a single run; returns the number of bytes written."""
+    payload = encode_month(frame, codec)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Per-process name: another process may be writing the same month
+    temp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    try:
+        with temp_path.open('wb') as handle:
+            handle.write(payload)
+        os.replace(temp_path, path)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+    return len(payload)
+
+
+def _read_run(path: Path, buffer: np.memmap, offset: int, verify: bool) -> tuple[BarFrame, int]:
+    """Decode the run starting at ``offset``; returns the frame and the offset just past it."""
+    size = len(buffer)
+    if size < offset + _HEADER.size:
+        raise MonthFileError(f'{path}: truncated header at byte {offset}')
+    magic, version, flags, count, symbol_len, crc = _HEADER.unpack(bytes(buffer[offset : offset + _HEADER.size]))
+    if magic != MONTH_FILE_MAGIC:
+        raise MonthFileError(f'{path}: not a month file')
+    if version not in (1, MONTH_FILE_VERSION):
+        raise MonthFileError(f'{path}: unsupported month file version {version}')
+
+    body = offset + _HEADER.size
+    if flags & _CODEC_MASK:
+        return _read_packed_run(path, buffer, body, flags & _CODEC_MASK, count, symbol_len, crc, verify)
+    offset = body + _aligned(symbol_len)
+    end = offset + count * 8 * len(_COLUMN_DTYPES)
+    if size < end:
+        raise MonthFileError(f'{path}: truncated ({size - body} bytes for {count} rows)')
+    if verify and version >= 2 and zlib.crc32(buffer[body:end].data) != crc:
+        raise MonthFileError(f'{path}: checksum mismatch in run at byte {body - _HEADER.size}')
+    symbol = bytes(buffer[body : body + symbol_len]).decode('utf-8')
+
+    columns: list[np.ndarray] = []
+    for _, dtype in _COLUMN_DTYPES:
+        column_end = offset + count * 8
+        columns.append(buffer[offset:column_end].view(dtype))
+        offset = column_end
+    timestamps, open_, high, low, close, volume = columns
+    frame = BarFrame(
+        symbol,
+        timestamps=timestamps,
+        open=open_,
+        high=high,
+        low=low,
+        close=close,
+        volume=volume,
+        tz=timezone.utc,
+        validate=False,
+    )
+    return frame, end
+
+
+def _read_packed_run(
+    path: Path, buffer: np.memmap, body: int, codec_id: int, count: int, symbol_len: int, crc: int, verify: bool
+) -> tuple[BarFrame, int]:
+    """Decode a compressed run whose packing header starts at ``body``."""
+    size = len(buffer)
+    if size < body + _PACKING.size:
+        raise MonthFileError(f'{path}: truncated header at byte {body}')
+    payload_len, decimals = _PACKING.unpack(bytes(buffer[body : body + _PACKING.size]))
+    payload_end = body + _PACKING.size + payload_len
+    end = body + _aligned(_PACKING.size + payload_len)
+    if size < end:
+        raise MonthFileError(f'{path}: truncated ({size - body} bytes for a {payload_len} byte payload)')
+    if verify and zlib.crc32(buffer[body:payload_end].data) != crc:
+        raise MonthFileError(f'{path}: checksum mismatch in run at byte {body - _HEADER.size}')
+    codec = next((name for name, codec_id_ in _CODEC_IDS.items() if codec_id_ == codec_id), None)
+    if codec is None or codec not in _CODECS:
+        raise MonthFileError(f'{path}: unsupported codec {codec or codec_id}')
+    try:
+        data = _CODECS[codec][1](bytes(buffer[body + _PACKING.size : payload_end]))
+    except Exception as e:
+        raise MonthFileError(f'{path}: cannot decompress run at byte {body - _HEADER.size}: {e}') from e
+    if len(data) != _aligned(symbol_len) + count * 8 * len(_COLUMN_DTYPES):
+        raise MonthFileError(f'{path}: run at byte {body - _HEADER.size} decompressed to {len(data)} bytes')
+    return _unpack_columns(data, symbol_len, count, decimals), end
+
+
+def month_file_codec(path: Path) -> str:
+    """Codec of a month file's first run (``'none'`` for memory-mappable files)."""
+    with path.open('rb') as handle:
+        header = handle.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise MonthFileError(f'{path}: truncated header')
+    magic, _, flags, _, _, _ = _HEADER.unpack(header)
+    if magic != MONTH_FILE_MAGIC:
+        raise MonthFileError(f'{path}: not a month file')
+    codec_id = flags & _CODEC_MASK
+    return next((name for name, id_ in _CODEC_IDS.items() if id_ == codec_id), str(codec_id))
+
+
+def read_month_runs(path: Path, verify_all: bool = True) -> tuple[list[BarFrame], int]:
+    """
+    Memory-map a month file and decode its valid runs.
+
+    Args:
+        verify_all: Check every run's checksum; otherwise only the last one
+            (the only run a crash mid-append can tear).
+
+    Returns:
+        ``(runs, valid_length)``: runs as read-only views of the mapping, and
+        the byte length of the valid prefix (where the next run is appended).
+
+    Raises:
+        MonthFileError: If the first run is truncated or not a month run.
+    """
+    if path.stat().st_size == 0:
+        raise MonthFileError(f'{path}: truncated header')
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    runs: list[BarFrame] = []
+    offset = 0
+    while offset < len(buffer):
+        try:
+            frame, end = _read_run(path, buffer, offset, verify=verify_all)
+            if not verify_all and end == len(buffer):
+                frame, end = _read_run(path, buffer, offset, verify=True)
+        except MonthFileError:
+            if not runs:
+                raise
+            break
+        runs.append(frame)
+        offset = end
+    return runs, offset
+
+
+def _concat(frames: list[BarFrame]) -> BarFrame:
+    def column(name: str) -> np.ndarray:
+        return np.concatenate([getattr(f, name) for f in frames])
+
+    return BarFrame(
+        frames[0].symbol,
+        column('timestamps'),
+        column('open'),
+        column('high'),
+        column('low'),
+        column('close'),
+        column('volume'),
+        tz=timezone.utc,
+        validate=False,
+    )
+
+
+def _sorted_unique(frame: BarFrame) -> BarFrame:
+    """Rows sorted by timestamp, keeping the last occurrence of each timestamp."""
+    order = np.argsort(frame.timestamps, kind='stable')
+    timestamps = frame.timestamps[order]
+    keep = np.ones(len(order), dtype=bool)
+    keep[:-1] = timestamps[1:] != timestamps[:-1]
+    rows = order[keep]
+    return BarFrame(
+        frame.symbol,
+        frame.timestamps[rows],
+        frame.open[rows],
+        frame.high[rows],
+        frame.low[rows],
+        frame.close[rows],
+        frame.volume[rows],
+        tz=timezone.utc,
+        validate=False,
+    )
+
+
+def merge_runs(runs: list[BarFrame]) -> BarFrame:
+    """One sorted frame from month runs; on duplicate timestamps the later run wins."""
+    runs = [run for run in runs if len(run)] or runs[:1]
+    if len(runs) == 1:
+        return runs[0]
+    merged = _concat(runs)
+    # Runs appended in time order (the usual incremental update) need no sort
+    if all(runs[i].timestamps[0] > runs[i - 1].timestamps[-1] for i in range(1, len(runs))):
+        return merged
+    return _sorted_unique(merged)
+
+
+def read_month_file(path: Path) -> BarFrame:
+    """
+    Read a month file as one frame.
+
+    A single-run month is returned as read-only views of the memory mapping;
+    a month with appended runs is merged into memory.
+    """
+    runs, _ = read_month_runs(path)
+    return merge_runs(runs)
+
+
+def append_month_run(path: Path, frame: BarFrame, codec: str = 'none') -> int:
+    """
+    Append ``frame`` (sorted, unique timestamps) to a month as a new run, writing only its rows.
+
+    A torn run left by an earlier crash is truncated away first. A missing or
+    unreadable file is replaced by one holding just ``frame``. The month's
+    directory lock is held throughout, so concurrent writers (threads or
+    processes) each see the other's run.
+
+    Returns:
+        Number of runs in the month afterwards.
+    """
+    payload = encode_month(frame, codec)
+    with _month_write_lock(path):
+        try:
+            runs, valid_length = read_month_runs(path, verify_all=False)
+        except (FileNotFoundError, MonthFileError):
+            write_month_file(path, frame, codec)
+            return 1
+        with path.open('r+b') as handle:
+            handle.truncate(valid_length)
+            handle.seek(valid_length)
+            handle.write(payload)
+        return len(runs) + 1
+
+
+def compact_month_file(path: Path, codec: str = 'none') -> int:
+    """Atomically rewrite a month as a single run (with ``codec``) under its directory lock; returns its row count."""
+    with _month_write_lock(path):
+        frame = read_month_file(path)
+        write_month_file(path, frame, codec)
+        return len(frame)
+
+
+def date_bounds(frame: BarFrame, start_date: date, end_date: date) -> tuple[int, int]:
+    """Row range ``[lo, hi)`` whose UTC date lies in ``[start_date, end_date]``, found by binary search."""
+    start = datetime.combine(start_date, time.min, tzinfo=timezone.utc)
+    end = datetime.combine(end_date + timedelta(days=1), time.min, tzinfo=timezone.utc)
+    lo = int(np.searchsorted(frame.timestamps, datetime_to_ns(start), side='left'))
+    hi = int(np.searchsorted(frame.timestamps, datetime_to_ns(end), side='left'))
+    return lo, hi
+
+
+def slice_dates(frame: BarFrame, start_date: date, end_date: date) -> BarFrame:
+    """Rows whose UTC date lies in ``[start_date, end_date]`` as a zero-copy slice."""
+    lo, hi = date_bounds(frame, start_date, end_date)
+    return frame[lo:hi]
+
+
+def bars_to_month_frame(symbol: str, bars: list[Bar]) -> BarFrame:
+    """Build a frame in month-file row order: sorted by timestamp, de-duplicated (last wins)."""
+    # Keep the last occurrence of each timestamp, like the JSON writer's list order did on reload.
+    return _sorted_unique(BarFrame.from_bars(bars, symbol=bars[0].symbol if bars else symbol))
+
+
+def split_months(frame: BarFrame) -> list[tuple[str, BarFrame]]:
+    """Split a timestamp-sorted frame into ``('YYYY-MM', view)`` pairs by UTC month."""
+    if len(frame) == 0:
+        return []
+    months = frame.timestamps.astype('datetime64[ns]').astype('datetime64[M]')
+    starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    ends = np.r_[starts[1:], len(frame)]
+    return [(str(months[lo]), frame[int(lo) : int(hi)]) for lo, hi in zip(starts, ends)]
+
+
+def read_legacy_json_month(path: Path) -> list[Bar]:
+    """Parse a month file written by the original JSON cache format."""
+    with open(path) as f:
+        month_data = cast(list[dict[str, object]], json.load(f))
+    return [
+        Bar(
+            symbol=str(bar_dict['symbol']),
+            timestamp=datetime.fromisoformat(str(bar_dict['timestamp'])),
+            open=Decimal(str(bar_dict['open'])),
+            high=Decimal(str(bar_dict['high'])),
+            low=Decimal(str(bar_dict['low'])),
+            close=Decimal(str(bar_dict['close'])),
+            volume=int(cast(int, bar_dict['volume'])),
+        )
+        for bar_dict in month_data
+    ]
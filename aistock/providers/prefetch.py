@@ -0,0 +1,307 @@
+"""
+Concurrent cache prefetch for the Massive.com provider.
+
+The prefetcher plans one request per uncached (symbol, month) from
+``MassiveCache.get_missing_ranges`` and pipelines them:
+
+- worker threads share one ``RateLimiter`` and only do network I/O, so the
+  limiter is kept saturated while other work happens;
+- the calling thread decodes responses into bars and writes month files as
+  each request completes, overlapping with the workers' waits.
+
+Month files are written atomically as they complete, so the cache itself is
+the resume journal: after an interruption, planning again skips every month
+already stored. A whole past month that returns no bars is indexed as empty,
+so it is not requested again on every run.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from calendar import monthrange
+from collections.abc import Sequence
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..data import Bar
+    from .cache import MassiveCache
+    from .massive import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Minute bars for a month fit in one page at this limit; larger months paginate
+AGGS_PAGE_LIMIT = 50000
+
+
+@dataclass(frozen=True)
+class PrefetchChunk:
+    """One API request: a symbol's bars within a single calendar month."""
+
+    symbol: str
+    start: date
+    end: date
+    timespan: str = 'minute'
+
+
+@dataclass
+class PrefetchReport:
+    """Outcome of a prefetch run."""
+
+    symbols: list[str] = field(default_factory=list)
+    cached_symbols: list[str] = field(default_factory=list)
+    chunks_planned: int = 0
+    chunks_completed: int = 0
+    api_calls: int = 0
+    bars_stored: int = 0
+    elapsed_seconds: float = 0.0
+    errors: dict[str, list[str]] = field(default_factory=dict)
+
+    @property
+    def success(self) -> bool:
+        return not self.errors
+
+    @property
+    def failed_symbols(self) -> list[str]:
+        return [symbol for symbol in self.symbols if symbol in self.errors]
+
+    @property
+    def calls_per_minute(self) -> float:
+        """Achieved request rate, to compare against the plan's limit."""
+        return self.api_calls / self.elapsed_seconds * 60 if self.elapsed_seconds > 0 else 0.0
+
+
+def _month_end(day: date) -> date:
+    return date(day.year, day.month, monthrange(day.year, day.month)[1])
+
+
+def _is_whole_past_month(chunk: PrefetchChunk) -> bool:
+    """True if ``chunk`` spans a full calendar month that has already ended (UTC)."""
+    month_end = _month_end(chunk.start)
+    return chunk.start.day == 1 and chunk.end == month_end and month_end < datetime.now(timezone.utc).date()
+
+
+def plan_prefetch(
+    cache: MassiveCache,
+    symbols: Sequence[str],
+    start_date: date,
+    end_date: date,
+    timespan: str = 'minute',
+    asset_type: str = 'stocks',
+    use_cache: bool = True,
+) -> list[PrefetchChunk]:
+    """
+    One chunk per uncached (symbol, month), in priority order.
+
+    Earlier months come first so the first walk-forward folds become runnable
+    soonest; within a month, symbols keep the order given. With ``use_cache``
+    False every month in the range is planned, cached or not.
+    """
+    chunks: list[tuple[date, int, PrefetchChunk]] = []
+    for rank, symbol in enumerate(symbols):
+        ranges = (
+            cache.get_missing_ranges(symbol, start_date, end_date, timespan, asset_type)
+            if use_cache
+            else [(start_date, end_date)]
+        )
+        for range_start, range_end in ranges:
+            current = range_start
+            while current <= range_end:
+                chunk_end = min(_month_end(current), range_end)
+                chunks.append((current, rank, PrefetchChunk(symbol, current, chunk_end, timespan)))
+                current = date(chunk_end.year + chunk_end.month // 12, chunk_end.month % 12 + 1, 1)
+    chunks.sort(key=lambda item: (item[0], item[1]))
+    return [chunk for _, _, chunk in chunks]
+
+
+def _decode_results(symbol: str, results: list[dict[str, Any]]) -> list[Bar]:
+    from ..data import Bar
+
+    return [
+        Bar(
+            symbol=symbol,
+            # Massive returns timestamp in milliseconds
+            timestamp=datetime.fromtimestamp(agg['t'] / 1000, tz=timezone.utc),
+            open=Decimal(str(agg['o'])),
+            high=Decimal(str(agg['h'])),
+            low=Decimal(str(agg['l'])),
+            close=Decimal(str(agg['c'])),
+            volume=int(agg['v']),
+        )
+        for agg in results
+    ]
+
+
+class _PrefetchCancelledError(Exception):
+    """Raised in a worker when the prefetch is stopped while it waits."""
+
+
+class MassivePrefetcher:
+    """
+    Runs a prefetch plan with a pool of workers sharing one rate limiter.
+
+    Args:
+        client: Massive ``RESTClient`` (``list_aggs`` with ``raw=True`` is used).
+        cache: Cache to fill; only the calling thread writes to it.
+        rate_limiter: Limiter shared by all workers.
+        workers: Concurrent requests in flight.
+        max_retries: Retries per chunk after a failed request.
+        retry_backoff_seconds: Initial retry backoff (doubles per retry).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        cache: MassiveCache,
+        rate_limiter: RateLimiter,
+        workers: int = 4,
+        max_retries: int = 3,
+        retry_backoff_seconds: float = 15.0,
+    ) -> None:
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        self._client = client
+        # Keep one connection per worker alive instead of reconnecting for every request
+        pool_kw: dict[str, Any] | None = getattr(getattr(client, 'client', None), 'connection_pool_kw', None)
+        if pool_kw is not None:
+            pool_kw['maxsize'] = max(int(pool_kw.get('maxsize', 1)), workers)
+        self._cache = cache
+        self._rate_limiter = rate_limiter
+        self._workers = workers
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff_seconds
+        self._stop = threading.Event()
+        self._calls_lock = threading.Lock()
+        self._api_calls = 0
+
+    def run(
+        self,
+        symbols: Sequence[str],
+        start_date: date,
+        end_date: date,
+        timespan: str = 'minute',
+        multiplier: int = 1,
+        use_cache: bool = True,
+    ) -> PrefetchReport:
+        """
+        Fetch every uncached month for ``symbols`` and store it.
+
+        With ``use_cache`` False every month is fetched again and merged into
+        the cache (fetched bars replace cached ones with the same timestamp).
+        On KeyboardInterrupt, in-flight requests are finished and stored
+        before the interrupt propagates; calling ``run`` again resumes.
+        """
+        started = time.time()
+        self._stop.clear()
+        self._api_calls = 0
+        plan = plan_prefetch(self._cache, symbols, start_date, end_date, timespan, use_cache=use_cache)
+        planned_symbols = {chunk.symbol for chunk in plan}
+        report = PrefetchReport(
+            symbols=list(symbols),
+            cached_symbols=[symbol for symbol in symbols if symbol not in planned_symbols],
+            chunks_planned=len(plan),
+        )
+        logger.info(f'Prefetch plan: {len(plan)} requests for {len(planned_symbols)} symbols, {self._workers} workers')
+
+        executor = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix='massive-prefetch')
+        futures: dict[Future[list[dict[str, Any]]], PrefetchChunk] = {
+            executor.submit(self._fetch_chunk, chunk, multiplier): chunk for chunk in plan
+        }
+        stored: set[Future[list[dict[str, Any]]]] = set()
+        try:
+            for future in as_completed(futures):
+                stored.add(future)
+                self._store(futures[future], future, report)
+        except BaseException:
+            # Finish what is in flight, keep it, and let the caller resume later
+            self._stop.set()
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+            for future, chunk in futures.items():
+                if future not in stored and not future.cancelled():
+                    self._store(chunk, future, report)
+            raise
+        finally:
+            executor.shutdown(wait=True)
+            report.api_calls = self._api_calls
+            report.elapsed_seconds = time.time() - started
+
+        logger.info(
+            f'Prefetch complete: {report.chunks_completed}/{report.chunks_planned} months, '
+            f'{report.bars_stored} bars, {report.api_calls} API calls '
+            f'({report.calls_per_minute:.1f}/min) in {report.elapsed_seconds:.1f}s'
+        )
+        return report
+
+    def _store(self, chunk: PrefetchChunk, future: Future[list[dict[str, Any]]], report: PrefetchReport) -> None:
+        """Decode a finished request and write it to the cache (calling thread only)."""
+        error = future.exception()
+        if isinstance(error, _PrefetchCancelledError):
+            return
+        if error is not None:
+            message = f'{chunk.start} to {chunk.end}: {error}'
+            logger.error(f'Prefetch failed for {chunk.symbol} {message}')
+            report.errors.setdefault(chunk.symbol, []).append(message)
+            return
+        bars = _decode_results(chunk.symbol, future.result())
+        if bars:
+            self._cache.store_bars(chunk.symbol, bars, chunk.timespan)
+        elif _is_whole_past_month(chunk):
+            self._cache.record_empty_month(chunk.symbol, f'{chunk.start:%Y-%m}', chunk.timespan)
+        report.chunks_completed += 1
+        report.bars_stored += len(bars)
+        logger.debug(f'Stored {len(bars)} bars for {chunk.symbol} {chunk.start:%Y-%m}')
+
+    def _fetch_chunk(self, chunk: PrefetchChunk, multiplier: int) -> list[dict[str, Any]]:
+        """Worker: request a chunk (all pages), retrying with backoff."""
+        attempt = 0
+        while True:
+            try:
+                return self._request_pages(chunk, multiplier)
+            except _PrefetchCancelledError:
+                raise
+            except Exception as exc:
+                if attempt >= self._max_retries:
+                    raise
+                backoff = self._retry_backoff * (2**attempt)
+                attempt += 1
+                logger.warning(
+                    f'Request for {chunk.symbol} {chunk.start:%Y-%m} failed ({exc}); '
+                    f'retry {attempt}/{self._max_retries} in {backoff}s'
+                )
+                if self._stop.wait(backoff):
+                    raise _PrefetchCancelledError() from exc
+
+    def _request_pages(self, chunk: PrefetchChunk, multiplier: int) -> list[dict[str, Any]]:
+        results: list[dict[str, Any]] = []
+        from_: str | int = chunk.start.isoformat()
+        while True:
+            if self._stop.is_set() or not self._rate_limiter.acquire(cancel=self._stop):
+                raise _PrefetchCancelledError()
+            with self._calls_lock:
+                self._api_calls += 1
+            response = self._client.list_aggs(
+                ticker=chunk.symbol,
+                multiplier=multiplier,
+                timespan=chunk.timespan,
+                from_=from_,
+                to=chunk.end.isoformat(),
+                limit=AGGS_PAGE_LIMIT,
+                raw=True,
+            )
+            if response.status != 200:
+                raise RuntimeError(f'HTTP {response.status}')
+            payload = json.loads(response.data)
+            page: list[dict[str, Any]] = payload.get('results') or []
+            results.extend(page)
+            # A truncated page: continue after its last bar (a new request against the limit)
+            if not page or 'next_url' not in payload:
+                return results
+            from_ = int(page[-1]['t']) + 1
@@ -0,0 +1,534 @@
+"""
+Compiled state encoding and array-backed Q-table for the FSD RL agent.
+
+The tabular agent used to key each state by an MD5 of a JSON-serialised dict of
+discretized features and to hold one ``dict[str, float]`` per state. Both the
+hashing and the per-state dicts dominate CPU and memory once the table grows,
+so states are now packed into a single mixed-radix integer and Q-values live in
+a preallocated ``float64`` matrix addressed through an integer -> row index.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import struct
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, cast
+
+import numpy as np
+from numpy.typing import NDArray
+
+if TYPE_CHECKING:
+    from .fsd import FSDConfig
+
+
+STATE_ENCODING_SCHEME = 'mixed_radix_v1'
+
+# (state key, legacy discretized name, default, lower bound, upper bound, FSDConfig bins attribute)
+_NUMERIC_FEATURES: tuple[tuple[str, str, float, float, float, str], ...] = (
+    ('price_change_pct', 'price_change_bin', 0.0, -0.05, 0.05, 'price_change_bins'),
+    ('volume_ratio', 'volume_bin', 1.0, 0.5, 2.0, 'volume_bins'),
+    ('position_pct', 'position_bin', 0.0, -0.5, 0.5, 'position_bins'),
+    ('rsi', 'rsi_bin', 50.0, 0.0, 100.0, 'rsi_bins'),
+    ('macd_hist_pct', 'macd_bin', 0.0, -0.05, 0.05, 'macd_bins'),
+    ('bb_pos', 'bb_pos_bin', 0.5, 0.0, 1.0, 'bollinger_bins'),
+    ('momentum_fast', 'momentum_fast_bin', 0.0, -1.0, 1.0, 'momentum_bins'),
+    ('momentum_slow', 'momentum_slow_bin', 0.0, -1.0, 1.0, 'momentum_bins'),
+    ('market_breadth', 'breadth_bin', 0.0, -1.0, 1.0, 'breadth_bins'),
+    ('vix_level', 'vix_bin', 0.0, 10.0, 50.0, 'vix_bins'),
+    ('spread_bps', 'spread_bin', 0.0, 0.0, 200.0, 'spread_bins'),
+    ('depth_proxy', 'depth_bin', 0.0, 0.0, 5.0, 'depth_bins'),
+)
+
+TREND_LABELS = ('neutral', 'up', 'down')
+VOLATILITY_LABELS = ('normal', 'low', 'high')
+
+# Categorical features in encoding order. Fast/slow variants fall back to the
+# resolved base label, matching how the agent has always normalised them.
+_CATEGORICAL_FEATURES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ('trend', TREND_LABELS),
+    ('volatility', VOLATILITY_LABELS),
+    ('trend_fast', TREND_LABELS),
+    ('trend_slow', TREND_LABELS),
+    ('volatility_fast', VOLATILITY_LABELS),
+    ('volatility_slow', VOLATILITY_LABELS),
+)
+
+_INT64_LIMIT = 2**63
+
+
+def discretize(value: float, min_val: float, max_val: float, bins: int) -> int:
+    """Discretize continuous value into bins."""
+    if value <= min_val:
+        return 0
+    if value >= max_val:
+        return bins - 1
+
+    range_size = max_val - min_val
+    bin_size = range_size / bins
+    bin_idx = int((value - min_val) / bin_size)
+
+    return min(bin_idx, bins - 1)
+
+
+class StateEncoder:
+    """
+    Pack a feature dict into one mixed-radix integer.
+
+    Each numeric feature contributes its bin index (radix = configured bins) and
+    each categorical feature its label index (radix = known labels + 1, the last
+    slot catching unexpected labels). The resulting key is stable for a given
+    set of bin counts, which are exposed via ``describe()`` so persisted tables
+    can detect a configuration change.
+    """
+
+    def __init__(self, config: FSDConfig):
+        self._numeric: tuple[tuple[str, float, float, float, int], ...] = tuple(
+            (name, default, lo, hi, int(getattr(config, bins_attr)))
+            for name, _, default, lo, hi, bins_attr in _NUMERIC_FEATURES
+        )
+        self._label_codes: tuple[dict[str, int], ...] = tuple(
+            {label: idx for idx, label in enumerate(labels)} for _, labels in _CATEGORICAL_FEATURES
+        )
+        self.radices: tuple[int, ...] = tuple(spec[4] for spec in self._numeric) + tuple(
+            len(labels) + 1 for _, labels in _CATEGORICAL_FEATURES
+        )
+
+        state_space = 1
+        for radix in self.radices:
+            state_space *= radix
+        if state_space >= _INT64_LIMIT:
+            raise ValueError(f'State space of {state_space} states does not fit a 64-bit key; reduce bin counts')
+        self.state_space = state_space
+
+    def describe(self) -> dict[str, object]:
+        """Return a JSON-serialisable description used to validate persisted keys."""
+        return {'scheme': STATE_ENCODING_SCHEME, 'radices': list(self.radices)}
+
+    def matches(self, description: object) -> bool:
+        """Return True if ``description`` was produced by an encoder with the same layout."""
+        if not isinstance(description, dict):
+            return False
+        desc = cast(dict[str, object], description)
+        radices = desc.get('radices')
+        if desc.get('scheme') != STATE_ENCODING_SCHEME or not isinstance(radices, list):
+            return False
+        return tuple(cast(list[object], radices)) == self.radices
+
+    def encode(self, state: Mapping[str, object]) -> int:
+        """Encode a state dict into its integer key."""
+        key = 0
+        for name, default, lo, hi, bins in self._numeric:
+            raw = state.get(name, default)
+            value = float(raw) if isinstance(raw, (int, float)) else default
+            key = key * bins + discretize(value, lo, hi, bins)
+
+        trend_raw = state.get('trend', 'neutral')
+        trend = trend_raw if isinstance(trend_raw, str) else 'neutral'
+        vol_raw = state.get('volatility', 'normal')
+        volatility = vol_raw if isinstance(vol_raw, str) else 'normal'
+        labels = (
+            trend,
+            volatility,
+            self._label(state, 'trend_fast', trend),
+            self._label(state, 'trend_slow', trend),
+            self._label(state, 'volatility_fast', volatility),
+            self._label(state, 'volatility_slow', volatility),
+        )
+        for label, codes in zip(labels, self._label_codes):
+            radix = len(codes) + 1
+            key = key * radix + codes.get(label, radix - 1)
+        return key
+
+    @staticmethod
+    def _label(state: Mapping[str, object], name: str, default: str) -> str:
+        raw = state.get(name, default)
+        return raw if isinstance(raw, str) else default
+
+    def decode(self, key: int) -> dict[str, int | str] | None:
+        """
+        Expand a key back into the discretized feature dict the legacy MD5 hash was built from.
+
+        Returns None when a categorical field holds the catch-all slot, because the
+        original label cannot be recovered.
+        """
+        digits: list[int] = []
+        for radix in reversed(self.radices):
+            key, digit = divmod(key, radix)
+            digits.append(digit)
+        digits.reverse()
+
+        discretized: dict[str, int | str] = {}
+        for spec, digit in zip(_NUMERIC_FEATURES, digits):
+            discretized[spec[1]] = digit
+        for (name, labels), digit in zip(_CATEGORICAL_FEATURES, digits[len(_NUMERIC_FEATURES) :]):
+            if digit >= len(labels):
+                return None
+            discretized[name] = labels[digit]
+        return discretized
+
+    def legacy_hash(self, key: int) -> str | None:
+        """Return the MD5 key the pre-encoder agent would have used for this state."""
+        discretized = self.decode(key)
+        if discretized is None:
+            return None
+        state_str = json.dumps(discretized, sort_keys=True)
+        return hashlib.md5(state_str.encode()).hexdigest()
+
+
+class QTable:
+    """
+    Fixed-capacity Q-value matrix with LRU eviction.
+
+    Rows of a preallocated ``(capacity, n_actions)`` float64 matrix are handed
+    out to state keys on first visit; an ``OrderedDict`` maps key -> row and
+    tracks recency. Evicted rows are recycled.
+
+    Decay is lazy: ``decay()`` only adds ``log(factor)`` to a global log scale.
+    Each row remembers the log scale its values were last brought up to date
+    at, and catches up (one multiply) the next time it is read or written, or
+    when ``fold_decay()`` runs before persistence. The cost of decaying is
+    therefore independent of table size.
+
+    Thread Safety:
+        Not thread-safe. ``RLAgent`` serialises access with its own lock.
+    """
+
+    def __init__(self, capacity: int, actions: Sequence[str]):
+        if capacity <= 0:
+            raise ValueError(f'capacity must be positive, got {capacity}')
+        self.capacity = capacity
+        self.actions: tuple[str, ...] = tuple(actions)
+        self.action_index: dict[str, int] = {action: idx for idx, action in enumerate(self.actions)}
+        self._values: NDArray[np.float64] = np.zeros((capacity, len(self.actions)), dtype=np.float64)
+        self._keys: NDArray[np.int64] = np.full(capacity, -1, dtype=np.int64)
+        self._stamps: NDArray[np.float64] = np.zeros(capacity, dtype=np.float64)
+        self.log_scale = 0.0
+        self._rows: OrderedDict[int, int] = OrderedDict()
+        self._free_rows: list[int] = []
+        self._next_row = 0
+        # Keys touched since the last snapshot, in last-touch order (for delta checkpoints)
+        self._dirty: dict[int, None] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rows
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate keys from least to most recently used."""
+        return iter(self._rows)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the preallocated value, key and decay stamp arrays."""
+        return int(self._values.nbytes + self._keys.nbytes + self._stamps.nbytes)
+
+    def row_for(self, key: int) -> int | None:
+        """Return the row for ``key`` without affecting recency."""
+        return self._rows.get(key)
+
+    def touch(self, key: int) -> int | None:
+        """Return the row for ``key`` and mark it most recently used."""
+        row = self._rows.get(key)
+        if row is not None:
+            self._rows.move_to_end(key)
+            self._mark_dirty(key)
+        return row
+
+    def _mark_dirty(self, key: int) -> None:
+        self._dirty.pop(key, None)
+        self._dirty[key] = None
+
+    @property
+    def dirty_count(self) -> int:
+        """Number of states touched since the last snapshot."""
+        return len(self._dirty)
+
+    def insert(
+        self,
+        key: int,
+        values: Sequence[float] | NDArray[np.float64] | None = None,
+        log_scale: float | None = None,
+    ) -> int:
+        """
+        Allocate a row for a new ``key`` (evicting the LRU state when full) and return it.
+
+        ``log_scale`` is the decay scale ``values`` are expressed at; it defaults
+        to the current scale. Values captured earlier catch up on first access.
+        """
+        if key in self._rows:
+            raise KeyError(f'state {key} already present')
+        if len(self._rows) >= self.capacity:
+            self.evict_oldest()
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            row = self._next_row
+            self._next_row += 1
+        if values is None:
+            self._values[row] = 0.0
+        else:
+            self._values[row] = values
+        self._stamps[row] = self.log_scale if log_scale is None else log_scale
+        self._keys[row] = key
+        self._rows[key] = row
+        self._mark_dirty(key)
+        return row
+
+    def evict_oldest(self) -> int | None:
+        """Drop the least recently used state and return its key."""
+        if not self._rows:
+            return None
+        key, row = self._rows.popitem(last=False)
+        self._dirty.pop(key, None)
+        self._keys[row] = -1
+        self._free_rows.append(row)
+        return key
+
+    def row_values(self, row: int) -> NDArray[np.float64]:
+        """Return a view of one row's up-to-date Q-values (ordered like ``actions``)."""
+        stamp = self._stamps[row]
+        if stamp != self.log_scale:
+            self._values[row] *= math.exp(self.log_scale - stamp)
+            self._stamps[row] = self.log_scale
+        return self._values[row]
+
+    def get(self, key: int) -> dict[str, float] | None:
+        """Return ``{action: q}`` for ``key`` without affecting recency."""
+        row = self._rows.get(key)
+        if row is None:
+            return None
+        return dict(zip(self.actions, self.row_values(row).tolist()))
+
+    def decay(self, factor: float) -> None:
+        """Multiply every Q-value by ``factor`` (applied lazily, O(1))."""
+        if factor <= 0:
+            raise ValueError(f'decay factor must be positive, got {factor}')
+        self.log_scale += math.log(factor)
+
+    def fold_decay(self) -> None:
+        """Bring every row up to the current decay scale in one vectorised pass."""
+        used = self._next_row
+        if used == 0:
+            return
+        lag = self.log_scale - self._stamps[:used]
+        stale = lag != 0.0
+        if stale.any():
+            self._values[:used][stale] *= np.exp(lag[stale])[:, np.newaxis]
+            self._stamps[:used] = self.log_scale
+
+    def items(self) -> Iterator[tuple[int, NDArray[np.float64]]]:
+        """Yield ``(key, row values view)`` from least to most recently used."""
+        self.fold_decay()
+        for key, row in self._rows.items():
+            yield key, self._values[row]
+
+    def to_dict(self) -> dict[str, dict[str, float]]:
+        """Serialise to ``{str(key): {action: q}}`` in LRU order."""
+        self.fold_decay()
+        return {str(key): dict(zip(self.actions, self._values[row].tolist())) for key, row in self._rows.items()}
+
+    def snapshot(self, dirty_only: bool = False) -> QTableSnapshot:
+        """
+        Copy rows out for persistence and reset dirty tracking.
+
+        A full snapshot lists every state from least to most recently used; a
+        dirty-only snapshot lists the states touched since the previous
+        snapshot in last-touch order, which is enough to replay both their
+        values and their recency on top of the earlier snapshot. Values are
+        copied raw alongside their decay stamps, so no folding is needed.
+        """
+        keys = list(self._dirty) if dirty_only else list(self._rows)
+        rows = np.fromiter((self._rows[key] for key in keys), dtype=np.intp, count=len(keys))
+        self._dirty.clear()
+        return QTableSnapshot(
+            keys=np.asarray(keys, dtype=np.int64),
+            values=self._values[rows],
+            stamps=self._stamps[rows],
+            log_scale=self.log_scale,
+        )
+
+    def load_rows(self, snapshot: QTableSnapshot) -> None:
+        """Bulk-load a full snapshot into an empty table, keeping the most recent ``capacity`` states."""
+        if self._rows:
+            raise ValueError('load_rows requires an empty table')
+        if snapshot.values.shape[1:] != (len(self.actions),):
+            raise ValueError(f'snapshot has {snapshot.values.shape[1:]} actions, expected {len(self.actions)}')
+        count = min(len(snapshot.keys), self.capacity)
+        start = len(snapshot.keys) - count
+        self._keys[:count] = snapshot.keys[start:]
+        self._values[:count] = snapshot.values[start:]
+        self._stamps[:count] = snapshot.stamps[start:]
+        self._rows = OrderedDict(zip(self._keys[:count].tolist(), range(count)))
+        self._next_row = count
+        self.log_scale = snapshot.log_scale
+
+    def apply_row(self, key: int, values: NDArray[np.float64], stamp: float) -> None:
+        """Replay one delta record: overwrite (or insert) ``key`` and mark it most recently used."""
+        row = self._rows.get(key)
+        if row is None:
+            self.insert(key, values, log_scale=stamp)
+            return
+        self._rows.move_to_end(key)
+        self._mark_dirty(key)
+        self._values[row] = values
+        self._stamps[row] = stamp
+
+    def mark_clean(self) -> None:
+        """Forget dirty tracking (after the table has been persisted or freshly loaded)."""
+        self._dirty.clear()
+
+    def clear(self) -> None:
+        self._rows.clear()
+        self._free_rows.clear()
+        self._dirty.clear()
+        self._keys[:] = -1
+        self._stamps[:] = 0.0
+        self.log_scale = 0.0
+        self._next_row = 0
+
+
+# ----------------------------------------------------------------------
+# Binary checkpoint format
+#
+# A base file holds a full snapshot: a fixed header followed by the key,
+# decay stamp and Q-value arrays, laid out so they can be memory-mapped. A
+# delta log next to it holds CRC-checked records of rows touched since the
+# base was written; a torn trailing record (crash mid-append) is ignored.
+
+SNAPSHOT_MAGIC = b'AIQT'
+DELTA_MAGIC = b'AIQD'
+SNAPSHOT_VERSION = 1
+
+# Rewrite the base snapshot once the delta log would exceed this fraction of its size
+DELTA_COMPACTION_RATIO = 0.5
+
+# magic, version, n_states, n_actions, reserved, log_scale, generation
+_SNAPSHOT_HEADER = struct.Struct('<4sIQIIdQ')
+# magic, n_states, n_actions, log_scale, generation, payload crc32, reserved
+_DELTA_HEADER = struct.Struct('<4sIIdQII')
+
+
+@dataclass
+class QTableSnapshot:
+    """Rows copied out of a ``QTable`` (keys in LRU order, raw values and decay stamps)."""
+
+    keys: NDArray[np.int64]
+    values: NDArray[np.float64]
+    stamps: NDArray[np.float64]
+    log_scale: float
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def to_bytes(self) -> bytes:
+        """Serialise the key, stamp and value arrays (little-endian, in that order)."""
+        return (
+            np.ascontiguousarray(self.keys, dtype='<i8').tobytes()
+            + np.ascontiguousarray(self.stamps, dtype='<f8').tobytes()
+            + np.ascontiguousarray(self.values, dtype='<f8').tobytes()
+        )
+
+
+def write_snapshot(handle: IO[bytes], snapshot: QTableSnapshot, generation: int) -> None:
+    """Write a full snapshot in the memory-mappable base format."""
+    n_actions = snapshot.values.shape[1] if snapshot.values.ndim == 2 else 0
+    handle.write(
+        _SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(snapshot), n_actions, 0, snapshot.log_scale, generation
+        )
+    )
+    handle.write(snapshot.to_bytes())
+
+
+def read_snapshot(path: Path) -> tuple[int, QTableSnapshot]:
+    """
+    Memory-map a base snapshot file.
+
+    Returns:
+        ``(generation, snapshot)``; the snapshot arrays are read-only views of the file.
+
+    Raises:
+        ValueError: If the file is truncated or not a Q-table snapshot.
+    """
+    size = path.stat().st_size
+    with path.open('rb') as handle:
+        header = handle.read(_SNAPSHOT_HEADER.size)
+    if len(header) < _SNAPSHOT_HEADER.size:
+        raise ValueError(f'{path} is too short to be a Q-table snapshot')
+    magic, version, n_states, n_actions, _, log_scale, generation = _SNAPSHOT_HEADER.unpack(header)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        raise ValueError(f'{path} is not a version {SNAPSHOT_VERSION} Q-table snapshot')
+    expected = _SNAPSHOT_HEADER.size + n_states * (8 + 8 + 8 * n_actions)
+    if size != expected:
+        raise ValueError(f'{path} is truncated ({size} bytes, expected {expected})')
+    if n_states == 0:
+        empty = np.zeros(0, dtype=np.float64)
+        return generation, QTableSnapshot(
+            np.zeros(0, dtype=np.int64), np.zeros((0, n_actions), dtype=np.float64), empty, log_scale
+        )
+
+    offset = _SNAPSHOT_HEADER.size
+    keys = np.memmap(path, dtype='<i8', mode='r', offset=offset, shape=(n_states,))
+    offset += 8 * n_states
+    stamps = np.memmap(path, dtype='<f8', mode='r', offset=offset, shape=(n_states,))
+    offset += 8 * n_states
+    values = np.memmap(path, dtype='<f8', mode='r', offset=offset, shape=(n_states, n_actions))
+    return generation, QTableSnapshot(
+        cast(NDArray[np.int64], keys), cast(NDArray[np.float64], values), cast(NDArray[np.float64], stamps), log_scale
+    )
+
+
+def encode_delta(snapshot: QTableSnapshot, generation: int) -> bytes:
+    """Serialise a dirty-row snapshot as one delta log record."""
+    payload = snapshot.to_bytes()
+    n_actions = snapshot.values.shape[1] if snapshot.values.ndim == 2 else 0
+    header = _DELTA_HEADER.pack(
+        DELTA_MAGIC, len(snapshot), n_actions, snapshot.log_scale, generation, zlib.crc32(payload), 0
+    )
+    return header + payload
+
+
+def read_deltas(path: Path, generation: int, n_actions: int) -> tuple[list[QTableSnapshot], int]:
+    """
+    Read the valid prefix of a delta log belonging to base ``generation``.
+
+    Returns:
+        ``(records, valid_length)``. Reading stops at the first record that is
+        torn, fails its checksum, or belongs to another base generation;
+        ``valid_length`` is where the next record should be appended.
+    """
+    if not path.exists():
+        return [], 0
+    data = path.read_bytes()
+    records: list[QTableSnapshot] = []
+    offset = 0
+    while offset + _DELTA_HEADER.size <= len(data):
+        magic, n_states, record_actions, log_scale, record_generation, crc, _ = _DELTA_HEADER.unpack_from(data, offset)
+        if magic != DELTA_MAGIC or record_generation != generation or record_actions != n_actions:
+            break
+        start = offset + _DELTA_HEADER.size
+        end = start + n_states * (8 + 8 + 8 * n_actions)
+        if end > len(data) or zlib.crc32(data[start:end]) != crc:
+            break
+        keys = np.frombuffer(data, dtype='<i8', count=n_states, offset=start)
+        stamps = np.frombuffer(data, dtype='<f8', count=n_states, offset=start + 8 * n_states)
+        values = np.frombuffer(data, dtype='<f8', count=n_states * n_actions, offset=start + 16 * n_states)
+        records.append(
+            QTableSnapshot(
+                keys.astype(np.int64),
+                values.reshape(n_states, n_actions).astype(np.float64),
+                stamps.astype(np.float64),
+                log_scale,
+            )
+        )
+        offset = end
+    return records, offset
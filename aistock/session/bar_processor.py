@@ -1,13 +1,27 @@
-"""Bar processing and ingestion."""
+"""Bar processing and ingestion.
+
+Histories are handed out as ``BarHistoryView`` snapshots instead of list
+copies. Each symbol's bars live in an append-only buffer of up to twice the
+history bound; once full, the newest half is moved into a fresh buffer (a new
+generation) rather than trimmed in place. Bars already in a buffer are never
+overwritten or moved, so a view is an immutable window over it that stays
+consistent while new bars arrive, at the cost of one slice per ``max_history``
+bars instead of one full copy per read.
+
+Last prices work the same way: ``get_all_prices`` returns the current price
+dict itself, and the next price update copies it before writing (copy on
+write), so readers share one snapshot per bar instead of copying per call.
+"""
 
 from __future__ import annotations
 
 import logging
 import threading
-from collections import defaultdict
+from collections.abc import Iterator, Sequence
 from datetime import datetime
 from decimal import Decimal
-from typing import TYPE_CHECKING
+from itertools import islice
+from typing import TYPE_CHECKING, overload
 
 from ..data import Bar
 
@@ -15,6 +29,79 @@ if TYPE_CHECKING:
     from ..interfaces.market_data import MarketDataProviderProtocol
 
 
+class BarHistoryView(Sequence[Bar]):
+    """Read-only window ``[start, stop)`` over one generation of a symbol's bar buffer.
+
+    Indexing and iteration read the shared buffer without copying; slicing
+    returns a list (like slicing a list), which is cheap for the short tails
+    consumers read.
+    """
+
+    __slots__ = ('_bars', '_start', '_stop', 'generation')
+
+    def __init__(self, bars: list[Bar], start: int, stop: int, generation: int) -> None:
+        self._bars = bars
+        self._start = start
+        self._stop = stop
+        self.generation = generation
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    @overload
+    def __getitem__(self, index: int) -> Bar:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Bar]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Bar | list[Bar]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._bars[self._start + start : self._start + max(start, stop)]
+            return [self._bars[self._start + i] for i in range(start, stop, step)]
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('history index out of range')
+        return self._bars[self._start + index]
+
+    def __iter__(self) -> Iterator[Bar]:
+        return islice(self._bars, self._start, self._stop)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (BarHistoryView, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'BarHistoryView(len={len(self)}, generation={self.generation})'
+
+
+class _HistoryBuffer:
+    """Append-only bar buffer of one symbol; see the module docstring."""
+
+    __slots__ = ('bars', 'generation')
+
+    def __init__(self) -> None:
+        self.bars: list[Bar] = []
+        self.generation = 0
+
+    def append(self, bar: Bar, max_history: int) -> None:
+        if len(self.bars) >= 2 * max_history:
+            # Views of the old generation keep the old list alive and unchanged
+            self.bars = self.bars[len(self.bars) - max_history + 1 :]
+            self.generation += 1
+        self.bars.append(bar)
+
+    def view(self, max_history: int) -> BarHistoryView:
+        stop = len(self.bars)
+        return BarHistoryView(self.bars, max(0, stop - max_history), stop, self.generation)
+
+
 class BarProcessor:
     """Processes incoming market bars and manages history.
 
@@ -34,12 +121,19 @@ class BarProcessor:
         self.warmup_bars = warmup_bars
 
         # State
-        self.history: dict[str, list[Bar]] = defaultdict(list)
+        self._history: dict[str, _HistoryBuffer] = {}
+        # Current price snapshot; replaced (not mutated) once handed out by get_all_prices
         self.last_prices: dict[str, Decimal] = {}
+        self._prices_shared = False
         self._lock = threading.Lock()
 
         self.logger = logging.getLogger(__name__)
 
+    @property
+    def max_history(self) -> int:
+        """Most bars a history view holds."""
+        return self.warmup_bars * 5
+
     def process_bar(
         self,
         timestamp: datetime,
@@ -63,17 +157,14 @@ class BarProcessor:
         )
 
         with self._lock:
-            # Add to history
-            history = self.history[symbol]
-            history.append(bar)
-
-            # Keep bounded
-            max_history = self.warmup_bars * 5
-            if len(history) > max_history:
-                del history[: len(history) - max_history]
+            # Add to history (bounded to max_history bars per view)
+            history = self._history.get(symbol)
+            if history is None:
+                history = self._history[symbol] = _HistoryBuffer()
+            history.append(bar, self.max_history)
 
             # Update price
-            self.last_prices[symbol] = bar.close
+            self._set_price_locked(symbol, bar.close)
 
         # Feed to timeframe manager
         if self.timeframe_manager:
@@ -81,10 +172,13 @@ class BarProcessor:
 
         return bar
 
-    def get_history(self, symbol: str) -> list[Bar]:
-        """Get history for a symbol (thread-safe copy)."""
+    def get_history(self, symbol: str) -> BarHistoryView:
+        """Get history for a symbol (thread-safe snapshot, unaffected by later bars)."""
         with self._lock:
-            return list(self.history.get(symbol, []))
+            history = self._history.get(symbol)
+            if history is None:
+                return BarHistoryView([], 0, 0, 0)
+            return history.view(self.max_history)
 
     def get_last_price(self, symbol: str) -> Decimal | None:
         """Get last price for a symbol."""
@@ -92,9 +186,10 @@ class BarProcessor:
             return self.last_prices.get(symbol)
 
     def get_all_prices(self) -> dict[str, Decimal]:
-        """Get all last prices (thread-safe copy)."""
+        """Get all last prices (thread-safe snapshot shared by readers; do not mutate)."""
         with self._lock:
-            return dict(self.last_prices)
+            self._prices_shared = True
+            return self.last_prices
 
     def update_price(self, symbol: str, price: Decimal) -> None:
         """Update last price for a symbol (thread-safe).
@@ -102,4 +197,11 @@ class BarProcessor:
         Used for fill price updates when fills occur between bars.
         """
         with self._lock:
-            self.last_prices[symbol] = price
+            self._set_price_locked(symbol, price)
+
+    def _set_price_locked(self, symbol: str, price: Decimal) -> None:
+        if self._prices_shared:
+            # Copy on write: snapshots already handed out stay unchanged
+            self.last_prices = dict(self.last_prices)
+            self._prices_shared = False
+        self.last_prices[symbol] = price
@@ -41,6 +41,7 @@ class _AggregatedOHLCV:
     low: float
     close: float
     volume: float
+    complete: bool = True  # False when real-time bars of the bucket were dropped before aggregation
 
 
 @dataclass
@@ -73,6 +74,16 @@ class _BarAggregator:
     def __init__(self, bucket_seconds: int) -> None:
         self._bucket_seconds = max(1, bucket_seconds)
         self._current: _AggregatedOHLCV | None = None
+        # (first, last) timestamps of runs of source bars that were dropped before reaching update()
+        self._dropped: list[tuple[datetime, datetime]] = []
+
+    def mark_dropped(self, first: datetime, last: datetime) -> None:
+        """Record lost source bars; buckets overlapping them are completed with ``complete=False``."""
+        if first.tzinfo is None:
+            first = first.replace(tzinfo=timezone.utc)
+        if last.tzinfo is None:
+            last = last.replace(tzinfo=timezone.utc)
+        self._dropped.append((first, last))
 
     def update(
         self,
@@ -90,6 +101,12 @@ class _BarAggregator:
 
         if bucket_start != self._current.timestamp:
             completed = self._current
+            if self._dropped:
+                end = completed.timestamp + timedelta(seconds=self._bucket_seconds)
+                completed.complete = not any(
+                    first < end and last >= completed.timestamp for first, last in self._dropped
+                )
+                self._dropped = [span for span in self._dropped if span[1] >= bucket_start]
             self._current = _AggregatedOHLCV(bucket_start, open_, high, low, close, volume)
             return completed
 
@@ -181,6 +198,23 @@ class TradingCoordinator:
         # Market-data subscriptions (IBKR) + aggregation from 5s real-time bars.
         self._market_subscriptions: dict[str, int] = {}
         self._aggregators: dict[str, dict[str, _BarAggregator]] = {}
+        # Completed decision bars waiting for the rest of their timestamp group (see _queue_decision_bar).
+        self._pending_decision_bars: dict[datetime, dict[str, Bar]] = {}
+        self._last_released_bucket: datetime | None = None
+        self._pending_bars_lock = threading.Lock()
+        # Wall-clock release timers of incomplete groups, by bucket (protected by _pending_bars_lock)
+        self._group_deadlines: dict[datetime, threading.Timer] = {}
+        # Symbols that missed a group deadline; groups stop waiting for them until they deliver a bar again
+        # (protected by _pending_bars_lock)
+        self._lagging_symbols: set[str] = set()
+        broker_config = config.broker
+        self._decision_group_timeout = broker_config.ib_decision_group_timeout if broker_config else 2.0
+        # Realtime bars are handled on several broker worker threads; decision groups are released and
+        # processed one at a time, in bucket order. The lock is held across process_bars, so a slow decision
+        # stalls every worker that completes a decision bar meanwhile; their queues then fill up and the
+        # broker's ib_bar_drop_policy applies (by default the reader thread blocks instead of losing bars).
+        # Releasing the lock before processing would let a later group overtake an earlier one.
+        self._decision_lock = threading.Lock()
         self._stop_thread_started = False
         self._decision_timeframe = self._infer_decision_timeframe()
         self._timeframes = self._infer_timeframes()
@@ -264,8 +298,24 @@ class TradingCoordinator:
 
     def process_bar(self, bar: Bar, timeframe: str = '1m') -> None:
         """Process a bar through the pipeline."""
-        if not self._running:
+        self.process_bars([bar], timeframe=timeframe)
+
+    def process_bars(self, bars: Sequence[Bar], timeframe: str = '1m') -> None:
+        """Process bars closing at the same timestamp (one per symbol) through the pipeline.
+
+        Decision-timeframe bars are evaluated as a group so the decision engine can
+        extract features for every symbol in one batch. Bars with differing
+        timestamps are split into per-timestamp groups and processed in order.
+        """
+        if not self._running or not bars:
+            return
+
+        timestamps = sorted({bar.timestamp for bar in bars})
+        if len(timestamps) > 1:
+            for ts in timestamps:
+                self.process_bars([bar for bar in bars if bar.timestamp == ts], timeframe=timeframe)
             return
+        timestamp = timestamps[0]
 
         # Check for manual stop request
         if self.stop_controller.is_stop_requested():
@@ -275,26 +325,29 @@ class TradingCoordinator:
             return
 
         # Only the decision timeframe drives the main bar history + decision loop.
-        is_decision_timeframe = timeframe == self._decision_timeframe
+        if timeframe != self._decision_timeframe:
+            for bar in bars:
+                self._forward_timeframe_bar(bar, timeframe)
+            return
 
         # Check if new trading day - reset EOD flatten flag
-        if is_decision_timeframe:
-            current_date = bar.timestamp.date()
-            if self._last_trading_date is None or current_date != self._last_trading_date:
-                if self._last_trading_date is not None:
-                    # New day detected, reset EOD flatten
-                    self.stop_controller.reset_eod_flatten()
-                    self.logger.info(f'New trading day detected: {current_date}, reset EOD flatten')
-                self._last_trading_date = current_date
+        current_date = timestamp.date()
+        if self._last_trading_date is None or current_date != self._last_trading_date:
+            if self._last_trading_date is not None:
+                # New day detected, reset EOD flatten
+                self.stop_controller.reset_eod_flatten()
+                self.logger.info(f'New trading day detected: {current_date}, reset EOD flatten')
+            self._last_trading_date = current_date
 
         # Check for end-of-day flatten
-        if is_decision_timeframe and self.stop_controller.check_eod_flatten(bar.timestamp):
+        if self.stop_controller.check_eod_flatten(timestamp):
             self.logger.warning('End-of-day flatten triggered - stopping trading')
             self.stop_controller.request_stop('end_of_day_flatten')
             self._trigger_stop_async()
             return
 
-        if is_decision_timeframe:
+        processed_bars: list[Bar] = []
+        for bar in bars:
             processed = self.bar_processor.process_bar(
                 bar.timestamp,
                 bar.symbol,
@@ -305,15 +358,15 @@ class TradingCoordinator:
                 bar.volume,
                 timeframe=timeframe,
             )
+            processed_bars.append(processed)
             self._process_scheduled_orders(bar)
             self._enforce_max_holding_period(bar.timestamp, bar.symbol)
-            self._evaluate_signal(bar.timestamp, bar.symbol)
+        self._evaluate_signals(timestamp, [bar.symbol for bar in bars])
+        for processed in processed_bars:
             self._maybe_process_paper_fills(processed)
-        else:
-            self._forward_timeframe_bar(bar, timeframe)
 
-    def _evaluate_signal(self, timestamp: datetime, symbol: str) -> None:
-        """Evaluate trading signal."""
+    def _evaluate_signals(self, timestamp: datetime, symbols: Sequence[str]) -> None:
+        """Evaluate trading signals for all symbols that closed a bar at ``timestamp``."""
         # Check trading hours
         allow_extended_hours = self.config.data.allow_extended_hours
         if self.config.account_capabilities:
@@ -339,22 +392,40 @@ class TradingCoordinator:
         self._check_rollover_alerts(timestamp)
 
         # Get market data
-        history = self.bar_processor.get_history(symbol)
         last_prices = self.bar_processor.get_all_prices()
+        histories: dict[str, Sequence[Bar]] = {}
+        for symbol in symbols:
+            history = self.bar_processor.get_history(symbol)
+            if history:
+                histories[symbol] = history
 
-        if not history:
+        if not histories:
             return
 
-        # Get decision
-        decision = cast(DecisionPayload, self.decision_engine.evaluate_opportunity(symbol, history, last_prices))
+        # Get decisions
+        for symbol, decision in self._get_decisions(histories, last_prices).items():
+            if not decision.get('should_trade'):
+                continue
+            history = histories[symbol]
+            if not self._apply_external_filters(symbol, history, timestamp, decision):
+                continue
 
-        if not decision.get('should_trade'):
-            return
-        if not self._apply_external_filters(symbol, history, timestamp, decision):
-            return
+            # Execute trade
+            self._execute_trade(symbol, decision, history, last_prices, timestamp)
 
-        # Execute trade
-        self._execute_trade(symbol, decision, history, last_prices, timestamp)
+    def _get_decisions(
+        self,
+        histories: dict[str, Sequence[Bar]],
+        last_prices: dict[str, Decimal],
+    ) -> dict[str, DecisionPayload]:
+        """Use the engine's batch API for multi-symbol groups when it has one."""
+        evaluate_batch = getattr(self.decision_engine, 'evaluate_batch', None)
+        if callable(evaluate_batch) and len(histories) > 1:
+            return cast(dict[str, DecisionPayload], evaluate_batch(histories, last_prices))
+        return {
+            symbol: cast(DecisionPayload, self.decision_engine.evaluate_opportunity(symbol, history, last_prices))
+            for symbol, history in histories.items()
+        }
 
     def _forward_timeframe_bar(self, bar: Bar, timeframe: str) -> None:
         """Forward non-decision timeframe bars to the timeframe manager (if enabled)."""
@@ -385,7 +456,7 @@ class TradingCoordinator:
     def _apply_external_filters(
         self,
         symbol: str,
-        history: list[Bar],
+        history: Sequence[Bar],
         timestamp: datetime,
         decision: DecisionPayload,
     ) -> bool:
@@ -584,7 +655,7 @@ class TradingCoordinator:
         return price + offset if side == OrderSide.BUY else price - offset
 
     @staticmethod
-    def _build_vwap_weights(history: list[Bar], slices: int) -> list[float]:
+    def _build_vwap_weights(history: Sequence[Bar], slices: int) -> list[float]:
         if slices <= 1:
             return [1.0]
         if len(history) < slices:
@@ -600,7 +671,7 @@ class TradingCoordinator:
         symbol: str,
         delta: Decimal,
         timestamp: datetime,
-        history: list[Bar],
+        history: Sequence[Bar],
         base_client_order_id: str,
     ) -> list[_ScheduledOrder]:
         execution = self.config.execution
@@ -666,7 +737,7 @@ class TradingCoordinator:
             )
         ]
 
-    def _choose_execution_style(self, total_qty: Decimal, history: list[Bar]) -> str:
+    def _choose_execution_style(self, total_qty: Decimal, history: Sequence[Bar]) -> str:
         if not history:
             return 'limit'
         sample = history[-20:]
@@ -808,7 +879,7 @@ class TradingCoordinator:
         self,
         symbol: str,
         decision: DecisionPayload,
-        history: list[Bar],
+        history: Sequence[Bar],
         last_prices: dict[str, Decimal],
         timestamp: datetime,
     ) -> None:
@@ -1064,6 +1135,11 @@ class TradingCoordinator:
                     continue
                 self._aggregators[symbol][timeframe] = _BarAggregator(seconds)
 
+        # Bars the broker drops under backpressure mark their buckets incomplete instead of leaving a silent gap
+        set_drop_handler = getattr(self.broker, 'set_realtime_bar_drop_handler', None)
+        if callable(set_drop_handler):
+            set_drop_handler(self._on_realtime_bars_dropped)
+
         for symbol in self.symbols:
             if symbol in self._market_subscriptions:
                 continue
@@ -1091,7 +1167,17 @@ class TradingCoordinator:
                 except Exception:
                     continue
         self._market_subscriptions.clear()
+        set_drop_handler = getattr(self.broker, 'set_realtime_bar_drop_handler', None)
+        if callable(set_drop_handler):
+            set_drop_handler(None)
         self._aggregators.clear()
+        with self._pending_bars_lock:
+            for timer in self._group_deadlines.values():
+                timer.cancel()
+            self._group_deadlines.clear()
+            self._pending_decision_bars.clear()
+            self._lagging_symbols.clear()
+            self._last_released_bucket = None
 
     def _trigger_stop_async(self) -> None:
         """Start a single background thread that calls stop() to perform a graceful shutdown.
@@ -1117,8 +1203,9 @@ class TradingCoordinator:
     ) -> None:
         """Handle a single realtime tick by updating latest price and aggregating into timeframe buckets.
 
-        If a completed bucket is produced for a timeframe, a Bar is constructed and routed to
-        process_bar when it matches the decision timeframe or to the timeframe manager otherwise.
+        If a completed bucket is produced for a timeframe, a Bar is constructed and queued for a grouped
+        process_bars call when it matches the decision timeframe, or sent to the timeframe manager otherwise.
+        A bucket missing bars the broker dropped is skipped: its OHLCV would be wrong.
         """
         # Keep last prices fresh even between decision bars.
         with suppress(Exception):
@@ -1132,6 +1219,12 @@ class TradingCoordinator:
             completed = aggregator.update(timestamp, open_, high, low, close, volume)
             if completed is None:
                 continue
+            if not completed.complete:
+                self.logger.warning(
+                    f'Skipping {timeframe} bar {symbol} {completed.timestamp.isoformat()}: '
+                    'real-time bars of it were dropped'
+                )
+                continue
 
             bar = Bar(
                 symbol=symbol,
@@ -1144,10 +1237,99 @@ class TradingCoordinator:
             )
 
             if timeframe == self._decision_timeframe:
-                self.process_bar(bar, timeframe=timeframe)
+                self._queue_decision_bar(bar)
             else:
                 self._forward_timeframe_bar(bar, timeframe)
 
+    def _on_realtime_bars_dropped(self, symbol: str, first: datetime, last: datetime) -> None:
+        """Mark the buckets of real-time bars the broker dropped (called before the symbol's next bar)."""
+        for aggregator in self._aggregators.get(symbol, {}).values():
+            aggregator.mark_dropped(first, last)
+
+    def _queue_decision_bar(self, bar: Bar) -> None:
+        """Hold a completed decision bar until every subscribed symbol has closed the same bucket.
+
+        The group is released as one ``process_bars`` call. A lagging, halted or
+        failed subscription must not hold the others back, so an incomplete group
+        is released with the bars already there once ``ib_decision_group_timeout``
+        seconds have passed since its first bar, or as soon as a symbol moves on
+        to a later bucket. Bars arriving after their bucket was released are
+        processed on their own. A symbol that missed a deadline (halted, or a
+        quiet subscription) is not waited for again until it delivers a bar, so
+        only the first bucket it misses pays the timeout.
+
+        Groups are processed on the calling worker thread under ``_decision_lock``
+        to keep them in bucket order, so the worker (and any other worker
+        completing a decision bar) waits for the decision to finish.
+        """
+        with self._decision_lock:
+            self._release_decision_bar(bar)
+
+    def _release_decision_bar(self, bar: Bar) -> None:
+        ready: list[list[Bar]] = []
+        with self._pending_bars_lock:
+            self._lagging_symbols.discard(bar.symbol)
+            expected = self._expected_symbols_locked()
+            released = self._last_released_bucket
+            if released is not None and bar.timestamp <= released:
+                ready.append([bar])
+            else:
+                for ts in sorted(ts for ts in self._pending_decision_bars if ts < bar.timestamp):
+                    ready.append(self._pop_decision_group_locked(ts))
+                group = self._pending_decision_bars.get(bar.timestamp)
+                if group is None:
+                    group = self._pending_decision_bars[bar.timestamp] = {}
+                    self._schedule_group_deadline_locked(bar.timestamp)
+                group[bar.symbol] = bar
+                if expected.issubset(group):
+                    ready.append(self._pop_decision_group_locked(bar.timestamp))
+
+        for group_bars in ready:
+            self.process_bars(group_bars, timeframe=self._decision_timeframe)
+
+    def _expected_symbols_locked(self) -> set[str]:
+        return (set(self._market_subscriptions) or set(self.symbols)) - self._lagging_symbols
+
+    def _schedule_group_deadline_locked(self, bucket: datetime) -> None:
+        timer = threading.Timer(self._decision_group_timeout, self._release_expired_group, args=(bucket,))
+        timer.daemon = True
+        timer.name = 'DecisionGroupDeadline'
+        self._group_deadlines[bucket] = timer
+        timer.start()
+
+    def _pop_decision_group_locked(self, bucket: datetime) -> list[Bar]:
+        timer = self._group_deadlines.pop(bucket, None)
+        if timer is not None:
+            timer.cancel()
+        self._last_released_bucket = bucket
+        return list(self._pending_decision_bars.pop(bucket).values())
+
+    def _release_expired_group(self, bucket: datetime) -> None:
+        """Deadline of an incomplete group: process the bars that have arrived (earlier groups first)."""
+        with self._decision_lock:
+            ready: list[list[Bar]] = []
+            with self._pending_bars_lock:
+                if bucket not in self._pending_decision_bars:
+                    return
+                expected = self._expected_symbols_locked()
+                for ts in sorted(ts for ts in self._pending_decision_bars if ts <= bucket):
+                    ready.append(self._pop_decision_group_locked(ts))
+                missing = sorted(expected.difference(bar.symbol for bar in ready[-1]))
+                self._lagging_symbols.update(missing)
+                # Later groups that were only waiting for the lagging symbols are complete now
+                expected = self._expected_symbols_locked()
+                for ts in sorted(self._pending_decision_bars):
+                    if not expected.issubset(self._pending_decision_bars[ts]):
+                        break
+                    ready.append(self._pop_decision_group_locked(ts))
+
+            self.logger.warning(
+                f'Decision bars for {bucket.isoformat()} released after {self._decision_group_timeout:g}s '
+                f'without {", ".join(missing)}; not waiting for them until they deliver a bar'
+            )
+            for group_bars in ready:
+                self.process_bars(group_bars, timeframe=self._decision_timeframe)
+
     def _should_check_withdrawal(self, current_time: datetime) -> bool:
         """Check if we should perform a capital withdrawal check.
 
@@ -6,17 +6,27 @@ This module provides:
 - Cross-timeframe correlation analysis
 - Timeframe confluence detection
 - Professional trading signals based on timeframe alignment
+
+Each (symbol, timeframe) series is a fixed-capacity ring buffer of bars with
+float64 close/volume/return columns alongside. Values are written twice, at
+``i`` and ``i + capacity``, so the most recent ``n`` values are always one
+contiguous slice: reads are views, not copies. The timeframe state (trend,
+momentum, volatility, volume ratio) is updated from running sums as each bar
+arrives instead of being recomputed over the window.
 """
 
 from __future__ import annotations
 
+import math
 from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime
-from decimal import Decimal
 from enum import Enum
 from threading import Lock
-from typing import Any
+from typing import Any, cast
+
+import numpy as np
+from numpy.typing import NDArray
 
 from .data import Bar
 from .log_config import configure_logger
@@ -61,6 +71,17 @@ TIMEFRAME_TO_SECONDS: dict[str, int] = {
 # Reverse mapping for display (seconds -> timeframe string)
 SECONDS_TO_TIMEFRAME: dict[int, str] = {v: k for k, v in TIMEFRAME_TO_SECONDS.items()}
 
+# Timeframe state is computed over the last STATE_WINDOW bars once MIN_STATE_BARS have arrived
+STATE_WINDOW = 20
+MIN_STATE_BARS = 10
+FAST_MA_BARS = 5
+SLOW_MA_BARS = 10
+TREND_THRESHOLD = 0.01  # fast MA this far above/below the slow MA
+MOMENTUM_SCALE = 10.0
+VOLATILITY_CEILING = 0.05  # std dev of returns that maps to volatility 1.0
+# Running sums are recomputed from the columns this often to shed float drift
+RESUM_INTERVAL = 4096
+
 
 @dataclass
 class TimeframeState:
@@ -73,6 +94,174 @@ class TimeframeState:
     last_bar: Bar | None
 
 
+class _BarSeries:
+    """
+    Ring buffer of one symbol/timeframe's bars plus float64 shadow columns and running sums.
+
+    Logically holds the last ``max_bars`` bars; physically keeps one more
+    than the state window so the value leaving each rolling window can be
+    read back. Not thread-safe: TimeframeManager serializes access.
+    """
+
+    __slots__ = (
+        'max_bars',
+        'window',
+        'capacity',
+        'count',
+        'bars',
+        'closes',
+        'volumes',
+        'returns',
+        'fast_sum',
+        'slow_sum',
+        'return_sum',
+        'return_sq_sum',
+        'return_count',
+        'volume_sum',
+        'last_close',
+        'last_volume',
+    )
+
+    def __init__(self, max_bars: int) -> None:
+        self.max_bars = max_bars
+        # State covers the last STATE_WINDOW bars, or all retained bars if fewer are kept
+        self.window = max(1, min(STATE_WINDOW, max_bars))
+        self.capacity = max(max_bars, self.window + 1)
+        self.count = 0
+        self.bars: list[Bar | None] = [None] * (2 * self.capacity)
+        self.closes = np.zeros(2 * self.capacity)
+        self.volumes = np.zeros(2 * self.capacity)
+        # Return into each bar from the previous close; NaN if undefined
+        self.returns = np.full(2 * self.capacity, np.nan)
+        self.fast_sum = 0.0  # last FAST_MA_BARS closes
+        self.slow_sum = 0.0  # last SLOW_MA_BARS closes
+        self.return_sum = 0.0  # defined returns among the last ``window - 1``
+        self.return_sq_sum = 0.0
+        self.return_count = 0
+        self.volume_sum = 0.0  # last ``window`` volumes
+        self.last_close = 0.0
+        self.last_volume = 0.0
+
+    def __len__(self) -> int:
+        return min(self.count, self.max_bars)
+
+    def _slot(self, age: int) -> int:
+        """Index of the bar ``age`` bars before the newest (0 = newest); requires ``age < capacity``."""
+        return (self.count - 1 - age) % self.capacity
+
+    def _end(self) -> int:
+        """Exclusive end of the contiguous mirrored slice ending at the newest value."""
+        return self._slot(0) + self.capacity + 1
+
+    def append(self, bar: Bar) -> None:
+        close = float(bar.close)
+        volume = float(bar.volume)
+        previous = self.last_close
+        ret = (close - previous) / previous if self.count and previous > 0 else math.nan
+        self.last_close = close
+        self.last_volume = volume
+
+        slot = self.count % self.capacity
+        mirror = slot + self.capacity
+        self.bars[slot] = self.bars[mirror] = bar
+        self.closes[slot] = self.closes[mirror] = close
+        self.volumes[slot] = self.volumes[mirror] = volume
+        self.returns[slot] = self.returns[mirror] = ret
+        self.count += 1
+
+        if self.count % RESUM_INTERVAL == 0:
+            self._resum()
+            return
+        self.fast_sum += close
+        self.slow_sum += close
+        self.volume_sum += volume
+        if not math.isnan(ret):
+            self.return_sum += ret
+            self.return_sq_sum += ret * ret
+            self.return_count += 1
+        # Drop the values that just left each window
+        if self.count > FAST_MA_BARS:
+            self.fast_sum -= float(self.closes[self._slot(FAST_MA_BARS)])
+        if self.count > SLOW_MA_BARS:
+            self.slow_sum -= float(self.closes[self._slot(SLOW_MA_BARS)])
+        if self.count > self.window:
+            self.volume_sum -= float(self.volumes[self._slot(self.window)])
+            old = float(self.returns[self._slot(self.window - 1)])
+            if not math.isnan(old):
+                self.return_sum -= old
+                self.return_sq_sum -= old * old
+                self.return_count -= 1
+
+    def _resum(self) -> None:
+        """Recompute the running sums exactly from the columns."""
+        end = self._end()
+        self.fast_sum = float(self.closes[end - min(self.count, FAST_MA_BARS) : end].sum())
+        self.slow_sum = float(self.closes[end - min(self.count, SLOW_MA_BARS) : end].sum())
+        self.volume_sum = float(self.volumes[end - min(self.count, self.window) : end].sum())
+        returns = self.returns[end - min(self.count, self.window - 1) : end]
+        returns = returns[~np.isnan(returns)]
+        self.return_sum = float(returns.sum())
+        self.return_sq_sum = float((returns * returns).sum())
+        self.return_count = len(returns)
+
+    def view(self, column: NDArray[np.float64], lookback: int | None) -> NDArray[np.float64]:
+        size = len(self) if lookback is None else max(0, min(lookback, len(self)))
+        end = self._end()
+        window = column[end - size : end]
+        window.flags.writeable = False
+        return window
+
+    def tail(self, lookback: int | None) -> list[Bar]:
+        size = len(self) if lookback is None else max(0, min(lookback, len(self)))
+        if not size:
+            return []
+        end = self._end()
+        return cast('list[Bar]', self.bars[end - size : end])
+
+    def latest(self) -> Bar | None:
+        return self.bars[self._slot(0)] if self.count else None
+
+    def state(self) -> TimeframeState | None:
+        """Trend, momentum, volatility and volume ratio over the last ``window`` bars."""
+        if len(self) < MIN_STATE_BARS:
+            return None
+        window = min(self.count, self.window)
+
+        # Trend: fast MA vs slow MA
+        fast_ma = self.fast_sum / FAST_MA_BARS
+        slow_ma = self.slow_sum / SLOW_MA_BARS
+        diff_pct = (fast_ma - slow_ma) / slow_ma if slow_ma > 0 else 0.0
+        if diff_pct > TREND_THRESHOLD:
+            trend = Trend.UP
+        elif diff_pct < -TREND_THRESHOLD:
+            trend = Trend.DOWN
+        else:
+            trend = Trend.NEUTRAL
+
+        # Momentum: change over the window, scaled and clamped to [-1, 1]
+        first = float(self.closes[self._slot(window - 1)])
+        momentum = max(-1.0, min(1.0, (self.last_close - first) / first * MOMENTUM_SCALE)) if first != 0 else 0.0
+
+        # Volatility: population std dev of returns, normalized to [0, 1]
+        volatility = 0.0
+        if self.return_count:
+            mean = self.return_sum / self.return_count
+            variance = max(0.0, self.return_sq_sum / self.return_count - mean * mean)
+            volatility = min(1.0, math.sqrt(variance) / VOLATILITY_CEILING)
+
+        # Volume ratio: newest volume vs the average of the rest of the window
+        avg_volume = (self.volume_sum - self.last_volume) / (window - 1)
+        volume_ratio = self.last_volume / avg_volume if avg_volume != 0 else 1.0
+
+        return TimeframeState(
+            trend=trend,
+            momentum=momentum,
+            volatility=volatility,
+            volume_ratio=volume_ratio,
+            last_bar=self.latest(),
+        )
+
+
 @dataclass
 class CrossTimeframeAnalysis:
     """Analysis across multiple timeframes."""
@@ -111,8 +300,8 @@ class TimeframeManager:
         # P0 Fix (Code Review): Thread safety lock for IBKR callback access
         self._lock = Lock()
 
-        # Data structure: {symbol: {timeframe: [bars]}}
-        self.bars: dict[str, dict[str, list[Bar]]] = defaultdict(lambda: defaultdict(list))
+        # Data structure: {symbol: {timeframe: ring buffer}}
+        self._series: dict[str, dict[str, _BarSeries]] = defaultdict(dict)
 
         # Timeframe states: {symbol: {timeframe: TimeframeState}}
         self._states: dict[str, dict[str, TimeframeState]] = defaultdict(dict)
@@ -139,7 +328,7 @@ class TimeframeManager:
 
     def add_bar(self, symbol: str, timeframe: str, bar: Bar) -> None:
         """
-        Add a bar to the manager.
+        Add a bar to the manager and update that timeframe's state.
 
         P0 Fix (Code Review): Thread-safe to prevent race conditions with IBKR callbacks.
 
@@ -152,18 +341,19 @@ class TimeframeManager:
         if timeframe not in self.timeframes:
             return
 
-        with self._lock:  # P0 Fix: Thread safety
-            bars = self.bars[symbol][timeframe]
-            bars.append(bar)
-
-            # Keep memory bounded
-            if len(bars) > self.max_bars:
-                # Remove oldest 20% of bars
-                remove_count = len(bars) - self.max_bars
-                del bars[:remove_count]
-
-        # Update state for this timeframe
-        self._update_timeframe_state(symbol, timeframe)
+        # CRITICAL FIX: Keep lock held through state calculations to prevent race conditions
+        with self._lock:
+            series = self._series[symbol].get(timeframe)
+            if series is None:
+                series = self._series[symbol][timeframe] = _BarSeries(self.max_bars)
+            series.append(bar)
+            state = series.state()
+            if state is not None:
+                self._states[symbol][timeframe] = state
+
+    def _get_series(self, symbol: str, timeframe: str) -> _BarSeries | None:
+        series = self._series.get(symbol)
+        return series.get(timeframe.lower()) if series is not None else None
 
     def get_bars(self, symbol: str, timeframe: str = '1m', lookback: int | None = None) -> list[Bar]:
         """
@@ -177,154 +367,35 @@ class TimeframeManager:
             lookback: Number of recent bars (None = all)
 
         Returns:
-            List of bars (may be empty, always a copy)
+            List of bars (may be empty, always a new list)
         """
-        timeframe = timeframe.lower()
-
         with self._lock:  # P0 Fix: Thread safety
-            bars = self.bars[symbol].get(timeframe, [])
-
-            if lookback is None:
-                return bars.copy()
-
-            if lookback <= 0:
-                return []
-
-            return bars[-lookback:].copy() if bars else []
-
-    def get_latest_bar(self, symbol: str, timeframe: str = '1m') -> Bar | None:
-        """Get the most recent bar for a symbol/timeframe (thread-safe)."""
-        timeframe = timeframe.lower()
-        with self._lock:
-            bars = self.bars[symbol].get(timeframe, [])
-            return bars[-1] if bars else None
+            series = self._get_series(symbol, timeframe)
+            return series.tail(lookback) if series is not None else []
 
-    def _update_timeframe_state(self, symbol: str, timeframe: str) -> None:
+    def get_closes(self, symbol: str, timeframe: str = '1m', lookback: int | None = None) -> NDArray[np.float64]:
         """
-        Update state for a specific symbol/timeframe.
+        Read-only float64 view of recent closes (oldest first), without copying.
 
-        CRITICAL FIX: Keep lock held through state calculations to prevent race conditions.
+        The view aliases the ring buffer: it stays valid until the series
+        receives ``max_bars_per_timeframe - len(view)`` more bars. Copy it to
+        keep it longer or to read it while other threads add bars.
         """
-        # CRITICAL FIX: Hold lock for entire state update, not just bar copy
         with self._lock:
-            bars = self.bars[symbol][timeframe].copy()
-
-            if len(bars) < 10:
-                return  # Need minimum bars for analysis
-
-            # Calculate trend
-            trend = self._calculate_trend(bars[-20:])
-
-            # Calculate momentum (rate of change)
-            momentum = self._calculate_momentum(bars[-20:])
-
-            # Calculate volatility
-            volatility = self._calculate_volatility(bars[-20:])
-
-            # Calculate volume ratio
-            volume_ratio = self._calculate_volume_ratio(bars[-20:])
-
-            # Store state (still under lock)
-            self._states[symbol][timeframe] = TimeframeState(
-                trend=trend,
-                momentum=momentum,
-                volatility=volatility,
-                volume_ratio=volume_ratio,
-                last_bar=bars[-1],
-            )
-
-    def _calculate_trend(self, bars: list[Bar]) -> Trend:
-        """
-        Calculate trend from bars using moving averages.
-
-        Professional logic: Fast MA vs Slow MA crossover.
-        """
-        if len(bars) < 10:
-            return Trend.NEUTRAL
-
-        closes = [bar.close for bar in bars]
-
-        # Fast MA (5 bars)
-        fast_ma = sum(closes[-5:], Decimal('0')) / Decimal('5')
-
-        # Slow MA (10 bars)
-        slow_ma = sum(closes[-10:], Decimal('0')) / Decimal('10')
-
-        # Trend determination
-        diff_pct = float((fast_ma - slow_ma) / slow_ma) if slow_ma > 0 else 0.0
-
-        if diff_pct > 0.01:  # 1% above
-            return Trend.UP
-        elif diff_pct < -0.01:  # 1% below
-            return Trend.DOWN
-        else:
-            return Trend.NEUTRAL
-
-    def _calculate_momentum(self, bars: list[Bar]) -> float:
-        """
-        Calculate momentum as rate of price change.
-
-        Returns: -1.0 to +1.0
-        """
-        if len(bars) < 2:
-            return 0.0
-
-        first_price = bars[0].close
-        last_price = bars[-1].close
-
-        if first_price == 0:
-            return 0.0
-
-        # Momentum as percentage change, clamped to [-1, 1] using Decimal math
-        momentum = (last_price - first_price) / first_price
-        scaled = momentum * Decimal('10')
-        clamped = max(Decimal('-1'), min(Decimal('1'), scaled))
-        return float(clamped)  # expose as float for downstream consumers
-
-    def _calculate_volatility(self, bars: list[Bar]) -> float:
-        """
-        Calculate volatility as standard deviation of returns.
-
-        Returns: 0.0 to 1.0 (normalized)
-        """
-        if len(bars) < 2:
-            return 0.0
-
-        closes = [bar.close for bar in bars]
-        returns = [
-            (closes[i] - closes[i - 1]) / closes[i - 1] for i in range(1, len(closes)) if closes[i - 1] > Decimal('0')
-        ]
-
-        if not returns:
-            return 0.0
-
-        # Standard deviation
-        mean_return = sum(returns, Decimal('0')) / Decimal(len(returns))
-        variance = sum(((r - mean_return) ** 2 for r in returns), Decimal('0')) / Decimal(len(returns))
-        std_dev = variance.sqrt()
-
-        # Normalize to 0-1 range (assume 5% std dev = high volatility)
-        # P0-7 Fix: Return float for compatibility (volatility is used as multiplier)
-        return min(1.0, float(std_dev) / 0.05)
-
-    def _calculate_volume_ratio(self, bars: list[Bar]) -> float:
-        """
-        Calculate current volume vs average volume.
+            series = self._get_series(symbol, timeframe)
+            return series.view(series.closes, lookback) if series is not None else np.empty(0)
 
-        Returns: Ratio (1.0 = average, 2.0 = double average)
-        """
-        if len(bars) < 2:
-            return 1.0
-
-        volumes = [bar.volume for bar in bars]
-        avg_volume = sum(volumes[:-1]) / len(volumes[:-1]) if len(volumes) > 1 else 1
-
-        current_volume = volumes[-1]
-
-        if avg_volume == 0:
-            return 1.0
+    def get_volumes(self, symbol: str, timeframe: str = '1m', lookback: int | None = None) -> NDArray[np.float64]:
+        """Read-only float64 view of recent volumes; same lifetime rules as ``get_closes``."""
+        with self._lock:
+            series = self._get_series(symbol, timeframe)
+            return series.view(series.volumes, lookback) if series is not None else np.empty(0)
 
-        return current_volume / avg_volume
+    def get_latest_bar(self, symbol: str, timeframe: str = '1m') -> Bar | None:
+        """Get the most recent bar for a symbol/timeframe (thread-safe)."""
+        with self._lock:
+            series = self._get_series(symbol, timeframe)
+            return series.latest() if series is not None else None
 
     def _validate_timeframe_sync(self, symbol: str) -> tuple[bool, str]:
         """
@@ -526,12 +597,12 @@ class TimeframeManager:
         P0 Fix (CRITICAL-1): Thread-safe to prevent race conditions with add_bar().
         """
         with self._lock:  # P0 Fix: Thread safety
-            if symbol not in self.bars:
+            if symbol not in self._series:
                 return False
 
             for tf in self.timeframes:
-                bars = self.bars[symbol].get(tf, [])
-                if len(bars) < min_bars:
+                series = self._series[symbol].get(tf)
+                if series is None or len(series) < min_bars:
                     return False
 
             return True
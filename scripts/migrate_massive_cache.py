@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Convert a Massive.com disk cache from JSON month files to binary month files.
+
+Older caches store each symbol-month as ``{YYYY-MM}_{timespan}.json``. The cache
+now reads memory-mapped ``.bars`` files and only falls back to JSON, so running
+this once per cache tree removes the JSON parsing cost from every backtest.
+
+With ``--compression`` the binary months (new and existing) are rewritten with
+that codec, which is how an existing cache is shrunk after enabling
+``MassiveConfig.cache_compression``.
+
+Usage:
+    python scripts/migrate_massive_cache.py --cache-dir data/massive_cache
+    python scripts/migrate_massive_cache.py --cache-dir data/massive_cache --keep-json
+    python scripts/migrate_massive_cache.py --cache-dir data/massive_cache --compression lzma
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import cast
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from aistock.providers.cache import MassiveCache  # noqa: E402
+from aistock.providers.month_file import available_codecs  # noqa: E402
+
+
+@dataclass(frozen=True)
+class Args:
+    cache_dir: Path
+    keep_json: bool
+    compression: str | None
+    json_output: bool
+
+
+def _parse_args() -> Args:
+    parser = argparse.ArgumentParser(description='Migrate Massive.com JSON month files to the binary format.')
+    parser.add_argument('--cache-dir', default='data/massive_cache', help='Cache root (default: data/massive_cache)')
+    parser.add_argument('--keep-json', action='store_true', help='Leave the JSON files in place after conversion')
+    parser.add_argument(
+        '--compression',
+        choices=available_codecs(),
+        default=None,
+        help='Rewrite every binary month with this codec (none: uncompressed, memory-mappable)',
+    )
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    parsed = parser.parse_args()
+    return Args(
+        cache_dir=Path(cast(str, parsed.cache_dir)).expanduser(),
+        keep_json=cast(bool, parsed.keep_json),
+        compression=cast('str | None', parsed.compression),
+        json_output=cast(bool, parsed.json),
+    )
+
+
+def main() -> int:
+    args = _parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+
+    if not args.cache_dir.is_dir():
+        print(f'Cache directory not found: {args.cache_dir}', file=sys.stderr)
+        return 1
+
+    cache = MassiveCache(args.cache_dir, compression=args.compression or 'none')
+    before = cache.get_cache_stats()
+    migrated = cache.migrate_legacy_months(remove_legacy=not args.keep_json)
+    recompressed = cache.compress_months() if args.compression is not None else 0
+    after = cache.get_cache_stats()
+
+    summary = {
+        'cache_dir': str(args.cache_dir),
+        'months_migrated': migrated,
+        'months_recompressed': recompressed,
+        'size_before_bytes': before['total_size_bytes'],
+        'size_after_bytes': after['total_size_bytes'],
+        'compression_ratio': after['compression_ratio'],
+    }
+    if args.json_output:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f'Migrated {migrated} month files in {args.cache_dir}')
+        if args.compression is not None:
+            print(f'Rewrote {recompressed} months with {args.compression} ({after["compression_ratio"]:.1f}x)')
+        print(f'Cache size: {before["total_size_bytes"]:,} -> {after["total_size_bytes"]:,} bytes')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
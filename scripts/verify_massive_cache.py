@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Check a Massive.com disk cache's coverage index against the month files on disk.
+
+The cache answers "which months are cached?" from ``metadata/coverage.json``
+and its journal. Month files copied in or deleted by hand, or a crash between
+writing a month and journaling it, leave the index out of date; this rebuilds
+it from the files and reports what differed.
+
+Usage:
+    python scripts/verify_massive_cache.py --cache-dir data/massive_cache
+    python scripts/verify_massive_cache.py --cache-dir data/massive_cache --check-only --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import cast
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from aistock.providers.cache import MassiveCache  # noqa: E402
+
+
+@dataclass(frozen=True)
+class Args:
+    cache_dir: Path
+    check_only: bool
+    json_output: bool
+
+
+def _parse_args() -> Args:
+    parser = argparse.ArgumentParser(description='Verify and rebuild the Massive.com cache coverage index.')
+    parser.add_argument('--cache-dir', default='data/massive_cache', help='Cache root (default: data/massive_cache)')
+    parser.add_argument(
+        '--check-only', action='store_true', help='Report differences without rewriting the index (exit 2 if any)'
+    )
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parsed = parser.parse_args()
+    return Args(
+        cache_dir=Path(cast(str, parsed.cache_dir)).expanduser(),
+        check_only=cast(bool, parsed.check_only),
+        json_output=cast(bool, parsed.json),
+    )
+
+
+def main() -> int:
+    args = _parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+
+    if not args.cache_dir.is_dir():
+        print(f'Cache directory not found: {args.cache_dir}', file=sys.stderr)
+        return 1
+
+    cache = MassiveCache(args.cache_dir, read_only=args.check_only)
+    report = cache.verify_index(repair=not args.check_only)
+
+    if args.json_output:
+        print(json.dumps({'cache_dir': str(args.cache_dir), **report.to_dict()}, indent=2))
+    else:
+        print(f'{report.months_on_disk} months on disk in {args.cache_dir}')
+        for label, months in (
+            ('Not indexed', report.missing),
+            ('Indexed but missing', report.stale),
+            ('Indexed with wrong extent', report.mismatched),
+            ('Unreadable', report.unreadable),
+        ):
+            if months:
+                print(f'{label} ({len(months)}):')
+                for month in months:
+                    print(f'  {month}')
+        if report.consistent:
+            print('Coverage index is consistent')
+        elif report.repaired:
+            print('Coverage index rebuilt from disk')
+    return 2 if args.check_only and not report.consistent else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
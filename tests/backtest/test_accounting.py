@@ -0,0 +1,245 @@
+"""Tests for the float64 backtest accounting backend."""
+
+from __future__ import annotations
+
+import json
+import random
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from aistock.backtest.accounting import FloatPortfolio
+from aistock.backtest.config import BacktestPlanConfig, PeriodResult
+from aistock.portfolio import Portfolio
+
+from .test_simulation_kernel import DAYS, GOLDEN_PATH, SEED, START, _orchestrator, _scenario_bars
+
+T0 = datetime(2024, 3, 4, 15, 0, tzinfo=timezone.utc)
+
+# (symbol, signed quantity, price, commission)
+FILLS = [
+    ('AAPL', '10', '100.10', '1.00'),
+    ('AAPL', '5', '101.37', '1.00'),
+    ('AAPL', '-7.333', '102.01', '1.00'),
+    ('AAPL', '-12.667', '99.95', '1.25'),  # Reverses to a short of 5
+    ('MSFT', '-3', '410.55', '1.00'),
+    ('AAPL', '5', '98.40', '1.00'),
+    ('MSFT', '3', '405.05', '1.00'),
+]
+
+
+def _apply(portfolio: Portfolio) -> list[Decimal]:
+    realised: list[Decimal] = []
+    for step, (symbol, quantity, price, commission) in enumerate(FILLS):
+        realised.append(
+            portfolio.apply_fill(
+                symbol, Decimal(quantity), Decimal(price), Decimal(commission), T0 + timedelta(minutes=step)
+            )
+        )
+    return realised
+
+
+class TestFloatPortfolio:
+    """Float books follow the Decimal books fill for fill."""
+
+    def test_matches_decimal_portfolio(self):
+        exact = Portfolio(initial_cash=Decimal('100000'))
+        fast = FloatPortfolio(Decimal('100000'))
+
+        for expected, actual in zip(_apply(exact), _apply(fast)):
+            assert float(actual) == pytest.approx(float(expected), abs=1e-9)
+
+        prices = {'AAPL': Decimal('99.00'), 'MSFT': Decimal('400.00')}
+        assert float(fast.get_cash()) == pytest.approx(float(exact.get_cash()), abs=1e-9)
+        assert float(fast.get_equity(prices)) == pytest.approx(float(exact.get_equity(prices)), abs=1e-9)
+        assert float(fast.get_realised_pnl()) == pytest.approx(float(exact.get_realised_pnl()), abs=1e-9)
+        assert fast.get_commissions_paid() == exact.get_commissions_paid()
+        assert fast.position_count() == exact.position_count() == 0
+        assert fast.position('AAPL').quantity == 0
+
+    def test_boundary_values_are_decimal(self):
+        fast = FloatPortfolio(Decimal('1000'))
+        fast.apply_fill('AAPL', Decimal('3'), Decimal('0.1'), Decimal('0.2'), T0)
+
+        assert fast.cash == Decimal('999.5')
+        assert fast.get_position('AAPL') == Decimal('3.0')
+        position = fast.position('AAPL')
+        assert position.average_price == Decimal('0.1')
+        assert position.entry_time_utc == T0
+
+    def test_reconciliation_with_shadow(self):
+        fast = FloatPortfolio(Decimal('100000'), shadow=Portfolio(initial_cash=Decimal('100000')))
+        _apply(fast)
+        fast.get_equity({'AAPL': Decimal('99.00')})
+
+        report = fast.reconciliation
+        assert report is not None
+        assert report.fills == len(FILLS)
+        assert report.equity_checks == 1
+        assert report.within_tolerance
+        assert report.max_cash_drift < 1e-9
+        assert report.to_dict()['within_tolerance'] is True
+
+    def test_reconciliation_flags_drift_over_tolerance(self):
+        shadow = Portfolio(initial_cash=Decimal('100000'))
+        fast = FloatPortfolio(Decimal('100000'), shadow=shadow, tolerance=0.01)
+        shadow.cash += Decimal('0.02')
+        fast.apply_fill('AAPL', Decimal('1'), Decimal('10'), Decimal('0'), T0)
+
+        report = fast.reconciliation
+        assert report is not None
+        assert report.max_cash_drift == pytest.approx(0.02)
+        assert not report.within_tolerance
+
+    def test_float_api_matches_decimal_api(self):
+        exact = FloatPortfolio(Decimal('100000'))
+        fast = FloatPortfolio(Decimal('100000'))
+        prices = {'AAPL': Decimal('99.00'), 'MSFT': Decimal('400.00')}
+
+        for step, (symbol, quantity, price, commission) in enumerate(FILLS):
+            timestamp = T0 + timedelta(minutes=step)
+            expected = exact.apply_fill(symbol, Decimal(quantity), Decimal(price), Decimal(commission), timestamp)
+            actual = fast.apply_fill_float(symbol, float(quantity), float(price), float(commission), timestamp)
+            assert isinstance(actual, float)
+            assert actual == float(expected)
+            assert fast.get_position_float(symbol) == float(exact.get_position(symbol))
+            assert fast.get_equity_float(prices) == float(exact.get_equity(prices))
+        assert fast.get_cash_float() == float(exact.get_cash())
+
+    def test_float_fills_are_reconciled(self):
+        fast = FloatPortfolio(Decimal('100000'), shadow=Portfolio(initial_cash=Decimal('100000')))
+        for step, (symbol, quantity, price, commission) in enumerate(FILLS):
+            fast.apply_fill_float(
+                symbol, float(quantity), float(price), float(commission), T0 + timedelta(minutes=step)
+            )
+        fast.get_equity_float({'AAPL': Decimal('99.00')})
+
+        report = fast.reconciliation
+        assert report is not None
+        assert report.fills == len(FILLS)
+        assert report.equity_checks == 1
+        assert report.within_tolerance
+
+    def test_update_position_keeps_contract_multiplier(self):
+        exact = Portfolio(initial_cash=Decimal('100000'))
+        fast = FloatPortfolio(Decimal('100000'))
+        for portfolio in (exact, fast):
+            portfolio.apply_fill('ES', Decimal('1'), Decimal('5000'), Decimal('2'), T0, multiplier=Decimal('50'))
+            portfolio.update_position('ES', Decimal('1'), Decimal('5010'), Decimal('2'))
+
+        assert fast.position('ES').multiplier == exact.position('ES').multiplier == Decimal('50')
+        assert fast.get_position('ES') == Decimal('2.0')
+        assert fast.get_cash() == exact.get_cash()
+        prices = {'ES': Decimal('5020')}
+        assert fast.get_equity(prices) == exact.get_equity(prices)
+
+    def test_position_snapshot_follows_fills(self):
+        fast = FloatPortfolio(Decimal('1000'))
+        fast.apply_fill('AAPL', Decimal('3'), Decimal('10'), Decimal('0'), T0)
+        first = fast.position('AAPL')
+        first.quantity = Decimal('99')  # Callers get a copy, not the cached values
+
+        assert fast.position('AAPL').quantity == Decimal('3.0')
+        fast.apply_fill('AAPL', Decimal('1'), Decimal('14'), Decimal('0'), T0)
+        assert fast.snapshot_positions()['AAPL'].quantity == Decimal('4.0')
+        assert fast.position('AAPL').average_price == Decimal('11.0')
+
+    def test_settlement_tracking_is_rejected(self):
+        with pytest.raises(ValueError):
+            FloatPortfolio(Decimal('1000')).enable_settlement_tracking(True)
+
+
+class TestFloatAccountingBacktest:
+    """Float accounting reproduces the Decimal golden run within tolerance."""
+
+    def test_golden_scenario_within_tolerance(self, tmp_path):
+        orchestrator = _orchestrator(tmp_path)
+        orchestrator._config.accounting = 'float'
+        orchestrator._config.reconcile_accounting = True
+        random.seed(SEED)
+        np.random.seed(SEED)
+        result = PeriodResult(start_date=START, end_date=START + timedelta(days=DAYS))
+        result = orchestrator._simulate_trading(_scenario_bars(), result)
+        golden = json.loads(GOLDEN_PATH.read_text())
+
+        assert result.total_trades == golden['metrics']['total_trades']
+        assert float(result.total_return) == pytest.approx(float(golden['metrics']['total_return']), abs=1e-6)
+        for (_, equity), (_, expected) in zip(result.equity_curve, golden['equity_curve']):
+            assert float(equity) == pytest.approx(float(expected), abs=1e-6)
+
+        report = result.accounting_reconciliation
+        assert report is not None
+        assert report.fills == result.total_trades
+        assert report.within_tolerance
+
+    def test_decimal_is_default(self, tmp_path):
+        orchestrator = _orchestrator(tmp_path)
+        assert type(orchestrator._make_portfolio()) is Portfolio
+
+
+def _decimal_workload(portfolio: Portfolio) -> None:
+    """The accounting calls one simulated period makes, through the Decimal API."""
+    symbols = ['AAPL', 'MSFT', 'SPY']
+    prices = [
+        {symbol: Decimal(100 + (step + i) % 23) + Decimal('0.37') for i, symbol in enumerate(symbols)}
+        for step in range(50)
+    ]
+    for step in range(4000):
+        last_prices = prices[step % 50]
+        for symbol in symbols:
+            float(portfolio.get_equity(last_prices))
+            float(portfolio.get_position(symbol))
+        if step % 4 == 0:
+            side = Decimal('1') if step % 8 == 0 else Decimal('-1')
+            portfolio.apply_fill(symbols[step % 3], side * 10, last_prices['AAPL'], Decimal('1'), T0)
+
+
+def _float_workload(portfolio: FloatPortfolio) -> None:
+    """The same calls through the float-native API the simulation loop uses."""
+    symbols = ['AAPL', 'MSFT', 'SPY']
+    prices = [
+        {symbol: Decimal(100 + (step + i) % 23) + Decimal('0.37') for i, symbol in enumerate(symbols)}
+        for step in range(50)
+    ]
+    for step in range(4000):
+        last_prices = prices[step % 50]
+        for symbol in symbols:
+            portfolio.get_equity_float(last_prices)
+            portfolio.get_position_float(symbol)
+        if step % 4 == 0:
+            side = 1.0 if step % 8 == 0 else -1.0
+            portfolio.apply_fill_float(symbols[step % 3], side * 10, float(last_prices['AAPL']), 1.0, T0)
+
+
+def _best_time(workload: Callable[[], None]) -> float:
+    best = float('inf')
+    for _ in range(3):
+        began = time.perf_counter()
+        workload()
+        best = min(best, time.perf_counter() - began)
+    return best
+
+
+class TestFloatAccountingBenchmark:
+    """The float-native path is measurably faster than Decimal books, not just equivalent."""
+
+    def test_float_native_loop_beats_decimal_portfolio(self):
+        decimal_seconds = _best_time(lambda: _decimal_workload(Portfolio(initial_cash=Decimal('1000000'))))
+        float_seconds = _best_time(lambda: _float_workload(FloatPortfolio(Decimal('1000000'))))
+
+        # Measured at 3-4x; the bound leaves room for noisy CI machines
+        assert decimal_seconds / float_seconds > 2.0
+
+
+class TestAccountingConfig:
+    def test_rejects_unknown_backend(self):
+        with pytest.raises(ValueError):
+            BacktestPlanConfig(symbols=['AAPL'], accounting='fixed')  # type: ignore[arg-type]
+
+    def test_reconciliation_requires_float_backend(self):
+        with pytest.raises(ValueError):
+            BacktestPlanConfig(symbols=['AAPL'], reconcile_accounting=True)
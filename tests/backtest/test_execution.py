@@ -2,14 +2,17 @@
 
 from __future__ import annotations
 
+import random
 from datetime import datetime, timezone
 from decimal import Decimal
 
+import numpy as np
 import pytest
 
 from aistock.backtest.config import RealisticExecutionConfig
 from aistock.backtest.execution import ExecutionCosts, FillResult, RealisticExecutionModel
 from aistock.data import Bar
+from aistock.execution import Order, OrderSide, OrderType
 
 
 def make_bar(
@@ -252,3 +255,127 @@ class TestFillResult:
         assert result.fill_price == Decimal('150.05')
         assert result.fill_quantity == Decimal('100')
         assert result.is_partial is False
+
+
+def _random_orders(seed: int, count: int) -> list[tuple[Order, Bar]]:
+    """Orders of every type against bars covering the model's edge cases."""
+    rng = random.Random(seed)
+    cases: list[tuple[Order, Bar]] = []
+    for _ in range(count):
+        close = Decimal(str(round(rng.uniform(5, 500), 2)))
+        width = Decimal(str(round(float(close) * rng.choice([0.0, 0.002, 0.02]), 2)))
+        volume = rng.choice([0, 50, 5_000, 200_000])
+        bar = Bar(
+            'AAPL',
+            datetime(2024, 1, 15, 10, 0, tzinfo=timezone.utc),
+            close,
+            close + width,
+            close - width,
+            close,
+            volume,
+        )
+        side = rng.choice([OrderSide.BUY, OrderSide.SELL])
+        order_type = rng.choice([OrderType.MARKET, OrderType.LIMIT, OrderType.STOP])
+        offset = close * Decimal(str(round(rng.uniform(-0.03, 0.03), 4)))
+        order = Order(
+            symbol='AAPL',
+            quantity=Decimal(rng.choice([1, 40, 900, 25_000])),
+            side=side,
+            order_type=order_type,
+            limit_price=close + offset if order_type == OrderType.LIMIT else None,
+            stop_price=close + offset if order_type == OrderType.STOP else None,
+        )
+        cases.append((order, bar))
+    return cases
+
+
+def _batch_inputs(cases: list[tuple[Order, Bar]]) -> dict[str, np.ndarray]:
+    def price(value: Decimal | None) -> float:
+        return float(value) if value is not None else np.nan
+
+    return {
+        'is_buy': np.array([order.side == OrderSide.BUY for order, _ in cases]),
+        'quantity': np.array([float(order.quantity) for order, _ in cases]),
+        'close': np.array([float(bar.close) for _, bar in cases]),
+        'high': np.array([float(bar.high) for _, bar in cases]),
+        'low': np.array([float(bar.low) for _, bar in cases]),
+        'volume': np.array([float(bar.volume) for _, bar in cases]),
+        'limit_price': np.array([price(order.limit_price) for order, _ in cases]),
+        'stop_price': np.array([price(order.stop_price) for order, _ in cases]),
+    }
+
+
+class TestBatchFills:
+    """The vectorized model matches the scalar Decimal path."""
+
+    @pytest.mark.parametrize(
+        'config',
+        [
+            RealisticExecutionConfig(),
+            RealisticExecutionConfig(enable_volume_fill_limits=False, use_dynamic_spread=False),
+            RealisticExecutionConfig(enable_market_impact=False, max_volume_participation=1.0),
+        ],
+    )
+    def test_matches_scalar_path(self, config: RealisticExecutionConfig) -> None:
+        model = RealisticExecutionModel(config)
+        cases = _random_orders(11, 400)
+        batch = model.calculate_fills(**_batch_inputs(cases))
+
+        assert 0 < int(batch.filled.sum()) < len(cases)
+        for i, (order, bar) in enumerate(cases):
+            expected = model.calculate_fill(order, bar)
+            assert bool(batch.filled[i]) is (expected is not None)
+            if expected is None:
+                assert batch.fill_quantity[i] == 0
+                continue
+            assert batch.fill_price[i] == pytest.approx(float(expected.fill_price), rel=1e-12)
+            assert batch.fill_quantity[i] == pytest.approx(float(expected.fill_quantity), rel=1e-12)
+            assert bool(batch.is_partial[i]) is expected.is_partial
+            assert batch.slippage[i] == pytest.approx(float(expected.costs.slippage), rel=1e-9)
+            assert batch.spread_cost[i] == pytest.approx(float(expected.costs.spread_cost), rel=1e-9)
+            assert batch.temporary_impact[i] == pytest.approx(float(expected.costs.temporary_impact), rel=1e-9)
+            assert batch.permanent_impact[i] == pytest.approx(float(expected.costs.permanent_impact), rel=1e-9)
+            assert batch.commission[i] == pytest.approx(float(expected.costs.commission), rel=1e-12)
+            assert batch.total_cost[i] == pytest.approx(float(expected.costs.total), rel=1e-9)
+
+    def test_broadcasts_orders_over_scenarios(self) -> None:
+        model = RealisticExecutionModel()
+        rng = np.random.default_rng(3)
+        scenarios, orders = 1000, 10
+        close = 100 * np.exp(rng.normal(0, 0.01, size=(scenarios, 1)))
+        batch = model.calculate_fills(
+            is_buy=np.arange(orders) % 2 == 0,
+            quantity=np.full(orders, 500.0),
+            close=close,
+            high=close * 1.002,
+            low=close * 0.998,
+            volume=rng.integers(10_000, 100_000, size=(scenarios, orders)),
+        )
+
+        assert batch.fill_price.shape == (scenarios, orders)
+        assert batch.cost_breakdown(axis=1)['total'].shape == (scenarios,)
+        assert np.all(batch.fill_price[:, 0] > close[:, 0])  # Buys pay up
+        assert np.all(batch.fill_price[:, 1] < close[:, 0])  # Sells give up
+
+    def test_simulate_executions_matches_scalar_path(self) -> None:
+        model = RealisticExecutionModel()
+        bars = [make_bar(close=Decimal(100 + i), volume=volume) for i, volume in enumerate([2_000, 50, 4_000, 10_000])]
+        order = Order(symbol='AAPL', quantity=Decimal('450'), side=OrderSide.SELL)
+        expected = model.simulate_execution(order, bars)
+
+        batch = model.simulate_executions(
+            is_buy=[False],
+            quantity=[450.0],
+            close=[[float(bar.close)] for bar in bars],
+            high=[[float(bar.high)] for bar in bars],
+            low=[[float(bar.low)] for bar in bars],
+            volume=[[bar.volume] for bar in bars],
+        )
+
+        assert batch.filled[:, 0].tolist() == [True, False, True, True]
+        filled_prices = batch.fill_price[batch.filled[:, 0], 0]
+        assert filled_prices.tolist() == pytest.approx([float(fill.fill_price) for fill in expected], rel=1e-12)
+        assert batch.fill_quantity.sum() == pytest.approx(450.0)
+        breakdown = batch.cost_breakdown()
+        scalar = model.get_cost_breakdown(expected)
+        assert float(breakdown['total']) == pytest.approx(float(scalar['total']), rel=1e-9)
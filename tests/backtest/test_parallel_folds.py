@@ -0,0 +1,149 @@
+"""Tests for walk-forward folds executed in worker processes."""
+
+from __future__ import annotations
+
+import os
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from aistock.backtest import orchestrator as orchestrator_module
+from aistock.backtest.config import BacktestPlanConfig, WalkForwardConfig
+from aistock.backtest.orchestrator import BacktestOrchestrator
+from aistock.backtest.walkforward import WalkForwardValidator
+from aistock.data import Bar
+from aistock.fsd import FSDConfig
+from aistock.providers.cache import MassiveCache
+from aistock.providers.massive import MassiveConfig
+
+SYMBOLS = ['AAPL', 'MSFT']
+START = date(2024, 1, 2)
+END = date(2024, 4, 30)
+
+
+def _seed_cache(cache_dir) -> None:
+    cache = MassiveCache(cache_dir)
+    rng = random.Random(42)
+    for symbol in SYMBOLS:
+        price = 100.0
+        bars = []
+        day = START
+        while day <= END:
+            if day.weekday() < 5:
+                session_open = datetime(day.year, day.month, day.day, 15, 0, tzinfo=timezone.utc)
+                for step in range(10):
+                    price = max(5.0, price * (1.0 + rng.gauss(0.0, 0.01)))
+                    close = Decimal(str(round(price, 2)))
+                    bars.append(
+                        Bar(
+                            symbol=symbol,
+                            timestamp=session_open + timedelta(minutes=30 * step),
+                            open=close,
+                            high=close + Decimal('0.20'),
+                            low=close - Decimal('0.20'),
+                            close=close,
+                            volume=rng.randint(1_000, 50_000),
+                        )
+                    )
+            day += timedelta(days=1)
+        cache.store_bars(symbol, bars)
+
+
+_real_fold_worker = orchestrator_module._run_fold_worker
+
+
+def _killed_fold_worker(task):
+    """Fold worker whose second fold dies like an OOM-killed process."""
+    if task.fold.fold_number == 2:
+        os._exit(1)
+    return _real_fold_worker(task)
+
+
+def _run(tmp_path, parallel_folds: int):
+    plan = BacktestPlanConfig(
+        symbols=list(SYMBOLS),
+        start_date=START,
+        end_date=END,
+        walkforward=WalkForwardConfig(
+            initial_train_days=30,
+            test_window_days=14,
+            step_days=14,
+            final_holdout_days=14,
+        ),
+        output_dir=str(tmp_path / f'out_{parallel_folds}'),
+        generate_report=False,
+        validate_universe=False,
+        parallel_folds=parallel_folds,
+        random_seed=1234,
+        # Trade on exploration so results depend on the seeded RNG
+        fsd_config=FSDConfig(min_confidence_threshold=0.0, exploration_rate=0.5, min_exploration_rate=0.5),
+    )
+    orchestrator = BacktestOrchestrator(plan, MassiveConfig(api_key='test', cache_dir=str(tmp_path / 'cache')))
+    return orchestrator._run_walkforward()
+
+
+def _fold_metrics(result):
+    rows = []
+    for fold in result.folds:
+        for period in (fold.train_result, fold.test_result):
+            assert period is not None
+            rows.append((period.total_return_pct, period.sharpe_ratio, period.total_trades))
+    return rows
+
+
+class TestParallelFolds:
+    """Fold results do not depend on how folds are executed."""
+
+    def test_parallel_matches_sequential(self, tmp_path):
+        _seed_cache(tmp_path / 'cache')
+
+        sequential = _run(tmp_path, parallel_folds=1)
+        parallel = _run(tmp_path, parallel_folds=3)
+
+        assert len(parallel.folds) >= 3
+        assert [f.fold_number for f in parallel.folds] == [f.fold_number for f in sequential.folds]
+        assert _fold_metrics(parallel) == _fold_metrics(sequential)
+        assert parallel.is_sharpes == sequential.is_sharpes
+        assert parallel.oos_returns == sequential.oos_returns
+        assert parallel.in_sample_sharpe == sequential.in_sample_sharpe
+        assert parallel.final_holdout_result is not None
+        assert sequential.final_holdout_result is not None
+        assert parallel.final_holdout_result.total_return_pct == sequential.final_holdout_result.total_return_pct
+
+        log_dir = tmp_path / 'out_3' / 'fold_logs'
+        logs = sorted(p.name for p in log_dir.iterdir())
+        assert logs == [f'fold_{f.fold_number:03d}.log' for f in parallel.folds]
+        assert 'Fold 1/' in (log_dir / 'fold_001.log').read_text()
+
+    def test_killed_worker_is_recorded_in_the_result(self, tmp_path, monkeypatch):
+        _seed_cache(tmp_path / 'cache')
+        monkeypatch.setattr(orchestrator_module, '_run_fold_worker', _killed_fold_worker)
+
+        result = _run(tmp_path, parallel_folds=2)
+
+        failed = {fold.fold_number: fold.error for fold in result.failed_folds}
+        assert 2 in failed
+        assert all(error is not None and 'BrokenProcessPool' in error for error in failed.values())
+        assert result.completed_folds + len(failed) == result.total_folds
+        assert len(result.oos_returns) == result.completed_folds
+        summary = WalkForwardValidator(result.config).generate_summary(result)
+        assert [entry['fold'] for entry in summary['failed_folds']] == sorted(failed)
+
+    def test_parallel_folds_must_be_positive(self):
+        with pytest.raises(ValueError, match='parallel_folds'):
+            BacktestPlanConfig(symbols=['AAPL'], parallel_folds=0)
+
+
+class TestReadOnlyCache:
+    """Workers open the cache without writing to it."""
+
+    def test_read_only_cache_refuses_writes(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'missing', read_only=True)
+        assert not (tmp_path / 'missing').exists()
+        assert cache.load_bars('AAPL', START, END) == []
+        with pytest.raises(PermissionError):
+            cache.store_bars('AAPL', [Bar('AAPL', datetime(2024, 1, 2, tzinfo=timezone.utc), *[Decimal(1)] * 4, 1)])
+        with pytest.raises(PermissionError):
+            cache.clear_cache()
@@ -0,0 +1,257 @@
+"""Golden-file regression tests for the backtest simulation kernel."""
+
+from __future__ import annotations
+
+import json
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from aistock.backtest.config import BacktestPlanConfig, PeriodResult
+from aistock.backtest.kernel import AlignedBars, BarHistory, HistoryView
+from aistock.backtest.orchestrator import BacktestOrchestrator
+from aistock.config import RiskLimits
+from aistock.data import Bar
+from aistock.fsd import FSDConfig, FSDEngine
+from aistock.portfolio import Portfolio
+from aistock.providers.massive import MassiveConfig
+
+GOLDEN_PATH = Path(__file__).parent.parent / 'fixtures' / 'backtest_kernel_golden.json'
+
+SYMBOLS = ['AAPL', 'MSFT', 'NVDA']
+START = date(2024, 3, 4)
+DAYS = 6
+BARS_PER_DAY = 90
+SEED = 20240304
+
+
+def _scenario_bars() -> list[Bar]:
+    """Minute bars for three symbols; MSFT has gaps so timestamps do not line up."""
+    rng = random.Random(7)
+    bars: list[Bar] = []
+    for symbol in SYMBOLS:
+        price = {'AAPL': 180.0, 'MSFT': 410.0, 'NVDA': 850.0}[symbol]
+        for day_offset in range(DAYS):
+            day = START + timedelta(days=day_offset)
+            session_open = datetime(day.year, day.month, day.day, 14, 45, tzinfo=timezone.utc)
+            for step in range(BARS_PER_DAY):
+                price = max(5.0, price * (1.0 + rng.gauss(0.0, 0.004)))
+                if symbol == 'MSFT' and rng.random() < 0.15:
+                    continue
+                close = Decimal(str(round(price, 2)))
+                spread = Decimal(str(round(price * 0.0015, 2)))
+                bars.append(
+                    Bar(
+                        symbol=symbol,
+                        timestamp=session_open + timedelta(minutes=step),
+                        open=close,
+                        high=close + spread,
+                        low=close - spread,
+                        close=close,
+                        volume=rng.randint(500, 40_000),
+                    )
+                )
+    bars.sort(key=lambda b: b.timestamp)
+    return bars
+
+
+def _orchestrator(tmp_path: Path) -> BacktestOrchestrator:
+    plan = BacktestPlanConfig(
+        symbols=list(SYMBOLS),
+        start_date=START,
+        end_date=START + timedelta(days=DAYS),
+        output_dir=str(tmp_path / 'out'),
+        generate_report=False,
+        validate_universe=False,
+        risk_limits=RiskLimits(max_holding_period_bars=25),
+        fsd_config=FSDConfig(
+            min_confidence_threshold=0.0,
+            exploration_rate=0.4,
+            min_exploration_rate=0.4,
+            enable_session_adaptation=False,
+        ),
+    )
+    return BacktestOrchestrator(plan, MassiveConfig(api_key='test', cache_dir=str(tmp_path / 'cache')))
+
+
+def _run_scenario(tmp_path: Path) -> PeriodResult:
+    orchestrator = _orchestrator(tmp_path)
+    random.seed(SEED)
+    np.random.seed(SEED)
+    result = PeriodResult(start_date=START, end_date=START + timedelta(days=DAYS))
+    return orchestrator._simulate_trading(_scenario_bars(), result)
+
+
+def _run_scenario_in_hourly_chunks(tmp_path: Path) -> PeriodResult:
+    """Same scenario streamed an hour at a time, so days span several chunks."""
+    orchestrator = _orchestrator(tmp_path)
+    random.seed(SEED)
+    np.random.seed(SEED)
+    by_hour: dict[datetime, list[Bar]] = {}
+    for bar in _scenario_bars():
+        by_hour.setdefault(bar.timestamp.replace(minute=0), []).append(bar)
+    result = PeriodResult(start_date=START, end_date=START + timedelta(days=DAYS))
+    return orchestrator._simulate_chunks(list(by_hour.values()), result)
+
+
+def _golden_payload(result: PeriodResult) -> dict[str, object]:
+    return {
+        'metrics': {
+            'total_return': str(result.total_return),
+            'total_return_pct': result.total_return_pct,
+            'sharpe_ratio': result.sharpe_ratio,
+            'sortino_ratio': result.sortino_ratio,
+            'max_drawdown_pct': result.max_drawdown_pct,
+            'calmar_ratio': result.calmar_ratio,
+            'total_trades': result.total_trades,
+            'win_rate': result.win_rate,
+            'profit_factor': result.profit_factor,
+            'average_trade_pnl': str(result.average_trade_pnl),
+            'total_slippage': str(result.total_slippage),
+            'total_commission': str(result.total_commission),
+        },
+        'equity_curve': [[day.isoformat(), str(equity)] for day, equity in result.equity_curve],
+        'trades': result.trades,
+    }
+
+
+class TestSimulationKernelGolden:
+    """The kernel reproduces the recorded trades and metrics exactly."""
+
+    def test_matches_golden_file(self, tmp_path):
+        payload = json.loads(json.dumps(_golden_payload(_run_scenario(tmp_path))))
+        golden = json.loads(GOLDEN_PATH.read_text())
+
+        assert payload['metrics'] == golden['metrics']
+        assert payload['equity_curve'] == golden['equity_curve']
+        assert len(payload['trades']) == len(golden['trades'])
+        for actual, expected in zip(payload['trades'], golden['trades']):
+            assert actual == expected
+
+    def test_chunked_run_matches_golden_file(self, tmp_path):
+        payload = json.loads(json.dumps(_golden_payload(_run_scenario_in_hourly_chunks(tmp_path))))
+        assert payload == json.loads(GOLDEN_PATH.read_text())
+
+    def test_scenario_exercises_slices_and_force_exits(self):
+        golden = json.loads(GOLDEN_PATH.read_text())
+        trades = golden['trades']
+        assert len(trades) > 20
+        assert {trade['side'] for trade in trades} == {'buy', 'sell'}
+        assert {trade['symbol'] for trade in trades} == set(SYMBOLS)
+
+
+class TestAlignedBars:
+    """Per-symbol arrays are aligned on the union of timestamps."""
+
+    def test_alignment_and_day_ends(self):
+        t0 = datetime(2024, 3, 4, 15, 0, tzinfo=timezone.utc)
+
+        def bar(symbol: str, minutes: int, close: str) -> Bar:
+            price = Decimal(close)
+            return Bar(symbol, t0 + timedelta(minutes=minutes), price, price, price, price, 100)
+
+        bars = [
+            bar('AAPL', 0, '10'),
+            bar('MSFT', 1, '20'),
+            bar('AAPL', 1, '11'),
+            bar('AAPL', 60 * 24, '12'),
+        ]
+        aligned = AlignedBars.from_bars(bars, ['MSFT', 'AAPL'])
+
+        assert aligned.symbols == ['MSFT', 'AAPL']
+        assert len(aligned) == 3
+        assert aligned.present.tolist() == [[False, True], [True, True], [False, True]]
+        assert aligned.bar_index.tolist() == [[-1, 0], [0, 1], [0, 2]]
+        assert aligned.day_end.tolist() == [False, True, True]
+        # Within a timestamp, symbols keep the order of the plan
+        assert [b.symbol for b in aligned.bars_at(1)] == ['MSFT', 'AAPL']
+
+    def test_symbols_outside_plan_are_appended(self):
+        t0 = datetime(2024, 3, 4, 15, 0, tzinfo=timezone.utc)
+        price = Decimal('1')
+        bars = [Bar('ZZZ', t0, price, price, price, price, 1), Bar('AAPL', t0, price, price, price, price, 1)]
+        aligned = AlignedBars.from_bars(bars, ['AAPL'])
+        assert aligned.symbols == ['AAPL', 'ZZZ']
+
+
+class TestHistoryView:
+    """History views read the preloaded bar list without copying it."""
+
+    def test_prefix_view(self):
+        t0 = datetime(2024, 3, 4, 15, 0, tzinfo=timezone.utc)
+        price = Decimal('1')
+        bars = [Bar('AAPL', t0 + timedelta(minutes=i), price, price, price, price, i) for i in range(10)]
+        view = HistoryView(bars, 6)
+
+        assert len(view) == 6
+        assert view[-1] is bars[5]
+        assert view[0] is bars[0]
+        assert [b.volume for b in view[-3:]] == [3, 4, 5]
+        assert [b.volume for b in view] == list(range(6))
+        with pytest.raises(IndexError):
+            view[6]
+        with pytest.raises(IndexError):
+            view[-7]
+
+    def test_bounded_view(self):
+        t0 = datetime(2024, 3, 4, 15, 0, tzinfo=timezone.utc)
+        price = Decimal('1')
+        bars = [Bar('AAPL', t0 + timedelta(minutes=i), price, price, price, price, i) for i in range(10)]
+        view = HistoryView(bars, 8, start=5)
+
+        assert len(view) == 3
+        assert [b.volume for b in view] == [5, 6, 7]
+        assert view[0].volume == 5
+        assert [b.volume for b in view[1:]] == [6, 7]
+
+
+class TestBarHistory:
+    """Per-symbol history keeps a fixed number of bars."""
+
+    def test_keeps_most_recent_bars(self):
+        t0 = datetime(2024, 3, 4, 15, 0, tzinfo=timezone.utc)
+        price = Decimal('1')
+        history = BarHistory(4)
+        for i in range(11):
+            history.append(Bar('AAPL', t0 + timedelta(minutes=i), price, price, price, price, i))
+            assert len(history._buffer) < 2 * history.capacity
+
+        view = history.view()
+        assert len(history) == len(view) == 4
+        assert [b.volume for b in view] == [7, 8, 9, 10]
+        assert view[-1].volume == 10
+
+    def test_capacity_must_be_positive(self):
+        with pytest.raises(ValueError):
+            BarHistory(0)
+
+
+class TestBoundedEngineHistory:
+    """A bounded window gives the engine the same state as the full history."""
+
+    def test_observe_bars_keeps_indicators_continuous(self):
+        bars = [bar for bar in _scenario_bars() if bar.symbol == 'AAPL']
+        full_engine = FSDEngine(FSDConfig(), Portfolio(initial_cash=Decimal('100000')))
+        bounded_engine = FSDEngine(FSDConfig(), Portfolio(initial_cash=Decimal('100000')))
+        history = BarHistory(bounded_engine.max_lookback)
+        skipped = range(100, 100 + 3 * bounded_engine.max_lookback)
+
+        for i, bar in enumerate(bars):
+            history.append(bar)
+            if i in skipped:
+                bounded_engine.observe_bars('AAPL', history.view())
+                continue
+            full_state = full_engine.extract_state('AAPL', bars[: i + 1], {})
+            assert bounded_engine.extract_state('AAPL', history.view(), {}) == full_state
+
+    def test_max_lookback_covers_components(self):
+        from aistock.professional import ProfessionalSafeguards
+
+        engine = FSDEngine(FSDConfig(), Portfolio(initial_cash=Decimal('100000')))
+        assert engine.max_lookback >= 100
+        engine.safeguards = ProfessionalSafeguards()
+        assert engine.max_lookback >= ProfessionalSafeguards.LOOKBACK_BARS
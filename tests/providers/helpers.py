@@ -0,0 +1,45 @@
+"""Bar factory shared by the provider tests."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from aistock.data import Bar
+
+
+def make_bars(
+    start: datetime,
+    count: int,
+    step: timedelta = timedelta(hours=6),
+    symbol: str = 'AAPL',
+    price: str = '150.25',
+    tick: str = '0.01',
+    period: int | None = None,
+) -> list[Bar]:
+    """
+    Bars ``step`` apart from ``start``.
+
+    The close starts at ``price`` and rises by ``tick`` per bar (``tick='0'``
+    keeps it flat); the open is 0.05 below it and high/low 0.10 either side.
+    Volume is 1000 plus the bar index. With ``period`` the index wraps every
+    ``period`` bars, so prices and volumes repeat like a quiet market's.
+    """
+    close_0 = Decimal(price)
+    step_price = Decimal(tick)
+    bars = []
+    for i in range(count):
+        n = i % period if period else i
+        close = close_0 + step_price * n
+        bars.append(
+            Bar(
+                symbol=symbol,
+                timestamp=start + step * i,
+                open=close - Decimal('0.05'),
+                high=close + Decimal('0.10'),
+                low=close - Decimal('0.10'),
+                close=close,
+                volume=1_000 + n,
+            )
+        )
+    return bars
@@ -0,0 +1,168 @@
+"""Tests for compressed month files and the MassiveCache disk budget."""
+
+from __future__ import annotations
+
+import os
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from functools import partial
+from pathlib import Path
+
+import pytest
+
+from aistock.data import Bar
+from aistock.providers.cache import MassiveCache
+from aistock.providers.month_file import (
+    append_month_run,
+    available_codecs,
+    bars_to_month_frame,
+    encode_month,
+    month_file_codec,
+    read_month_file,
+    read_month_runs,
+    write_month_file,
+)
+from tests.providers.helpers import make_bars
+
+CODECS = available_codecs()
+DAY_NS = 24 * 3600 * 10**9
+
+_minute_bars = partial(make_bars, step=timedelta(minutes=1), period=37)
+
+
+def _age(path: Path, days: int) -> None:
+    stamp = os.stat(path).st_mtime_ns - days * DAY_NS
+    os.utime(path, ns=(stamp, stamp))
+
+
+class TestMonthCodecs:
+    """Encoding month runs with each available codec."""
+
+    @pytest.mark.parametrize('codec', CODECS)
+    def test_roundtrip_is_lossless(self, tmp_path, codec):
+        bars = _minute_bars(datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc), 500)
+        path = tmp_path / '2024-01_minute.bars'
+        write_month_file(path, bars_to_month_frame('AAPL', bars), codec)
+
+        assert month_file_codec(path) == codec
+        assert read_month_file(path).to_bars() == bars
+
+    @pytest.mark.parametrize('codec', CODECS)
+    def test_prices_beyond_fixed_point_roundtrip(self, tmp_path, codec):
+        bars = _minute_bars(datetime(2024, 1, 2, tzinfo=timezone.utc), 50)
+        third = Decimal('1') / Decimal('3')
+        bars[7] = Bar('AAPL', bars[7].timestamp, third, Decimal('1'), Decimal('0.1'), third, 5)
+        frame = bars_to_month_frame('AAPL', bars)
+        path = tmp_path / '2024-01_minute.bars'
+        write_month_file(path, frame, codec)
+
+        loaded = read_month_file(path)
+        assert (loaded.open == frame.open).all()
+        assert (loaded.close == frame.close).all()
+
+    def test_compressed_runs_append_and_shrink(self, tmp_path):
+        bars = _minute_bars(datetime(2024, 1, 2, tzinfo=timezone.utc), 2_000)
+        frame = bars_to_month_frame('AAPL', bars)
+        plain = tmp_path / 'plain.bars'
+        packed = tmp_path / 'packed.bars'
+        write_month_file(plain, frame)
+        write_month_file(packed, bars_to_month_frame('AAPL', bars[:1_500]), 'lzma')
+        append_month_run(packed, bars_to_month_frame('AAPL', bars[1_500:]), 'zlib')
+
+        assert read_month_file(packed).to_bars() == bars
+        assert packed.stat().st_size * 4 < plain.stat().st_size
+
+    def test_torn_compressed_run_is_ignored(self, tmp_path):
+        bars = _minute_bars(datetime(2024, 1, 2, tzinfo=timezone.utc), 300)
+        path = tmp_path / '2024-01_minute.bars'
+        write_month_file(path, bars_to_month_frame('AAPL', bars[:200]), 'zlib')
+        intact = path.stat().st_size
+        with path.open('ab') as handle:
+            handle.write(encode_month(bars_to_month_frame('AAPL', bars[200:]), 'zlib')[:-10])
+
+        assert read_month_file(path).to_bars() == bars[:200]
+        assert read_month_runs(path)[1] == intact
+
+
+class TestMassiveCacheCompression:
+    """Compressed stores and rewriting an existing cache."""
+
+    def test_compressed_cache_stores_and_loads(self, tmp_path):
+        bars = _minute_bars(datetime(2024, 1, 31, 20, 0, tzinfo=timezone.utc), 600)
+        cache = MassiveCache(tmp_path / 'cache', compression='lzma')
+        cache.store_bars('AAPL', bars[:400])
+        cache.store_bars('AAPL', bars[400:])
+
+        for path in (tmp_path / 'cache' / 'stocks' / 'AAPL').glob('*.bars'):
+            assert month_file_codec(path) == 'lzma'
+        loaded = MassiveCache(tmp_path / 'cache').load_bars('AAPL', date(2024, 1, 1), date(2024, 2, 29))
+        assert loaded == bars
+
+    def test_unknown_codec_is_rejected(self, tmp_path):
+        with pytest.raises(ValueError, match='compression'):
+            MassiveCache(tmp_path / 'cache', compression='lz4')
+
+    def test_compress_months_rewrites_existing_cache(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        bars = _minute_bars(datetime(2024, 1, 2, tzinfo=timezone.utc), 3_000)
+        cache.store_bars('AAPL', bars)
+        before = cache.get_cache_stats()
+        assert before['compressed_files'] == 0
+        assert before['compression_ratio'] == pytest.approx(1.0, rel=0.05)
+
+        assert cache.compress_months('lzma') == 1
+        assert cache.compress_months('lzma') == 0
+        after = cache.get_cache_stats()
+        assert after['compressed_files'] == 1
+        assert after['compression_ratio'] > 4
+        assert after['raw_size_bytes'] == before['raw_size_bytes']
+        assert cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31)) == bars
+        assert cache.verify_index(repair=False).consistent
+
+
+class TestDiskBudget:
+    """Least-recently-accessed eviction once the cache outgrows its budget."""
+
+    def _fill(self, cache: MassiveCache, directory: Path, months: int) -> list[Path]:
+        """Store ``months`` months of AAPL, each last accessed a day after the previous one."""
+        for month in range(1, months + 1):
+            cache.store_bars('AAPL', _minute_bars(datetime(2023, month, 2, tzinfo=timezone.utc), 200))
+        paths = sorted((directory / 'stocks' / 'AAPL').glob('*.bars'))
+        for age, path in enumerate(reversed(paths), start=1):
+            _age(path, age)
+        return paths
+
+    def test_store_evicts_least_recently_accessed_months(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        paths = self._fill(cache, tmp_path / 'cache', 6)
+        month_bytes = os.stat(paths[0]).st_size
+
+        # Reading March makes it the most recently used month
+        assert cache.load_bars('AAPL', date(2023, 3, 1), date(2023, 3, 31))
+        budget = month_bytes * 5
+        cache = MassiveCache(tmp_path / 'cache', disk_budget_bytes=budget)
+        cache.store_bars('AAPL', _minute_bars(datetime(2023, 7, 2, tzinfo=timezone.utc), 200))
+
+        assert sorted(cache.get_coverage('AAPL')) == ['2023-03', '2023-05', '2023-06', '2023-07']
+        assert not cache.has_cached_data('AAPL', date(2023, 1, 1), date(2023, 1, 31))
+        assert cache.get_cache_stats()['total_size_bytes'] <= budget * 0.9
+        assert cache.verify_index(repair=False).consistent
+
+    def test_just_written_months_are_kept(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache', disk_budget_bytes=1)
+        cache.store_bars('AAPL', _minute_bars(datetime(2023, 1, 2, tzinfo=timezone.utc), 200))
+        assert sorted(cache.get_coverage('AAPL')) == ['2023-01']
+
+        cache.store_bars('AAPL', _minute_bars(datetime(2023, 2, 2, tzinfo=timezone.utc), 200))
+        assert sorted(cache.get_coverage('AAPL')) == ['2023-02']
+
+    def test_access_recency_stats(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache', disk_budget_bytes=10**9)
+        self._fill(cache, tmp_path / 'cache', 3)
+        _age(sorted((tmp_path / 'cache' / 'stocks' / 'AAPL').glob('*.bars'))[0], 40)
+
+        stats = cache.get_cache_stats()
+        assert stats['disk_budget_bytes'] == 10**9
+        assert stats['idle_files_30d'] == 1
+        assert stats['oldest_access_age_seconds'] > 30 * 24 * 3600
+        assert stats['newest_access_age_seconds'] < stats['oldest_access_age_seconds']
@@ -0,0 +1,214 @@
+"""Tests for the month coverage index behind MassiveCache."""
+
+from __future__ import annotations
+
+import multiprocessing
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from aistock.data import datetime_to_ns
+from aistock.providers import coverage as coverage_module
+from aistock.providers.cache import MassiveCache
+from aistock.providers.coverage import CoverageIndex, MonthCoverage
+from aistock.providers.month_file import bars_to_month_frame, write_month_file
+from tests.providers.helpers import make_bars
+
+
+def _store_months(cache_dir: Path, worker: int, workers: int) -> None:
+    """Process target: store every ``workers``-th month of 2015-2019 for two symbols, from month ``worker``."""
+    cache = MassiveCache(cache_dir)
+    for month in range(worker, 60, workers):
+        start = datetime(2015 + month // 12, month % 12 + 1, 2, tzinfo=timezone.utc)
+        for symbol in ('AAPL', 'MSFT'):
+            cache.store_bars(symbol, make_bars(start, 3, symbol=symbol))
+
+
+class TestCoverageIndex:
+    """Snapshot + journal persistence."""
+
+    def test_store_journals_without_rewriting_snapshot(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        snapshot = tmp_path / 'cache' / 'metadata' / 'coverage.json'
+        before = snapshot.stat().st_mtime_ns
+
+        bars = make_bars(datetime(2024, 1, 25, tzinfo=timezone.utc), 40)
+        cache.store_bars('AAPL', bars)
+
+        assert snapshot.stat().st_mtime_ns == before
+        journal = (tmp_path / 'cache' / 'metadata' / 'coverage.journal').read_text().splitlines()
+        assert len(journal) == 2
+        coverage = MassiveCache(tmp_path / 'cache').get_coverage('AAPL')
+        assert sorted(coverage) == ['2024-01', '2024-02']
+        assert coverage['2024-01'].first_ns == datetime_to_ns(bars[0].timestamp)
+        assert coverage['2024-02'].last_ns == datetime_to_ns(bars[-1].timestamp)
+        assert sum(month.bar_count for month in coverage.values()) == 40
+
+    def test_queries_do_not_touch_month_files(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        cache.store_bars('AAPL', make_bars(datetime(2015, 1, 1, tzinfo=timezone.utc), 4 * 365 * 3, timedelta(hours=6)))
+        real_stat = Path.stat
+        stats: list[Path] = []
+
+        def counting_stat(path: Path, *args: Any, **kwargs: Any) -> Any:
+            stats.append(path)
+            return real_stat(path, *args, **kwargs)
+
+        with patch.object(Path, 'stat', counting_stat), patch.object(Path, 'exists', side_effect=AssertionError):
+            assert cache.has_cached_data('AAPL', date(2015, 1, 1), date(2017, 12, 31))
+            assert cache.get_missing_ranges('AAPL', date(2014, 1, 1), date(2018, 6, 30)) == [
+                (date(2014, 1, 1), date(2014, 12, 31)),
+                (date(2018, 1, 1), date(2018, 6, 30)),
+            ]
+        assert {path.parent.name for path in stats} == {'metadata'}
+        assert len(stats) == 4
+
+    def test_torn_journal_tail_is_ignored_and_replaced(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        cache.store_bars('AAPL', make_bars(datetime(2024, 1, 2, tzinfo=timezone.utc), 5))
+        journal = tmp_path / 'cache' / 'metadata' / 'coverage.journal'
+        with journal.open('ab') as f:
+            f.write(b'{"g":1,"k":"stocks/MSFT/minute","m":"2024-0')
+
+        reopened = MassiveCache(tmp_path / 'cache')
+        assert reopened.get_coverage('MSFT') == {}
+        assert sorted(reopened.get_coverage('AAPL')) == ['2024-01']
+
+        reopened.store_bars('MSFT', make_bars(datetime(2024, 3, 2, tzinfo=timezone.utc), 5, symbol='MSFT'))
+        assert len(journal.read_text().splitlines()) == 2
+        assert sorted(MassiveCache(tmp_path / 'cache').get_coverage('MSFT')) == ['2024-03']
+
+    def test_records_from_an_older_snapshot_are_ignored(self, tmp_path):
+        directory = tmp_path / 'metadata'
+        index = CoverageIndex(directory)
+        index.replace({})
+        key = ('stocks', 'AAPL', 'minute')
+        index.record(key, '2024-01', MonthCoverage(1, 2, 3))
+        journal = (directory / 'coverage.journal').read_bytes()
+
+        # Crash between writing the next snapshot and emptying the journal
+        index.record(key, '2024-01', None)
+        index.compact()
+        (directory / 'coverage.journal').write_bytes(journal)
+
+        reloaded = CoverageIndex(directory)
+        assert reloaded.load()
+        assert reloaded.months(key) == {}
+
+    def test_journal_is_compacted(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        journal = tmp_path / 'cache' / 'metadata' / 'coverage.journal'
+        with patch.object(coverage_module, 'MIN_JOURNAL_COMPACTION_RECORDS', 4):
+            for month in range(1, 7):
+                cache.store_bars('AAPL', make_bars(datetime(2024, month, 2, tzinfo=timezone.utc), 3))
+        assert len(journal.read_text().splitlines()) == 2
+        assert len(MassiveCache(tmp_path / 'cache').get_coverage('AAPL')) == 6
+
+    def test_reader_sees_writer_appends(self, tmp_path):
+        writer = MassiveCache(tmp_path / 'cache')
+        reader = MassiveCache(tmp_path / 'cache', read_only=True)
+        assert not reader.has_cached_data('AAPL', date(2024, 1, 1), date(2024, 1, 31))
+
+        writer.store_bars('AAPL', make_bars(datetime(2024, 1, 2, tzinfo=timezone.utc), 5))
+        assert reader.has_cached_data('AAPL', date(2024, 1, 1), date(2024, 1, 31))
+        assert len(reader.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31))) == 5
+
+        writer.clear_cache('AAPL', 'stocks')
+        assert not reader.has_cached_data('AAPL', date(2024, 1, 1), date(2024, 1, 31))
+
+    def test_clear_cache_drops_coverage(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        cache.store_bars('AAPL', make_bars(datetime(2024, 1, 2, tzinfo=timezone.utc), 5))
+        cache.store_bars(
+            'ESH26', make_bars(datetime(2024, 1, 2, tzinfo=timezone.utc), 5, symbol='ESH26'), 'minute', 'futures'
+        )
+
+        cache.clear_cache('AAPL', 'stocks')
+        assert cache.get_coverage('AAPL') == {}
+        assert cache.get_coverage('ESH26', asset_type='futures') != {}
+
+        cache.clear_cache()
+        assert cache.get_coverage('ESH26', asset_type='futures') == {}
+        assert MassiveCache(tmp_path / 'cache').get_coverage('ESH26', asset_type='futures') == {}
+
+    def test_concurrent_writer_processes_keep_every_month(self, tmp_path):
+        cache_dir = tmp_path / 'cache'
+        # A low compaction threshold so the writers also replace each other's snapshots
+        with patch.object(coverage_module, 'MIN_JOURNAL_COMPACTION_RECORDS', 16):
+            writers = [
+                multiprocessing.Process(target=_store_months, args=(cache_dir, worker, 6)) for worker in range(6)
+            ]
+            for process in writers:
+                process.start()
+            for process in writers:
+                process.join(timeout=120)
+                assert process.exitcode == 0
+
+        cache = MassiveCache(cache_dir)
+        for symbol in ('AAPL', 'MSFT'):
+            assert len(cache.get_coverage(symbol)) == 60
+            assert cache.get_missing_ranges(symbol, date(2015, 1, 1), date(2019, 12, 31)) == []
+        assert cache.verify_index(repair=False).consistent
+        assert list((cache_dir / 'metadata').glob('*.tmp')) == []
+
+
+class TestVerifyIndex:
+    """Rebuilding the index from the month files on disk."""
+
+    def test_consistent_after_stores(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        cache.store_bars('AAPL', make_bars(datetime(2024, 1, 25, tzinfo=timezone.utc), 40))
+
+        report = cache.verify_index()
+        assert report.consistent
+        assert report.months_on_disk == 2
+        assert not report.repaired
+
+    def test_detects_and_repairs_drift(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        cache.store_bars('AAPL', make_bars(datetime(2024, 1, 2, tzinfo=timezone.utc), 5))
+        cache.store_bars('AAPL', make_bars(datetime(2024, 2, 2, tzinfo=timezone.utc), 5))
+        cache.store_bars('AAPL', make_bars(datetime(2024, 3, 2, tzinfo=timezone.utc), 5))
+
+        stocks = tmp_path / 'cache' / 'stocks' / 'AAPL'
+        (stocks / '2024-01_minute.bars').unlink()
+        more = make_bars(datetime(2024, 2, 2, tzinfo=timezone.utc), 9)
+        write_month_file(stocks / '2024-02_minute.bars', bars_to_month_frame('AAPL', more))
+        msft = make_bars(datetime(2024, 4, 2, tzinfo=timezone.utc), 5, symbol='MSFT')
+        write_month_file(
+            tmp_path / 'cache' / 'stocks' / 'MSFT' / '2024-04_minute.bars', bars_to_month_frame('MSFT', msft)
+        )
+        (stocks / '2024-05_minute.bars').write_bytes(b'garbage')
+
+        report = cache.verify_index(repair=False)
+        assert report.stale == ['stocks/AAPL/2024-01_minute']
+        assert report.mismatched == ['stocks/AAPL/2024-02_minute']
+        assert report.missing == ['stocks/MSFT/2024-04_minute']
+        assert report.unreadable == ['stocks/AAPL/2024-05_minute.bars']
+        assert not report.repaired
+        assert cache.has_cached_data('AAPL', date(2024, 1, 1), date(2024, 1, 31))
+
+        assert cache.verify_index().repaired
+        assert not cache.has_cached_data('AAPL', date(2024, 1, 1), date(2024, 1, 31))
+        assert cache.get_coverage('AAPL')['2024-02'].bar_count == 9
+        assert cache.has_cached_data('MSFT', date(2024, 4, 1), date(2024, 4, 30))
+        assert MassiveCache(tmp_path / 'cache').verify_index().consistent
+
+    def test_empty_months_stay_indexed_without_a_file(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        cache.store_bars('AAPL', make_bars(datetime(2024, 2, 2, tzinfo=timezone.utc), 5))
+        cache.record_empty_month('AAPL', '2024-01')
+        cache.record_empty_month('AAPL', '2024-02')  # Already holds bars: left alone
+
+        assert cache.has_cached_data('AAPL', date(2024, 1, 1), date(2024, 2, 29))
+        assert cache.get_coverage('AAPL')['2024-01'].empty
+        assert cache.get_coverage('AAPL')['2024-02'].bar_count == 5
+        assert len(cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 2, 29))) == 5
+        assert not (tmp_path / 'cache' / 'stocks' / 'AAPL' / '2024-01_minute.bars').exists()
+
+        report = MassiveCache(tmp_path / 'cache').verify_index()
+        assert report.consistent
+        assert report.months_on_disk == 1
+        assert cache.enforce_disk_budget(budget_bytes=0) == ['stocks/AAPL/2024-02_minute']
+        assert cache.get_coverage('AAPL') == {'2024-01': MonthCoverage(0, 0, 0)}
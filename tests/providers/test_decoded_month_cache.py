@@ -0,0 +1,118 @@
+"""Tests for the process-wide decoded-month LRU in MassiveCache."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from aistock.providers import cache as cache_module
+from aistock.providers.cache import CachedMonth, DecodedMonthLRU, MassiveCache
+from tests.providers.helpers import make_bars
+
+
+@pytest.fixture
+def memory():
+    lru = DecodedMonthLRU()
+    with patch.object(cache_module, '_decoded_months', lru):
+        yield lru
+
+
+class TestDecodedMonthLRU:
+    """Byte-budgeted LRU bookkeeping."""
+
+    def _month(self, count: int) -> CachedMonth:
+        from aistock.data import BarFrame
+
+        return CachedMonth(BarFrame.from_bars(make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), count)))
+
+    def test_evicts_least_recently_used(self):
+        lru = DecodedMonthLRU(max_bytes=10 * 48 * 2)
+        a, b, c = self._month(10), self._month(10), self._month(10)
+        lru.put(('r', 'stocks', 'A', '2024-01', 'minute'), a)
+        lru.put(('r', 'stocks', 'B', '2024-01', 'minute'), b)
+        assert lru.get(('r', 'stocks', 'A', '2024-01', 'minute')) is a
+        lru.put(('r', 'stocks', 'C', '2024-01', 'minute'), c)
+
+        assert lru.get(('r', 'stocks', 'B', '2024-01', 'minute')) is None
+        assert lru.stats() == {
+            'hits': 1,
+            'misses': 1,
+            'evictions': 1,
+            'entries': 2,
+            'bytes': 2 * 480,
+            'max_bytes': 960,
+        }
+
+    def test_oversized_entry_is_not_kept(self):
+        lru = DecodedMonthLRU(max_bytes=100)
+        lru.put(('r', 'stocks', 'A', '2024-01', 'minute'), self._month(10))
+        assert len(lru) == 0
+        assert lru.stats()['bytes'] == 0
+
+    def test_decoded_bars_are_accounted(self):
+        lru = DecodedMonthLRU()
+        month = self._month(10)
+        key = ('r', 'stocks', 'A', '2024-01', 'minute')
+        lru.put(key, month)
+        month.bars = month.frame.to_bars()
+        lru.put(key, month)
+        assert lru.stats()['bytes'] == 480 + 10 * cache_module.DECODED_BAR_BYTES
+        assert len(lru) == 1
+
+
+class TestMassiveCacheMemoryLayer:
+    """Overlapping loads read each month from disk once."""
+
+    def test_overlapping_windows_read_each_month_once(self, tmp_path, memory):
+        cache = MassiveCache(tmp_path / 'cache')
+        bars = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 4 * 91)
+        cache.store_bars('AAPL', bars)
+
+        windows = [(date(2024, 1, 1), date(2024, 2, 15)), (date(2024, 1, 20), date(2024, 3, 10))] * 10
+        with patch.object(cache_module, 'read_month_file', wraps=cache_module.read_month_file) as reader:
+            for start, end in windows:
+                loaded = cache.load_bars('AAPL', start, end)
+                assert loaded == [b for b in bars if start <= b.timestamp.date() <= end]
+            frame = cache.load_frame('AAPL', date(2024, 1, 1), date(2024, 3, 31))
+
+        assert reader.call_count == 3
+        assert len(frame) == len(bars)
+        stats = cache.get_memory_cache_stats()
+        assert stats['misses'] == 3
+        assert stats['entries'] == 3
+
+    def test_store_bars_invalidates_month(self, tmp_path, memory):
+        cache = MassiveCache(tmp_path / 'cache')
+        cache.store_bars('AAPL', make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 20))
+        cache.store_bars('AAPL', make_bars(datetime(2024, 2, 1, tzinfo=timezone.utc), 20))
+        cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 2, 29))
+        assert len(memory) == 2
+
+        fresh = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 20, price='99.50')
+        cache.store_bars('AAPL', fresh)
+
+        assert len(memory) == 1
+        assert cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31)) == fresh
+
+    def test_clear_cache_invalidates(self, tmp_path, memory):
+        cache = MassiveCache(tmp_path / 'cache')
+        other = MassiveCache(tmp_path / 'other')
+        for c in (cache, other):
+            c.store_bars('AAPL', make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 20))
+            c.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31))
+        assert len(memory) == 2
+
+        cache.clear_cache('AAPL', 'stocks')
+
+        assert len(memory) == 1
+        assert cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31)) == []
+        assert len(other.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31))) == 20
+
+    def test_zero_budget_disables_memory_layer(self, tmp_path, memory):
+        cache = MassiveCache(tmp_path / 'cache', memory_cache_bytes=0)
+        cache.store_bars('AAPL', make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 20))
+        cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31))
+        assert len(memory) == 0
+        assert memory.stats()['misses'] == 0
@@ -0,0 +1,167 @@
+"""Tests for the rolling in-memory bar windows behind MassiveDataProvider's live methods."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from aistock.data import Bar
+from aistock.providers.live_window import LiveBarWindow
+from aistock.providers.massive import MassiveConfig, MassiveDataProvider
+
+TODAY = date(2024, 3, 15)
+
+
+def _bar(timestamp: datetime, close: str = '100.00', symbol: str = 'AAPL') -> Bar:
+    price = Decimal(close)
+    return Bar(symbol, timestamp, price, price, price, price, 100)
+
+
+def _minutes(start: datetime, count: int, close: str = '100.00') -> list[Bar]:
+    return [_bar(start + timedelta(minutes=i), close) for i in range(count)]
+
+
+class FakeSource:
+    """Bar loader over an in-memory list, recording each load."""
+
+    def __init__(self, bars: list[Bar]) -> None:
+        self.bars = bars
+        self.calls: list[tuple[str, date, date]] = []
+
+    def __call__(self, symbol: str, start: date, end: date) -> list[Bar]:
+        self.calls.append((symbol, start, end))
+        return [bar for bar in self.bars if bar.symbol == symbol and start <= bar.timestamp.date() <= end]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _window(
+    source: FakeSource, clock: FakeClock, window_days: int = 30, refresh_seconds: float = 60.0
+) -> LiveBarWindow:
+    return LiveBarWindow(source, window_days, refresh_seconds, clock=clock, today=lambda: TODAY)
+
+
+class TestLiveBarWindow:
+    """Seeding, refreshing and invalidating per-symbol windows."""
+
+    def test_lookups_are_served_from_memory_after_seed(self) -> None:
+        source = FakeSource(_minutes(datetime(2024, 3, 14, 14, 30, tzinfo=timezone.utc), 300))
+        clock = FakeClock()
+        window = _window(source, clock)
+
+        assert len(window.get_bars('AAPL')) == 300
+        assert window.get_bars('AAPL', lookback=5) == source.bars[-5:]
+        assert window.get_latest_bar('AAPL') == source.bars[-1]
+        assert window.bar_count('AAPL') == 300
+        assert window.get_bars('AAPL', lookback=0) == []
+        assert source.calls == [('AAPL', date(2024, 2, 14), TODAY)]
+
+    def test_stale_window_is_extended_with_newer_bars_only(self) -> None:
+        bars = _minutes(datetime(2024, 3, 14, 14, 30, tzinfo=timezone.utc), 300)
+        source = FakeSource(bars[:200])
+        clock = FakeClock()
+        window = _window(source, clock, refresh_seconds=60)
+        assert window.bar_count('AAPL') == 200
+
+        source.bars = bars
+        clock.now += 30
+        assert window.bar_count('AAPL') == 200
+        clock.now += 31
+        assert window.get_bars('AAPL') == bars
+        assert source.calls[-1] == ('AAPL', date(2024, 3, 14), TODAY)
+        assert window.get_stats()['refreshes'] == 1
+
+    def test_add_bar_appends_and_replaces(self) -> None:
+        start = datetime(2024, 3, 14, 14, 30, tzinfo=timezone.utc)
+        source = FakeSource(_minutes(start, 10))
+        window = _window(source, FakeClock())
+        window.bar_count('AAPL')
+
+        window.add_bar('AAPL', _bar(start + timedelta(minutes=10), '101.00'))
+        window.add_bar('AAPL', _bar(start + timedelta(minutes=10), '102.00'))
+        window.add_bar('AAPL', _bar(start + timedelta(minutes=3), '99.00'))
+
+        bars = window.get_bars('AAPL')
+        assert len(bars) == 11
+        assert bars[-1].close == Decimal('102.00')
+        assert bars[3].close == Decimal('99.00')
+        assert [bar.timestamp for bar in bars] == sorted(bar.timestamp for bar in bars)
+        assert len(source.calls) == 1
+
+    def test_bars_streamed_before_seed_are_merged(self) -> None:
+        start = datetime(2024, 3, 14, 14, 30, tzinfo=timezone.utc)
+        cached = _minutes(start, 10)
+        window = _window(FakeSource(cached), FakeClock())
+
+        window.add_bar('AAPL', _bar(start + timedelta(minutes=10), '101.00'))
+        bars = window.get_bars('AAPL')
+        assert bars == [*cached, _bar(start + timedelta(minutes=10), '101.00')]
+
+    def test_old_bars_age_out(self) -> None:
+        start = datetime(2024, 3, 13, tzinfo=timezone.utc)
+        window = _window(FakeSource(_minutes(start, 10)), FakeClock(), window_days=2)
+        assert window.bar_count('AAPL') == 10
+
+        window.add_bar('AAPL', _bar(start + timedelta(days=2, hours=1)))
+        bars = window.get_bars('AAPL')
+        assert [bar.timestamp for bar in bars] == [start + timedelta(days=2, hours=1)]
+        assert window.get_bars('AAPL', lookback=5) == bars
+
+    def test_invalidate_reseeds(self) -> None:
+        bars = _minutes(datetime(2024, 3, 14, 14, 30, tzinfo=timezone.utc), 20)
+        source = FakeSource(bars[10:])
+        window = _window(source, FakeClock(), refresh_seconds=3600)
+        assert window.bar_count('AAPL') == 10
+
+        # A backfill before the window's first bar is only seen after invalidation
+        source.bars = bars
+        assert window.bar_count('AAPL') == 10
+        window.invalidate('AAPL')
+        assert window.get_bars('AAPL') == bars
+        assert window.get_stats()['seeds'] == 2
+
+    def test_invalidate_keeps_streamed_bars_newer_than_the_cache(self) -> None:
+        start = datetime(2024, 3, 14, 14, 30, tzinfo=timezone.utc)
+        source = FakeSource(_minutes(start, 10))
+        window = _window(source, FakeClock(), refresh_seconds=3600)
+        window.bar_count('AAPL')
+        streamed = [_bar(start + timedelta(minutes=i), '101.00') for i in range(8, 13)]
+        for bar in streamed:
+            window.add_bar('AAPL', bar)
+
+        # A backfill rewrites minutes 0-9; the streamed minutes 10-12 were never cached
+        backfilled = _minutes(start, 10, close='99.00')
+        source.bars = backfilled
+        window.invalidate('AAPL')
+        assert window.get_bars('AAPL') == [*backfilled, *streamed[2:]]
+        assert window.get_stats()['seeds'] == 2
+
+
+class TestMassiveDataProviderLiveMethods:
+    """The MarketDataProviderProtocol methods read through the window."""
+
+    def test_live_methods_use_window(self, tmp_path) -> None:
+        config = MassiveConfig(api_key='test', cache_dir=str(tmp_path / 'cache'), live_refresh_seconds=3600)
+        provider = MassiveDataProvider(config)
+        now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        bars = _minutes(now - timedelta(days=2), 50)
+        provider._get_cache().store_bars('AAPL', bars)
+
+        assert provider.get_bars('AAPL', lookback=3) == bars[-3:]
+        assert provider.has_sufficient_data('AAPL', min_bars=50)
+        assert not provider.has_sufficient_data('AAPL', min_bars=51)
+
+        streamed = _bar(now - timedelta(days=1))
+        provider.add_bar('AAPL', '1m', streamed)
+        assert provider.get_latest_bar('AAPL') == streamed
+
+        # A backfill reloads the cached bars but keeps the streamed one, which is newer
+        provider.invalidate_live_window('AAPL')
+        assert provider.get_latest_bar('AAPL') == streamed
+        assert provider.get_bars('AAPL', lookback=2) == [bars[-1], streamed]
@@ -36,6 +36,13 @@ class TestMassiveConfig:
         with pytest.raises(ValueError, match='Rate limit must be at least 1'):
             MassiveConfig(api_key='test', rate_limit_per_minute=0)
 
+    def test_invalid_cache_compression(self) -> None:
+        """Test that unknown codecs and negative disk budgets are rejected."""
+        with pytest.raises(ValueError, match='cache_compression'):
+            MassiveConfig(api_key='test', cache_compression='lz4')
+        with pytest.raises(ValueError, match='disk_cache_bytes'):
+            MassiveConfig(api_key='test', disk_cache_bytes=-1)
+
 
 class TestRateLimiter:
     """Tests for RateLimiter."""
@@ -78,6 +85,41 @@ class TestRateLimiter:
         assert stats['total_calls'] == 3
         assert stats['current_window_calls'] == 3
 
+    def test_concurrent_callers_respect_limit(self) -> None:
+        """Threads woken from a wait re-check the window instead of all taking a slot."""
+        import threading
+
+        limiter = RateLimiter(max_calls=3, window_seconds=0.5, safety_margin_seconds=0.0)
+        acquired: list[float] = []
+        lock = threading.Lock()
+
+        def worker() -> None:
+            limiter.acquire()
+            with lock:
+                acquired.append(time.time())
+
+        threads = [threading.Thread(target=worker) for _ in range(9)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        acquired.sort()
+        for i in range(3, len(acquired)):
+            assert acquired[i] - acquired[i - 3] >= 0.45
+
+    def test_acquire_can_be_cancelled(self) -> None:
+        """A cancelled wait returns False without taking a slot."""
+        import threading
+
+        limiter = RateLimiter(max_calls=1, window_seconds=60)
+        limiter.acquire()
+        cancel = threading.Event()
+        cancel.set()
+
+        assert limiter.acquire(cancel=cancel) is False
+        assert limiter.get_stats()['total_calls'] == 1
+
     def test_reset_stats(self) -> None:
         """Test stats reset."""
         limiter = RateLimiter(max_calls=5, window_seconds=60)
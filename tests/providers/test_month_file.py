@@ -0,0 +1,309 @@
+"""Tests for the binary month files behind MassiveCache."""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import multiprocessing
+import struct
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from aistock.data import Bar, BarFrame
+from aistock.providers import cache as cache_module
+from aistock.providers.cache import MassiveCache
+from aistock.providers.month_file import (
+    MAX_MONTH_RUNS,
+    MONTH_LOCK_NAME,
+    MonthFileError,
+    append_month_run,
+    bars_to_month_frame,
+    compact_month_file,
+    encode_month,
+    read_month_file,
+    read_month_runs,
+    slice_dates,
+    split_months,
+    write_month_file,
+)
+from tests.providers.helpers import make_bars
+
+
+def _append_runs(path, worker: int, runs: int) -> None:
+    """Process target: append ``runs`` runs of disjoint bars, compacting like MassiveCache does."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=worker)
+    for run in range(runs):
+        bars = make_bars(start + timedelta(hours=run), 5, step=timedelta(seconds=1))
+        if append_month_run(path, bars_to_month_frame('AAPL', bars)) > MAX_MONTH_RUNS:
+            compact_month_file(path)
+
+
+def _write_legacy_month(path, bars: list[Bar]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    records = [
+        {
+            'symbol': bar.symbol,
+            'timestamp': bar.timestamp.isoformat(),
+            'open': str(bar.open),
+            'high': str(bar.high),
+            'low': str(bar.low),
+            'close': str(bar.close),
+            'volume': bar.volume,
+        }
+        for bar in bars
+    ]
+    path.write_text(json.dumps(records))
+
+
+class TestMonthFile:
+    """Encoding, memory-mapped reads and date slicing."""
+
+    def test_roundtrip(self, tmp_path):
+        bars = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 40)
+        path = tmp_path / '2024-01_minute.bars'
+        size = write_month_file(path, bars_to_month_frame('AAPL', bars))
+
+        frame = read_month_file(path)
+        assert path.stat().st_size == size
+        assert isinstance(frame.close, np.memmap) or isinstance(frame.close.base, np.memmap)
+        assert frame.to_bars() == bars
+
+    def test_unsorted_duplicates_keep_last(self):
+        bars = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 5)
+        replacement = Bar('AAPL', bars[2].timestamp, Decimal('1'), Decimal('2'), Decimal('1'), Decimal('2'), 7)
+        frame = bars_to_month_frame('AAPL', [bars[4], bars[2], *bars[:2], bars[3], replacement])
+
+        assert list(frame.timestamps) == sorted(set(frame.timestamps))
+        assert len(frame) == 5
+        assert frame[2] == replacement
+
+    def test_slice_dates_is_inclusive_and_zero_copy(self, tmp_path):
+        bars = make_bars(datetime(2024, 3, 1, tzinfo=timezone.utc), 31 * 4)
+        path = tmp_path / '2024-03_minute.bars'
+        write_month_file(path, bars_to_month_frame('AAPL', bars))
+        frame = read_month_file(path)
+
+        window = slice_dates(frame, date(2024, 3, 10), date(2024, 3, 12))
+        assert window.to_bars() == [b for b in bars if date(2024, 3, 10) <= b.timestamp.date() <= date(2024, 3, 12)]
+        assert np.shares_memory(window.close, frame.close)
+
+    def test_split_months(self):
+        bars = make_bars(datetime(2024, 1, 30, tzinfo=timezone.utc), 16, step=timedelta(days=1))
+        months = split_months(bars_to_month_frame('AAPL', bars))
+        assert [(ym, len(f)) for ym, f in months] == [('2024-01', 2), ('2024-02', 14)]
+
+    def test_corrupt_file_rejected(self, tmp_path):
+        path = tmp_path / 'bad.bars'
+        path.write_bytes(b'not a month file at all')
+        with pytest.raises(MonthFileError):
+            read_month_file(path)
+
+        write_month_file(path, bars_to_month_frame('AAPL', make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 10)))
+        path.write_bytes(path.read_bytes()[:-16])
+        with pytest.raises(MonthFileError, match='truncated'):
+            read_month_file(path)
+
+
+class TestMassiveCacheBinaryFormat:
+    """MassiveCache stores binary months and still reads legacy JSON."""
+
+    def test_store_writes_one_binary_file_per_month(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        bars = make_bars(datetime(2024, 1, 25, tzinfo=timezone.utc), 20 * 4)
+        cache.store_bars('AAPL', bars)
+
+        files = sorted(p.name for p in (tmp_path / 'cache' / 'stocks' / 'AAPL').iterdir())
+        assert files == [MONTH_LOCK_NAME, '2024-01_minute.bars', '2024-02_minute.bars']
+        assert cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 2, 29)) == bars
+        assert cache.get_cache_stats()['stocks_files'] == 2
+
+    def test_load_frame_matches_load_bars(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        cache.store_bars('AAPL', make_bars(datetime(2024, 1, 20, tzinfo=timezone.utc), 30 * 4))
+
+        frame = cache.load_frame('AAPL', date(2024, 1, 28), date(2024, 2, 3))
+        assert isinstance(frame, BarFrame)
+        assert frame.to_bars() == cache.load_bars('AAPL', date(2024, 1, 28), date(2024, 2, 3))
+        assert len(cache.load_frame('AAPL', date(2023, 1, 1), date(2023, 1, 31))) == 0
+
+    def test_legacy_json_is_read_and_migrated(self, tmp_path):
+        bars = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 20)
+        legacy_path = tmp_path / 'cache' / 'stocks' / 'AAPL' / '2024-01_minute.json'
+        _write_legacy_month(legacy_path, bars)
+        # A cache that predates the coverage index is indexed on first open
+        cache = MassiveCache(tmp_path / 'cache')
+
+        assert cache.has_cached_data('AAPL', date(2024, 1, 1), date(2024, 1, 31))
+        assert cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31)) == bars
+
+        assert cache.migrate_legacy_months() == 1
+        assert not legacy_path.exists()
+        assert legacy_path.with_suffix('.bars').exists()
+        assert cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31)) == bars
+        assert cache.migrate_legacy_months() == 0
+
+    def test_store_merges_and_replaces_legacy_month(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        legacy_path = tmp_path / 'cache' / 'stocks' / 'AAPL' / '2024-01_minute.json'
+        legacy = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 5)
+        _write_legacy_month(legacy_path, legacy)
+
+        # Overlaps the last legacy bar, which the new bar replaces
+        fresh = make_bars(datetime(2024, 1, 2, tzinfo=timezone.utc), 8)
+        cache.store_bars('AAPL', fresh)
+
+        assert not legacy_path.exists()
+        assert cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31)) == legacy[:4] + fresh
+
+
+class TestMonthRuns:
+    """Appended runs, torn appends and compaction."""
+
+    def test_append_writes_only_new_rows(self, tmp_path):
+        bars = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 30)
+        path = tmp_path / '2024-01_minute.bars'
+        base = write_month_file(path, bars_to_month_frame('AAPL', bars[:20]))
+
+        tail = bars_to_month_frame('AAPL', bars[20:])
+        assert append_month_run(path, tail) == 2
+
+        assert path.stat().st_size == base + len(encode_month(tail))
+        runs, valid_length = read_month_runs(path)
+        assert [len(run) for run in runs] == [20, 10]
+        assert valid_length == path.stat().st_size
+        assert read_month_file(path).to_bars() == bars
+
+    def test_later_runs_win_on_duplicate_timestamps(self, tmp_path):
+        bars = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 10)
+        path = tmp_path / '2024-01_minute.bars'
+        write_month_file(path, bars_to_month_frame('AAPL', bars))
+        price = Decimal('99.5')
+        revised = [Bar('AAPL', bars[i].timestamp, price, price, price, price, 1) for i in (2, 7)]
+        append_month_run(path, bars_to_month_frame('AAPL', revised))
+
+        merged = read_month_file(path).to_bars()
+        assert merged == [*bars[:2], revised[0], *bars[3:7], revised[1], *bars[8:]]
+
+    def test_torn_append_is_ignored_and_truncated(self, tmp_path):
+        bars = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 30)
+        path = tmp_path / '2024-01_minute.bars'
+        write_month_file(path, bars_to_month_frame('AAPL', bars[:20]))
+        intact = path.stat().st_size
+
+        # Crash part-way through appending a run
+        with path.open('ab') as handle:
+            handle.write(encode_month(bars_to_month_frame('AAPL', bars[20:25]))[:-24])
+        assert read_month_file(path).to_bars() == bars[:20]
+        assert read_month_runs(path)[1] == intact
+
+        append_month_run(path, bars_to_month_frame('AAPL', bars[20:]))
+        assert read_month_file(path).to_bars() == bars
+        assert len(read_month_runs(path)[0]) == 2
+
+    def test_corrupt_appended_run_is_ignored(self, tmp_path):
+        bars = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 30)
+        path = tmp_path / '2024-01_minute.bars'
+        write_month_file(path, bars_to_month_frame('AAPL', bars[:20]))
+        append_month_run(path, bars_to_month_frame('AAPL', bars[20:]))
+        data = bytearray(path.read_bytes())
+        data[-1] ^= 0xFF
+        path.write_bytes(bytes(data))
+
+        assert read_month_file(path).to_bars() == bars[:20]
+
+    def test_version_1_files_are_read(self, tmp_path):
+        bars = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 10)
+        payload = bytearray(encode_month(bars_to_month_frame('AAPL', bars)))
+        # Version 1 headers carried no checksum
+        magic, _, flags, count, symbol_len, _ = struct.unpack_from('<4sHHQII', payload)
+        struct.pack_into('<4sHHQII', payload, 0, magic, 1, flags, count, symbol_len, 0)
+        path = tmp_path / '2024-01_minute.bars'
+        path.write_bytes(bytes(payload))
+
+        assert read_month_file(path).to_bars() == bars
+        append_month_run(path, bars_to_month_frame('AAPL', make_bars(bars[-1].timestamp + timedelta(hours=6), 2)))
+        assert len(read_month_file(path)) == 12
+
+
+class TestMonthWriteLock:
+    """Appends and compactions from several processes."""
+
+    def test_concurrent_writers_lose_no_runs(self, tmp_path):
+        path = tmp_path / 'AAPL' / '2024-01_minute.bars'
+        workers = [multiprocessing.Process(target=_append_runs, args=(path, worker, 20)) for worker in range(4)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=60)
+            assert process.exitcode == 0
+
+        frame = read_month_file(path)
+        assert len(frame) == 4 * 20 * 5
+        assert len(np.unique(frame.timestamps)) == len(frame)
+
+    def test_writer_waits_for_another_process_lock(self, tmp_path):
+        path = tmp_path / 'AAPL' / '2024-01_minute.bars'
+        write_month_file(path, bars_to_month_frame('AAPL', make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 5)))
+        before = path.stat().st_size
+
+        with open(path.parent / MONTH_LOCK_NAME, 'ab') as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            writer = multiprocessing.Process(target=_append_runs, args=(path, 30, 1))
+            writer.start()
+            writer.join(timeout=0.5)
+            assert writer.is_alive()
+            assert path.stat().st_size == before
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+        writer.join(timeout=30)
+
+        assert writer.exitcode == 0
+        assert len(read_month_file(path)) == 10
+
+
+class TestMassiveCacheAppends:
+    """store_bars appends to months already cached."""
+
+    def test_daily_updates_append_and_compact(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        path = tmp_path / 'cache' / 'stocks' / 'AAPL' / '2024-01_minute.bars'
+        days = [
+            make_bars(datetime(2024, 1, day, 14, 30, tzinfo=timezone.utc), 6, timedelta(minutes=1))
+            for day in range(1, 12)
+        ]
+
+        sizes: list[int] = []
+        with patch.object(cache_module, 'read_month_file', wraps=cache_module.read_month_file) as reader:
+            for day in days[:MAX_MONTH_RUNS]:
+                cache.store_bars('AAPL', day)
+                sizes.append(path.stat().st_size)
+        # In-order appends neither rewrite nor re-read the month
+        assert reader.call_count == 0
+        increments = {after - before for before, after in zip(sizes, sizes[1:])}
+        assert increments == {len(encode_month(bars_to_month_frame('AAPL', days[0])))}
+        assert len(read_month_runs(path)[0]) == MAX_MONTH_RUNS
+
+        cache.store_bars('AAPL', days[MAX_MONTH_RUNS])
+        assert len(read_month_runs(path)[0]) == 1
+        for day in days[MAX_MONTH_RUNS + 1 :]:
+            cache.store_bars('AAPL', day)
+
+        expected = [bar for day in days for bar in day]
+        assert cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31)) == expected
+        coverage = cache.get_coverage('AAPL')['2024-01']
+        assert coverage.bar_count == len(expected)
+        assert cache.verify_index().consistent
+
+    def test_backfill_merges_and_keeps_index_exact(self, tmp_path):
+        cache = MassiveCache(tmp_path / 'cache')
+        bars = make_bars(datetime(2024, 1, 1, tzinfo=timezone.utc), 40)
+        cache.store_bars('AAPL', bars[10:30])
+        cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31))
+        cache.store_bars('AAPL', bars[:15] + bars[25:])
+
+        assert cache.load_bars('AAPL', date(2024, 1, 1), date(2024, 1, 31)) == bars
+        assert cache.get_coverage('AAPL')['2024-01'].bar_count == 40
+        assert cache.verify_index().consistent
@@ -0,0 +1,331 @@
+"""Tests for the concurrent Massive prefetcher against a local rate-limited HTTP stub."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+from urllib.request import urlopen
+
+import pytest
+
+from aistock.data import Bar
+from aistock.providers.cache import MassiveCache
+from aistock.providers.massive import MassiveConfig, MassiveDataProvider, RateLimiter
+from aistock.providers.prefetch import MassivePrefetcher, PrefetchChunk, plan_prefetch
+
+BARS_PER_DAY = 3
+
+
+class AggsStub(ThreadingHTTPServer):
+    """Serves /v2/aggs like Massive, answering 429 when the sliding-window limit is exceeded."""
+
+    daemon_threads = True
+    request_queue_size = 64  # The default backlog of 5 delays concurrent connects by a SYN retry
+
+    def __init__(self, max_calls: int, window_seconds: float, latency: float = 0.0, page_size: int = 50000) -> None:
+        super().__init__(('127.0.0.1', 0), _AggsHandler)
+        self.max_calls = max_calls
+        self.window_seconds = window_seconds
+        self.latency = latency
+        self.page_size = page_size
+        self.failing_symbols: set[str] = set()
+        self.empty_symbols: set[str] = set()
+        self.requests: list[tuple[str, str]] = []
+        self.rejected = 0
+        self._arrivals: deque[float] = deque()
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def admit(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            while self._arrivals and now - self._arrivals[0] >= self.window_seconds:
+                self._arrivals.popleft()
+            if len(self._arrivals) >= self.max_calls:
+                self.rejected += 1
+                return False
+            self._arrivals.append(now)
+            return True
+
+
+def _parse_bound(value: str, end: bool) -> int:
+    if value.isdigit():
+        return int(value)
+    day = date.fromisoformat(value)
+    moment = datetime(day.year, day.month, day.day, tzinfo=timezone.utc) + (timedelta(days=1) if end else timedelta())
+    return int(moment.timestamp() * 1000) - (1 if end else 0)
+
+
+def _synthetic_aggs(from_ms: int, to_ms: int) -> list[dict[str, Any]]:
+    results: list[dict[str, Any]] = []
+    day = datetime.fromtimestamp(from_ms / 1000, tz=timezone.utc).date()
+    last = datetime.fromtimestamp(to_ms / 1000, tz=timezone.utc).date()
+    while day <= last:
+        if day.weekday() < 5:
+            for minute in range(BARS_PER_DAY):
+                ts = int(datetime(day.year, day.month, day.day, 15, minute, tzinfo=timezone.utc).timestamp() * 1000)
+                if from_ms <= ts <= to_ms:
+                    price = 100 + day.day + minute / 10
+                    results.append({'t': ts, 'o': price, 'h': price + 1, 'l': price - 1, 'c': price, 'v': 1000})
+        day += timedelta(days=1)
+    return results
+
+
+class _AggsHandler(BaseHTTPRequestHandler):
+    server: AggsStub
+
+    def do_GET(self) -> None:  # noqa: N802
+        stub = self.server
+        url = urlparse(self.path)
+        if url.path.startswith('/_'):
+            self._control(url.path, parse_qs(url.query))
+            return
+        parts = url.path.strip('/').split('/')
+        # v2/aggs/ticker/{ticker}/range/{multiplier}/{timespan}/{from}/{to}
+        symbol, from_, to = parts[3], parts[7], parts[8]
+        if not stub.admit():
+            self._send(429, {'status': 'ERROR', 'error': 'rate limited'})
+            return
+        time.sleep(stub.latency)
+        with stub._lock:
+            stub.requests.append((symbol, from_))
+        if symbol in stub.failing_symbols:
+            self._send(500, {'status': 'ERROR'})
+            return
+        aggs = (
+            []
+            if symbol in stub.empty_symbols
+            else _synthetic_aggs(_parse_bound(from_, end=False), _parse_bound(to, end=True))
+        )
+        limit = min(int(parse_qs(url.query).get('limit', ['50000'])[0]), stub.page_size)
+        payload: dict[str, Any] = {'status': 'OK', 'results': aggs[:limit]}
+        if len(aggs) > limit:
+            payload['next_url'] = f'{stub.base_url}{url.path}?cursor=next'
+        self._send(200, payload)
+
+    def _control(self, path: str, query: dict[str, list[str]]) -> None:
+        stub = self.server
+        with stub._lock:
+            if path == '/_fail':
+                stub.failing_symbols = set(query.get('symbol', []))
+            elif path == '/_empty':
+                stub.empty_symbols = set(query.get('symbol', []))
+            elif path == '/_reset':
+                stub.requests.clear()
+            self._send(200, {'rejected': stub.rejected, 'requests': stub.requests})
+
+    def _send(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def _serve(ready: Any, kwargs: dict[str, Any]) -> None:
+    server = AggsStub(**kwargs)
+    ready.put(server.server_address[1])
+    server.serve_forever()
+
+
+class StubProcess:
+    """The stub in its own process, so its clock is not skewed by our threads holding the GIL."""
+
+    def __init__(self, **kwargs: Any) -> None:
+        ready: Any = multiprocessing.Queue()
+        self._process = multiprocessing.Process(target=_serve, args=(ready, kwargs), daemon=True)
+        self._process.start()
+        self.base_url = f'http://127.0.0.1:{ready.get(timeout=30)}'
+
+    def _control(self, path: str) -> dict[str, Any]:
+        with urlopen(f'{self.base_url}{path}') as response:
+            return json.loads(response.read())
+
+    @property
+    def rejected(self) -> int:
+        return self._control('/_stats')['rejected']
+
+    @property
+    def requests(self) -> list[tuple[str, str]]:
+        return [tuple(request) for request in self._control('/_stats')['requests']]
+
+    def fail(self, *symbols: str) -> None:
+        self._control('/_fail?' + '&'.join(f'symbol={symbol}' for symbol in symbols))
+
+    def empty(self, *symbols: str) -> None:
+        self._control('/_empty?' + '&'.join(f'symbol={symbol}' for symbol in symbols))
+
+    def reset(self) -> None:
+        self._control('/_reset')
+
+    def stop(self) -> None:
+        self._process.terminate()
+        self._process.join()
+
+
+@pytest.fixture
+def stub_factory() -> Iterator[Any]:
+    stubs: list[StubProcess] = []
+
+    def start(**kwargs: Any) -> StubProcess:
+        stub = StubProcess(**kwargs)
+        stubs.append(stub)
+        return stub
+
+    yield start
+    for stub in stubs:
+        stub.stop()
+
+
+def _client(stub: StubProcess) -> Any:
+    from massive import RESTClient
+
+    return RESTClient(api_key='test', base=stub.base_url, retries=0)
+
+
+def _months(cache: MassiveCache, symbol: str, start: date, end: date) -> int:
+    return len(cache.load_bars(symbol, start, end))
+
+
+class TestPlanPrefetch:
+    def test_months_earliest_first_and_cached_months_skipped(self, tmp_path) -> None:
+        cache = MassiveCache(tmp_path / 'cache')
+        ts = datetime(2024, 2, 5, 15, 0, tzinfo=timezone.utc)
+        price = Decimal('100')
+        cache.store_bars('MSFT', [Bar('MSFT', ts, price, price, price, price, 1)])
+
+        plan = plan_prefetch(cache, ['MSFT', 'AAPL'], date(2024, 1, 15), date(2024, 3, 10))
+
+        assert plan == [
+            PrefetchChunk('MSFT', date(2024, 1, 1), date(2024, 1, 31)),
+            PrefetchChunk('AAPL', date(2024, 1, 1), date(2024, 1, 31)),
+            PrefetchChunk('AAPL', date(2024, 2, 1), date(2024, 2, 29)),
+            PrefetchChunk('MSFT', date(2024, 3, 1), date(2024, 3, 10)),
+            PrefetchChunk('AAPL', date(2024, 3, 1), date(2024, 3, 10)),
+        ]
+
+    def test_without_cache_plans_cached_months(self, tmp_path) -> None:
+        cache = MassiveCache(tmp_path / 'cache')
+        ts = datetime(2024, 2, 5, 15, 0, tzinfo=timezone.utc)
+        price = Decimal('100')
+        cache.store_bars('MSFT', [Bar('MSFT', ts, price, price, price, price, 1)])
+
+        plan = plan_prefetch(cache, ['MSFT'], date(2024, 1, 15), date(2024, 3, 10), use_cache=False)
+
+        assert plan == [
+            PrefetchChunk('MSFT', date(2024, 1, 15), date(2024, 1, 31)),
+            PrefetchChunk('MSFT', date(2024, 2, 1), date(2024, 2, 29)),
+            PrefetchChunk('MSFT', date(2024, 3, 1), date(2024, 3, 10)),
+        ]
+
+
+class TestMassivePrefetcher:
+    def test_saturates_rate_limit_without_violations(self, stub_factory, tmp_path) -> None:
+        stub = stub_factory(max_calls=20, window_seconds=1.0, latency=0.1)
+        cache = MassiveCache(tmp_path / 'cache')
+        limiter = RateLimiter(max_calls=20, window_seconds=1, safety_margin_seconds=0.1)
+        prefetcher = MassivePrefetcher(_client(stub), cache, limiter, workers=8, max_retries=0)
+        symbols = ['AAPL', 'MSFT', 'NVDA', 'AMZN', 'META']
+
+        report = prefetcher.run(symbols, date(2023, 1, 1), date(2023, 12, 31))
+
+        assert report.success
+        assert report.chunks_planned == report.chunks_completed == 60
+        assert report.api_calls == 60
+        assert stub.rejected == 0
+        # 60 calls at 20/s: two full waits plus request latency. One request at
+        # a time would need at least 60 * 0.1s.
+        assert report.elapsed_seconds < 4.0
+        assert report.calls_per_minute > 0.6 * 20 * 60
+        for symbol in symbols:
+            assert _months(cache, symbol, date(2023, 1, 1), date(2023, 12, 31)) == 260 * BARS_PER_DAY
+
+    def test_follows_truncated_pages(self, stub_factory, tmp_path) -> None:
+        stub = stub_factory(max_calls=100, window_seconds=1.0, page_size=25)
+        cache = MassiveCache(tmp_path / 'cache')
+        prefetcher = MassivePrefetcher(_client(stub), cache, RateLimiter(100, 1, 0.0), workers=2, max_retries=0)
+
+        report = prefetcher.run(['AAPL'], date(2024, 1, 1), date(2024, 1, 31))
+
+        assert report.bars_stored == 23 * BARS_PER_DAY
+        assert report.api_calls == len(stub.requests) == 3
+        assert _months(cache, 'AAPL', date(2024, 1, 1), date(2024, 1, 31)) == 23 * BARS_PER_DAY
+
+    def test_resumes_only_missing_months(self, stub_factory, tmp_path) -> None:
+        stub = stub_factory(max_calls=100, window_seconds=1.0)
+        stub.fail('MSFT')
+        cache = MassiveCache(tmp_path / 'cache')
+        prefetcher = MassivePrefetcher(_client(stub), cache, RateLimiter(100, 1, 0.0), workers=4, max_retries=0)
+
+        first = prefetcher.run(['AAPL', 'MSFT'], date(2024, 1, 1), date(2024, 3, 31))
+        assert first.failed_symbols == ['MSFT']
+        assert len(first.errors['MSFT']) == 3
+        assert first.chunks_completed == 3
+
+        stub.fail()
+        stub.reset()
+        second = prefetcher.run(['AAPL', 'MSFT'], date(2024, 1, 1), date(2024, 3, 31))
+
+        assert second.success
+        assert second.cached_symbols == ['AAPL']
+        assert sorted(stub.requests) == [('MSFT', '2024-01-01'), ('MSFT', '2024-02-01'), ('MSFT', '2024-03-01')]
+
+    def test_empty_months_are_not_requested_again(self, stub_factory, tmp_path) -> None:
+        stub = stub_factory(max_calls=100, window_seconds=1.0)
+        stub.empty('NEWCO')
+        cache = MassiveCache(tmp_path / 'cache')
+        prefetcher = MassivePrefetcher(_client(stub), cache, RateLimiter(100, 1, 0.0), workers=2, max_retries=0)
+
+        # Only whole months that have ended are recorded; the partial March is asked for again
+        first = prefetcher.run(['NEWCO'], date(2024, 1, 1), date(2024, 3, 15))
+        assert first.success
+        assert first.chunks_completed == 3
+        assert sorted(cache.get_coverage('NEWCO')) == ['2024-01', '2024-02']
+
+        stub.reset()
+        second = prefetcher.run(['NEWCO'], date(2024, 1, 1), date(2024, 3, 15))
+        assert second.api_calls == 1
+        assert stub.requests == [('NEWCO', '2024-03-01')]
+
+    def test_provider_prefetch_without_cache_refetches(self, stub_factory, tmp_path) -> None:
+        stub = stub_factory(max_calls=100, window_seconds=1.0)
+        config = MassiveConfig(api_key='test', cache_dir=str(tmp_path / 'cache'), api_base_url=stub.base_url)
+        provider = MassiveDataProvider(config)
+        assert provider.prefetch(['AAPL'], date(2024, 1, 1), date(2024, 2, 29)).api_calls == 2
+
+        assert provider.estimate_fetch_time(['AAPL'], date(2024, 1, 1), date(2024, 2, 29))['estimated_api_calls'] == 0
+        estimate = provider.estimate_fetch_time(['AAPL'], date(2024, 1, 1), date(2024, 2, 29), use_cache=False)
+        assert estimate['estimated_api_calls'] == 2
+        report = provider.prefetch(['AAPL'], date(2024, 1, 1), date(2024, 2, 29), use_cache=False)
+
+        assert report.success
+        assert report.api_calls == 2
+        assert _months(provider._get_cache(), 'AAPL', date(2024, 1, 1), date(2024, 2, 29)) == 44 * BARS_PER_DAY
+
+    def test_provider_prefetch_uses_shared_limiter(self, stub_factory, tmp_path) -> None:
+        stub = stub_factory(max_calls=5, window_seconds=60.0)
+        config = MassiveConfig(api_key='test', cache_dir=str(tmp_path / 'cache'), api_base_url=stub.base_url)
+        provider = MassiveDataProvider(config)
+
+        report = provider.prefetch(['AAPL', 'MSFT'], date(2024, 1, 1), date(2024, 2, 29))
+
+        assert report.success
+        assert report.api_calls == 4
+        assert provider.get_rate_limiter_stats()['total_calls'] == 4
+        assert provider.prefetch(['AAPL', 'MSFT'], date(2024, 1, 1), date(2024, 2, 29)).api_calls == 0
@@ -0,0 +1,149 @@
+"""Tests for the columnar BarFrame bar container."""
+
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from aistock.data import Bar, BarFrame, datetime_to_ns, ns_to_datetime
+
+
+def _bars(count: int = 10, symbol: str = 'AAPL') -> list[Bar]:
+    base = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+    bars = []
+    for i in range(count):
+        close = Decimal('100.25') + Decimal(i) / Decimal('100')
+        bars.append(
+            Bar(
+                symbol=symbol,
+                timestamp=base + timedelta(minutes=i),
+                open=close - Decimal('0.05'),
+                high=close + Decimal('0.10'),
+                low=close - Decimal('0.10'),
+                close=close,
+                volume=1_000 + i,
+            )
+        )
+    return bars
+
+
+class TestTimestampConversion:
+    """Epoch-nanosecond helpers."""
+
+    def test_roundtrip_preserves_microseconds(self):
+        moment = datetime(2024, 6, 3, 13, 45, 7, 123456, tzinfo=timezone.utc)
+        assert ns_to_datetime(datetime_to_ns(moment)) == moment
+
+    def test_naive_is_treated_as_utc(self):
+        naive = datetime(2024, 6, 3, 13, 45)
+        assert datetime_to_ns(naive) == datetime_to_ns(naive.replace(tzinfo=timezone.utc))
+        assert ns_to_datetime(datetime_to_ns(naive), tz=None) == naive
+
+
+class TestBarFrameConversion:
+    """Converters to and from list[Bar]."""
+
+    @pytest.mark.parametrize('price_scale', [None, 10_000])
+    def test_roundtrip_equals_source_bars(self, price_scale):
+        bars = _bars()
+        frame = BarFrame.from_bars(bars, price_scale=price_scale)
+        assert len(frame) == len(bars)
+        assert frame.to_bars() == bars
+        assert list(frame) == bars
+
+    def test_fixed_point_keeps_decimals_exact(self):
+        bars = _bars()
+        frame = BarFrame.from_bars(bars, price_scale=10_000)
+        assert frame.close.dtype == np.int64
+        assert frame[3].close == bars[3].close
+        assert str(frame[3].close) == '100.28'
+
+    def test_float_columns(self):
+        frame = BarFrame.from_bars(_bars())
+        assert frame.timestamps.dtype == np.int64
+        assert frame.close.dtype == np.float64
+        assert frame.volume.dtype == np.int64
+        assert frame.prices('close') is frame.close
+        np.testing.assert_allclose(BarFrame.from_bars(_bars(), price_scale=100).prices('close'), frame.close)
+
+    @pytest.mark.parametrize(('source', 'target'), [(None, 10_000), (100, 10_000), (10_000, 100), (10_000, None)])
+    def test_frame_input_is_rescaled(self, source, target):
+        bars = _bars()
+        frame = BarFrame.from_bars(bars, price_scale=source)
+        # from_bars only rescales when given a scale; back to float64 is with_price_scale(None)
+        rescaled = frame.with_price_scale(target) if target is None else BarFrame.from_bars(frame, price_scale=target)
+        expected = BarFrame.from_bars(bars, price_scale=target)
+
+        assert rescaled.price_scale == target
+        for name in ('open', 'high', 'low', 'close'):
+            np.testing.assert_array_equal(getattr(rescaled, name), getattr(expected, name))
+        assert rescaled.timestamps is frame.timestamps
+        assert BarFrame.from_bars(frame) is frame
+        assert frame.with_price_scale(source) is frame
+
+    def test_rescale_rounds_and_checks_overflow(self):
+        frame = BarFrame.from_bars(_bars(), price_scale=10_000)
+        assert frame.with_price_scale(10).to_bars()[3].close == Decimal('100.3')
+        with pytest.raises(ValueError):
+            frame.with_price_scale(10**18)
+        with pytest.raises(ValueError):
+            frame.with_price_scale(0)
+
+    def test_empty_frame_needs_symbol(self):
+        with pytest.raises(ValueError):
+            BarFrame.from_bars([])
+        assert len(BarFrame.from_bars([], symbol='AAPL')) == 0
+
+
+class TestBarFrameViews:
+    """Slicing shares buffers and indexing builds bars lazily."""
+
+    def test_slice_is_zero_copy(self):
+        frame = BarFrame.from_bars(_bars(20))
+        window = frame[-5:]
+        assert isinstance(window, BarFrame)
+        assert np.shares_memory(window.close, frame.close)
+        assert window[0] == frame[15]
+        assert window[-1] == frame[19]
+
+    def test_index_out_of_range(self):
+        frame = BarFrame.from_bars(_bars(3))
+        with pytest.raises(IndexError):
+            frame[3]
+
+    def test_between_uses_timestamps(self):
+        bars = _bars(10)
+        frame = BarFrame.from_bars(bars)
+        window = frame.between(bars[2].timestamp, bars[5].timestamp)
+        assert window.to_bars() == bars[2:5]
+
+    def test_nbytes_is_columnar(self):
+        frame = BarFrame.from_bars(_bars(100))
+        assert frame.nbytes == 100 * 6 * 8
+
+
+class TestBarFrameValidation:
+    """Vectorized equivalent of Bar validation."""
+
+    def _arrays(self):
+        frame = BarFrame.from_bars(_bars(5))
+        return [frame.timestamps, frame.open.copy(), frame.high.copy(), frame.low.copy(), frame.close.copy()]
+
+    def test_high_below_low_rejected(self):
+        ts, open_, high, low, close = self._arrays()
+        high[2] = low[2] - 1.0
+        with pytest.raises(ValueError, match='row 2'):
+            BarFrame('AAPL', ts, open_, high, low, close, np.ones(5, dtype=np.int64))
+
+    def test_negative_volume_rejected(self):
+        ts, open_, high, low, close = self._arrays()
+        volume = np.ones(5, dtype=np.int64)
+        volume[4] = -1
+        with pytest.raises(ValueError, match='Volume cannot be negative'):
+            BarFrame('AAPL', ts, open_, high, low, close, volume)
+
+    def test_wrong_dtype_rejected(self):
+        ts, open_, high, low, close = self._arrays()
+        with pytest.raises(ValueError, match='volume'):
+            BarFrame('AAPL', ts, open_, high, low, close, np.ones(5, dtype=np.float64))  # type: ignore[arg-type]
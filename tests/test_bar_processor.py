@@ -0,0 +1,83 @@
+"""Tests for BarProcessor's snapshot history views and copy-on-write prices."""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+
+from aistock.data import Bar
+from aistock.session.bar_processor import BarProcessor
+
+START = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def _feed(processor: BarProcessor, symbol: str, count: int, first: int = 0) -> None:
+    for i in range(first, first + count):
+        price = 100 + i
+        processor.process_bar(START + timedelta(minutes=i), symbol, price, price, price, price, 1000)
+
+
+def _closes(history: Sequence[Bar]) -> list[int]:
+    return [int(bar.close) for bar in history]
+
+
+class TestHistoryViews:
+    """Views behave like the list copies they replace and never change once taken."""
+
+    def test_view_is_bounded_and_list_like(self) -> None:
+        processor = BarProcessor(warmup_bars=2)
+        _feed(processor, 'AAPL', 25)
+
+        history = processor.get_history('AAPL')
+        assert len(history) == processor.max_history == 10
+        assert _closes(history) == list(range(115, 125))
+        assert history[0].close == Decimal(115)
+        assert history[-1].close == Decimal(124)
+        assert _closes(history[-3:]) == [122, 123, 124]
+        assert _closes(history[::4]) == [115, 119, 123]
+        assert history[-3:] == list(history)[-3:]
+        assert history == list(history)
+        with pytest.raises(IndexError):
+            history[10]
+
+    def test_view_is_unaffected_by_later_bars(self) -> None:
+        processor = BarProcessor(warmup_bars=2)
+        _feed(processor, 'AAPL', 10)
+        snapshot = processor.get_history('AAPL')
+        expected = list(snapshot)
+
+        # Enough bars to roll the buffer over to new generations several times
+        _feed(processor, 'AAPL', 45, first=10)
+        assert list(snapshot) == expected
+        latest = processor.get_history('AAPL')
+        assert _closes(latest) == list(range(145, 155))
+        assert latest.generation > snapshot.generation
+
+    def test_unknown_symbol_is_empty(self) -> None:
+        processor = BarProcessor()
+        history = processor.get_history('MSFT')
+        assert not history
+        assert list(history) == []
+
+
+class TestPriceSnapshots:
+    """get_all_prices shares one dict until the next update copies it."""
+
+    def test_snapshot_is_shared_until_written(self) -> None:
+        processor = BarProcessor()
+        _feed(processor, 'AAPL', 1)
+        _feed(processor, 'MSFT', 1)
+
+        first = processor.get_all_prices()
+        assert processor.get_all_prices() is first
+        assert first == {'AAPL': Decimal(100), 'MSFT': Decimal(100)}
+
+        processor.update_price('AAPL', Decimal('101.5'))
+        assert first['AAPL'] == Decimal(100)
+        second = processor.get_all_prices()
+        assert second is not first
+        assert second['AAPL'] == Decimal('101.5')
+        assert processor.get_last_price('AAPL') == Decimal('101.5')
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import time
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any
@@ -308,3 +309,147 @@ def test_max_holding_period_forces_exit(tmp_path) -> None:
     coordinator.process_bar(bar)
 
     assert portfolio.get_position('AAPL') == Decimal('0')
+
+
+class _BatchDecisionEngineStub(_DecisionEngineNoTrade):
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+        self.single_calls: list[str] = []
+
+    def evaluate_opportunity(self, symbol: str, bars: list[Bar], last_prices: dict[str, Decimal]) -> dict[str, Any]:
+        self.single_calls.append(symbol)
+        return {'should_trade': False, 'action': {}}
+
+    def evaluate_batch(
+        self, histories: dict[str, list[Bar]], last_prices: dict[str, Decimal]
+    ) -> dict[str, dict[str, Any]]:
+        self.batches.append(list(histories))
+        return {symbol: {'should_trade': False, 'action': {}} for symbol in histories}
+
+
+def _batch_coordinator(tmp_path, engine: _BatchDecisionEngineStub, group_timeout: float = 2.0) -> TradingCoordinator:
+    checkpoint_dir = tmp_path / 'state'
+    symbols = ('AAPL', 'MSFT', 'NVDA')
+    data = DataSource(path=str(tmp_path), timezone=timezone.utc, symbols=symbols, enforce_trading_hours=False)
+    engine_config = EngineConfig(strategy=StrategyConfig(), initial_equity=10000.0)
+    execution = ExecutionConfig(slip_bps_limit=0.0, partial_fill_probability=0.0)
+    broker_config = BrokerConfig(backend='paper', ib_decision_group_timeout=group_timeout)
+    config = BacktestConfig(data=data, engine=engine_config, execution=execution, broker=broker_config)
+
+    portfolio = Portfolio(cash=Decimal('10000'))
+    risk_engine = RiskEngine(
+        engine_config.risk, portfolio, bar_interval=timedelta(minutes=1), minimum_balance_enabled=False
+    )
+    broker = PaperBroker(execution)
+    coordinator = TradingCoordinator(
+        config=config,
+        portfolio=portfolio,
+        risk_engine=risk_engine,
+        decision_engine=engine,
+        broker=broker,
+        bar_processor=BarProcessor(timeframe_manager=None, warmup_bars=50),
+        reconciler=PositionReconciler(portfolio, broker, risk_engine, interval_minutes=999999),
+        checkpointer=_NoopCheckpointer(),
+        analytics=AnalyticsReporter(portfolio, str(checkpoint_dir)),
+        capital_manager=CompoundingStrategy(),
+        stop_controller=StopController(StopConfig(enable_eod_flatten=False)),
+        symbols=list(symbols),
+        checkpoint_dir=str(checkpoint_dir),
+    )
+    coordinator.start()
+    return coordinator
+
+
+def _flat_bar(symbol: str, ts: datetime) -> Bar:
+    price = Decimal('100')
+    return Bar(symbol=symbol, timestamp=ts, open=price, high=price, low=price, close=price, volume=1_000)
+
+
+def test_process_bars_evaluates_timestamp_group_in_one_batch(tmp_path) -> None:
+    engine = _BatchDecisionEngineStub()
+    coordinator = _batch_coordinator(tmp_path, engine)
+    ts = datetime(2025, 1, 1, 14, 30, tzinfo=timezone.utc)
+
+    coordinator.process_bars([_flat_bar(symbol, ts) for symbol in ('AAPL', 'MSFT', 'NVDA')])
+    coordinator.process_bar(_flat_bar('AAPL', ts + timedelta(minutes=1)))
+
+    assert engine.batches == [['AAPL', 'MSFT', 'NVDA']]
+    assert engine.single_calls == ['AAPL']
+
+
+def test_realtime_decision_bars_are_grouped_by_bucket(tmp_path) -> None:
+    engine = _BatchDecisionEngineStub()
+    coordinator = _batch_coordinator(tmp_path, engine)
+    ts = datetime(2025, 1, 1, 14, 30, tzinfo=timezone.utc)
+    next_ts = ts + timedelta(minutes=1)
+
+    coordinator._queue_decision_bar(_flat_bar('AAPL', ts))
+    coordinator._queue_decision_bar(_flat_bar('MSFT', ts))
+    assert engine.batches == [] and engine.single_calls == []
+
+    coordinator._queue_decision_bar(_flat_bar('NVDA', ts))
+    assert engine.batches == [['AAPL', 'MSFT', 'NVDA']]
+
+    # An incomplete group is released once any symbol moves on to a later bucket.
+    coordinator._queue_decision_bar(_flat_bar('AAPL', next_ts))
+    coordinator._queue_decision_bar(_flat_bar('MSFT', next_ts))
+    coordinator._queue_decision_bar(_flat_bar('AAPL', next_ts + timedelta(minutes=1)))
+    assert engine.batches[-1] == ['AAPL', 'MSFT']
+
+    # A straggler for an already released bucket is processed on its own.
+    coordinator._queue_decision_bar(_flat_bar('NVDA', next_ts))
+    assert engine.single_calls == ['NVDA']
+
+
+def test_incomplete_decision_group_is_released_at_its_deadline(tmp_path) -> None:
+    engine = _BatchDecisionEngineStub()
+    coordinator = _batch_coordinator(tmp_path, engine, group_timeout=0.05)
+    ts = datetime(2025, 1, 1, 14, 30, tzinfo=timezone.utc)
+
+    # NVDA's subscription lags: the other symbols are decided without it, before the next bucket starts.
+    coordinator._queue_decision_bar(_flat_bar('AAPL', ts))
+    coordinator._queue_decision_bar(_flat_bar('MSFT', ts))
+    deadline = time.monotonic() + 5.0
+    while not engine.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert engine.batches == [['AAPL', 'MSFT']]
+
+    coordinator._queue_decision_bar(_flat_bar('NVDA', ts))
+    assert engine.single_calls == ['NVDA']
+
+    # A complete group is released at once and its deadline cancelled.
+    next_ts = ts + timedelta(minutes=1)
+    for symbol in ('AAPL', 'MSFT', 'NVDA'):
+        coordinator._queue_decision_bar(_flat_bar(symbol, next_ts))
+    time.sleep(0.1)
+    assert engine.batches == [['AAPL', 'MSFT'], ['AAPL', 'MSFT', 'NVDA']]
+    assert coordinator._group_deadlines == {}
+
+
+def test_halted_symbol_only_delays_the_first_group_it_misses(tmp_path) -> None:
+    engine = _BatchDecisionEngineStub()
+    coordinator = _batch_coordinator(tmp_path, engine, group_timeout=0.05)
+    ts = datetime(2025, 1, 1, 14, 30, tzinfo=timezone.utc)
+
+    # NVDA is halted: its first missed bucket waits for the deadline ...
+    coordinator._queue_decision_bar(_flat_bar('AAPL', ts))
+    coordinator._queue_decision_bar(_flat_bar('MSFT', ts))
+    deadline = time.monotonic() + 5.0
+    while not engine.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert engine.batches == [['AAPL', 'MSFT']]
+
+    # ... later buckets are released as soon as the other symbols have closed them.
+    for minute in range(1, 4):
+        coordinator._queue_decision_bar(_flat_bar('AAPL', ts + timedelta(minutes=minute)))
+        coordinator._queue_decision_bar(_flat_bar('MSFT', ts + timedelta(minutes=minute)))
+        assert engine.batches == [['AAPL', 'MSFT']] * (minute + 1)
+
+    # Once NVDA delivers a bar again, groups wait for it.
+    resumed = ts + timedelta(minutes=4)
+    coordinator._queue_decision_bar(_flat_bar('NVDA', resumed))
+    coordinator._queue_decision_bar(_flat_bar('AAPL', resumed))
+    assert len(engine.batches) == 4
+    coordinator._queue_decision_bar(_flat_bar('MSFT', resumed))
+    assert engine.batches[-1] == ['NVDA', 'AAPL', 'MSFT']
+    assert coordinator._group_deadlines == {}
@@ -208,28 +208,29 @@ class TestTimeframeStateRaceRegression:
     self.bars without protection (timeframes.py:191). Concurrent IBKR callbacks
     can mutate the list mid-read.
 
-    NOTE: This fix is verified by code inspection. The change at timeframes.py:191-195
-    now acquires the lock and makes a copy before processing bars.
+    NOTE: This fix is verified by code inspection. add_bar() now appends the bar
+    and updates the timeframe state from the series' running sums in one
+    locked section.
     """
 
     def test_fix_verified_by_code_inspection(self):
         """Verify the fix is in place by checking the code was modified."""
-        # The fix adds:
+        # The fix holds the lock across append and state update:
         #   with self._lock:
-        #       bars = self.bars[symbol][timeframe].copy()
+        #       ...
+        #       series.append(bar)
+        #       state = series.state()
         #
         # This is verified by reading the source file
         from pathlib import Path
 
         timeframes_path = Path('aistock/timeframes.py')
         source = timeframes_path.read_text()
-        # Updated assertion to match new comment
-        assert (
-            'CRITICAL FIX: Keep lock held through state calculations' in source
-            or 'Hold lock for entire state update' in source
-        )
-        assert 'with self._lock:' in source
-        assert 'bars = self.bars[symbol][timeframe].copy()' in source
+        assert 'CRITICAL FIX: Keep lock held through state calculations' in source
+        locked = source.split('CRITICAL FIX: Keep lock held through state calculations', 1)[1]
+        locked = locked.split('def ', 1)[0]
+        assert 'with self._lock:' in locked
+        assert locked.index('series.append(bar)') < locked.index('state = series.state()')
 
 
 class TestNaiveTimestampCoercionRegression:
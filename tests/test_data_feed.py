@@ -1,8 +1,10 @@
 import unittest
+from collections.abc import Iterator
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
+from itertools import islice
 
-from aistock.data import Bar, DataFeed
+from aistock.data import Bar, BarFrame, DataFeed, merge_bar_streams
 
 
 class DataFeedTests(unittest.TestCase):
@@ -59,6 +61,55 @@ class DataFeedTests(unittest.TestCase):
         events = [evt for evt in feed.iter_stream() if evt[1] == 'MSFT' and evt[0] == self.t1]
         self.assertFalse(events)
 
+    def test_same_timestamp_follows_symbol_order(self):
+        bars = {
+            'MSFT': [self._bar('MSFT', self.t1, '201'), self._bar('MSFT', self.t2, '202')],
+            'AAPL': [self._bar('AAPL', self.t0, '100'), self._bar('AAPL', self.t1, '101')],
+        }
+        events = [(ts, symbol) for ts, symbol, _ in DataFeed(bars).iter_stream()]
+        self.assertEqual(
+            events,
+            [(self.t0, 'AAPL'), (self.t1, 'MSFT'), (self.t1, 'AAPL'), (self.t2, 'MSFT')],
+        )
+
+    def test_forward_fill_continues_after_symbol_ends(self):
+        bars = {
+            'AAPL': [self._bar('AAPL', self.t0, '100')],
+            'MSFT': [self._bar('MSFT', self.t1, '201'), self._bar('MSFT', self.t2, '202')],
+        }
+        feed = DataFeed(bars, fill_missing=True)
+        events = [(ts, symbol, bar.close, bar.volume) for ts, symbol, bar in feed.iter_stream()]
+        self.assertEqual(
+            events,
+            [
+                (self.t0, 'AAPL', Decimal('100'), 1000),
+                (self.t1, 'AAPL', Decimal('100'), 0),
+                (self.t1, 'MSFT', Decimal('201'), 1000),
+                (self.t2, 'AAPL', Decimal('100'), 0),
+                (self.t2, 'MSFT', Decimal('202'), 1000),
+            ],
+        )
+
+    def test_generator_sources_are_pulled_lazily(self):
+        pulled = {'AAPL': 0, 'MSFT': 0}
+
+        def stream(symbol: str, price: str) -> Iterator[Bar]:
+            for minute in range(1_000):
+                pulled[symbol] += 1
+                yield self._bar(symbol, self.t0 + timedelta(minutes=minute), price)
+
+        streams = {'AAPL': stream('AAPL', '100'), 'MSFT': stream('MSFT', '200')}
+        events = list(islice(merge_bar_streams(streams), 6))
+        self.assertEqual([ts for ts, _, _ in events], [self.t0, self.t0, self.t1, self.t1, self.t2, self.t2])
+        self.assertLessEqual(max(pulled.values()), 4)
+
+    def test_bar_frame_sources(self):
+        aapl = [self._bar('AAPL', self.t0, '100'), self._bar('AAPL', self.t2, '102')]
+        msft = [self._bar('MSFT', self.t1, '201')]
+        streams = {'AAPL': BarFrame.from_bars(aapl), 'MSFT': BarFrame.from_bars(msft)}
+        events = [(symbol, bar) for _, symbol, bar in merge_bar_streams(streams)]
+        self.assertEqual(events, [('AAPL', aapl[0]), ('MSFT', msft[0]), ('AAPL', aapl[1])])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,10 +1,30 @@
+import io
 import pathlib
 import tempfile
 import unittest
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import timezone
+from decimal import Decimal
+from unittest import mock
 
-from aistock.config import DataSource
-from aistock.data import load_csv_directory
+from aistock.config import DataQualityConfig, DataSource
+from aistock.data import BarFrame, load_csv_directory, load_csv_file
+
+_HEADER = 'timestamp,open,high,low,close,volume\n'
+
+
+def _write_csv(path: pathlib.Path, rows: list[str]) -> pathlib.Path:
+    path.write_text(_HEADER + ''.join(f'{row}\n' for row in rows), encoding='utf-8')
+    return path
+
+
+def _minute_rows(count: int, start_price: float = 100.0) -> list[str]:
+    rows = []
+    for i in range(count):
+        price = start_price + i * 0.25
+        rows.append(f'2024-01-01T09:{30 + i:02d}:00,{price},{price + 0.5},{price - 0.5},{price + 0.1},{1000 + i}')
+    return rows
 
 
 class DataLoaderTests(unittest.TestCase):
@@ -30,5 +50,115 @@ class DataLoaderTests(unittest.TestCase):
             self.assertEqual(float(first_bar.open), 100.0)
 
 
+class LoadCsvFileTests(unittest.TestCase):
+    def test_values_match_decimal_of_text(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_csv(pathlib.Path(tmpdir) / 'AAPL.csv', _minute_rows(5))
+            bars = load_csv_file(path, 'AAPL')
+        self.assertEqual(len(bars), 5)
+        self.assertEqual(bars[1].open, Decimal('100.25'))
+        self.assertEqual(bars[1].close, Decimal('100.35'))
+        self.assertEqual(bars[4].volume, 1004)
+        self.assertEqual([bar.timestamp for bar in bars], sorted(bar.timestamp for bar in bars))
+
+    def test_frame_matches_bars(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_csv(pathlib.Path(tmpdir) / 'AAPL.csv', _minute_rows(8))
+            bars = load_csv_file(path, 'AAPL')
+            frame = load_csv_file(path, 'AAPL', as_frame=True)
+        self.assertIsInstance(frame, BarFrame)
+        self.assertEqual(frame.to_bars(), bars)
+
+    def test_strict_raises_on_non_positive_price(self):
+        rows = _minute_rows(3)
+        rows.append('2024-01-01T09:40:00,0,1,0,1,100')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_csv(pathlib.Path(tmpdir) / 'AAPL.csv', rows)
+            with self.assertRaisesRegex(ValueError, 'Invalid bar data for AAPL at .*Invalid prices'):
+                load_csv_file(path, 'AAPL')
+
+    def test_strict_raises_on_close_outside_range(self):
+        rows = _minute_rows(3)
+        rows.append('2024-01-01T09:40:00,100,101,99,105,100')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_csv(pathlib.Path(tmpdir) / 'AAPL.csv', rows)
+            with self.assertRaisesRegex(ValueError, 'outside High/Low'):
+                load_csv_file(path, 'AAPL')
+            with redirect_stdout(io.StringIO()):
+                lenient = load_csv_file(path, 'AAPL', strict=False)
+        self.assertEqual(len(lenient), 3)
+
+    def test_skipped_rows_reported_once(self):
+        rows = _minute_rows(4)
+        rows.append('2024-01-01T09:40:00,100,99,101,100,100')  # high below low
+        rows.append('2024-01-01T09:41:00,100,101,99,100,-5')  # negative volume
+        rows.append('2024-01-01T09:42:00,abc,101,99,100,100')  # unparseable
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = _write_csv(pathlib.Path(tmpdir) / 'AAPL.csv', rows)
+            output = io.StringIO()
+            with redirect_stdout(output):
+                bars = load_csv_file(path, 'AAPL')
+        self.assertEqual(len(bars), 4)
+        lines = output.getvalue().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertIn('high below low: 1 row(s)', lines[0])
+        self.assertIn('negative volume: 1 row(s)', lines[0])
+        self.assertIn('missing or invalid values: 1 row(s)', lines[0])
+
+
+class LoadCsvDirectoryTests(unittest.TestCase):
+    def test_parallel_load_keeps_symbol_order(self):
+        symbols = ('MSFT', 'AAPL', 'NVDA')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = pathlib.Path(tmpdir)
+            for offset, symbol in enumerate(symbols):
+                _write_csv(path / f'{symbol}.csv', _minute_rows(6, start_price=50.0 + offset * 100))
+            source = DataSource(path=str(path), timezone=timezone.utc, symbols=symbols, warmup_bars=1)
+            with redirect_stdout(io.StringIO()):
+                parallel = load_csv_directory(source, max_workers=3)
+                serial = load_csv_directory(source, max_workers=1)
+                frames = load_csv_directory(source, as_frame=True, max_workers=2)
+        self.assertEqual(list(parallel), list(symbols))
+        self.assertEqual(parallel, serial)
+        self.assertEqual({symbol: frame.to_bars() for symbol, frame in frames.items()}, serial)
+
+    def test_default_loads_small_directories_in_process(self):
+        symbols = ('MSFT', 'AAPL')
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = pathlib.Path(tmpdir)
+            for symbol in symbols:
+                _write_csv(path / f'{symbol}.csv', _minute_rows(6))
+            source = DataSource(path=str(path), timezone=timezone.utc, symbols=symbols, warmup_bars=1)
+            with (
+                redirect_stdout(io.StringIO()),
+                mock.patch('aistock.data.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as pool,
+                mock.patch('os.cpu_count', return_value=2),
+            ):
+                serial = load_csv_directory(source)
+                pool.assert_not_called()
+                with mock.patch('aistock.data.PARALLEL_CSV_MIN_BYTES', 1):
+                    parallel = load_csv_directory(source)
+                pool.assert_called_once_with(max_workers=2)
+        self.assertEqual(parallel, serial)
+
+    def test_lenient_directory_skips_bad_rows_and_short_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = pathlib.Path(tmpdir)
+            rows = _minute_rows(5)
+            rows.append('2024-01-01T09:40:00,100,101,99,105,100')  # close outside range
+            _write_csv(path / 'AAPL.csv', rows)
+            _write_csv(path / 'MSFT.csv', _minute_rows(2))
+            source = DataSource(path=str(path), timezone=timezone.utc, symbols=('AAPL', 'MSFT', 'TSLA'))
+            output = io.StringIO()
+            with redirect_stdout(output):
+                data = load_csv_directory(source, DataQualityConfig(min_bars=3), max_workers=1)
+        self.assertEqual(list(data), ['AAPL'])
+        self.assertEqual(len(data['AAPL']), 5)
+        text = output.getvalue()
+        self.assertIn('open/close outside high/low: 1 row(s)', text)
+        self.assertIn('Insufficient bars for MSFT', text)
+        self.assertIn('Data file not found for TSLA', text)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,272 @@
+"""Tests for the incremental per-symbol indicator state used by FSDEngine."""
+
+import math
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from aistock.data import Bar
+from aistock.fsd import FSDConfig, FSDEngine
+from aistock.indicators import RollingWindow, SymbolIndicatorState
+from aistock.portfolio import Portfolio
+
+
+def _make_bars(count: int, seed: int = 7, symbol: str = 'AAPL', flat_from: int | None = None) -> list[Bar]:
+    rng = random.Random(seed)
+    base_time = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+    price = 100.0
+    bars = []
+    for i in range(count):
+        if flat_from is None or i < flat_from:
+            price = max(1.0, price * (1.0 + rng.gauss(0.0, 0.015)))
+        close = Decimal(str(round(price, 2)))
+        bars.append(
+            Bar(
+                symbol=symbol,
+                timestamp=base_time + timedelta(minutes=i),
+                open=close,
+                high=close + Decimal('0.50'),
+                low=close - Decimal('0.50'),
+                close=close,
+                volume=rng.randint(500, 5000),
+            )
+        )
+    return bars
+
+
+# Reference implementations: the list/NumPy computations the incremental state replaced.
+
+
+def _reference_rsi(closes: list[float], period: int = 14) -> float | None:
+    """Wilder RSI over the whole series: simple-average seed, then Wilder smoothing."""
+    if len(closes) < period + 1:
+        return None
+    deltas = np.diff(np.array(closes, dtype=float))
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    avg_gain = float(gains[:period].mean())
+    avg_loss = float(losses[:period].mean())
+    for gain, loss in zip(gains[period:], losses[period:]):
+        avg_gain = (avg_gain * (period - 1) + gain) / period
+        avg_loss = (avg_loss * (period - 1) + loss) / period
+    if avg_loss == 0:
+        return 100.0
+    return 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+
+# Wilder's RSI worked example as published by StockCharts: 33 closes and the RSI from the 15th on.
+WILDER_CLOSES = [
+    44.3389, 44.0902, 44.1497, 43.6124, 44.2779, 44.9966, 45.1018, 45.4263, 45.8312, 46.0826, 45.8937,
+    46.0328, 45.614, 46.282, 46.282, 46.0028, 46.0328, 46.4116, 46.2222, 45.6439, 46.2122, 46.2521,
+    45.7137, 46.4515, 45.7835, 45.3548, 44.0288, 44.1783, 44.2181, 44.5672, 43.4205, 42.6628, 43.1314,
+]  # fmt: skip
+WILDER_RSI = [
+    70.53, 66.32, 66.55, 69.41, 66.36, 57.97, 62.93, 63.26, 56.06, 62.38,
+    54.71, 50.42, 39.99, 41.46, 41.87, 45.46, 37.30, 33.08, 37.77,
+]  # fmt: skip
+
+
+def _reference_ema_series(values: list[float], period: int) -> list[float]:
+    if not values:
+        return []
+    k = 2.0 / (period + 1.0)
+    series = [values[0]]
+    for value in values[1:]:
+        series.append((value - series[-1]) * k + series[-1])
+    return series
+
+
+def _reference_macd(closes: list[float]) -> tuple[float, float, float] | None:
+    if len(closes) < 35:
+        return None
+    fast = _reference_ema_series(closes, 12)
+    slow = _reference_ema_series(closes, 26)
+    macd_series = [f - s for f, s in zip(fast, slow)]
+    signal = _reference_ema_series(macd_series, 9)[-1]
+    return (macd_series[-1], signal, macd_series[-1] - signal)
+
+
+def _reference_bollinger(closes: list[float], period: int = 20, num_std: float = 2.0) -> tuple[float, float] | None:
+    if len(closes) < period:
+        return None
+    window = np.array(closes[-period:], dtype=float)
+    sma = float(window.mean())
+    std = float(window.std())
+    upper = sma + num_std * std
+    lower = sma - num_std * std
+    if upper == lower:
+        return (0.5, 0.0)
+    return ((window[-1] - lower) / (upper - lower), (upper - lower) / sma if sma > 0 else 0.0)
+
+
+def _reference_momentum(closes: list[float], window: int) -> float:
+    if len(closes) <= window:
+        return 0.0
+    past = closes[-(window + 1)]
+    if past == 0:
+        return 0.0
+    return max(-1.0, min(1.0, (closes[-1] - past) / past * 10.0))
+
+
+def _reference_depth_proxy(volumes: list[int]) -> float:
+    if not volumes:
+        return 0.0
+    average = np.mean(volumes[:-1]) if len(volumes) > 1 else volumes[-1]
+    if average <= 0:
+        return 0.0
+    return max(0.0, min(5.0, float(volumes[-1] / average)))
+
+
+class TestRollingWindow:
+    """Sliding mean/variance against NumPy."""
+
+    def test_matches_numpy_over_long_stream(self):
+        rng = random.Random(1)
+        window = RollingWindow(20)
+        values = [rng.uniform(50, 150) for _ in range(500)]
+        for i, value in enumerate(values):
+            window.push(value)
+            tail = values[max(0, i - 19) : i + 1]
+            assert window.mean == pytest.approx(float(np.mean(tail)), rel=1e-12)
+            assert window.std == pytest.approx(float(np.std(tail)), rel=1e-9, abs=1e-12)
+
+    def test_flat_window_has_zero_variance(self):
+        window = RollingWindow(5)
+        for value in (1.0, 7.0, 3.0, 9.0, 2.0, 4.0, 4.0, 4.0, 4.0, 4.0):
+            window.push(value)
+        assert window.variance == 0.0
+        assert window.nonzero == 5
+
+    def test_rejects_non_positive_size(self):
+        with pytest.raises(ValueError):
+            RollingWindow(0)
+
+
+class TestIndicatorParity:
+    """Incremental indicators must agree with the reference implementations above."""
+
+    @pytest.mark.parametrize('seed', [3, 11, 29])
+    def test_matches_reference_helpers_bar_by_bar(self, seed):
+        bars = _make_bars(120, seed=seed)
+        state = SymbolIndicatorState()
+        for i, bar in enumerate(bars):
+            state.update(bar)
+            closes = [float(b.close) for b in bars[: i + 1]]
+            volumes = [b.volume for b in bars[max(0, i - 19) : i + 1]]
+
+            expected_rsi = _reference_rsi(closes)
+            if expected_rsi is None:
+                assert state.rsi() is None
+            else:
+                assert state.rsi() == pytest.approx(expected_rsi, rel=1e-9)
+
+            expected_macd = _reference_macd(closes)
+            if expected_macd is None:
+                assert state.macd() is None
+            else:
+                assert state.macd() == pytest.approx(expected_macd, rel=1e-9, abs=1e-12)
+
+            expected_bb = _reference_bollinger(closes)
+            if expected_bb is None:
+                assert state.bollinger() is None
+            else:
+                assert state.bollinger() == pytest.approx(expected_bb, rel=1e-9, abs=1e-12)
+
+            assert state.momentum(5) == pytest.approx(_reference_momentum(closes, 5))
+            assert state.momentum(20) == pytest.approx(_reference_momentum(closes, 20))
+            assert state.depth_proxy() == pytest.approx(_reference_depth_proxy(volumes))
+            assert state.volume_ratio() == pytest.approx(volumes[-1] / float(np.mean(volumes)))
+
+            if len(closes) >= 20:
+                returns = np.diff(closes[-20:]) / np.array(closes[-20:-1])
+                assert state.return_std(19) == pytest.approx(float(np.std(returns)), rel=1e-9, abs=1e-12)
+            if len(closes) >= 30:
+                assert state.close_mean(30) == pytest.approx(float(np.mean(closes[-30:])), rel=1e-12)
+
+    def test_rsi_matches_wilder_reference(self):
+        base_time = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        state = SymbolIndicatorState()
+        values: list[float] = []
+        for i, close in enumerate(WILDER_CLOSES):
+            price = Decimal(str(close))
+            state.update(Bar('AAPL', base_time + timedelta(days=i), price, price, price, price, 1_000))
+            rsi = state.rsi()
+            if i < 14:
+                assert rsi is None
+            else:
+                assert rsi is not None
+                values.append(rsi)
+        # The published table rounds its intermediate averages
+        assert values == pytest.approx(WILDER_RSI, abs=0.015)
+
+    def test_rsi_without_losses_is_100(self):
+        base_time = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        state = SymbolIndicatorState()
+        for i in range(20):
+            price = Decimal(100 + i)
+            state.update(Bar('AAPL', base_time + timedelta(minutes=i), price, price, price, price, 1_000))
+        assert state.rsi() == 100.0
+
+    def test_flat_prices_hit_degenerate_branches(self):
+        state = SymbolIndicatorState.from_bars(_make_bars(60, flat_from=30))
+        assert state.bollinger() == (0.5, 0.0)
+        assert state.return_std(19) == 0.0
+
+    def test_longer_lookbacks_now_fire(self):
+        state = SymbolIndicatorState.from_bars(_make_bars(40))
+        assert state.macd() is not None
+        assert state.has_closes(30)
+        assert state.has_returns(29)
+        assert state.momentum(20) != 0.0
+
+
+class TestExtractStateIncremental:
+    """FSDEngine keeps one indicator state per symbol and advances it."""
+
+    def test_incremental_matches_rebuild(self):
+        portfolio = Portfolio(cash=Decimal('10000'))
+        incremental = FSDEngine(FSDConfig(), portfolio)
+        bars = _make_bars(80)
+        last_prices = {'AAPL': bars[-1].close}
+
+        history: list[Bar] = []
+        for bar in bars:
+            history.append(bar)
+            live = incremental.extract_state('AAPL', history, last_prices)
+            fresh = FSDEngine(FSDConfig(), portfolio).extract_state('AAPL', list(history), last_prices)
+            assert live.keys() == fresh.keys()
+            for key, value in fresh.items():
+                if isinstance(value, float):
+                    assert math.isclose(live[key], value, rel_tol=1e-9, abs_tol=1e-12), key
+                else:
+                    assert live[key] == value, key
+
+    def test_only_new_bars_are_ingested(self):
+        engine = FSDEngine(FSDConfig(), Portfolio(cash=Decimal('10000')))
+        bars = _make_bars(50)
+        engine.extract_state('AAPL', bars[:30], {})
+        state = engine._indicators['AAPL']
+        assert state.count == 30
+
+        engine.extract_state('AAPL', bars[:30], {})
+        assert engine._indicators['AAPL'] is state
+        assert state.count == 30
+
+        engine.extract_state('AAPL', bars[5:33], {})
+        assert engine._indicators['AAPL'] is state
+        assert state.count == 33
+
+    def test_rewind_rebuilds_state(self):
+        engine = FSDEngine(FSDConfig(), Portfolio(cash=Decimal('10000')))
+        bars = _make_bars(50)
+        engine.extract_state('AAPL', bars, {})
+        first = engine._indicators['AAPL']
+
+        engine.extract_state('AAPL', bars[:25], {})
+        rebuilt = engine._indicators['AAPL']
+        assert rebuilt is not first
+        assert rebuilt.count == 25
+        assert rebuilt.last_bar is bars[24]
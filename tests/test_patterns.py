@@ -0,0 +1,173 @@
+"""Tests for PatternDetector's vectorized scan and its result cache."""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from aistock.data import Bar, BarFrame
+from aistock.patterns import SCAN_PATTERNS, PatternDetector, PatternType
+
+
+def _random_bars(count: int, seed: int, ticks: int = 6, decimals: int = 2) -> list[Bar]:
+    """Bars on a coarse tick grid, so small bodies, long wicks and exact threshold ties are common."""
+    rng = random.Random(seed)
+    tick = Decimal(1).scaleb(-decimals)
+    start = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+    base = 10_000
+    bars = []
+    for i in range(count):
+        base += rng.randint(-3, 3)
+        open_ = base + rng.randint(-ticks, ticks)
+        close = base + rng.randint(-ticks, ticks)
+        high = max(open_, close) + rng.choice([0, 0, 1, 2, 2 * ticks])
+        low = min(open_, close) - rng.choice([0, 0, 1, 2, 2 * ticks])
+        volume = rng.choice([100, 100, 120, 400])
+        o, h, lo, c = (Decimal(value) * tick for value in (open_, high, low, close))
+        bars.append(Bar('AAPL', start + timedelta(minutes=i), o, h, lo, c, volume))
+    return bars
+
+
+def _expected(bars: list[Bar], index: int, body_threshold: float = 0.3, wick_ratio: float = 2.0):
+    # A fresh detector per call so its cache cannot mask a difference
+    return PatternDetector(body_threshold, wick_ratio).detect_patterns(bars[: index + 1])
+
+
+class TestPatternScan:
+    """Row i of a scan equals detect_patterns(bars[: i + 1])."""
+
+    @pytest.mark.parametrize(
+        ('seed', 'decimals', 'body_threshold', 'wick_ratio'),
+        [(1, 2, 0.3, 2.0), (2, 0, 0.25, 1.5), (3, 4, 1 / 3, 2.5)],
+    )
+    def test_scan_matches_detect_patterns(
+        self, seed: int, decimals: int, body_threshold: float, wick_ratio: float
+    ) -> None:
+        bars = _random_bars(300, seed, ticks=seed * 2, decimals=decimals)
+        detector = PatternDetector(body_threshold, wick_ratio)
+
+        scans = [
+            detector.scan(bars),
+            detector.scan(BarFrame.from_bars(bars)),
+            detector.scan(BarFrame.from_bars(bars, price_scale=10**4)),
+        ]
+        for scan in scans:
+            assert len(scan) == len(bars)
+            for i in range(len(bars)):
+                assert scan.at(i) == _expected(bars, i, body_threshold, wick_ratio), i
+        assert scans[0].detected.any(axis=0).all()
+
+    def test_scan_applies_context_and_early_exit(self) -> None:
+        bars = _random_bars(2000, 7, ticks=4)
+        scan = PatternDetector().scan(bars)
+
+        hammers = scan.column(PatternType.HAMMER)
+        assert not hammers[:9].any()
+        assert {0.85, 0.60} <= set(hammers.tolist())
+        for i in np.flatnonzero((scan.strength > 0.8).sum(axis=1) >= 2).tolist():
+            assert scan.at(i) == _expected(bars, i)
+
+    def test_scan_arrays_matches_scan(self) -> None:
+        bars = _random_bars(200, 11)
+        frame = BarFrame.from_bars(bars)
+        detector = PatternDetector()
+
+        scan = detector.scan_arrays(frame.open, frame.high, frame.low, frame.close, frame.volume)
+        np.testing.assert_array_equal(scan.strength, detector.scan(bars).strength)
+        assert scan.patterns == SCAN_PATTERNS
+
+    def test_prices_beyond_int64_stay_exact(self) -> None:
+        bars = [
+            Bar(
+                bar.symbol,
+                bar.timestamp,
+                bar.open.scaleb(15) + Decimal('0.0000001'),
+                bar.high.scaleb(15) + Decimal('0.0000001'),
+                bar.low.scaleb(15),
+                bar.close.scaleb(15),
+                bar.volume,
+            )
+            for bar in _random_bars(100, 5)
+        ]
+        scan = PatternDetector().scan(bars)
+        for i in range(len(bars)):
+            assert scan.at(i) == _expected(bars, i)
+
+    def test_empty_and_short_series(self) -> None:
+        detector = PatternDetector()
+        assert detector.scan([]).strength.shape == (0, len(SCAN_PATTERNS))
+
+        bars = _random_bars(2, 3)
+        scan = detector.scan(bars)
+        assert [scan.at(i) for i in range(2)] == [_expected(bars, i) for i in range(2)]
+
+
+class TestPatternCache:
+    """Results are cached per symbol, timeframe and bar content."""
+
+    def test_symbols_sharing_a_timestamp_do_not_collide(self) -> None:
+        bars = _random_bars(50, 1)
+        other = [Bar('MSFT', bar.timestamp, bar.close, bar.high, bar.low, bar.open, bar.volume) for bar in bars]
+        detector = PatternDetector()
+
+        for i in range(len(bars)):
+            assert detector.detect_patterns(bars[: i + 1]) == _expected(bars, i)
+            assert detector.detect_patterns(other[: i + 1]) == _expected(other, i)
+        assert detector.get_cache_stats()['misses'] == 100
+
+    def test_repeated_calls_hit_and_content_changes_miss(self) -> None:
+        bars = _random_bars(30, 2)
+        detector = PatternDetector()
+        first = detector.detect_patterns(bars)
+        assert detector.detect_patterns(list(bars)) == first
+        assert detector.detect_patterns(bars, timeframe='5m') == first
+
+        # A corrected volume inside the lookback changes the key, not just the last bar
+        revised = [
+            *bars[:-5],
+            Bar('AAPL', bars[-5].timestamp, bars[-5].open, bars[-5].high, bars[-5].low, bars[-5].close, 10_000),
+            *bars[-4:],
+        ]
+        assert detector.detect_patterns(revised) == _expected(revised, len(revised) - 1)
+        stats = detector.get_cache_stats()
+        assert (stats['hits'], stats['misses'], stats['entries']) == (1, 3, 3)
+        assert stats['hit_rate'] == 0.25
+
+    def test_budget_evicts_least_recently_used(self) -> None:
+        bars = _random_bars(20, 3)
+        detector = PatternDetector(cache_size=5)
+        for i in range(10):
+            detector.detect_patterns(bars[: i + 1])
+        detector.detect_patterns(bars[:6])
+        detector.detect_patterns(bars[:1])
+
+        stats = detector.get_cache_stats()
+        assert (stats['entries'], stats['evictions'], stats['hits'], stats['misses']) == (5, 6, 1, 11)
+
+    def test_invalidate_one_symbol(self) -> None:
+        detector = PatternDetector()
+        for symbol in ('AAPL', 'MSFT'):
+            bars = [
+                Bar(symbol, bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume)
+                for bar in _random_bars(5, 4)
+            ]
+            for i in range(len(bars)):
+                detector.detect_patterns(bars[: i + 1])
+
+        assert detector.invalidate('AAPL') == 5
+        assert detector.get_cache_stats()['symbols'] == 1
+        assert detector.invalidate() == 5
+        assert detector.get_cache_stats()['entries'] == 0
+
+    def test_zero_size_disables_cache(self) -> None:
+        detector = PatternDetector(cache_size=0)
+        bars = _random_bars(12, 5)
+        assert detector.detect_patterns(bars) == detector.detect_patterns(bars)
+        stats = detector.get_cache_stats()
+        assert (stats['entries'], stats['evictions'], stats['misses']) == (0, 0, 2)
+        with pytest.raises(ValueError):
+            PatternDetector(cache_size=-1)
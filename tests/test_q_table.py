@@ -0,0 +1,293 @@
+"""
+Unit tests for the integer state encoder and array-backed Q-table.
+
+Covers key packing, LRU eviction, lazy decay, and migration from MD5-keyed
+state files.
+"""
+
+import hashlib
+import json
+from decimal import Decimal
+
+import pytest
+
+from aistock.fsd import FSDConfig, FSDEngine, RLAgent
+from aistock.portfolio import Portfolio
+from aistock.q_table import QTable, StateEncoder
+
+
+def _legacy_md5(state: dict[str, object], config: FSDConfig) -> str:
+    """Reproduce the pre-encoder RLAgent hash for a fully specified state."""
+    agent = RLAgent(config)
+    discretized = {
+        'price_change_bin': agent._discretize(float(state['price_change_pct']), -0.05, 0.05, config.price_change_bins),
+        'volume_bin': agent._discretize(float(state['volume_ratio']), 0.5, 2.0, config.volume_bins),
+        'position_bin': agent._discretize(0.0, -0.5, 0.5, config.position_bins),
+        'trend': state['trend'],
+        'volatility': 'normal',
+        'trend_fast': state['trend'],
+        'trend_slow': state['trend'],
+        'volatility_fast': 'normal',
+        'volatility_slow': 'normal',
+        'rsi_bin': agent._discretize(float(state['rsi']), 0.0, 100.0, config.rsi_bins),
+        'macd_bin': agent._discretize(0.0, -0.05, 0.05, config.macd_bins),
+        'bb_pos_bin': agent._discretize(0.5, 0.0, 1.0, config.bollinger_bins),
+        'momentum_fast_bin': agent._discretize(0.0, -1.0, 1.0, config.momentum_bins),
+        'momentum_slow_bin': agent._discretize(0.0, -1.0, 1.0, config.momentum_bins),
+        'breadth_bin': agent._discretize(0.0, -1.0, 1.0, config.breadth_bins),
+        'vix_bin': agent._discretize(0.0, 10.0, 50.0, config.vix_bins),
+        'spread_bin': agent._discretize(0.0, 0.0, 200.0, config.spread_bins),
+        'depth_bin': agent._discretize(0.0, 0.0, 5.0, config.depth_bins),
+    }
+    return hashlib.md5(json.dumps(discretized, sort_keys=True).encode()).hexdigest()
+
+
+STATE = {'price_change_pct': 0.012, 'volume_ratio': 1.4, 'rsi': 71.0, 'trend': 'up'}
+
+
+class TestStateEncoder:
+    """Tests for mixed-radix state keys."""
+
+    def test_distinct_bins_give_distinct_keys(self):
+        encoder = StateEncoder(FSDConfig())
+        keys = {encoder.encode({'rsi': float(rsi)}) for rsi in range(0, 100, 13)}
+        assert len(keys) == FSDConfig().rsi_bins
+
+    def test_keys_fit_in_int64(self):
+        encoder = StateEncoder(FSDConfig())
+        assert 0 <= encoder.encode(STATE) < encoder.state_space < 2**63
+
+    def test_oversized_state_space_rejected(self):
+        with pytest.raises(ValueError, match='64-bit'):
+            StateEncoder(FSDConfig(price_change_bins=10**6, volume_bins=10**6, rsi_bins=10**6))
+
+    def test_legacy_hash_matches_md5_scheme(self):
+        config = FSDConfig()
+        encoder = StateEncoder(config)
+        assert encoder.legacy_hash(encoder.encode(STATE)) == _legacy_md5(STATE, config)
+
+    def test_unknown_label_has_no_legacy_hash(self):
+        encoder = StateEncoder(FSDConfig())
+        key = encoder.encode({'trend': 'sideways'})
+        assert key != encoder.encode({'trend': 'neutral'})
+        assert encoder.legacy_hash(key) is None
+
+
+class TestQTable:
+    """Tests for the array-backed Q-table."""
+
+    def test_lru_eviction_recycles_rows(self):
+        table = QTable(capacity=2, actions=('A', 'B'))
+        row_1 = table.insert(1, [1.0, 2.0])
+        table.insert(2)
+        table.touch(1)
+        table.insert(3, [5.0, 6.0])
+
+        assert list(table) == [1, 3]
+        assert table.row_for(3) != row_1
+        assert table.get(3) == {'A': 5.0, 'B': 6.0}
+        assert table.get(2) is None
+
+    def test_agent_respects_capacity(self):
+        agent = RLAgent(FSDConfig(max_q_table_states=10))
+        for i in range(50):
+            agent.select_action({'rsi': float(i * 2), 'price_change_pct': 0.001 * i}, training=False)
+        assert len(agent.q_values) == 10
+
+
+class TestQTablePersistence:
+    """Tests for saving, reloading and migrating Q-tables."""
+
+    def test_roundtrip_preserves_q_values(self, tmp_path):
+        config = FSDConfig()
+        engine = FSDEngine(config, Portfolio(cash=Decimal('10000')))
+        agent = engine.rl_agent
+        agent.update_q_value(STATE, 'BUY', 1.0, {**STATE, 'rsi': 20.0}, done=False)
+        expected = agent.q_values.get(agent.hash_state(STATE))
+
+        filepath = str(tmp_path / 'fsd_state.json')
+        engine.save_state(filepath)
+        restored = FSDEngine(config, Portfolio(cash=Decimal('10000')))
+        assert restored.load_state(filepath)
+
+        assert restored.rl_agent.q_values.get(restored.rl_agent.hash_state(STATE)) == expected
+
+    def test_legacy_md5_states_migrate_on_visit(self, tmp_path):
+        config = FSDConfig()
+        legacy_key = _legacy_md5(STATE, config)
+        filepath = tmp_path / 'fsd_state.json'
+        legacy_q = {'BUY': 3.0, 'SELL': -1.0, 'HOLD': 0.0, 'INCREASE_SIZE': 0.5, 'DECREASE_SIZE': 0.0}
+        filepath.write_text(json.dumps({'q_values': {legacy_key: legacy_q, 'f' * 32: legacy_q}}))
+
+        engine = FSDEngine(config, Portfolio(cash=Decimal('10000')))
+        assert engine.load_state(str(filepath))
+        agent = engine.rl_agent
+        assert len(agent.q_values) == 0
+        assert agent.check_q_table_size()['num_states'] == 2
+
+        assert agent.get_confidence(STATE, 'BUY') > 0.9
+        assert agent.select_action(STATE, training=False) == 'BUY'
+        assert agent.q_values.get(agent.hash_state(STATE)) == legacy_q
+
+        # Unvisited legacy states survive the next save
+        engine.save_state(str(filepath))
+        saved = json.loads(filepath.read_text())
+        assert list(saved['legacy_q_values']) == ['f' * 32]
+        assert saved['q_state_encoding']['scheme'] == 'mixed_radix_v1'
+
+    def test_changed_bin_layout_discards_keys(self, tmp_path):
+        engine = FSDEngine(FSDConfig(), Portfolio(cash=Decimal('10000')))
+        engine.rl_agent.select_action(STATE)
+        filepath = str(tmp_path / 'fsd_state.json')
+        engine.save_state(filepath)
+
+        resized = FSDEngine(FSDConfig(rsi_bins=4), Portfolio(cash=Decimal('10000')))
+        assert resized.load_state(filepath)
+        assert len(resized.rl_agent.q_values) == 0
+
+
+class TestLazyDecay:
+    """Lazy decay must reproduce the eager per-state sweep."""
+
+    def test_matches_eager_sweep(self):
+        import random
+
+        rng = random.Random(7)
+        table = QTable(capacity=64, actions=('A', 'B'))
+        reference: dict[int, list[float]] = {}
+        for step in range(500):
+            key = rng.randrange(40)
+            if key not in table:
+                table.insert(key)
+                reference[key] = [0.0, 0.0]
+            row = table.touch(key)
+            assert row is not None
+            values = table.row_values(row)
+            delta = rng.uniform(-1.0, 1.0)
+            values[step % 2] += delta
+            reference[key][step % 2] += delta
+            if step % 25 == 0:
+                factor = rng.uniform(0.5, 1.0)
+                table.decay(factor)
+                for ref_values in reference.values():
+                    ref_values[0] *= factor
+                    ref_values[1] *= factor
+
+        for key, ref_values in reference.items():
+            assert table.get(key) == pytest.approx({'A': ref_values[0], 'B': ref_values[1]}, rel=1e-12, abs=1e-15)
+
+    def test_decay_does_not_touch_rows_until_read(self):
+        table = QTable(capacity=4, actions=('A',))
+        row = table.insert(1, [2.0])
+        table.decay(0.5)
+        assert table._values[row, 0] == 2.0
+        assert table.get(1) == {'A': 1.0}
+
+    def test_agent_decay_applies_on_next_read_and_save(self, tmp_path):
+        from datetime import datetime, timedelta, timezone
+
+        config = FSDConfig(q_value_decay_per_day=0.5)
+        engine = FSDEngine(config, Portfolio(cash=Decimal('10000')))
+        agent = engine.rl_agent
+        key = agent.hash_state(STATE)
+        agent.select_action(STATE)
+        agent.q_values.row_values(agent.q_values.row_for(key))[0] = 8.0
+
+        agent.last_decay_timestamp = datetime.now(timezone.utc) - timedelta(days=2)
+        info = agent.apply_q_value_decay()
+        assert info['states_decayed'] == 1
+        assert agent.q_values.get(key)['BUY'] == pytest.approx(8.0 * info['decay_factor'])
+
+        filepath = str(tmp_path / 'fsd_state.json')
+        engine.save_state(filepath)
+        restored = FSDEngine(config, Portfolio(cash=Decimal('10000')))
+        assert restored.load_state(filepath)
+        assert restored.rl_agent.q_values.get(key)['BUY'] == pytest.approx(8.0 * info['decay_factor'], rel=1e-3)
+
+
+def _populated_engine(num_states: int = 200) -> FSDEngine:
+    engine = FSDEngine(FSDConfig(), Portfolio(cash=Decimal('10000')))
+    for i in range(num_states):
+        state = {
+            'rsi': (i % 8) * 12.5 + 1.0,
+            'price_change_pct': -0.049 + ((i // 8) % 10) * 0.01,
+            'volume_ratio': 0.51 + (i // 80) * 0.3,
+        }
+        engine.rl_agent.update_q_value(state, 'BUY', float(i), state, done=False)
+    return engine
+
+
+class TestBinaryCheckpoint:
+    """Tests for the binary snapshot + delta log Q-table checkpoint."""
+
+    def test_state_file_references_binary_checkpoint(self, tmp_path):
+        engine = _populated_engine(10)
+        filepath = tmp_path / 'fsd_state.json'
+        engine.save_state(str(filepath))
+
+        saved = json.loads(filepath.read_text())
+        assert 'q_values' not in saved
+        assert saved['q_table']['snapshot'] == 'fsd_state.qtable.bin'
+        assert (tmp_path / 'fsd_state.qtable.bin').exists()
+
+    def test_second_save_appends_only_dirty_rows(self, tmp_path):
+        engine = _populated_engine()
+        filepath = str(tmp_path / 'fsd_state.json')
+        base_path, delta_path = FSDEngine.q_table_paths(tmp_path / 'fsd_state.json')
+        engine.save_state(filepath)
+        base_bytes = base_path.read_bytes()
+
+        engine.rl_agent.update_q_value(STATE, 'SELL', 5.0, STATE, done=False)
+        engine.save_state(filepath)
+
+        assert base_path.read_bytes() == base_bytes
+        assert 0 < delta_path.stat().st_size < len(base_bytes) // 10
+
+        restored = FSDEngine(FSDConfig(), Portfolio(cash=Decimal('10000')))
+        assert restored.load_state(filepath)
+        assert list(restored.rl_agent.q_values) == list(engine.rl_agent.q_values)
+        key = engine.rl_agent.hash_state(STATE)
+        assert restored.rl_agent.q_values.get(key) == engine.rl_agent.q_values.get(key)
+
+    def test_torn_delta_record_is_ignored(self, tmp_path):
+        engine = _populated_engine()
+        filepath = str(tmp_path / 'fsd_state.json')
+        _, delta_path = FSDEngine.q_table_paths(tmp_path / 'fsd_state.json')
+        engine.save_state(filepath)
+        engine.rl_agent.update_q_value(STATE, 'SELL', 5.0, STATE, done=False)
+        engine.save_state(filepath)
+        expected = engine.rl_agent.q_values.get(engine.rl_agent.hash_state(STATE))
+
+        with delta_path.open('ab') as handle:
+            handle.write(b'AIQD' + b'\x00' * 10)
+
+        restored = FSDEngine(FSDConfig(), Portfolio(cash=Decimal('10000')))
+        assert restored.load_state(filepath)
+        assert restored.rl_agent.q_values.get(restored.rl_agent.hash_state(STATE)) == expected
+
+        # The next delta overwrites the torn tail instead of appending after it
+        restored.rl_agent.update_q_value(STATE, 'SELL', 5.0, STATE, done=False)
+        restored.save_state(filepath)
+        again = FSDEngine(FSDConfig(), Portfolio(cash=Decimal('10000')))
+        assert again.load_state(filepath)
+        assert again.rl_agent.q_values.get(again.rl_agent.hash_state(STATE)) == restored.rl_agent.q_values.get(
+            restored.rl_agent.hash_state(STATE)
+        )
+
+    def test_corrupt_snapshot_falls_back_to_backup(self, tmp_path):
+        engine = _populated_engine(10)
+        filepath = str(tmp_path / 'fsd_state.json')
+        base_path, _ = FSDEngine.q_table_paths(tmp_path / 'fsd_state.json')
+        engine.save_state(filepath)
+        # Touching more rows than the delta budget allows forces a snapshot rewrite
+        for key in list(engine.rl_agent.q_values):
+            engine.rl_agent.q_values.touch(key)
+        engine.rl_agent.update_q_value(STATE, 'BUY', 1.0, STATE, done=False)
+        engine.save_state(filepath)
+        assert base_path.with_suffix('.backup').exists()
+
+        base_path.write_bytes(b'garbage')
+        restored = FSDEngine(FSDConfig(), Portfolio(cash=Decimal('10000')))
+        assert restored.load_state(filepath)
+        assert len(restored.rl_agent.q_values) == 10
+        assert engine.rl_agent.hash_state(STATE) not in restored.rl_agent.q_values
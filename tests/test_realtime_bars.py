@@ -0,0 +1,408 @@
+"""Tests for the real-time bar hand-off from a broker callback thread to worker threads."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from aistock.brokers.paper import PaperBroker
+from aistock.brokers.realtime import (
+    BLOCK,
+    DROP_NEWEST,
+    DROP_OLDEST,
+    RealtimeBarDispatcher,
+    RealtimeBarDropHandler,
+    RealtimeBarHandler,
+)
+from aistock.capital_management import CompoundingStrategy
+from aistock.config import BacktestConfig, BrokerConfig, DataSource, EngineConfig, ExecutionConfig, StrategyConfig
+from aistock.portfolio import Portfolio
+from aistock.risk import RiskEngine
+from aistock.session.analytics_reporter import AnalyticsReporter
+from aistock.session.bar_processor import BarProcessor
+from aistock.session.coordinator import TradingCoordinator
+from aistock.session.reconciliation import PositionReconciler
+from aistock.stop_control import StopConfig, StopController
+
+# Mid-session, clear of the open/close avoidance windows
+START = datetime(2025, 1, 2, 16, 0, tzinfo=timezone.utc)
+
+
+class FakeRealtimeBroker(PaperBroker):
+    """Paper broker with real-time bar subscriptions fed by ``emit`` on one callback thread, like IBAPI's reader."""
+
+    def __init__(self, dispatcher: RealtimeBarDispatcher) -> None:
+        super().__init__(ExecutionConfig())
+        self.dispatcher = dispatcher
+        self._handlers: dict[int, tuple[str, RealtimeBarHandler]] = {}
+        self._req_ids = itertools.count(1)
+
+    def start(self) -> None:
+        self.dispatcher.start()
+
+    def stop(self) -> None:
+        self.dispatcher.stop()
+        super().stop()
+
+    def subscribe_realtime_bars(self, symbol: str, handler: RealtimeBarHandler, bar_size: int = 5) -> int:
+        req_id = next(self._req_ids)
+        self._handlers[req_id] = (symbol, handler)
+        return req_id
+
+    def unsubscribe(self, req_id: int) -> None:
+        self._handlers.pop(req_id, None)
+
+    def set_realtime_bar_drop_handler(self, handler: RealtimeBarDropHandler | None) -> None:
+        self.dispatcher.set_drop_handler(handler)
+
+    def emit(
+        self, bars_per_symbol: int, rate_hz: float | None = None, bar_seconds: int = 5, first_bar: int = 0
+    ) -> float:
+        """Emit bars round-robin over the subscriptions at ``rate_hz`` (None = as fast as possible).
+
+        Bar ``i`` is stamped ``START + i * bar_seconds``, starting at ``first_bar``.
+        Returns the seconds the callback thread spent emitting.
+        """
+        interval = 1.0 / rate_hz if rate_hz else 0.0
+        began = time.perf_counter()
+        for i in range(first_bar, first_bar + bars_per_symbol):
+            timestamp = START + timedelta(seconds=i * bar_seconds)
+            for symbol, handler in list(self._handlers.values()):
+                price = 100.0 + i
+                self.dispatcher.submit(symbol, handler, timestamp, price, price, price, price, 100.0)
+                if interval:
+                    time.sleep(interval)
+        return time.perf_counter() - began
+
+
+class Recorder:
+    """Handler recording (symbol, timestamp) per call, optionally slow."""
+
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.calls: dict[str, list[datetime]] = {}
+        self.threads: set[str] = set()
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, timestamp: datetime, symbol: str, open_: float, high: float, low: float, close: float, volume: float
+    ) -> None:
+        if self.delay:
+            time.sleep(self.delay)
+        with self._lock:
+            self.calls.setdefault(symbol, []).append(timestamp)
+            self.threads.add(threading.current_thread().name)
+
+
+def _wait_idle(dispatcher: RealtimeBarDispatcher, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        stats = dispatcher.get_stats()
+        if stats['processed'] + stats['dropped'] >= stats['submitted'] and not stats['queued']:
+            return
+        time.sleep(0.005)
+    raise AssertionError(f'dispatcher did not drain: {dispatcher.get_stats()}')
+
+
+def _subscribe(broker: FakeRealtimeBroker, handler: RealtimeBarHandler, symbols: int) -> None:
+    for i in range(symbols):
+        broker.subscribe_realtime_bars(f'SYM{i}', handler)
+
+
+class TestRealtimeBarDispatcher:
+    """Ordering, backpressure and metrics of the hand-off."""
+
+    def test_bars_are_handled_in_order_per_symbol_across_workers(self) -> None:
+        dispatcher = RealtimeBarDispatcher(workers=4, queue_size=100_000)
+        broker = FakeRealtimeBroker(dispatcher)
+        recorder = Recorder()
+        _subscribe(broker, recorder, 8)
+        broker.start()
+
+        broker.emit(bars_per_symbol=500)
+        _wait_idle(dispatcher)
+        broker.stop()
+
+        assert len(recorder.calls) == 8
+        for timestamps in recorder.calls.values():
+            assert timestamps == [START + timedelta(seconds=5 * i) for i in range(500)]
+        assert len(recorder.threads) == 4
+        stats = dispatcher.get_stats()
+        assert (stats['submitted'], stats['processed'], stats['dropped'], stats['errors']) == (4000, 4000, 0, 0)
+        assert stats['symbols'] == 8
+        assert 0 <= stats['lag_mean_seconds'] <= stats['lag_max_seconds']
+
+    def test_slow_handler_does_not_stall_the_callback_thread(self) -> None:
+        dispatcher = RealtimeBarDispatcher(workers=2, queue_size=5, policy=DROP_OLDEST)
+        broker = FakeRealtimeBroker(dispatcher)
+        recorder = Recorder(delay=0.01)
+        _subscribe(broker, recorder, 4)
+        broker.start()
+
+        # 400 bars of 10 ms handler work would take 2 s inline
+        emit_seconds = broker.emit(bars_per_symbol=100)
+        assert emit_seconds < 0.5
+        _wait_idle(dispatcher)
+        broker.stop()
+
+        stats = dispatcher.get_stats()
+        assert stats['dropped'] > 0
+        assert stats['processed'] + stats['dropped'] == stats['submitted'] == 400
+        assert stats['max_queued'] <= 5
+        assert stats['lag_max_seconds'] >= 0.01
+        for timestamps in recorder.calls.values():
+            # The freshest bars survive, still in order
+            assert timestamps == sorted(timestamps)
+            assert timestamps[-1] == START + timedelta(seconds=5 * 99)
+
+    def test_drop_newest_keeps_the_queued_bars(self) -> None:
+        dispatcher = RealtimeBarDispatcher(workers=1, queue_size=5, policy=DROP_NEWEST)
+        recorder = Recorder()
+        # Not started: nothing is consumed, so the queue fills up
+        for i in range(8):
+            accepted = dispatcher.submit('AAPL', recorder, START + timedelta(seconds=i), 1.0, 1.0, 1.0, 1.0, 1.0)
+            assert accepted == (i < 5)
+        dispatcher.start()
+        _wait_idle(dispatcher)
+        dispatcher.stop()
+
+        assert recorder.calls['AAPL'] == [START + timedelta(seconds=i) for i in range(5)]
+        assert dispatcher.get_stats()['dropped'] == 3
+
+    def test_drop_oldest_only_evicts_the_bursting_symbol(self) -> None:
+        dispatcher = RealtimeBarDispatcher(workers=1, queue_size=3, policy=DROP_OLDEST)
+        recorder = Recorder()
+        # Both symbols share the only worker; not started, so MSFT's bars stay queued behind AAPL's burst
+        for i in range(2):
+            assert dispatcher.submit('MSFT', recorder, START + timedelta(seconds=i), 1.0, 1.0, 1.0, 1.0, 1.0)
+        for i in range(10):
+            assert dispatcher.submit('AAPL', recorder, START + timedelta(seconds=i), 1.0, 1.0, 1.0, 1.0, 1.0)
+        assert dispatcher.get_stats()['queued'] == 5
+        dispatcher.start()
+        _wait_idle(dispatcher)
+        dispatcher.stop()
+
+        assert recorder.calls['MSFT'] == [START, START + timedelta(seconds=1)]
+        assert recorder.calls['AAPL'] == [START + timedelta(seconds=i) for i in range(7, 10)]
+        assert dispatcher.get_stats()['dropped'] == 7
+
+    @pytest.mark.parametrize(
+        ('policy', 'expected'),
+        [
+            # The span is reported before the first bar handled after the drops
+            (DROP_OLDEST, [('dropped', 0, 2), 3, 4]),
+            (DROP_NEWEST, [('dropped', 2, 4), 0, 1]),
+        ],
+    )
+    def test_dropped_bars_are_reported_in_order(self, policy: str, expected: list[Any]) -> None:
+        dispatcher = RealtimeBarDispatcher(workers=1, queue_size=2, policy=policy)
+        events: list[Any] = []
+
+        def on_bar(timestamp: datetime, symbol: str, *prices: float) -> None:
+            events.append(int((timestamp - START).total_seconds()))
+
+        def on_drop(symbol: str, first: datetime, last: datetime) -> None:
+            events.append(('dropped', int((first - START).total_seconds()), int((last - START).total_seconds())))
+
+        dispatcher.set_drop_handler(on_drop)
+        for i in range(5):
+            dispatcher.submit('AAPL', on_bar, START + timedelta(seconds=i), 1.0, 1.0, 1.0, 1.0, 1.0)
+        dispatcher.start()
+        _wait_idle(dispatcher)
+        dispatcher.stop()
+
+        assert events == expected
+
+    def test_block_is_the_default_policy(self) -> None:
+        assert RealtimeBarDispatcher().get_stats()['policy'] == BLOCK
+        assert BrokerConfig().ib_bar_drop_policy == BLOCK
+
+    def test_block_waits_for_space(self) -> None:
+        dispatcher = RealtimeBarDispatcher(workers=1, queue_size=2, policy=BLOCK, block_timeout=5.0)
+        broker = FakeRealtimeBroker(dispatcher)
+        recorder = Recorder(delay=0.002)
+        _subscribe(broker, recorder, 1)
+        broker.start()
+
+        broker.emit(bars_per_symbol=50)
+        _wait_idle(dispatcher)
+        broker.stop()
+
+        stats = dispatcher.get_stats()
+        assert (stats['processed'], stats['dropped']) == (50, 0)
+        assert stats['blocked'] > 0
+        assert len(recorder.calls['SYM0']) == 50
+
+    def test_handler_errors_are_counted_and_workers_survive(self) -> None:
+        dispatcher = RealtimeBarDispatcher(workers=1)
+        seen: list[datetime] = []
+
+        def flaky(timestamp: datetime, symbol: str, *prices: float) -> None:
+            if len(seen) % 2 == 0:
+                seen.append(timestamp)
+                raise RuntimeError('boom')
+            seen.append(timestamp)
+
+        dispatcher.start()
+        for i in range(6):
+            dispatcher.submit('AAPL', flaky, START + timedelta(seconds=i), 1.0, 1.0, 1.0, 1.0, 1.0)
+        _wait_idle(dispatcher)
+        dispatcher.stop()
+
+        stats = dispatcher.get_stats()
+        assert (stats['processed'], stats['errors']) == (6, 3)
+
+    def test_zero_workers_handles_inline(self) -> None:
+        dispatcher = RealtimeBarDispatcher(workers=0)
+        recorder = Recorder()
+        dispatcher.submit('AAPL', recorder, START, 1.0, 1.0, 1.0, 1.0, 1.0)
+
+        assert recorder.calls == {'AAPL': [START]}
+        assert recorder.threads == {threading.current_thread().name}
+        assert dispatcher.get_stats()['processed'] == 1
+
+    def test_stop_without_drain_discards_queue(self) -> None:
+        dispatcher = RealtimeBarDispatcher(workers=1)
+        recorder = Recorder()
+        dispatcher.start()
+        dispatcher.stop()
+        for i in range(3):
+            dispatcher.submit('AAPL', recorder, START + timedelta(seconds=i), 1.0, 1.0, 1.0, 1.0, 1.0)
+        dispatcher.start()
+        dispatcher.stop(drain=False)
+        assert dispatcher.get_stats()['processed'] + dispatcher.get_stats()['dropped'] == 3
+
+    @pytest.mark.parametrize(
+        'kwargs',
+        [{'workers': -1}, {'queue_size': 0}, {'policy': 'fifo'}, {'block_timeout': -1.0}],
+    )
+    def test_invalid_arguments(self, kwargs: dict[str, Any]) -> None:
+        with pytest.raises(ValueError):
+            RealtimeBarDispatcher(**kwargs)
+
+    def test_broker_config_validates_ingest_settings(self) -> None:
+        BrokerConfig(ib_bar_workers=0, ib_bar_drop_policy='block').validate()
+        with pytest.raises(ValueError):
+            BrokerConfig(ib_bar_drop_policy='fifo').validate()
+        with pytest.raises(ValueError):
+            BrokerConfig(ib_bar_queue_size=0).validate()
+
+
+class _GroupingEngine:
+    """Decision engine stub recording the decision-bar groups it evaluates."""
+
+    def __init__(self) -> None:
+        self.groups: list[tuple[datetime, list[str]]] = []
+
+    def evaluate_opportunity(self, symbol: str, bars: Any, last_prices: dict[str, Decimal]) -> dict[str, Any]:
+        self.groups.append((bars[-1].timestamp, [symbol]))
+        return {'should_trade': False, 'action': {}}
+
+    def evaluate_batch(self, histories: Any, last_prices: dict[str, Decimal]) -> dict[str, dict[str, Any]]:
+        timestamp = next(iter(histories.values()))[-1].timestamp
+        self.groups.append((timestamp, sorted(histories)))
+        return {symbol: {'should_trade': False, 'action': {}} for symbol in histories}
+
+    def register_trade_intent(self, *args: object) -> None:
+        return
+
+    def handle_fill(self, *args: object) -> None:
+        return
+
+    def start_session(self) -> dict[str, Any]:
+        return {}
+
+    def end_session(self) -> dict[str, Any]:
+        return {}
+
+    def save_state(self, filepath: str) -> None:
+        return
+
+    def load_state(self, filepath: str) -> bool:
+        return False
+
+
+class _NoopCheckpointer:
+    def save_async(self, *args: object, **kwargs: object) -> None:
+        return
+
+    def shutdown(self) -> None:
+        return
+
+
+def _coordinator(
+    tmp_path: Path, broker: FakeRealtimeBroker, engine: _GroupingEngine, symbols: list[str]
+) -> TradingCoordinator:
+    data = DataSource(path=str(tmp_path), timezone=timezone.utc, symbols=tuple(symbols), enforce_trading_hours=False)
+    engine_config = EngineConfig(strategy=StrategyConfig(), initial_equity=10000.0)
+    broker_config = BrokerConfig(backend='ibkr', ib_account='DU0000000', ib_client_id=1)
+    config = BacktestConfig(data=data, engine=engine_config, execution=ExecutionConfig(), broker=broker_config)
+    portfolio = Portfolio(cash=Decimal('10000'))
+    risk_engine = RiskEngine(
+        engine_config.risk, portfolio, bar_interval=timedelta(minutes=1), minimum_balance_enabled=False
+    )
+    checkpoint_dir = tmp_path / 'state'
+    return TradingCoordinator(
+        config=config,
+        portfolio=portfolio,
+        risk_engine=risk_engine,
+        decision_engine=engine,
+        broker=broker,
+        bar_processor=BarProcessor(timeframe_manager=None, warmup_bars=50),
+        reconciler=PositionReconciler(portfolio, broker, risk_engine, interval_minutes=999999),
+        checkpointer=_NoopCheckpointer(),
+        analytics=AnalyticsReporter(portfolio, str(checkpoint_dir)),
+        capital_manager=CompoundingStrategy(),
+        stop_controller=StopController(StopConfig(enable_eod_flatten=False)),
+        symbols=symbols,
+        checkpoint_dir=str(checkpoint_dir),
+    )
+
+
+def test_coordinator_processes_realtime_bars_from_worker_threads(tmp_path: Path) -> None:
+    symbols = ['SYM0', 'SYM1', 'SYM2', 'SYM3']
+    dispatcher = RealtimeBarDispatcher(workers=4)
+    broker = FakeRealtimeBroker(dispatcher)
+    engine = _GroupingEngine()
+    coordinator = _coordinator(tmp_path, broker, engine, symbols)
+    coordinator.start()
+
+    # 5 s bars for 10 minutes plus one bar to close the last minute; emitted at a steady rate
+    broker.emit(bars_per_symbol=121, rate_hz=20_000)
+    _wait_idle(dispatcher)
+    coordinator.stop()
+
+    assert [timestamp for timestamp, _ in engine.groups] == [START + timedelta(minutes=i) for i in range(10)]
+    assert all(group == symbols for _, group in engine.groups)
+
+
+def test_coordinator_skips_minutes_with_dropped_bars(tmp_path: Path) -> None:
+    symbols = ['SYM0', 'SYM1']
+    dispatcher = RealtimeBarDispatcher(workers=1, queue_size=13, policy=DROP_NEWEST)
+    broker = FakeRealtimeBroker(dispatcher)
+    engine = _GroupingEngine()
+    coordinator = _coordinator(tmp_path, broker, engine, symbols)
+    coordinator.start()
+
+    # Stall the worker: minute 0 and the first bar of minute 1 are queued, the rest up to minute 2's
+    # first bar (65 s to 120 s) is dropped
+    dispatcher.stop()
+    broker.emit(bars_per_symbol=25)
+    dispatcher.start()
+    # Then the rest of minute 2, minute 3 and the bar closing it, a queue's worth at a time
+    for first_bar in (25, 37):
+        _wait_idle(dispatcher)
+        broker.emit(bars_per_symbol=12, first_bar=first_bar)
+    _wait_idle(dispatcher)
+    coordinator.stop()
+
+    assert dispatcher.get_stats()['dropped'] == 24
+    # Minutes 1 and 2 lost bars, so their OHLCV is not fed to the decision engine
+    assert engine.groups == [(START, symbols), (START + timedelta(minutes=3), symbols)]
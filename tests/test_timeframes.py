@@ -1,9 +1,23 @@
-from datetime import timezone
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import numpy as np
+import pytest
 
 from aistock.config import BacktestConfig, BrokerConfig, DataSource, EngineConfig
+from aistock.data import Bar
 from aistock.factories import SessionFactory
 from aistock.fsd import FSDConfig
-from aistock.timeframes import TimeframeManager
+from aistock.timeframes import TimeframeManager, Trend
+
+
+def _bars(closes: list[float], volume: int = 1000) -> list[Bar]:
+    start = datetime(2024, 1, 2, 14, 30, tzinfo=timezone.utc)
+    bars = []
+    for i, close in enumerate(closes):
+        price = Decimal(str(close))
+        bars.append(Bar('AAPL', start + timedelta(minutes=i), price, price, price, price, volume + i))
+    return bars
 
 
 def test_invalid_timeframe_defaults_to_one_minute():
@@ -24,3 +38,52 @@ def test_session_factory_filters_timeframes_by_max_timeframe_seconds(tmp_path):
     assert '15m' not in timeframe_manager.timeframes
     assert '1m' in timeframe_manager.timeframes
     assert '5m' in timeframe_manager.timeframes
+
+
+def test_ring_buffer_keeps_last_max_bars():
+    manager = TimeframeManager(symbols=['AAPL'], timeframes=['1m'], max_bars_per_timeframe=25)
+    bars = _bars([100 + i for i in range(60)])
+    for bar in bars:
+        manager.add_bar('AAPL', '1m', bar)
+
+    assert manager.get_bars('AAPL', '1m') == bars[-25:]
+    assert manager.get_bars('AAPL', '1m', lookback=3) == bars[-3:]
+    assert manager.get_bars('AAPL', '1m', lookback=0) == []
+    assert manager.get_latest_bar('AAPL', '1m') is bars[-1]
+    assert manager.get_bars('MSFT', '1m') == []
+    assert manager.has_sufficient_data('AAPL', min_bars=25)
+    assert not manager.has_sufficient_data('AAPL', min_bars=26)
+
+
+def test_close_and_volume_views_are_read_only_and_uncopied():
+    manager = TimeframeManager(symbols=['AAPL'], timeframes=['1m'], max_bars_per_timeframe=25)
+    bars = _bars([100 + i for i in range(40)])
+    for bar in bars:
+        manager.add_bar('AAPL', '1m', bar)
+
+    closes = manager.get_closes('AAPL', '1m', lookback=10)
+    np.testing.assert_array_equal(closes, [float(bar.close) for bar in bars[-10:]])
+    np.testing.assert_array_equal(manager.get_volumes('AAPL', '1m'), [bar.volume for bar in bars[-25:]])
+    assert not closes.flags.owndata
+    with pytest.raises(ValueError):
+        closes[0] = 0.0
+    assert len(manager.get_closes('MSFT', '1m')) == 0
+
+
+def test_state_follows_the_rolling_window():
+    manager = TimeframeManager(symbols=['AAPL'], timeframes=['1m'])
+    rising = [100 * 1.01**i for i in range(30)]
+    for bar in _bars(rising):
+        manager.add_bar('AAPL', '1m', bar)
+    up = manager.analyze_cross_timeframe('AAPL').timeframe_states['1m']
+    assert up.trend == Trend.UP
+    assert up.momentum == pytest.approx(1.0)
+    assert up.volatility == pytest.approx(0.0, abs=1e-3)
+
+    falling = [rising[-1] * 0.99**i for i in range(1, 30)]
+    for bar in _bars(falling)[:20]:
+        manager.add_bar('AAPL', '1m', bar)
+    down = manager.analyze_cross_timeframe('AAPL').timeframe_states['1m']
+    assert down.trend == Trend.DOWN
+    assert down.momentum < 0
+    assert down.volume_ratio == pytest.approx(1019 / np.mean(np.arange(1000, 1019)))